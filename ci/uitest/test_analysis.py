@@ -31,7 +31,8 @@ import pytest
 
 from uitest.jls_fixtures import write_fsr_v2
 
-_WIDGET_TOOLS = ['HistogramRangeTool', 'CdfRangeTool', 'FrequencyRangeTool']
+_WIDGET_TOOLS = ['HistogramRangeTool', 'CdfRangeTool', 'FrequencyRangeTool', 'SpectrogramRangeTool',
+                 'EventsRangeTool']
 
 
 def _open_signal_file(ui_session, tmp_capture):
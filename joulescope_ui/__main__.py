@@ -16,6 +16,7 @@
 
 import sys
 import argparse
+import multiprocessing
 from joulescope_ui import entry_points
 
 
@@ -47,6 +48,7 @@ def get_parser():
 
 
 def run():
+    multiprocessing.freeze_support()  # range tool worker processes in frozen builds
     parser, entry_point_names = get_parser()
     if len(sys.argv) == 1:
         sys.argv.append('ui')
@@ -171,6 +171,25 @@ SETTINGS = {
         ],
         'default': 'SI',
     },
+    'range_tool_process': {
+        'dtype': 'bool',
+        'brief': N_('Run range tool analysis in worker processes.'),
+        'detail': N_("""When enabled, CPU-intensive range tools, such as
+            histogram and max window, compute in separate processes.
+            The user interface remains responsive during long analyses
+            at the cost of additional memory and process startup time."""),
+        'default': False,
+    },
+    'range_tool_cache_disk': {
+        'dtype': 'bool',
+        'brief': N_('Save range tool results next to JLS files.'),
+        'detail': N_("""Range tool results are always cached in memory.
+            When enabled, results for JLS files are also saved to a
+            directory next to the file, so repeating an analysis after
+            reopening the file is fast.  Results are invalidated when
+            the file changes."""),
+        'default': False,
+    },
     'opengl': {
         'dtype': 'str',
         'brief': N_('Select the OpenGL rendering method.'),
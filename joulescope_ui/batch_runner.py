@@ -0,0 +1,380 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run range tool analyses over many ranges, signals and files.
+
+Publish to registry/batch_runner/actions/!run with the obj value:
+
+* id: The optional caller-provided batch identifier, returned in the result.
+* jobs: The list of job dicts, each with:
+  * source: The SIGNAL_BUFFER_SOURCE unique id.  Provide source or path.
+  * path: The JLS file path, directory or glob pattern.  Each matching
+    file is opened for the batch and closed when the batch completes.
+  * signal: The signal as '{source}.{device}.{quantity}', '{device}.{quantity}'
+    or '{quantity}', such as 'i'.
+  * range: None for the entire signal, [start, end] in UTC time64, or
+    {'waveform': unique_id} for each dual marker in a waveform widget.
+* analyses: The list of analysis names or dicts with the 'name' key
+  and the analysis parameters.  See ANALYSES.
+* parallelism: The optional maximum number of concurrent jobs.
+* output: The optional output file path.  The '.json' extension writes
+  JSON, and all other extensions write CSV.
+* rsp_topic: The optional topic to also receive the result.
+
+When complete, the runner publishes the result to events/done as
+the obj with id, columns, rows, output and elapsed_s.  Each row
+contains the job range, its status, the seconds spent waiting
+in the queue, the seconds spent running, and the analysis values.
+"""
+
+from joulescope_ui import N_, Metadata, get_topic_name, time64
+from joulescope_ui.jls_source import JlsSource
+from joulescope_ui.range_tool import RangeToolBase
+from joulescope_ui.range_tools.max_window import find_windows
+from joulescope_ui.range_tools.plugin_helpers import calculate_distribution, PERCENTILES
+from collections import deque
+import csv
+import glob
+import json
+import logging
+import numpy as np
+import os
+import time
+
+
+PARALLELISM_DEFAULT = 2
+_BASE_COLUMNS = ['job', 'source', 'path', 'signal', 'marker', 'range_start', 'range_end',
+                 'range_start_utc', 'range_s', 'status', 'queue_s', 'elapsed_s']
+_log = logging.getLogger(__name__)
+
+
+def _statistics(tool, signal, params):
+    d = tool.request(signal, 'utc', *tool.x_range, 1)
+    data = d['data']
+    if d['response_type'] == 'summary':
+        v_mean, v_std, v_min, v_max = [float(x) for x in data[0, :4]]
+    else:
+        x = np.asarray(data, dtype=np.float64)
+        v_mean, v_std, v_min, v_max = [float(f(x)) for f in (np.mean, np.std, np.min, np.max)]
+    r = d['info']['time_range_samples']
+    return {'mean': v_mean, 'std': v_std, 'min': v_min, 'max': v_max,
+            'samples': int(r['end'] - r['start'] + 1)}
+
+
+def _histogram(tool, signal, params):
+    rv = calculate_distribution(tool, tool.value, signal, params.get('num_bins', 0),
+                                params.get('scale'), PERCENTILES)
+    if rv is None:
+        return None
+    return {f'p{p:g}': float(v) for p, v in rv['percentiles'].items()}
+
+
+def _max_window(tool, signal, params):
+    rv = find_windows(tool, signal, tool.x_range, float(params['width']))
+    if rv is None:
+        return None
+    if not len(rv[0]):
+        return {}
+    v, t0, t1 = rv[0][0]
+    x0 = tool.x_range[0]
+    return {
+        'max_window_mean': float(v),
+        'max_window_start_s': (t0 - x0) / time64.SECOND,
+        'max_window_end_s': (t1 - x0) / time64.SECOND,
+    }
+
+
+ANALYSES = {
+    'statistics': _statistics,  # mean, std, min, max, samples
+    'histogram': _histogram,    # exact percentiles, params: num_bins, scale
+    'max_window': _max_window,  # params: width in seconds
+}
+
+
+class BatchJob(RangeToolBase):
+    """Run the batch analyses for one range."""
+    NAME = N_('Batch job')
+    BRIEF = N_('Run batch analyses over a range')
+    DESCRIPTION = N_('Run the batch analyses over one range.')
+    CAPABILITIES = []  # not a user-selectable range tool
+
+    def __init__(self, value):
+        super().__init__(value)
+
+    def _run(self):
+        row = self.value['row']
+        row['queue_s'] = time.perf_counter() - self.value['t_queue']
+        t_start = time.perf_counter()
+        signal = self.signals[0]
+        try:
+            for analysis in self.kwargs['analyses']:
+                rv = ANALYSES[analysis['name']](self, signal, analysis)
+                if rv is None or self.abort:
+                    row['status'] = 'aborted'
+                    break
+                row.update(rv)
+            else:
+                row['status'] = 'ok'
+        except Exception as ex:
+            self._log.warning('job %s failed: %s', row['job'], ex)
+            row['status'] = f'error: {ex}'
+        row['elapsed_s'] = time.perf_counter() - t_start
+
+
+def _analyses_normalize(analyses):
+    result = []
+    for analysis in analyses or ['statistics']:
+        if isinstance(analysis, str):
+            analysis = {'name': analysis}
+        analysis = dict(analysis)
+        if analysis.get('name') not in ANALYSES:
+            raise ValueError(f'unsupported analysis: {analysis.get("name")}')
+        result.append(analysis)
+    return result
+
+
+def _paths_expand(path):
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, '*.jls')))
+    if glob.has_magic(path):
+        return sorted(glob.glob(path))
+    return [path]
+
+
+def _signal_resolve(pubsub, source, signal):
+    if signal.count('.') == 2:
+        return signal
+    for s in pubsub.enumerate(f'{get_topic_name(source)}/settings/signals'):
+        if s == signal or s.endswith('.' + signal):
+            return f'{source}.{s}'
+    raise ValueError(f'signal {signal} not found in {source}')
+
+
+def _ranges_resolve(pubsub, signal, x_range):
+    """Return the list of (marker, [start, end]) for a job range."""
+    if x_range is None:
+        source, device, quantity = signal.split('.')
+        r = pubsub.query(f'{get_topic_name(source)}/settings/signals/{device}.{quantity}/range')
+        return [('', [int(r['utc'][0]), int(r['utc'][1])])]
+    if isinstance(x_range, dict) and 'waveform' in x_range:
+        annotations = pubsub.query(f'{get_topic_name(x_range["waveform"])}/settings/annotations', default=None)
+        markers = (annotations or {}).get('x', {})
+        rv = []
+        for marker_id, m in sorted(markers.items(), key=lambda item: item[1].get('pos1', 0)):
+            if m.get('dtype') == 'dual':
+                t0, t1 = sorted([int(m['pos1']), int(m['pos2'])])
+                rv.append((str(marker_id), [t0, t1]))
+        return rv
+    t0, t1 = [int(x) for x in x_range]
+    return [('', [min(t0, t1), max(t0, t1)])]
+
+
+def _columns(rows):
+    columns = list(_BASE_COLUMNS)
+    for row in rows:
+        for key in row.keys():
+            if key not in columns:
+                columns.append(key)
+    return columns
+
+
+def write_table(path, columns, rows):
+    """Write the batch results.
+
+    :param path: The output path.  The '.json' extension writes JSON
+        and all other extensions write CSV.
+    :param columns: The list of column names.
+    :param rows: The list of row dicts.
+    """
+    if os.path.splitext(path)[1].lower() == '.json':
+        with open(path, 'wt') as f:
+            json.dump({'columns': columns, 'rows': rows}, f, indent=2)
+    else:
+        with open(path, 'wt', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval='')
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+class _Batch:
+
+    def __init__(self, batch_id, value):
+        self.id = batch_id
+        self.value = value
+        self.analyses = _analyses_normalize(value.get('analyses'))
+        self.parallelism = value.get('parallelism')
+        self.pending = deque()   # BatchJob values
+        self.active = set()      # BatchJob unique ids
+        self.rows = []
+        self.opened = []         # source unique ids opened for this batch
+        self.t_start = time.perf_counter()
+        self.cancelled = False
+
+
+class BatchRunner:
+    """Run range tool analyses over many ranges, signals and files."""
+
+    SETTINGS = {
+        'parallelism': {
+            'dtype': 'int',
+            'brief': N_('The maximum number of concurrent batch jobs.'),
+            'default': PARALLELISM_DEFAULT,
+        },
+    }
+
+    EVENTS = {
+        'done': Metadata(dtype='obj',
+                         brief='Batch results',
+                         detail='The dict with id, columns, rows, output and elapsed_s',
+                         flags=['ro', 'skip_undo']),
+    }
+
+    def __init__(self):
+        self._log = logging.getLogger(__name__)
+        self._batches = {}
+        self._batch_id_next = 1
+
+    def _source_open(self, batch, path):
+        path = os.path.abspath(path)
+        if not os.path.isfile(path):
+            raise ValueError(f'file not found: {path}')
+        obj = JlsSource(path)
+        self.pubsub.register(obj)
+        batch.opened.append(obj.unique_id)
+        return obj.unique_id
+
+    def _jobs_expand(self, batch):
+        sources = {}  # path -> source unique id
+        jobs = []
+        for job in batch.value.get('jobs', []):
+            if job.get('path'):
+                targets = []
+                for path in _paths_expand(job['path']):
+                    if path not in sources:
+                        sources[path] = self._source_open(batch, path)
+                    targets.append((sources[path], path))
+            else:
+                targets = [(job['source'], '')]
+            for source, path in targets:
+                signal = _signal_resolve(self.pubsub, source, job['signal'])
+                for marker, x_range in _ranges_resolve(self.pubsub, signal, job.get('range')):
+                    jobs.append((source, path, signal, marker, x_range))
+        return jobs
+
+    def on_action_run(self, value):
+        """Run a batch.  See the module documentation for the value format."""
+        batch_id = value.get('id')
+        if batch_id is None:
+            batch_id = self._batch_id_next
+            self._batch_id_next += 1
+        batch = _Batch(batch_id, value)
+        self._batches[batch_id] = batch
+        try:
+            jobs = self._jobs_expand(batch)
+        except Exception as ex:
+            self._log.warning('batch %s: %s', batch_id, ex)
+            self._finish(batch, error=str(ex))
+            return
+        t_queue = time.perf_counter()
+        done_topic = f'{get_topic_name(self)}/callbacks/!job_done'
+        for idx, (source, path, signal, marker, x_range) in enumerate(jobs):
+            row = {
+                'job': idx,
+                'source': source,
+                'path': path,
+                'signal': signal,
+                'marker': marker,
+                'range_start': x_range[0],
+                'range_end': x_range[1],
+                'range_start_utc': time64.as_datetime(x_range[0]).isoformat(),
+                'range_s': (x_range[1] - x_range[0]) / time64.SECOND,
+                'status': 'pending',
+            }
+            batch.rows.append(row)
+            batch.pending.append({
+                'x_range': x_range,
+                'signals': [signal],
+                'kwargs': {'analyses': batch.analyses},
+                'range_tool': {'done_callbacks': [done_topic]},
+                'batch_id': batch_id,
+                'row': row,
+                't_queue': t_queue,
+            })
+        self._log.info('batch %s: %d jobs', batch_id, len(jobs))
+        self._dispatch(batch)
+
+    def on_action_cancel(self, value):
+        """Cancel a batch.
+
+        :param value: The batch id, or None to cancel all batches.
+        """
+        for batch in list(self._batches.values()):
+            if value is None or value == batch.id:
+                batch.cancelled = True
+                batch.pending.clear()
+                for unique_id in list(batch.active):
+                    self.pubsub.publish(f'{get_topic_name(unique_id)}/actions/!cancel', None)
+                if not batch.active:
+                    self._finish(batch)
+
+    def on_callback_job_done(self, value):
+        batch = self._batches.get(value['batch_id'])
+        if batch is None:
+            return
+        batch.active.discard(value.get('unique_id'))
+        self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        parallelism = batch.parallelism
+        if parallelism is None:
+            parallelism = self.parallelism
+        parallelism = max(1, int(parallelism))
+        while len(batch.pending) and len(batch.active) < parallelism:
+            value = batch.pending.popleft()
+            job = BatchJob(value)
+            self.pubsub.register(job)
+            value['unique_id'] = job.unique_id
+            batch.active.add(job.unique_id)
+        if not len(batch.pending) and not len(batch.active):
+            self._finish(batch)
+
+    def _finish(self, batch, error=None):
+        self._batches.pop(batch.id, None)
+        for unique_id in batch.opened:
+            self.pubsub.publish(f'{get_topic_name(unique_id)}/actions/!close', None)
+        for row in batch.rows:
+            if row['status'] == 'pending':
+                row['status'] = 'cancelled'
+        columns = _columns(batch.rows)
+        output = batch.value.get('output')
+        if output and error is None:
+            try:
+                write_table(output, columns, batch.rows)
+            except OSError as ex:
+                error = f'could not write {output}: {ex}'
+        rv = {
+            'id': batch.id,
+            'columns': columns,
+            'rows': batch.rows,
+            'output': output,
+            'elapsed_s': time.perf_counter() - batch.t_start,
+        }
+        if error is not None:
+            rv['error'] = error
+        self._log.info('batch %s done in %.3f s', batch.id, rv['elapsed_s'])
+        self.pubsub.publish(f'{get_topic_name(self)}/events/done', rv)
+        rsp_topic = batch.value.get('rsp_topic')
+        if rsp_topic:
+            self.pubsub.publish(rsp_topic, rv)
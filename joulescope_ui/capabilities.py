@@ -107,6 +107,10 @@ class CAPABILITIES(Enum):
           * utc: [t_start, t_end]
           * samples: {'start': s_start, 'end': s_end, 'length': s_length}
           * sample_rate: For fixed-rate samples, the sample rate in Hz.
+        * settings/generation: Optional int that changes whenever previously
+          provided sample data is discarded.  Range tools use this value
+          to identify cached results.  File sources provide settings/path
+          instead.
         * actions/!request obj with keys:
           * signal_id: The signal_id for the request.
           * time_type: 'utc' or 'samples'.
@@ -121,6 +125,15 @@ class CAPABILITIES(Enum):
             member variable and reuse the same binding so that deduplication
             can work correctly.  Otherwise, each call will use a new binding
             that is different and will not allow deduplication matching.
+        * actions/!request_batch obj with keys:
+          * requests: The list of request objects, each as defined by
+            actions/!request but without rsp_topic.  Each request's rsp_id
+            identifies the matching entry in the batch response.
+          * rsp_topic: The arbitrary response topic for the batch response.
+          * rsp_id: The optional and arbitrary response immutable object
+            for the batch.  Sources may merge a pending batch with a newer
+            batch that has the same rsp_topic and rsp_id.  Requests in the
+            newer batch replace pending requests with the same rsp_id.
         * actions/!annotations_request with keys:
           * rsp_topic: The arbitrary response topic called with list of 
             annotations.  See joulescope_ui/widgets/waveform/annotations.md for 
@@ -158,6 +171,13 @@ class CAPABILITIES(Enum):
         * data_type: one of f32, u4, u1
         * data: The data which whose shape is (N, 4) for summary or (N, ) for samples.
           u4 and u1 data is packed into bytes.
+
+    The batch response is a dict with the following keys:
+        * version: The response version = 1
+        * rsp_id: The same rsp_id provided to the batch request
+        * responses: The list of responses, one for each request in the
+          batch, as defined above.  Entries that could not be processed
+          are None.
     """
 
     SERIAL_SOURCE = 'serial.source'
@@ -111,6 +111,22 @@ class DevSignalBufferSource:
         """Process a signal request.
 
         :param value: The request.  See CAPABILITIES.SIGNAL_BUFFER_SOURCE."""
+        rsp = self._process(value)
+        if rsp is not None:
+            self.pubsub.publish(value['rsp_topic'], rsp)
+
+    def on_action_request_batch(self, value):
+        """Process a batch signal request.
+
+        :param value: The batch request.  See CAPABILITIES.SIGNAL_BUFFER_SOURCE."""
+        rsp = {
+            'version': 1,
+            'rsp_id': value.get('rsp_id'),
+            'responses': [self._process(req) for req in value['requests']],
+        }
+        self.pubsub.publish(value['rsp_topic'], rsp)
+
+    def _process(self, value):
         signal_id = value['signal_id']
         y = self._signals[signal_id]
         time_type = value['time_type']
@@ -118,10 +134,10 @@ class DevSignalBufferSource:
             s_start, s_end = value['start'], value['end']
             if s_start < self.s_start:
                 self._log.warning('sample req start too early: %s < %s', s_start, self.s_start)
-                return
+                return None
             if s_end > self.s_end:
                 self._log.warning('sample req end too late: %s > %s', s_end, self.s_end)
-                return
+                return None
             xi = np.linspace(s_start, s_end, value['length'])
             y = np.interp(xi, self.x_samples, y)
             t_start, t_end = np.interp([xi[0], xi[-1]], self.x_time64, self.x_time64)
@@ -129,10 +145,10 @@ class DevSignalBufferSource:
             t_start, t_end = value['start'], value['end']
             if t_start < self.t_start:
                 self._log.warning('utc req start too early: %s < %s', t_start, self.t_start)
-                return
+                return None
             if t_end > self.t_end:
                 self._log.warning('utc req end too late: %s > %s', t_end, self.t_end)
-                return
+                return None
             xi = np.linspace(t_start, t_end, value['length'])
             y = np.interp(xi, self.x_time64, y)
             s_start, s_end = np.interp([xi[0], xi[-1]], self.x_samples, self.x_samples)
@@ -141,7 +157,7 @@ class DevSignalBufferSource:
 
         rsp = {
             'version': 1,
-            'rsp_id': value['rsp_id'],
+            'rsp_id': value.get('rsp_id'),
             'info': {
                 'field': signal_id.split('.')[1],
                 'units': _UNITS[signal_id],
@@ -165,4 +181,4 @@ class DevSignalBufferSource:
             'data_type': 'f32',
             'data': y,
         }
-        self.pubsub.publish(value['rsp_topic'], rsp)
+        return rsp
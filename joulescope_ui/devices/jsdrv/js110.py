@@ -14,6 +14,8 @@
 
 from joulescope_ui import N_, register, Metadata, get_topic_name, P_
 from .device import Device, CAPABILITIES_OBJECT_OPEN, CURRENT_RANGE_SHORT, CURRENT_RANGE_LONG
+from joulescope_ui.sample_tap import sample_tap
+from joulescope_ui.statistics_data import StatisticsData
 import copy
 import queue
 import threading
@@ -441,6 +443,7 @@ class Js110(Device):
                 'time_map': value['time_map'],
             }
             fwd['data'] = value['data']
+            sample_tap.publish(utopic, fwd)
             self.pubsub.publish(utopic, fwd)
         return fn
 
@@ -604,21 +607,14 @@ class Js110(Device):
         self._log.info('close %s done', self.unique_id)
 
     def _on_stats(self, topic, value):
-        # Runs on the driver thread; deepcopy before mutating so we do not
-        # corrupt the driver-owned object or race with UI readers.
-        value = copy.deepcopy(value)
+        # Runs on the driver thread.  StatisticsData reads the driver-owned
+        # value without modifying it, and all subscribers share the result.
         if self._statistics_offsets is None:
             accum_sample_start = value['time']['accum_samples']['value'][-1]
             charge = value['accumulators']['charge']['value']
             energy = value['accumulators']['energy']['value']
             self._statistics_offsets = [accum_sample_start, charge, energy]
-        accum_sample_start, charge, energy = self._statistics_offsets
-        value['time']['accum_samples']['value'][0] = accum_sample_start
-        value['accumulators']['charge']['value'] -= charge
-        value['accumulators']['energy']['value'] -= energy
-        value['source'] = {
-            'unique_id': self.unique_id,
-        }
+        value = StatisticsData(value, self.unique_id, self._statistics_offsets)
         self._ui_publish('events/statistics/!data', value)
 
     def on_action_state_req(self, value):
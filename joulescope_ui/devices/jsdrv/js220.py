@@ -16,6 +16,8 @@ from .device import Device, CAPABILITIES_OBJECT_OPEN, CURRENT_RANGE_SHORT, CURRE
 from .js220_fuse import fuse_to_config
 from joulescope_ui import N_, get_topic_name, register, P_, CAPABILITIES
 from joulescope_ui.metadata import Metadata
+from joulescope_ui.sample_tap import sample_tap
+from joulescope_ui.statistics_data import StatisticsData
 from .serial_decoder import SerialDecoder
 from pyjoulescope_driver import time64
 from joulescope_ui.time_map import TimeMap
@@ -663,6 +665,7 @@ class Js220(Device):
                 'origin_decimate_factor': value['decimate_factor'],
                 'time_map': value['time_map'],
             }
+            sample_tap.publish(utopic, fwd)
             self.pubsub.publish(utopic, fwd)
         return fn
 
@@ -975,21 +978,14 @@ class Js220(Device):
         self._log.info('close %s done', self.unique_id)
 
     def _on_stats(self, topic, value):
-        # Runs on the driver thread; deepcopy before mutating so we do not
-        # corrupt the driver-owned object or race with UI readers.
-        value = copy.deepcopy(value)
+        # Runs on the driver thread.  StatisticsData reads the driver-owned
+        # value without modifying it, and all subscribers share the result.
         if self._statistics_offsets is None:
             accum_sample_start = value['time']['accum_samples']['value'][-1]
             charge = value['accumulators']['charge']['value']
             energy = value['accumulators']['energy']['value']
             self._statistics_offsets = [accum_sample_start, charge, energy]
-        accum_sample_start, charge, energy = self._statistics_offsets
-        value['time']['accum_samples']['value'][0] = accum_sample_start
-        value['accumulators']['charge']['value'] -= charge
-        value['accumulators']['energy']['value'] -= energy
-        value['source'] = {
-            'unique_id': self.unique_id,
-        }
+        value = StatisticsData(value, self.unique_id, self._statistics_offsets)
         self._ui_publish('events/statistics/!data', value)
 
     def on_action_state_req(self, value):
@@ -17,6 +17,7 @@ from pyjoulescope_driver import time64
 from .device import Device
 import copy
 import logging
+import threading
 import time
 
 
@@ -83,8 +84,14 @@ _SETTINGS = {
             The buffer functions as if sample streaming started for the
             first time.""",
         'default': True,
-    }
-
+    },
+    'generation': {
+        'dtype': 'int',
+        'brief': 'The buffer data generation',
+        'detail': 'Incremented whenever the buffer data is discarded.',
+        'default': 0,
+        'flags': ['hide', 'ro', 'tmp', 'skip_undo'],
+    },
 }
 
 _SETTINGS_PER_SOURCE = {
@@ -161,6 +168,8 @@ class JsdrvStreamBuffer:
         self._req_fwd = {}  # (pubsub_rsp_topic, pubsub_rsp_id): device_rsp_id
         self._req_bwd = {}  # device_rsp_id: (pubsub_rsp_topic, pubsub_rsp_id)
         self._req_time = {}  # device_rsp_id: time_last_used
+        self._batch_lock = threading.Lock()
+        self._batch_bwd = {}  # device_rsp_id: (batch, index)
         self._collect_time = time.time()
 
     def __str__(self):
@@ -213,6 +222,7 @@ class JsdrvStreamBuffer:
                 continue
             self._ui_device_subscribe(device_id, f'settings/signals/{signal}/enable',
                                       self._on_signal_enable, ['pub', 'retain'])
+        self._generation_increment()  # device sample ids may restart
         topic = get_topic_name(self.unique_id)
         self.pubsub.publish(f'{topic}/events/sources/!add', device_id)
 
@@ -380,8 +390,13 @@ class JsdrvStreamBuffer:
         self.pubsub.publish(f'{ui_prefix}/events/signals/!remove', signal_id)
         self.pubsub.topic_remove(f'{ui_prefix}/settings/signals/{signal_id}', defer=True)
 
+    def _generation_increment(self):
+        topic = f'{get_topic_name(self)}/settings/generation'
+        self.pubsub.publish(topic, self.pubsub.query(topic, default=0) + 1)
+
     def on_action_clear(self):
         self._driver_publish(f'm/{self._id}/g/!clear', 0, timeout=0)
+        self._generation_increment()
 
     def _on_buf_response(self, topic, value):
         # will be called from device's pubsub thread
@@ -390,6 +405,11 @@ class JsdrvStreamBuffer:
             return
         value = copy.deepcopy(value)
         device_req_id = value['rsp_id']
+        with self._batch_lock:
+            batch_entry = self._batch_bwd.pop(device_req_id, None)
+        if batch_entry is not None:
+            self._on_batch_response(*batch_entry, value)
+            return
         try:
             req = self._req_bwd[device_req_id]
             value['rsp_topic'] = req[0]
@@ -428,6 +448,65 @@ class JsdrvStreamBuffer:
         self._driver_publish(f'm/{self._id}/s/{buf_id:03d}/!req', value, timeout=0)
         self._mem_collect(t_now)
 
+    def on_action_request_batch(self, value):
+        """Request data for multiple signals from the memory buffer.
+
+        :param value: The batch request structure.
+            See joulescope_ui.capabilities SIGNAL_BUFFER_SOURCE
+
+        All sub-requests are forwarded to the driver in one pass.  The
+        driver responses are collected and published as a single
+        batch response once every sub-request completes.
+        """
+        requests = value['requests']
+        batch = {
+            'rsp_topic': value['rsp_topic'],
+            'rsp': {
+                'version': 1,
+                'rsp_id': value.get('rsp_id'),
+                'responses': [None] * len(requests),
+            },
+            'rsp_ids': [r.get('rsp_id') for r in requests],
+            'pending': 0,
+            'keys': [],
+            'time': time.time(),
+        }
+        driver_requests = []
+        with self._batch_lock:
+            for idx, req in enumerate(requests):
+                signal_id = '.'.join(req['signal_id'].split('.')[-2:])
+                try:
+                    buf_id = self._signals[signal_id][0]
+                except KeyError:
+                    self._log.info('Batch request for missing signal %s', signal_id)
+                    continue
+                req = dict(req)
+                key = (batch['rsp'], idx)  # keep alive for the id
+                batch['keys'].append(key)
+                device_req_id = id(key)
+                self._batch_bwd[device_req_id] = (batch, idx)
+                req['rsp_topic'] = self._rsp_topic
+                req['rsp_id'] = device_req_id
+                batch['pending'] += 1
+                driver_requests.append((buf_id, req))
+        if not driver_requests:
+            self.pubsub.publish(batch['rsp_topic'], batch['rsp'])
+            return
+        for buf_id, req in driver_requests:
+            self._driver_publish(f'm/{self._id}/s/{buf_id:03d}/!req', req, timeout=0)
+        self._mem_collect(batch['time'])
+
+    def _on_batch_response(self, batch, idx, value):
+        # will be called from device's pubsub thread
+        with self._batch_lock:
+            rsp = batch['rsp']
+            value['rsp_id'] = batch['rsp_ids'][idx]
+            rsp['responses'][idx] = value
+            batch['pending'] -= 1
+            is_done = batch['pending'] == 0
+        if is_done:
+            self.pubsub.publish(batch['rsp_topic'], rsp)
+
     def on_action_annotations_request(self, value):
         self.pubsub.publish(value['rsp_topic'], None)
 
@@ -439,4 +518,8 @@ class JsdrvStreamBuffer:
                 pubsub_req = self._req_bwd.pop(device_req_id)
                 self._req_time.pop(device_req_id)
                 self._req_fwd.pop(pubsub_req)
+        with self._batch_lock:
+            for device_req_id, (batch, _) in list(self._batch_bwd.items()):
+                if (t_now - batch['time']) > _MEM_EXPIRE_INTERVAL_S:
+                    self._batch_bwd.pop(device_req_id)
         self._collect_time = t_now
@@ -13,14 +13,18 @@
 # limitations under the License.
 
 from enum import Enum
+import bisect
 import numpy as np
 import logging
 
 
+_FRAME_BITS = 10        # N81: start, 8 data bits, stop
+_NEWLINE = (0x0a, 0x0d)
+
+
 class _State(Enum):
     WAIT_FOR_IDLE = 0
     WAIT_FOR_START_BIT = 1
-    PARSE_FRAME = 2
 
 
 class SerialDecoder:
@@ -31,6 +35,11 @@ class SerialDecoder:
 
     Messages are framed by either newline / carriage returns or
     serial line idle gaps.
+
+    The decoder processes each block with numpy operations.  It only
+    walks the frame start bits in Python, never the individual samples.
+    It samples all bit centers of all frames at once, and it keeps at
+    most one partial frame between blocks.
     """
     def __init__(self, sample_rate=2000000, baud_rate=115200):
         self._sample_rate = sample_rate
@@ -39,7 +48,7 @@ class SerialDecoder:
         self._idle_threshold = 0
         self._idle_count = 0
         self._state = _State.WAIT_FOR_IDLE          # State machine state for bit processing.
-        self._buffer = None                         # unpacked binary bit buffer.
+        self._buffer = None                         # unpacked binary bit carryover, at most one frame.
         self._buffer_start_sample_id = None         # sample id for first bit in _buffer.
         self._message = []                          # current message being assembled.
         self._message_start_sample_id = None        # timestamp for the current message.
@@ -57,7 +66,11 @@ class SerialDecoder:
         self._message_complete()
         self._baud_rate = float(value)
         self._samples_per_bit = self._sample_rate / self._baud_rate
-        self._idle_threshold = self._samples_per_bit * 10  # 10 bits per serial frame in N81.
+        self._idle_threshold = self._samples_per_bit * _FRAME_BITS
+        self._frame_length = int(_FRAME_BITS * self._samples_per_bit * 0.997)
+        # The sample offset from the start bit edge to each bit center.
+        self._bit_centers = (np.arange(_FRAME_BITS) + 0.5) * self._samples_per_bit
+        self._frame_samples = max(self._frame_length, int(round(self._bit_centers[-1])) + 1)
 
     def _message_complete(self):
         if len(self._message):
@@ -66,6 +79,109 @@ class SerialDecoder:
             self._message_start_sample_id = None
         self._previous_frame_end_sample_id = None
 
+    def _wait_for_idle(self, buffer, idx):
+        """Find the end of the first idle run of at least one frame.
+
+        :return: The buffer index after the idle run, or len(buffer).
+        """
+        idle_samples = int(np.ceil(self._idle_threshold))
+        active = np.flatnonzero(buffer[idx:] != self._idle_level)
+        run_start = np.concatenate(([0], active + 1))
+        run_length = np.concatenate((active, [len(buffer) - idx])) - run_start
+        run_length[0] += self._idle_count
+        runs = np.flatnonzero(run_length >= idle_samples)
+        if not len(runs):
+            self._idle_count = int(run_length[-1])
+            return len(buffer)
+        k = runs[0]
+        end = run_start[k] + idle_samples - (self._idle_count if k == 0 else 0)
+        self._idle_count = 0
+        self._state = _State.WAIT_FOR_START_BIT
+        return idx + int(end)
+
+    def _frame_starts(self, buffer, idx, edges):
+        """Find the start bit index for each complete frame.
+
+        :return: (starts, search, idx) where starts is the list of frame
+            start indices, search is the list of indices where the search
+            for each start began, followed by the final search index, and
+            idx is the next buffer index to process.
+        """
+        n = len(buffer)
+        starts = []
+        search = []
+        while idx < n:
+            start = idx
+            if buffer[idx] == self._idle_level:
+                k = bisect.bisect_left(edges, idx)
+                if k >= len(edges):
+                    search.append(idx)
+                    return starts, search, n
+                start = edges[k]
+            if start + self._frame_samples >= n:
+                # not enough data for full 10 bits.  Wait until next time.
+                search.append(idx)
+                return starts, search, start
+            starts.append(start)
+            search.append(idx)
+            idx = start + self._frame_length
+        search.append(idx)
+        return starts, search, n
+
+    def _parse_frames(self, buffer, idx, edges):
+        """Decode all complete frames from idx until a framing error.
+
+        :return: The next buffer index to process.
+        """
+        buffer_start = self._buffer_start_sample_id
+        starts, search, idx_next = self._frame_starts(buffer, idx, edges)
+        starts = np.array(starts, dtype=np.int64)
+        search = np.array(search, dtype=np.int64)
+
+        # Sample a window (center ±1 sample) around each bit center for majority vote.
+        centers = np.round(starts[:, np.newaxis] + self._bit_centers).astype(np.int64)
+        bits = (buffer[centers - 1] + buffer[centers] + buffer[centers + 1]) >= 2
+        errors = np.flatnonzero((bits[:, 0] == self._idle_level) | (bits[:, -1] != self._idle_level))
+        count = len(starts) if not len(errors) else int(errors[0])
+        # Assemble the data bytes (bits 1 through 8); data is transmitted LSB first.
+        values = np.packbits(bits[:count, 1:9], axis=1, bitorder='little')[:, 0].tolist()
+
+        # An idle gap of more than one frame completes the message.
+        # search[k] is where the search for frame k started, which is
+        # the end of frame k - 1 for k > 0.
+        gaps = (starts[:count] > search[:count]) & (starts[:count] - 1 - search[:count] > self._idle_threshold)
+        prev_end = self._previous_frame_end_sample_id
+        if count:
+            gaps[0] = (prev_end is not None and starts[0] > search[0]
+                       and buffer_start + starts[0] - 1 - prev_end > self._idle_threshold)
+        gaps = gaps.tolist()
+        starts_list = (starts[:count] + buffer_start).tolist()
+        for gap, frame_start_sample_id, value in zip(gaps, starts_list, values):
+            if gap:
+                self._message_complete()
+            if len(self._message) == 0:
+                self._message_start_sample_id = frame_start_sample_id
+            if value in _NEWLINE:
+                self._message_complete()
+            else:
+                self._message.append(value)
+            self._previous_frame_end_sample_id = frame_start_sample_id + self._frame_length
+
+        if count < len(starts):  # framing error
+            frame_start = int(starts[count])
+            self._log.warning(f'framing error at {buffer_start + frame_start}')
+            self._message_complete()
+            self._state = _State.WAIT_FOR_IDLE
+            self._idle_count = 0
+            return frame_start + self._frame_length
+
+        # Check the idle gap through the last searched sample.
+        prev_end = self._previous_frame_end_sample_id
+        if prev_end is not None and idx_next > search[-1]:
+            if buffer_start + idx_next - 1 - prev_end > self._idle_threshold:
+                self._message_complete()
+        return idx_next
+
     def process_block(self, block):
         """Process a new block of data.
 
@@ -89,6 +205,9 @@ class SerialDecoder:
             if block_sample_id > expected_next_sample:
                 # detected missing samples
                 self._message_complete()
+                if self._state == _State.WAIT_FOR_START_BIT and len(self._buffer):
+                    self._state = _State.WAIT_FOR_IDLE  # drop the partial frame
+                    self._idle_count = 0
                 # Reset the buffer with the new block data.
                 self._buffer = unpacked
                 self._buffer_start_sample_id = block_sample_id
@@ -97,71 +216,29 @@ class SerialDecoder:
                 if block_sample_id < expected_next_sample:
                     offset = expected_next_sample - block_sample_id
                     unpacked = unpacked[offset:]
-                # Append the new samples to our existing buffer.
-                self._buffer = np.concatenate((self._buffer, unpacked))
+                # Append the new samples to the carryover, which is at most one frame.
+                if len(self._buffer):
+                    self._buffer = np.concatenate((self._buffer, unpacked))
+                else:
+                    self._buffer = unpacked
 
+        buffer = self._buffer
+        is_active = buffer != self._idle_level
+        # The index of each idle to active transition, which are the start bit candidates.
+        edges = (np.flatnonzero(is_active[1:] & ~is_active[:-1]) + 1).tolist()
         buffer_idx = 0
-        while buffer_idx < len(self._buffer):
+        while buffer_idx < len(buffer):
             if self._state == _State.WAIT_FOR_IDLE:
-                if self._buffer[buffer_idx] != self._idle_level:  # not idle
-                    self._idle_count = 0
-                    buffer_idx += 1
-                else:  # idle
-                    self._idle_count += 1
-                    buffer_idx += 1
-                    if self._idle_count >= self._idle_threshold:
-                        self._idle_count = 0
-                        self._state = _State.WAIT_FOR_START_BIT
-            elif self._state == _State.WAIT_FOR_START_BIT:
-                if self._buffer[buffer_idx] != self._idle_level:
-                    self._state = _State.PARSE_FRAME
-                else:
-                    if self._previous_frame_end_sample_id is not None:
-                        gap = self._buffer_start_sample_id + buffer_idx - self._previous_frame_end_sample_id
-                        if gap > self._idle_threshold:
-                            self._message_complete()
-                    buffer_idx += 1
-            elif self._state == _State.PARSE_FRAME:
-                frame_start_sample_id = self._buffer_start_sample_id + buffer_idx
-                last_bit_end = buffer_idx + int(10 * self._samples_per_bit * 0.997)
-                if last_bit_end >= len(self._buffer):
-                    # not enough data for full 10 bits.  Wait until next time
-                    break
-
-                # For each of the 10 bits, sample a window around the expected bit center.
-                bits = []
-                for bit_index in range(10):
-                    # Expected center for this bit:
-                    center = buffer_idx + (bit_index + 0.5) * self._samples_per_bit
-                    center_idx = int(round(center))
-                    # Use a small window (center_idx ±1 sample) for majority vote.
-                    vote = int(np.median(self._buffer[center_idx - 1:center_idx + 2]))
-                    bits.append(vote)
-
-                if (bits[0] == self._idle_level) or (bits[-1] != self._idle_level):  # framing error
-                    self._log.warning(f'framing error at {frame_start_sample_id}')
-                    self._message_complete()
-                    self._state = _State.WAIT_FOR_IDLE
-                    buffer_idx = last_bit_end
-                    continue
-
-                # Assemble the data byte (bits 1 through 8); data is transmitted LSB first.
-                byte_val = 0
-                for bit_index in range(1, 9):
-                    byte_val |= (bits[bit_index] << (bit_index - 1))
-                if len(self._message) == 0:
-                    self._message_start_sample_id = frame_start_sample_id
-
-                if byte_val in b'\r\n':
-                    self._message_complete()
-                else:
-                    self._message.append(byte_val)
-
-                buffer_idx = last_bit_end
-                self._previous_frame_end_sample_id = self._buffer_start_sample_id + buffer_idx
-                self._state = _State.WAIT_FOR_START_BIT
+                buffer_idx = self._wait_for_idle(buffer, buffer_idx)
+            else:
+                idx = self._parse_frames(buffer, buffer_idx, edges)
+                if idx == buffer_idx:
+                    break  # partial frame
+                buffer_idx = idx
+                if self._state == _State.WAIT_FOR_START_BIT and buffer_idx < len(buffer):
+                    break  # partial frame at buffer_idx
 
         self._buffer_start_sample_id += buffer_idx
-        self._buffer = self._buffer[buffer_idx:]
+        self._buffer = buffer[buffer_idx:]
         output_messages, self._output_messages = self._output_messages, []
         return output_messages
@@ -0,0 +1,80 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the UART serial decoder with continuous text.
+
+The input is back-to-back lines of text with no idle time between
+characters, which is the worst case for the decoder.  Run with:
+
+    python -m joulescope_ui.devices.jsdrv.test.benchmark_serial_decoder
+"""
+
+from joulescope_ui.devices.jsdrv.serial_decoder import SerialDecoder
+from joulescope_ui.devices.jsdrv.serial_encoder import SerialEncoder
+import argparse
+import numpy as np
+import time
+
+
+def get_parser():
+    p = argparse.ArgumentParser(description='Benchmark the UART serial decoder.')
+    p.add_argument('--fs', type=int, default=2_000_000, help='The sample rate in Hz.')
+    p.add_argument('--baud', type=int, nargs='+', default=[9600, 115200, 1_000_000],
+                   help='The baud rates to benchmark.')
+    p.add_argument('--block', type=int, default=65536, help='The samples per block, multiple of 8.')
+    p.add_argument('--duration', type=float, default=1.0, help='The input duration in seconds.')
+    return p
+
+
+def _input(fs, baud, duration):
+    """Encode text lines into packed samples for at least duration seconds."""
+    encoder = SerialEncoder(fs, baud)
+    chars = int(duration * baud / 10) + 1
+    lines = []
+    k = 0
+    while chars > 0:
+        line = f'line {k}: the quick brown fox jumps over the lazy dog\n'.encode('utf-8')
+        lines.append(line)
+        chars -= len(line)
+        k += 1
+    data = [encoder.encode_idle()['data'], encoder.encode_message(b''.join(lines))['data'],
+            encoder.encode_idle()['data']]
+    return np.concatenate(data), len(lines)
+
+
+def run(fs, bauds, block, duration):
+    block_bytes = block // 8
+    print(f'{"baud":>9} {"Msps":>8} {"real time":>10} {"messages":>9}')
+    for baud in bauds:
+        data, line_count = _input(fs, baud, duration)
+        decoder = SerialDecoder(fs, baud)
+        count = 0
+        t_start = time.perf_counter()
+        for k in range(0, len(data), block_bytes):
+            count += len(decoder.process_block({'sample_id': k * 8, 'data': data[k:k + block_bytes]}))
+        elapsed = time.perf_counter() - t_start
+        rate = len(data) * 8 / elapsed
+        if count != line_count:
+            print(f'  decode mismatch: {count} != {line_count}')
+        print(f'{baud:9d} {rate / 1e6:8.1f} {rate / fs:9.1f}x {count:9d}')
+
+
+def main():
+    args = get_parser().parse_args()
+    run(args.fs, args.baud, args.block, args.duration)
+
+
+if __name__ == '__main__':
+    main()
@@ -108,3 +108,22 @@ class TestUartDecoder(unittest.TestCase):
         messages = decoder.process_block(encoder.encode(b'world'))
         self.assertEqual(1, len(messages))
         self.assertEqual(b'world', messages[0][1])
+
+    def test_split_blocks(self):
+        encoder = SerialEncoder()
+        msg = b'hello\r\nworld'
+        data = encoder.encode(msg)['data']
+        decoder = SerialDecoder()
+        messages = []
+        for k in range(0, len(data), 3):
+            messages.extend(decoder.process_block({'sample_id': k * 8, 'data': data[k:k + 3]}))
+            self.assertLess(len(decoder._buffer), 200)  # at most one partial frame
+        self.assertEqual([(176, b'hello'), (1391, b'world')], messages)
+
+    def test_baud_rate(self):
+        for baud_rate in [9600, 115200, 400000, 1000000]:
+            msg = b'the quick brown fox jumps over the lazy dog'
+            encoder = SerialEncoder(baud_rate=baud_rate)
+            decoder = SerialDecoder(baud_rate=baud_rate)
+            messages = decoder.process_block(encoder.encode(msg, msg))
+            self.assertEqual([msg, msg], [m[1] for m in messages])
@@ -0,0 +1,463 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Simulated streaming device for load testing without hardware."""
+
+from joulescope_ui import N_, get_topic_name
+from joulescope_ui.capabilities import CAPABILITIES
+from joulescope_ui.metadata import Metadata
+from joulescope_ui.sample_tap import sample_tap
+from joulescope_ui.statistics_data import StatisticsData, UNITS
+from pyjoulescope_driver import time64
+from .sim_generator import ProceduralGenerator, JlsReplayGenerator, SIGNAL_IDS
+import copy
+import logging
+import numpy as np
+import threading
+import time
+
+
+_BLOCK_FREQUENCY = 100  # signal data messages per second
+_BACKLOG_MAX = 1.0      # seconds behind real time before dropping samples
+
+
+_CAPABILITIES_OPEN = [
+    CAPABILITIES.SOURCE,
+    CAPABILITIES.STATISTIC_STREAM_SOURCE,
+    CAPABILITIES.SIGNAL_STREAM_SOURCE,
+]
+
+
+_SIGNALS = {
+    'i': {
+        'name': 'current',
+        'units': 'A',
+        'brief': N_('Current'),
+        'detail': N_("""Enable the current signal streaming."""),
+    },
+    'v': {
+        'name': 'voltage',
+        'units': 'V',
+        'brief': N_('Voltage'),
+        'detail': N_("""Enable the voltage signal streaming."""),
+    },
+    'p': {
+        'name': 'power',
+        'units': 'W',
+        'brief': N_('Power'),
+        'detail': N_("""Enable the power signal streaming."""),
+    },
+}
+
+
+EVENTS = {
+    'statistics/!data': Metadata('obj', 'Periodic statistics data for each signal.'),
+}
+
+
+_SETTINGS = {
+    'name': {
+        'dtype': 'str',
+        'brief': N_('Device name'),
+        'default': None,
+    },
+    'info': {
+        'dtype': 'obj',
+        'brief': N_('Device information'),
+        'default': None,
+        'flags': ['ro', 'hide', 'skip_undo'],
+    },
+    'state': {
+        'dtype': 'int',
+        'brief': N_('Device state'),
+        'options': [
+            [0, 'closed'],
+            [1, 'opening'],
+            [2, 'open'],
+            [3, 'closing'],
+        ],
+        'default': 0,
+        'flags': ['ro', 'hide', 'skip_undo'],
+    },
+    'sources/1/name': {
+        'dtype': 'str',
+        'brief': N_('Device name'),
+        'default': None,
+        'flags': ['ro', 'hide', 'skip_undo'],
+    },
+    'sources/1/info': {
+        'dtype': 'obj',
+        'brief': N_('Device information'),
+        'default': None,
+        'flags': ['ro', 'hide', 'skip_undo'],
+    },
+    'signal_frequency': {
+        'dtype': 'int',
+        'brief': N_('Signal frequency'),
+        'detail': N_("""The sample rate for the generated signals.
+            When replaying a JLS file, the device uses the file
+            sample rate instead."""),
+        'options': [
+            [2000000, "2 MHz"],
+            [1000000, "1 MHz"],
+            [500000, "500 kHz"],
+            [200000, "200 kHz"],
+            [100000, "100 kHz"],
+            [50000, "50 kHz"],
+            [20000, "20 kHz"],
+            [10000, "10 kHz"],
+            [5000, "5 kHz"],
+            [2000, "2 kHz"],
+            [1000, "1 kHz"],
+        ],
+        'default': 1_000_000,
+    },
+    'statistics_frequency': {
+        'dtype': 'float',
+        'brief': N_('Statistics frequency'),
+        'detail': N_("""The output frequency for the statistics data."""),
+        'options': [
+            [100, '100 Hz'],
+            [50, '50 Hz'],
+            [20, '20 Hz'],
+            [10, '10 Hz'],
+            [5, '5 Hz'],
+            [2, '2 Hz'],
+            [1, '1 Hz'],
+        ],
+        'default': 2,
+    },
+}
+
+
+def _populate():
+    for signal_id, value in _SIGNALS.items():
+        _SETTINGS[f'signals/{signal_id}/name'] = {
+            'dtype': 'str',
+            'brief': N_('Signal name'),
+            'flags': ['hide'],
+            'default': value['brief'],
+        }
+        _SETTINGS[f'signals/{signal_id}/enable'] = {
+            'dtype': 'bool',
+            'brief': value['brief'],
+            'detail': value['detail'],
+            'flags': ['hide'],
+            'default': True,
+        }
+        EVENTS[f'signals/{signal_id}/!data'] = Metadata('obj', 'Signal data')
+
+
+_populate()
+
+
+class SimStatistics:
+    """Compute statistics messages over fixed sample windows.
+
+    :param sample_rate: The sample rate in Hz.
+    :param window: The number of samples for each statistics message.
+    :param time_map: The time map dict with offset_time, offset_counter,
+        and counter_rate that converts sample ids to time64.
+
+    The messages use the nested dict format that the driver provides,
+    including the charge and energy accumulated since the first sample.
+    """
+
+    def __init__(self, sample_rate, window, time_map):
+        self.sample_rate = sample_rate
+        self.window = max(1, int(window))
+        self.time_map = time_map
+        self._accum = np.zeros(2, dtype=np.float64)  # charge, energy
+        self._accum_start = None
+        self._start = None
+        self._count = 0
+        self._sum = np.zeros(3, dtype=np.float64)
+        self._sum2 = np.zeros(3, dtype=np.float64)
+        self._min = np.zeros(3, dtype=np.float64)
+        self._max = np.zeros(3, dtype=np.float64)
+
+    def _time64(self, sample_id):
+        tm = self.time_map
+        dt = (sample_id - tm['offset_counter']) / tm['counter_rate']
+        return tm['offset_time'] + int(round(dt * time64.SECOND))
+
+    def _reset(self, sample_id):
+        self._start = sample_id
+        self._count = 0
+        self._sum[:] = 0.0
+        self._sum2[:] = 0.0
+        self._min[:] = np.inf
+        self._max[:] = -np.inf
+
+    def skip(self):
+        """Discard the partial window after a sample id gap."""
+        self._start = None
+
+    def process(self, sample_id, data):
+        """Process a block of samples.
+
+        :param sample_id: The sample id for the first sample in data.
+        :param data: The dict mapping 'i', 'v', 'p' to equal length arrays.
+        :return: The list of completed statistics messages.
+        """
+        rv = []
+        length = len(data['i'])
+        if self._accum_start is None:
+            self._accum_start = sample_id
+        if self._start is None:
+            self._reset(sample_id)
+        k = 0
+        while k < length:
+            n = min(length - k, self.window - self._count)
+            for idx, signal_id in enumerate(SIGNAL_IDS):
+                x = data[signal_id][k:k + n].astype(np.float64)
+                self._sum[idx] += np.sum(x)
+                self._sum2[idx] += np.dot(x, x)
+                self._min[idx] = min(self._min[idx], np.min(x))
+                self._max[idx] = max(self._max[idx], np.max(x))
+            self._count += n
+            k += n
+            if self._count >= self.window:
+                rv.append(self._message())
+                self._reset(sample_id + k)
+        return rv
+
+    def _message(self):
+        n = self._count
+        fs = self.sample_rate
+        avg = self._sum / n
+        std = np.sqrt(np.maximum(0.0, self._sum2 / n - avg * avg))
+        self._accum += self._sum[[0, 2]] / fs
+        sample_end = self._start + n
+        signals = {}
+        for idx, name in enumerate(['current', 'voltage', 'power']):
+            units = UNITS[name]
+            signals[name] = {
+                'avg': {'value': float(avg[idx]), 'units': units},
+                'std': {'value': float(std[idx]), 'units': units},
+                'min': {'value': float(self._min[idx]), 'units': units},
+                'max': {'value': float(self._max[idx]), 'units': units},
+                'p2p': {'value': float(self._max[idx] - self._min[idx]), 'units': units},
+            }
+        return {
+            'time': {
+                'samples': {'value': [self._start, sample_end], 'units': 'samples'},
+                'utc': {'value': [self._time64(self._start), self._time64(sample_end)], 'units': 'time64'},
+                'delta': {'value': n / fs, 'units': 's'},
+                'sample_freq': {'value': fs, 'units': 'Hz'},
+                'accum_samples': {'value': [self._accum_start, sample_end], 'units': 'samples'},
+                'time_map': dict(self.time_map),
+            },
+            'signals': signals,
+            'accumulators': {
+                'charge': {'value': float(self._accum[0]), 'units': 'C'},
+                'energy': {'value': float(self._accum[1]), 'units': 'J'},
+            },
+        }
+
+
+class SimDevice:
+    """A simulated device that streams signals and statistics.
+
+    :param config: The dict with keys:
+        * name: The device name.
+        * serial_number: The device serial number.
+        * path: The optional JLS file path to replay.  None generates
+          the signals procedurally.
+
+    Once opened, a thread generates the current, voltage, and power
+    samples in real time and publishes them to events/signals/{id}/!data
+    along with events/statistics/!data, just like a connected instrument.
+    When the application cannot keep up for more than one second, the
+    device drops samples, which consumers see as a sample_id gap.
+    """
+
+    CAPABILITIES = []
+    EVENTS = {}
+    SETTINGS = {}
+
+    def __init__(self, config):
+        self._name = config['name']
+        self._path = config.get('path')
+        self._log = logging.getLogger(__name__ + '.' + self._name)
+        self._thread = None
+        self._quit = False
+        self._statistics_offsets = None
+        self._enable = {signal_id: True for signal_id in SIGNAL_IDS}
+
+        self.CAPABILITIES = []
+        self.EVENTS = copy.deepcopy(EVENTS)
+        self.SETTINGS = copy.deepcopy(_SETTINGS)
+
+        self._info = {
+            'vendor': 'Jetperch LLC',
+            'model': 'Simulator',
+            'version': '1',
+            'serial_number': config.get('serial_number', self._name),
+        }
+        self.SETTINGS['name']['default'] = self._name
+        self.SETTINGS['info']['default'] = self._info
+        self.SETTINGS['sources/1/name']['default'] = self._name
+        self.SETTINGS['sources/1/info']['default'] = self._info
+
+    def on_pubsub_register(self):
+        topic = get_topic_name(self)
+        self.pubsub.publish(f'{topic}/settings/info', self._info)
+        self.pubsub.publish(f'{topic}/settings/sources/1/info', self._info)
+        self.pubsub.subscribe(f'{topic}/settings/signals', self._on_signal_settings, ['pub', 'retain'])
+
+    def on_pubsub_unregister(self):
+        self.pubsub.unsubscribe_all(self._on_signal_settings)
+
+    def _on_signal_settings(self, topic, value):
+        parts = topic.split('/')
+        if parts[-1] == 'enable' and parts[-2] in self._enable:
+            self._enable[parts[-2]] = bool(value)
+
+    def _generator(self):
+        if self._path is not None:
+            return JlsReplayGenerator(self._path)
+        return ProceduralGenerator(self.signal_frequency)
+
+    @property
+    def is_open(self):
+        return self._thread is not None
+
+    def open(self):
+        """Start streaming."""
+        if self._thread is not None:
+            return
+        topic = get_topic_name(self)
+        self.pubsub.publish(f'{topic}/settings/state', 1)  # opening
+        try:
+            generator = self._generator()
+        except Exception:
+            self._log.exception('generator failed')
+            self.pubsub.publish(f'{topic}/settings/state', 0)  # closed
+            raise
+        self._log.info('open at %d Hz', generator.sample_rate)
+        self._quit = False
+        self._statistics_offsets = None
+        self._thread = threading.Thread(target=self._run, args=(generator, ),
+                                        name=f'sim_{self._name}', daemon=True)
+        self._thread.start()
+        self.pubsub.publish(f'{topic}/settings/state', 2)  # open
+        self.pubsub.capabilities_append(self, _CAPABILITIES_OPEN)
+
+    def close(self):
+        """Stop streaming."""
+        if self._thread is None:
+            return
+        self._log.info('close')
+        topic = get_topic_name(self)
+        self.pubsub.publish(f'{topic}/settings/state', 3)  # closing
+        self.pubsub.capabilities_remove(self, _CAPABILITIES_OPEN)
+        self._quit = True
+        self._thread.join()
+        self._thread = None
+        self.pubsub.publish(f'{topic}/settings/state', 0)  # closed
+
+    def _run(self, generator):
+        self._log.info('thread start')
+        try:
+            fs = generator.sample_rate
+            block = max(1, fs // _BLOCK_FREQUENCY)
+            time_map = {
+                'offset_time': time64.now(),
+                'offset_counter': 0,
+                'counter_rate': float(fs),
+            }
+            statistics = SimStatistics(fs, fs / float(self.statistics_frequency), time_map)
+            t_start = time.perf_counter()
+            sample_id = 0
+            while not self._quit:
+                available = int((time.perf_counter() - t_start) * fs) - sample_id
+                if available < block:
+                    time.sleep((block - available) / fs)
+                    continue
+                if available > _BACKLOG_MAX * fs:
+                    dropped = available - block
+                    self._log.warning('cannot keep up, drop %d samples', dropped)
+                    sample_id += dropped
+                    statistics.skip()
+                self._process(generator, statistics, sample_id, block, time_map)
+                sample_id += block
+        finally:
+            generator.close()
+            self._log.info('thread stop')
+
+    def _process(self, generator, statistics, sample_id, length, time_map):
+        data = generator.read(sample_id, length)
+        fs = generator.sample_rate
+        utc = time_map['offset_time'] + int(round(sample_id * time64.SECOND / fs))
+        topic = get_topic_name(self)
+        for signal_id, x in data.items():
+            if not self._enable[signal_id]:
+                continue
+            signal_info = _SIGNALS[signal_id]
+            utopic = f'{topic}/events/signals/{signal_id}/!data'
+            value = {
+                'source': self._info,
+                'sample_id': sample_id,
+                'sample_freq': fs,
+                'utc': utc,
+                'field': signal_info['name'],
+                'data': x,
+                'dtype': 'f32',
+                'units': signal_info['units'],
+                'origin_sample_id': sample_id,
+                'origin_sample_freq': fs,
+                'origin_decimate_factor': 1,
+                'time_map': time_map,
+            }
+            sample_tap.publish(utopic, value)
+            self.pubsub.publish(utopic, value)
+        for value in statistics.process(sample_id, data):
+            self._on_stats(value)
+
+    def _on_stats(self, value):
+        if self._statistics_offsets is None:
+            accum_sample_start = value['time']['accum_samples']['value'][-1]
+            charge = value['accumulators']['charge']['value']
+            energy = value['accumulators']['energy']['value']
+            self._statistics_offsets = [accum_sample_start, charge, energy]
+        value = StatisticsData(value, self.unique_id, self._statistics_offsets)
+        self.pubsub.publish(f'{get_topic_name(self)}/events/statistics/!data', value)
+
+    def on_action_accum_clear(self, topic, value):
+        prev_value = self._statistics_offsets
+        if value is None:
+            self._statistics_offsets = None
+        else:
+            self._statistics_offsets = list(value)
+        return topic, prev_value
+
+    def on_action_finalize(self):
+        self.close()
+
+    def on_setting_name(self, value):
+        self._name = value
+        self.pubsub.publish(f'{get_topic_name(self)}/settings/sources/1/name', value)
+
+    def _restart(self):
+        if self._thread is not None:
+            self.close()
+            self.open()
+
+    def on_setting_signal_frequency(self, value):
+        if self._path is None:
+            self._restart()
+
+    def on_setting_statistics_frequency(self, value):
+        self._restart()
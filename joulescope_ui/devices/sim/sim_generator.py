@@ -0,0 +1,129 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Sample generators for the simulated device.
+
+Each generator provides:
+
+* sample_rate: The sample rate in Hz.
+* read(sample_id, length): Get the dict mapping signal id 'i', 'v', 'p'
+  to a new float32 numpy array of length samples.
+* close(): Release resources.
+
+The generators are unbounded: sample_id may increase forever.
+"""
+
+from pyjls import Reader, SignalType
+import numpy as np
+
+
+SIGNAL_IDS = ['i', 'v', 'p']
+_JLS_SIGNAL_NAMES = {
+    'current': 'i',
+    'voltage': 'v',
+    'power': 'p',
+}
+
+
+class ProceduralGenerator:
+    """Generate a repeating load waveform.
+
+    :param sample_rate: The sample rate in Hz.
+    :param period: The waveform period in seconds.
+    :param seed: The random seed for the noise.
+
+    The waveform is a 1 mA sleep current with a 100 mA active pulse for
+    the first 20% of each period, a 3.3 V supply with 0.5 Ω source
+    resistance, and gaussian noise.  The generator computes one period at
+    construction and then serves blocks by indexing into it, so the
+    per-block cost stays low at high sample rates.
+    """
+
+    def __init__(self, sample_rate, period=None, seed=None):
+        period = 0.1 if period is None else float(period)
+        self.sample_rate = int(sample_rate)
+        n = max(1, int(round(self.sample_rate * period)))
+        rng = np.random.default_rng(0 if seed is None else seed)
+        x = np.arange(n, dtype=np.float64) / n
+        i = np.where(x < 0.2, 0.100, 0.001)
+        i += 0.0005 * np.sin(2 * np.pi * 10 * x)
+        i += rng.normal(0.0, 20e-6, n)
+        v = 3.3 - 0.5 * i + rng.normal(0.0, 0.5e-3, n)
+        self._signals = {
+            'i': i.astype(np.float32),
+            'v': v.astype(np.float32),
+            'p': (i * v).astype(np.float32),
+        }
+
+    def read(self, sample_id, length):
+        idx = np.arange(sample_id, sample_id + length, dtype=np.int64)
+        return {key: np.take(x, idx, mode='wrap') for key, x in self._signals.items()}
+
+    def close(self):
+        pass
+
+
+class JlsReplayGenerator:
+    """Replay the current, voltage, and power signals from a JLS file.
+
+    :param path: The JLS file path.
+    :raise ValueError: If the file does not contain FSR current and
+        voltage signals with the same sample rate.
+
+    The replay loops back to the start at the end of the file.
+    When the file does not contain power, the generator computes it
+    from current and voltage.
+    """
+
+    def __init__(self, path):
+        self._reader = Reader(path)
+        signals = {}
+        for signal in self._reader.signals.values():
+            key = _JLS_SIGNAL_NAMES.get(signal.name)
+            if key is None or key in signals or signal.signal_type != SignalType.FSR:
+                continue
+            signals[key] = signal
+        try:
+            if 'i' not in signals or 'v' not in signals:
+                raise ValueError(f'JLS file does not contain current and voltage: {path}')
+            sample_rates = set(int(s.sample_rate) for s in signals.values())
+            if len(sample_rates) != 1:
+                raise ValueError(f'JLS file signals have different sample rates: {path}')
+            self.length = min(int(s.length) for s in signals.values())
+            if self.length <= 0:
+                raise ValueError(f'JLS file is empty: {path}')
+        except Exception:
+            self._reader.close()
+            raise
+        self.sample_rate = sample_rates.pop()
+        self._signals = {key: s.signal_id for key, s in signals.items()}
+
+    def read(self, sample_id, length):
+        parts = {key: [] for key in self._signals.keys()}
+        while length > 0:
+            start = sample_id % self.length
+            n = min(length, self.length - start)
+            for key, signal_id in self._signals.items():
+                parts[key].append(self._reader.fsr(signal_id, start, n))
+            sample_id += n
+            length -= n
+        rv = {key: np.concatenate(x).astype(np.float32, copy=False) for key, x in parts.items()}
+        if 'p' not in rv:
+            rv['p'] = rv['i'] * rv['v']
+        return rv
+
+    def close(self):
+        r, self._reader = self._reader, None
+        if r is not None:
+            r.close()
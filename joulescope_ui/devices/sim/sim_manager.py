@@ -0,0 +1,73 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Manager for simulated devices."""
+
+from joulescope_ui.capabilities import CAPABILITIES
+from .sim_device import SimDevice
+from .sim_stream_buffer import SimStreamBuffer, UNIQUE_ID as _STREAM_BUFFER_ID
+import logging
+
+
+class SimDeviceManager:
+    """Create and open simulated devices.
+
+    :param count: The number of simulated devices.
+    :param path: The optional JLS file path that all devices replay.
+        None generates the signals procedurally.
+
+    The manager registers the devices as Sim-001, Sim-002, ... and
+    opens them immediately.  The devices stream into the
+    SimStreamBuffer:001 signal buffer source for the waveform.
+    """
+
+    CAPABILITIES = []  # set on the instance, see ExternalSerialManager
+
+    def __init__(self, count=1, path=None):
+        self.CAPABILITIES = [CAPABILITIES.DEVICE_FACTORY]
+        self._log = logging.getLogger(__name__)
+        self._count = int(count)
+        self._path = path
+        self._devices = []
+        self._stream_buffer = None
+
+    def on_pubsub_register(self):
+        self._log.info('on_pubsub_register: %d devices', self._count)
+        self._stream_buffer = SimStreamBuffer()
+        self.pubsub.register(self._stream_buffer, _STREAM_BUFFER_ID)
+        for idx in range(self._count):
+            serial_number = f'{idx + 1:03d}'
+            name = f'Sim-{serial_number}'
+            device = SimDevice({'name': name, 'serial_number': serial_number, 'path': self._path})
+            self.pubsub.register(device, name)
+            self._devices.append(device)
+            self._stream_buffer.source_add(name)
+            try:
+                device.open()
+            except Exception:
+                self._log.warning('Failed to open %s', name)
+
+    def on_pubsub_unregister(self):
+        self.on_action_finalize()
+
+    def on_action_finalize(self):
+        self._log.info('finalize')
+        while len(self._devices):
+            device = self._devices.pop()
+            device.close()
+            self._stream_buffer.source_remove(device.unique_id)
+            self.pubsub.unregister(device)
+        stream_buffer, self._stream_buffer = self._stream_buffer, None
+        if stream_buffer is not None:
+            self.pubsub.unregister(stream_buffer)
@@ -0,0 +1,530 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Stream buffer for the simulated devices.
+
+The jsdrv stream buffer only captures the signals of jsdrv driver
+devices, so this small equivalent buffers the simulated device signals
+and provides them as a CAPABILITIES.SIGNAL_BUFFER_SOURCE for the
+waveform.
+"""
+
+from joulescope_ui import N_, get_topic_name
+from joulescope_ui.capabilities import CAPABILITIES
+from joulescope_ui.metadata import Metadata
+from joulescope_ui.time_map import TimeMap
+from pyjoulescope_driver import time64
+from .sim_generator import SIGNAL_IDS
+import logging
+import numpy as np
+import time
+import warnings
+
+
+UNIQUE_ID = 'SimStreamBuffer:001'
+_BLOCK = 256                 # samples per summary block
+_DIRECT_MAX = 4 * _BLOCK     # largest summary increment computed from the samples
+_RANGE_PERIOD = 0.05         # minimum seconds between signal range updates
+
+
+_EVENTS = {
+    'sources/!add': Metadata('str', 'Source added'),
+    'sources/!remove': Metadata('str', 'Source removed'),
+    'signals/!add': Metadata('str', 'Signal added'),
+    'signals/!remove': Metadata('str', 'Signal removed'),
+}
+
+
+_SETTINGS = {
+    'name': {
+        'dtype': 'str',
+        'brief': N_('Name'),
+        'default': N_('Simulated stream buffer'),
+    },
+    'duration': {
+        'dtype': 'float',
+        'brief': N_('Buffer memory duration in seconds'),
+        'default': 10.0,
+    },
+    'sources': {
+        'dtype': 'node',
+        'brief': 'Hold source settings',
+        'default': None,
+        'flags': ['hide', 'skip_undo'],
+    },
+    'signals': {
+        'dtype': 'node',
+        'brief': 'Hold signal settings',
+        'default': None,
+        'flags': ['hide', 'skip_undo'],
+    },
+    'generation': {
+        'dtype': 'int',
+        'brief': 'The buffer data generation',
+        'detail': 'Incremented whenever the buffer data is discarded.',
+        'default': 0,
+        'flags': ['hide', 'ro', 'tmp', 'skip_undo'],
+    },
+}
+
+_SETTINGS_PER_SOURCE = {
+    'name': Metadata({
+        'dtype': 'str',
+        'brief': N_('Name'),
+        'default': N_('Source name'),
+    }),
+    'info': Metadata({
+        'dtype': 'obj',
+        'brief': N_('Source information'),
+        'default': None,
+        'flags': ['ro', 'hide', 'skip_undo'],
+    }),
+}
+
+_SETTINGS_PER_SIGNAL = {
+    'name': Metadata({
+        'dtype': 'str',
+        'brief': N_('Name'),
+        'default': N_('Signal name'),
+    }),
+    'meta': Metadata({
+        'dtype': 'obj',
+        'brief': N_('Signal metadata'),
+        'default': None,
+        'flags': ['ro', 'hide', 'skip_undo'],
+    }),
+    'range': Metadata({
+        'dtype': 'obj',
+        'brief': N_('Signal time range'),
+        'default': None,
+        'flags': ['ro', 'hide', 'skip_undo'],
+    }),
+}
+
+
+class SignalBuffer:
+    """Keep the most recent samples for one signal.
+
+    :param duration: The buffer duration in seconds.
+
+    A second ring holds the count, sum, sum of squares, min and max for
+    each block of _BLOCK samples, so that summaries over long spans do
+    not visit every sample.  These summaries align their edges to the
+    blocks.
+    """
+
+    def __init__(self, duration):
+        self.duration = float(duration)
+        self.field = None
+        self.units = None
+        self.sample_rate = None
+        self.start = None  # first buffered sample id
+        self.end = None    # one past the last buffered sample id
+        self.tmap = TimeMap()
+        self._x = None
+        self._blocks = None
+
+    def clear(self):
+        self.start = None
+        self.end = None
+        self._x = None
+        self._blocks = None
+
+    def _alloc(self, sample_rate, sample_id):
+        blocks = max(2, int(np.ceil(self.duration * sample_rate / _BLOCK)))
+        self.sample_rate = sample_rate
+        self._x = np.full(blocks * _BLOCK, np.nan, dtype=np.float32)
+        self._blocks = np.zeros((blocks, 5), dtype=np.float64)
+        self.start = sample_id
+        self.end = sample_id
+
+    def add(self, value):
+        """Add a signal stream message.
+
+        :param value: The CAPABILITIES.SIGNAL_STREAM_SOURCE data message.
+        """
+        sample_id = int(value['sample_id'])
+        sample_rate = value['sample_freq']
+        x = np.asarray(value['data'], dtype=np.float32)
+        if self._x is None or sample_rate != self.sample_rate or sample_id < self.end:
+            self._alloc(sample_rate, sample_id)  # first data or device restart
+        time_map = value['time_map']
+        self.tmap.update(time_map['offset_counter'], time_map['offset_time'],
+                         time_map['counter_rate'] / time64.SECOND)
+        self.field = value['field']
+        self.units = value['units']
+        size = len(self._x)
+        if sample_id - self.end >= size:
+            self.start = self.end = sample_id  # gap longer than the buffer
+        elif sample_id > self.end:
+            self._write(self.end, np.full(sample_id - self.end, np.nan, dtype=np.float32))
+        if len(x) > size:
+            sample_id, x = sample_id + len(x) - size, x[-size:]
+        end_prev = max(self.end, sample_id)
+        self._write(sample_id, x)
+        self.end = sample_id + len(x)
+        self.start = max(self.start, self.end - size)
+        self._blocks_update(end_prev)
+
+    def _write(self, sample_id, x):
+        self._x[np.arange(sample_id, sample_id + len(x)) % len(self._x)] = x
+
+    def _blocks_update(self, end_prev):
+        count = len(self._blocks)
+        b1 = self.end // _BLOCK
+        b0 = max(end_prev // _BLOCK, b1 - count)
+        if b1 <= b0:
+            return
+        x = self.read(b0 * _BLOCK, (b1 - b0) * _BLOCK).reshape((-1, _BLOCK))
+        finite = np.isfinite(x)
+        z = np.where(finite, x, 0.0).astype(np.float64)
+        rows = np.arange(b0, b1) % count
+        self._blocks[rows, 0] = np.count_nonzero(finite, axis=1)
+        self._blocks[rows, 1] = np.sum(z, axis=1)
+        self._blocks[rows, 2] = np.sum(z * z, axis=1)
+        self._blocks[rows, 3] = np.min(np.where(finite, x, np.inf), axis=1)
+        self._blocks[rows, 4] = np.max(np.where(finite, x, -np.inf), axis=1)
+
+    def read(self, start, length):
+        """Read samples.
+
+        :param start: The starting sample id.
+        :param length: The number of samples.
+        :return: The np.float32 array.  Samples outside the buffer are NaN.
+        """
+        y = np.full(length, np.nan, dtype=np.float32)
+        if self._x is None:
+            return y
+        s0 = max(start, self.start)
+        s1 = min(start + length, self.end)
+        if s1 > s0:
+            y[s0 - start:s1 - start] = np.take(self._x, np.arange(s0, s1), mode='wrap')
+        return y
+
+    def summary(self, start, increment, length):
+        """Summarize samples.
+
+        :param start: The starting sample id.
+        :param increment: The number of samples in each entry.
+        :param length: The number of entries.
+        :return: The np.float32 array with shape (length, 4) and columns
+            mean, std, min, max.
+        """
+        with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+            warnings.simplefilter('ignore', category=RuntimeWarning)  # all-NaN entries
+            if increment <= _DIRECT_MAX or self._x is None:
+                x = self.read(start, increment * length).reshape((length, increment)).astype(np.float64)
+                y = [np.nanmean(x, axis=1), np.nanstd(x, axis=1), np.nanmin(x, axis=1), np.nanmax(x, axis=1)]
+                return np.stack(y, axis=1).astype(np.float32)
+
+            # each entry combines the blocks that start within it
+            edges = -(-(start + increment * np.arange(length + 1, dtype=np.int64)) // _BLOCK)
+            blocks = np.arange(edges[0], edges[-1])
+            count = len(self._blocks)
+            b_first = max(-(-self.start // _BLOCK), self.end // _BLOCK - count + 1)
+            valid = np.logical_and(blocks >= b_first, blocks < self.end // _BLOCK)
+            s = self._blocks[blocks % count]
+            s[np.logical_not(valid)] = [0.0, 0.0, 0.0, np.inf, -np.inf]
+            idx = edges[:-1] - edges[0]
+            n = np.add.reduceat(s[:, 0], idx)
+            mean = np.add.reduceat(s[:, 1], idx) / n
+            var = np.add.reduceat(s[:, 2], idx) / n - mean * mean
+            y_min = np.minimum.reduceat(s[:, 3], idx)
+            y_max = np.maximum.reduceat(s[:, 4], idx)
+            empty = n == 0
+            y_min[empty] = np.nan
+            y_max[empty] = np.nan
+            y = [mean, np.sqrt(np.maximum(var, 0.0)), y_min, y_max]
+            return np.stack(y, axis=1).astype(np.float32)
+
+    def range(self):
+        """Get the buffered range.
+
+        :return: The range dict for settings/signals/{signal_id}/range
+            or None when empty.
+        """
+        if self.end is None or self.end <= self.start:
+            return None
+        t0, t1 = self.tmap.sample_id_to_timestamp(np.array([self.start, self.end - 1], dtype=np.int64))
+        return {
+            'utc': [int(t0), int(t1)],
+            'samples': {'start': self.start, 'end': self.end - 1, 'length': self.end - self.start},
+            'sample_rate': self.sample_rate,
+        }
+
+    def process(self, req):
+        """Handle a buffer request.
+
+        :param req: The buffer request structure.
+            See joulescope_ui.capabilities SIGNAL_BUFFER_SOURCE
+        :return: The response or None.
+        """
+        if self.end is None:
+            return None
+        req_end = req.get('end', 0)
+        length = req.get('length', 0)
+        if req['time_type'] == 'utc':
+            start = int(np.rint(self.tmap.timestamp_to_sample_id(req['start'])))
+            end = int(np.rint(self.tmap.timestamp_to_sample_id(req_end))) if req_end else 0
+        else:
+            start, end = int(req['start']), int(req_end)
+        interval = end - start + 1
+        response_type = 'samples'
+        increment = 1
+        if not req_end:
+            data = self.read(start, length)
+        elif interval < 0:
+            return None
+        elif not length:
+            length = interval
+            data = self.read(start, length)
+        elif length <= (interval // 2):
+            increment = interval // length
+            length = interval // increment
+            data = self.summary(start, increment, length)
+            response_type = 'summary'
+        else:
+            length = interval
+            data = self.read(start, length)
+        sample_id_end = start + increment * length - 1
+        t0, t1 = self.tmap.sample_id_to_timestamp(np.array([start, sample_id_end], dtype=np.int64))
+        info = {
+            'version': 1,
+            'field': self.field,
+            'units': self.units,
+            'time_range_utc': {
+                'start': int(t0),
+                'end': int(t1),
+                'length': length,
+            },
+            'time_range_samples': {
+                'start': start,
+                'end': sample_id_end,
+                'length': length,
+            },
+            'time_map': {
+                'offset_counter': self.tmap.counter_offset,
+                'offset_time': self.tmap.time_offset,
+                'counter_rate': self.sample_rate,
+            },
+            'tmap': self.tmap,
+            'sample_rate': self.sample_rate,
+        }
+        return {
+            'version': 1,
+            'rsp_id': req.get('rsp_id'),
+            'info': info,
+            'response_type': response_type,
+            'data': data,
+            'data_type': 'f32',
+        }
+
+
+class SimStreamBuffer:
+    """Buffer the simulated device signals.
+
+    Use :meth:`source_add` to buffer the enabled signals of a simulated
+    device.  Like the jsdrv stream buffer, the buffer holds while signal
+    streaming is paused and clears when streaming resumes.
+    """
+    CAPABILITIES = []
+    EVENTS = {}
+    SETTINGS = {}
+
+    def __init__(self):
+        self.CAPABILITIES = [CAPABILITIES.SOURCE, CAPABILITIES.SIGNAL_BUFFER_SOURCE]
+        self.EVENTS = _EVENTS
+        self.SETTINGS = _SETTINGS
+        self._log = logging.getLogger(__name__)
+        self._hold = False
+        self._sources = {}   # device unique_id -> list of (topic, fn)
+        self._signals = {}   # signal_id '{device}.{signal}' -> SignalBuffer
+        self._signal_subscriptions = {}  # signal_id -> (topic, fn)
+        self._range_time = {}  # signal_id -> time of last range publish
+
+    def on_pubsub_register(self):
+        topic = get_topic_name(self)
+        for t in self.pubsub.enumerate(f'{topic}/settings/sources', absolute=True):
+            self.pubsub.topic_remove(t)
+        for t in self.pubsub.enumerate(f'{topic}/settings/signals', absolute=True):
+            self.pubsub.topic_remove(t)
+        self.pubsub.subscribe('registry/app/settings/signal_stream_enable',
+                              self._on_signal_stream_enable, ['pub', 'retain'])
+
+    def on_pubsub_unregister(self):
+        self._log.info('unregister')
+        self.pubsub.unsubscribe('registry/app/settings/signal_stream_enable', self._on_signal_stream_enable)
+        for device_id in list(self._sources.keys()):
+            self.source_remove(device_id)
+
+    def _on_signal_stream_enable(self, value):
+        if value is None:
+            return
+        self._hold = not bool(value)
+        if not self._hold:
+            self.on_action_clear()
+
+    def source_add(self, device_id):
+        """Buffer the signals for a simulated device.
+
+        :param device_id: The device unique_id.
+        """
+        if device_id in self._sources:
+            return
+        self._log.info('source_add %s', device_id)
+        topic = get_topic_name(self)
+        device_topic = get_topic_name(device_id)
+        source_topic = f'{topic}/settings/sources/{device_id}'
+        for name, meta in _SETTINGS_PER_SOURCE.items():
+            self.pubsub.topic_add(f'{source_topic}/{name}', meta, exists_ok=True)
+        self.pubsub.publish(f'{source_topic}/name', self.pubsub.query(f'{device_topic}/settings/name'))
+        self.pubsub.publish(f'{source_topic}/info', self.pubsub.query(f'{device_topic}/settings/info'))
+        subs = []
+        self._sources[device_id] = subs
+        for signal in SIGNAL_IDS:
+            t = f'{device_topic}/settings/signals/{signal}/enable'
+            self.pubsub.subscribe(t, self._on_signal_enable, ['pub', 'retain'])
+            subs.append((t, self._on_signal_enable))
+        t = f'{device_topic}/settings/state'
+        self.pubsub.subscribe(t, self._on_device_state, ['pub', 'retain'])
+        subs.append((t, self._on_device_state))
+        self.pubsub.publish(f'{topic}/events/sources/!add', device_id)
+
+    def source_remove(self, device_id):
+        """Stop buffering the signals for a simulated device.
+
+        :param device_id: The device unique_id.
+        """
+        subs = self._sources.pop(device_id, None)
+        if subs is None:
+            return
+        self._log.info('source_remove %s', device_id)
+        for t, fn in subs:
+            self.pubsub.unsubscribe(t, fn)
+        for signal_id in list(self._signals.keys()):
+            if signal_id.split('.')[0] == device_id:
+                self.on_action_remove(signal_id)
+        topic = get_topic_name(self)
+        self.pubsub.topic_remove(f'{topic}/settings/sources/{device_id}')
+        self.pubsub.publish(f'{topic}/events/sources/!remove', device_id)
+
+    def _on_signal_enable(self, topic, value):
+        parts = topic.split('/')
+        signal_id = f'{parts[1]}.{parts[4]}'
+        if bool(value):
+            self.on_action_add(signal_id)
+        elif signal_id in self._signals:
+            self.on_action_remove(signal_id)
+
+    def _on_device_state(self, topic, value):
+        if value == 2:  # open, device sample ids restart
+            device_id = topic.split('/')[1]
+            for signal_id, b in self._signals.items():
+                if signal_id.split('.')[0] == device_id:
+                    b.clear()
+            self._generation_increment()
+
+    def on_action_add(self, signal_id):
+        if signal_id in self._signals:
+            return
+        self._log.info('add %s', signal_id)
+        device_id, signal = signal_id.split('.')
+        device_topic = get_topic_name(device_id)
+        self._signals[signal_id] = SignalBuffer(self.duration)
+        prefix = f'{get_topic_name(self)}/settings/signals/{signal_id}'
+        for key, meta in _SETTINGS_PER_SIGNAL.items():
+            self.pubsub.topic_add(f'{prefix}/{key}', meta, exists_ok=True)
+        self.pubsub.publish(f'{prefix}/name', self.pubsub.query(f'{device_topic}/settings/signals/{signal}/name'))
+        self.pubsub.publish(f'{prefix}/meta', self.pubsub.query(f'{device_topic}/settings/info'))
+        data_topic = f'{device_topic}/events/signals/{signal}/!data'
+        self.pubsub.subscribe(data_topic, self._on_data, ['pub'])
+        self._signal_subscriptions[signal_id] = (data_topic, self._on_data)
+        self.pubsub.publish(f'{get_topic_name(self)}/events/signals/!add', signal_id)
+
+    def on_action_remove(self, signal_id):
+        if self._signals.pop(signal_id, None) is None:
+            return
+        self._log.info('remove %s', signal_id)
+        self.pubsub.unsubscribe(*self._signal_subscriptions.pop(signal_id))
+        self._range_time.pop(signal_id, None)
+        topic = get_topic_name(self)
+        self.pubsub.publish(f'{topic}/events/signals/!remove', signal_id)
+        self.pubsub.topic_remove(f'{topic}/settings/signals/{signal_id}', defer=True)
+
+    def _on_data(self, topic, value):
+        if self._hold:
+            return
+        parts = topic.split('/')
+        signal_id = f'{parts[1]}.{parts[-2]}'
+        b = self._signals.get(signal_id)
+        if b is None:
+            return
+        b.add(value)
+        t_now = time.time()
+        if t_now - self._range_time.get(signal_id, 0.0) >= _RANGE_PERIOD:
+            self._range_time[signal_id] = t_now
+            self._range_publish(signal_id, b)
+
+    def _range_publish(self, signal_id, b):
+        r = b.range()
+        if r is None:
+            r = {'utc': [0, 0], 'samples': {'start': 0, 'end': 0, 'length': 0}, 'sample_rate': 0}
+        self.pubsub.publish(f'{get_topic_name(self)}/settings/signals/{signal_id}/range', r)
+
+    def _generation_increment(self):
+        topic = f'{get_topic_name(self)}/settings/generation'
+        self.pubsub.publish(topic, self.pubsub.query(topic, default=0) + 1)
+
+    def on_setting_duration(self, value):
+        for b in self._signals.values():
+            b.duration = float(value)
+            b.clear()
+
+    def on_action_clear(self):
+        for b in self._signals.values():
+            b.clear()
+        self._generation_increment()
+
+    def _process(self, value):
+        signal_id = '.'.join(value['signal_id'].split('.')[-2:])
+        b = self._signals.get(signal_id)
+        if b is None:
+            self._log.info('Request for missing signal %s', signal_id)
+            return None
+        return b.process(value)
+
+    def on_action_request(self, value):
+        """Request data from the buffer.
+
+        :param value: The buffer request structure.
+            See joulescope_ui.capabilities SIGNAL_BUFFER_SOURCE
+        """
+        rsp = self._process(value)
+        if rsp is not None:
+            self.pubsub.publish(value['rsp_topic'], rsp)
+
+    def on_action_request_batch(self, value):
+        """Request data for multiple signals from the buffer.
+
+        :param value: The batch request structure.
+            See joulescope_ui.capabilities SIGNAL_BUFFER_SOURCE
+        """
+        self.pubsub.publish(value['rsp_topic'], {
+            'version': 1,
+            'rsp_id': value.get('rsp_id'),
+            'responses': [self._process(req) for req in value['requests']],
+        })
+
+    def on_action_annotations_request(self, value):
+        self.pubsub.publish(value['rsp_topic'], None)
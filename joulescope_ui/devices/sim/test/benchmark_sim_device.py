@@ -0,0 +1,99 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark PubSub delivery from simulated devices.
+
+Each device streams current, voltage, and power in real time.  The main
+thread processes PubSub like the UI thread and counts the delivered
+samples.  Run with:
+
+    python -m joulescope_ui.devices.sim.test.benchmark_sim_device
+"""
+
+from joulescope_ui import CAPABILITIES
+from joulescope_ui.pubsub import PubSub
+from joulescope_ui.devices.sim.sim_device import SimDevice
+import argparse
+import time
+
+
+def get_parser():
+    p = argparse.ArgumentParser(description='Benchmark simulated device streaming.')
+    p.add_argument('--fs', type=int, default=2_000_000, help='The sample rate in Hz.')
+    p.add_argument('--devices', type=int, default=1, help='The number of simulated devices.')
+    p.add_argument('--jls', help='The optional JLS file to replay.')
+    p.add_argument('--duration', type=float, default=5.0, help='The duration in seconds.')
+    return p
+
+
+def run(fs, device_count, path, duration):
+    pubsub = PubSub(app='benchmark_sim_device')
+    pubsub.registry_initialize()
+    for capability in [CAPABILITIES.SOURCE, CAPABILITIES.STATISTIC_STREAM_SOURCE,
+                       CAPABILITIES.SIGNAL_STREAM_SOURCE]:
+        pubsub.register_capability(capability)
+    counts = {'samples': 0, 'statistics': 0}
+
+    def on_signal(topic, value):
+        counts['samples'] += len(value['data'])
+
+    def on_statistics(value):
+        counts['statistics'] += 1
+
+    pubsub.register(SimDevice)
+    devices = []
+    for idx in range(device_count):
+        name = f'Sim-{idx + 1:03d}'
+        device = SimDevice({'name': name, 'path': path})
+        pubsub.register(device, name)
+        pubsub.publish(f'registry/{name}/settings/signal_frequency', fs)
+        pubsub.subscribe(f'registry/{name}/events/signals', on_signal, ['pub'])
+        pubsub.subscribe(f'registry/{name}/events/statistics/!data', on_statistics, ['pub'])
+        devices.append(device)
+
+    for device in devices:
+        device.open()
+    busy = 0.0
+    t_start = time.perf_counter()
+    t_end = t_start + duration
+    while True:
+        t = time.perf_counter()
+        if t >= t_end:
+            break
+        pubsub.process()
+        busy += time.perf_counter() - t
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - t_start
+    for device in devices:
+        device.close()
+
+    rate = counts['samples'] / elapsed
+    expect = 3 * fs * device_count if path is None else None
+    print(f'devices={device_count} fs={fs} duration={elapsed:.1f} s')
+    print(f'  delivered {rate / 1e6:.2f} Msps', end='')
+    if expect:
+        print(f' of {expect / 1e6:.2f} Msps ({100 * rate / expect:.0f}%)', end='')
+    print()
+    print(f'  statistics messages: {counts["statistics"]}')
+    print(f'  PubSub process busy: {100 * busy / elapsed:.0f}%')
+
+
+def main():
+    args = get_parser().parse_args()
+    run(args.fs, args.devices, args.jls, args.duration)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the simulated device.
+"""
+
+import unittest
+from joulescope_ui import CAPABILITIES, time64
+from joulescope_ui.pubsub import PubSub
+from joulescope_ui.statistics_data import StatisticsData
+from joulescope_ui.devices.sim.sim_generator import ProceduralGenerator, JlsReplayGenerator
+from joulescope_ui.devices.sim.sim_device import SimDevice, SimStatistics
+from pyjls import Writer, SignalType, DataType
+import numpy as np
+import os
+import tempfile
+import time
+
+
+_SIGNAL_SOURCES = f'registry_manager/capabilities/{CAPABILITIES.SIGNAL_STREAM_SOURCE}/list'
+_TIME_MAP = {'offset_time': 0, 'offset_counter': 0, 'counter_rate': 1000.0}
+
+
+def _jls_write(path, signals):
+    with Writer(path) as w:
+        w.source_def(source_id=1, name='js220', vendor='Jetperch', model='JS220',
+                     version='1', serial_number='000001')
+        for signal_id, (name, units, x) in enumerate(signals, start=1):
+            w.signal_def(signal_id=signal_id, source_id=1, signal_type=SignalType.FSR,
+                         data_type=DataType.F32, sample_rate=1000, name=name, units=units)
+            w.fsr_f32(signal_id, 0, x)
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_procedural_continuous(self):
+        g = ProceduralGenerator(10000, period=0.01)
+        a = g.read(50, 250)
+        b = g.read(50, 100)
+        c = g.read(150, 150)
+        for key in ['i', 'v', 'p']:
+            self.assertEqual(np.float32, a[key].dtype)
+            self.assertEqual(250, len(a[key]))
+            np.testing.assert_equal(a[key], np.concatenate([b[key], c[key]]))
+        np.testing.assert_allclose(a['i'] * a['v'], a['p'], rtol=1e-5)
+        np.testing.assert_equal(g.read(0, 100)['i'], g.read(100, 100)['i'])  # periodic
+
+    def test_jls_replay(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'replay.jls')
+            i = np.arange(100, dtype=np.float32)
+            _jls_write(path, [('current', 'A', i), ('voltage', 'V', np.full(100, 2, dtype=np.float32))])
+            g = JlsReplayGenerator(path)
+            try:
+                self.assertEqual(1000, g.sample_rate)
+                x = g.read(90, 20)
+                np.testing.assert_equal(np.concatenate([i[90:], i[:10]]), x['i'])
+                np.testing.assert_equal(2 * x['i'], x['p'])
+            finally:
+                g.close()
+
+    def test_jls_replay_requires_voltage(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'replay.jls')
+            _jls_write(path, [('current', 'A', np.zeros(100, dtype=np.float32))])
+            with self.assertRaises(ValueError):
+                JlsReplayGenerator(path)
+
+
+class TestSimStatistics(unittest.TestCase):
+
+    def test_windows(self):
+        s = SimStatistics(1000, 100, _TIME_MAP)
+        g = ProceduralGenerator(1000, period=0.037)
+        data = g.read(0, 250)
+        msgs = []
+        for k in range(0, 250, 30):
+            block = {key: x[k:k + 30] for key, x in data.items()}
+            msgs.extend(s.process(k, block))
+        self.assertEqual(2, len(msgs))
+        m = msgs[1]
+        i = data['i'][100:200].astype(np.float64)
+        current = m['signals']['current']
+        self.assertAlmostEqual(np.mean(i), current['avg']['value'])
+        self.assertAlmostEqual(np.std(i), current['std']['value'], places=6)
+        self.assertEqual(np.min(i), current['min']['value'])
+        self.assertEqual(np.max(i), current['max']['value'])
+        self.assertEqual([100, 200], m['time']['samples']['value'])
+        self.assertEqual([0, 200], m['time']['accum_samples']['value'])
+        self.assertEqual(round(0.2 * time64.SECOND), m['time']['utc']['value'][1])
+        charge = np.sum(data['i'][:200].astype(np.float64)) / 1000
+        self.assertAlmostEqual(charge, m['accumulators']['charge']['value'])
+        self.assertEqual(len(StatisticsData(m).values), 17)
+
+
+class TestSimDevice(unittest.TestCase):
+
+    def setUp(self):
+        self.pubsub = PubSub(app='test_sim_device')
+        self.pubsub.registry_initialize()
+        for capability in [CAPABILITIES.SOURCE, CAPABILITIES.STATISTIC_STREAM_SOURCE,
+                           CAPABILITIES.SIGNAL_STREAM_SOURCE]:
+            self.pubsub.register_capability(capability)
+        self.pubsub.register(SimDevice)
+        self.device = SimDevice({'name': 'Sim-001'})
+        self.pubsub.register(self.device, 'Sim-001')
+        self.pubsub.publish('registry/Sim-001/settings/signal_frequency', 10000)
+        self.pubsub.publish('registry/Sim-001/settings/statistics_frequency', 100)
+        self.pubsub.publish('registry/Sim-001/settings/signals/v/enable', False)
+        self.signals = []
+        self.statistics = []
+        self.pubsub.subscribe('registry/Sim-001/events/signals', self._on_signal, ['pub'])
+        self.pubsub.subscribe('registry/Sim-001/events/statistics/!data', self._on_statistics, ['pub'])
+
+    def tearDown(self):
+        self.device.close()
+        self.pubsub.unregister(self.device, delete=True)
+        self.pubsub.unregister(SimDevice, delete=True)
+
+    def _on_signal(self, topic, value):
+        self.signals.append((topic.split('/')[-2], value))
+
+    def _on_statistics(self, value):
+        self.statistics.append(value)
+
+    def _process_until(self, fn, timeout=2.0):
+        t_end = time.time() + timeout
+        while not fn() and time.time() < t_end:
+            time.sleep(0.005)
+            self.pubsub.process()
+        self.pubsub.process()
+
+    def test_stream(self):
+        self.device.open()
+        self.assertEqual(['Sim-001'], self.pubsub.query(_SIGNAL_SOURCES))
+        self._process_until(lambda: len(self.statistics) >= 3)
+        self.device.close()
+        self.pubsub.process()
+        self.assertEqual([], self.pubsub.query(_SIGNAL_SOURCES))
+        self.assertEqual(0, self.pubsub.query('registry/Sim-001/settings/state'))
+
+        self.assertGreaterEqual(len(self.statistics), 3)
+        s = self.statistics[0]
+        self.assertIsInstance(s, StatisticsData)
+        self.assertEqual('Sim-001', s.unique_id)
+        self.assertEqual((0, 100), s.samples)
+        self.assertEqual(0.0, s.field('charge'))  # offset from the first message
+        self.assertGreater(self.statistics[-1].field('charge'), 0.0)
+
+        signal_ids = set(signal_id for signal_id, _ in self.signals)
+        self.assertEqual({'i', 'p'}, signal_ids)
+        current = [value for signal_id, value in self.signals if signal_id == 'i']
+        v = current[0]
+        self.assertEqual(10000, v['sample_freq'])
+        self.assertEqual('current', v['field'])
+        self.assertEqual('A', v['units'])
+        self.assertEqual(100, len(v['data']))
+        sample_ids = [value['sample_id'] for value in current]
+        self.assertEqual(list(range(0, 100 * len(current), 100)), sample_ids)
+
+    def test_accum_clear(self):
+        self.device.open()
+        self._process_until(lambda: len(self.statistics) >= 2)
+        self.pubsub.publish('registry/Sim-001/actions/!accum_clear', None)
+        self.statistics.clear()
+        self._process_until(lambda: any(s.accum_samples[0] > 0 for s in self.statistics))
+        s = [s for s in self.statistics if s.accum_samples[0] > 0][0]
+        self.assertEqual(s.accum_samples[0], s.accum_samples[1])
+        self.assertEqual(0.0, s.field('charge'))
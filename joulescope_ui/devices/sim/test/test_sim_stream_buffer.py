@@ -0,0 +1,196 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the simulated device stream buffer.
+"""
+
+import unittest
+from joulescope_ui import CAPABILITIES, time64
+from joulescope_ui.pubsub import PubSub
+from joulescope_ui.devices.sim.sim_device import SimDevice
+from joulescope_ui.devices.sim.sim_stream_buffer import SignalBuffer, SimStreamBuffer, UNIQUE_ID
+import numpy as np
+import time
+
+
+_FS = 1000
+_TIME_MAP = {'offset_time': 10 * time64.SECOND, 'offset_counter': 0, 'counter_rate': float(_FS)}
+
+
+def _msg(sample_id, data):
+    return {
+        'sample_id': sample_id,
+        'sample_freq': _FS,
+        'field': 'current',
+        'units': 'A',
+        'data': np.asarray(data, dtype=np.float32),
+        'time_map': _TIME_MAP,
+    }
+
+
+def _summary(x):
+    return np.stack([np.nanmean(x, axis=1), np.nanstd(x, axis=1),
+                     np.nanmin(x, axis=1), np.nanmax(x, axis=1)], axis=1)
+
+
+class TestSignalBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.b = SignalBuffer(10.0)  # 10240 samples
+        self.x = np.random.default_rng(3).normal(size=30000).astype(np.float32)
+
+    def _add(self, length, block=100):
+        for k in range(0, length, block):
+            self.b.add(_msg(k, self.x[k:k + block]))
+
+    def test_read(self):
+        self._add(1000)
+        np.testing.assert_equal(self.x[100:900], self.b.read(100, 800))
+        y = self.b.read(900, 200)
+        np.testing.assert_equal(self.x[900:1000], y[:100])
+        self.assertTrue(np.all(np.isnan(y[100:])))
+
+    def test_wrap(self):
+        self._add(30000)
+        self.assertEqual(30000, self.b.end)
+        self.assertEqual(30000 - 10240, self.b.start)
+        np.testing.assert_equal(self.x[25000:30000], self.b.read(25000, 5000))
+        self.assertTrue(np.all(np.isnan(self.b.read(0, 1000))))
+
+    def test_gap(self):
+        self.b.add(_msg(0, self.x[:100]))
+        self.b.add(_msg(200, self.x[200:300]))
+        y = self.b.read(0, 300)
+        self.assertTrue(np.all(np.isnan(y[100:200])))
+        np.testing.assert_equal(self.x[200:300], y[200:])
+
+    def test_restart(self):
+        self._add(1000)
+        self.b.add(_msg(0, self.x[:100]))
+        self.assertEqual(0, self.b.start)
+        self.assertEqual(100, self.b.end)
+
+    def test_summary_samples(self):
+        self._add(5000)
+        y = self.b.summary(1000, 100, 20)
+        np.testing.assert_allclose(_summary(self.x[1000:3000].reshape((20, 100))), y, rtol=1e-5, atol=1e-6)
+
+    def test_summary_blocks(self):
+        self._add(30000)
+        start = 256 * 80
+        y = self.b.summary(start, 2048, 4)
+        x = self.x[start:start + 2048 * 4].astype(np.float64).reshape((4, 2048))
+        np.testing.assert_allclose(_summary(x), y, rtol=1e-4, atol=1e-5)
+
+    def test_summary_outside(self):
+        self._add(30000)
+        y = self.b.summary(0, 2048, 4)
+        self.assertTrue(np.all(np.isnan(y)))
+
+    def test_process(self):
+        self._add(5000)
+        rsp = self.b.process({'signal_id': 'Sim-001.i', 'time_type': 'samples',
+                              'start': 1000, 'end': 2999, 'length': 20, 'rsp_id': 3})
+        self.assertEqual(3, rsp['rsp_id'])
+        self.assertEqual('summary', rsp['response_type'])
+        self.assertEqual((20, 4), rsp['data'].shape)
+        self.assertEqual(1000, rsp['info']['time_range_samples']['start'])
+        rsp = self.b.process({'signal_id': 'Sim-001.i', 'time_type': 'utc',
+                              'start': _TIME_MAP['offset_time'] + time64.SECOND,
+                              'end': _TIME_MAP['offset_time'] + 2 * time64.SECOND, 'length': 2000})
+        self.assertEqual('samples', rsp['response_type'])
+        np.testing.assert_equal(self.x[1000:2001], rsp['data'])
+        t = rsp['info']['tmap'].sample_id_to_timestamp(np.array([1000], dtype=np.int64))
+        self.assertEqual(_TIME_MAP['offset_time'] + time64.SECOND, t[0])
+
+
+class TestSimStreamBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.pubsub = PubSub(app='test_sim_stream_buffer')
+        self.pubsub.registry_initialize()
+        for capability in [CAPABILITIES.SOURCE, CAPABILITIES.STATISTIC_STREAM_SOURCE,
+                           CAPABILITIES.SIGNAL_STREAM_SOURCE, CAPABILITIES.SIGNAL_BUFFER_SOURCE]:
+            self.pubsub.register_capability(capability)
+        self.pubsub.register(SimDevice)
+        self.pubsub.register(SimStreamBuffer)
+        self.buffer = SimStreamBuffer()
+        self.pubsub.register(self.buffer, UNIQUE_ID)
+        self.device = SimDevice({'name': 'Sim-001'})
+        self.pubsub.register(self.device, 'Sim-001')
+        self.pubsub.publish('registry/Sim-001/settings/signal_frequency', 10000)
+        self.pubsub.publish('registry/Sim-001/settings/signals/v/enable', False)
+        self.signals = []
+        self.responses = []
+        self.pubsub.subscribe(f'registry/{UNIQUE_ID}/events/signals/!add', self._on_signal_add, ['pub'])
+        self.buffer.source_add('Sim-001')
+
+    def tearDown(self):
+        self.device.close()
+        self.buffer.source_remove('Sim-001')
+        self.pubsub.unregister(self.device, delete=True)
+        self.pubsub.unregister(self.buffer, delete=True)
+        self.pubsub.unregister(SimDevice, delete=True)
+        self.pubsub.unregister(SimStreamBuffer, delete=True)
+
+    def _on_signal_add(self, value):
+        self.signals.append(value)
+
+    def _on_response(self, value):
+        self.responses.append(value)
+
+    def _process_until(self, fn, timeout=2.0):
+        t_end = time.time() + timeout
+        while not fn() and time.time() < t_end:
+            time.sleep(0.005)
+            self.pubsub.process()
+        self.pubsub.process()
+
+    def _range(self):
+        return self.pubsub.query(f'registry/{UNIQUE_ID}/settings/signals/Sim-001.i/range')
+
+    def test_request(self):
+        self.assertEqual(['Sim-001.i', 'Sim-001.p'],
+                         sorted(self.pubsub.enumerate(f'registry/{UNIQUE_ID}/settings/signals')))
+        self.assertEqual(['Sim-001.i', 'Sim-001.p'], sorted(self.signals))
+        self.device.open()
+        self._process_until(lambda: self._range() is not None and self._range()['samples']['length'] >= 2000)
+        self.device.close()
+        r = self._range()
+        self.assertEqual(10000, r['sample_rate'])
+        self.assertGreaterEqual(r['samples']['length'], 2000)
+        self.assertLess(r['utc'][0], r['utc'][1])
+
+        self.pubsub.topic_add('test', dtype='node', brief='test root')
+        self.pubsub.topic_add('test/!rsp', dtype='obj', brief='response', default=None)
+        self.pubsub.subscribe('test/!rsp', self._on_response, ['pub'])
+        self.pubsub.publish(f'registry/{UNIQUE_ID}/actions/!request_batch', {
+            'requests': [
+                {'signal_id': f'{UNIQUE_ID}.Sim-001.i', 'time_type': 'utc',
+                 'start': r['utc'][0], 'end': r['utc'][1], 'length': 100, 'rsp_id': 1},
+                {'signal_id': f'{UNIQUE_ID}.Sim-001.v', 'time_type': 'utc',
+                 'start': r['utc'][0], 'end': r['utc'][1], 'length': 100, 'rsp_id': 2},
+            ],
+            'rsp_topic': 'test/!rsp',
+            'rsp_id': 7,
+        })
+        self.pubsub.process()
+        self.assertEqual(1, len(self.responses))
+        rsp_i, rsp_v = self.responses[0]['responses']
+        self.assertIsNone(rsp_v)  # disabled
+        self.assertEqual(1, rsp_i['rsp_id'])
+        self.assertEqual('summary', rsp_i['response_type'])
+        self.assertEqual('A', rsp_i['info']['units'])
+        self.assertTrue(np.all(np.isfinite(rsp_i['data'])))
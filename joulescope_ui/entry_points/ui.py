@@ -42,6 +42,12 @@ def parser_config(p):
     p.add_argument('--tcp-server', '--tcp_server',
                    action='store_true',
                    help='Enable TCP server for remote PubSub access and Qt inspection')
+    p.add_argument('--sim-devices', '--sim_devices',
+                   type=int,
+                   default=0,
+                   help='The number of simulated devices for load testing without hardware.')
+    p.add_argument('--sim-jls', '--sim_jls',
+                   help='Replay this JLS file from the simulated devices in real time.')
     return on_cmd
 
 
@@ -51,7 +57,8 @@ def on_cmd(args):
             file_log_level=args.file_log_level,
             filename=args.filename,
             safe_mode=args.safe_mode,
-            tcp_server=args.tcp_server)
+            tcp_server=args.tcp_server,
+            sim={'count': args.sim_devices, 'path': args.sim_jls})
     if args.profile is None:
         return local_run()
     elif args.profile == 'cProfile':
@@ -264,31 +264,20 @@ class Exporter(RangeToolBase):
                         if utc_start < e[f2] < utc_end:
                             jls.utc(jls_signal_id, e[f1] - sample_id_offset, e[f2])
                     jls.utc(jls_signal_id, sample_id_end - sample_id_offset, tmap.sample_id_to_timestamp(sample_id_end))
-                count = 0
-                length_total = sample_id_end - sample_id_offset
-                sample_id = sample_id_offset
                 bytes_since_flush = 0
-                while not self.abort:
-                    length_remaining = sample_id_end - sample_id
-                    if length_remaining <= 0:
-                        self._log.info(f'{signal["signal"]}: exported {count} samples')
-                        break
-                    length = min(100_000, length_remaining)
-                    d = self.request(signal['signal'], 'samples', sample_id, 0, length, timeout=1.0)
-                    info = d['info']
-                    sample_id_start = info['time_range_samples']['start']
-                    if sample_id_start != sample_id:
-                        self._log.warning(f'sample_id mismatch: {sample_id_start} != {sample_id}')
-                        sample_id = sample_id_start
-                    data = np.ascontiguousarray(d['data'])
+                chunks = self.iter_chunks(
+                    signal['signal'], [sample_id_offset, sample_id_end - 1], time_type='samples',
+                    as_f32=False, timeout=1.0,
+                    progress=(signal_idx * progress_iter, (signal_idx + 1) * progress_iter))
+                for sample_id, data in chunks:
+                    data = np.ascontiguousarray(data)
                     jls.fsr(jls_signal_id, sample_id - sample_id_offset, data)
-                    sample_id += info['time_range_samples']['length']
-                    count += length
                     bytes_since_flush += data.nbytes
                     if bytes_since_flush > _FLUSH_BYTES:
                         jls.flush()
                         bytes_since_flush = 0
-                    self.progress((signal_idx + (1 - length_remaining / length_total)) * progress_iter)
+                if not self.abort:
+                    self._log.info(f'{signal["signal"]}: exported {sample_id_end - sample_id_offset} samples')
                 jls.flush()
 
         if self.abort:
@@ -0,0 +1,382 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Overlay multiple JLS captures on a common time origin.
+
+Each capture becomes one subsource of this signal buffer source,
+shifted in time so that all captures start together.  All captures
+share a single reader thread and a single summary tile cache,
+so the waveform widget issues one batched request per frame
+regardless of the number of captures.
+"""
+
+from joulescope_ui import CAPABILITIES, Metadata, register, get_topic_name, get_instance
+from joulescope_ui.jls_source import _Dedup, _batch_merge, _jls_version_detect
+from joulescope_ui.jls_v2 import JlsV2, ChunkMeta
+from joulescope_ui.tile_cache import TileCache
+import copy
+import logging
+import os
+import queue
+import re
+import threading
+
+
+_log = logging.getLogger(__name__)
+
+
+class _Collector:
+    """Collect the topics that a JLS reader would add to pubsub."""
+
+    def __init__(self):
+        self.topics = {}
+
+    def topic_add(self, topic, meta, *args, **kwargs):
+        self.topics[topic] = meta.default
+
+    def publish(self, topic, value, *args, **kwargs):
+        pass
+
+
+class _ShiftedTimeMap:
+    """Shift a reader time map by a fixed time64 offset."""
+
+    def __init__(self, tmap, offset):
+        self._tmap = tmap
+        self._offset = offset
+
+    def __enter__(self):
+        self._tmap.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._tmap.__exit__(exc_type, exc_val, exc_tb)
+
+    def __len__(self):
+        return len(self._tmap)
+
+    def sample_id_to_timestamp(self, sample_id):
+        return self._tmap.sample_id_to_timestamp(sample_id) + self._offset
+
+    def timestamp_to_sample_id(self, timestamp):
+        return self._tmap.timestamp_to_sample_id(timestamp - self._offset)
+
+
+def capture_names(paths):
+    """Construct the unique capture (subsource) names.
+
+    :param paths: The list of JLS paths.
+    :return: The list of names, one for each path.
+    """
+    names = []
+    for idx, path in enumerate(paths):
+        stem = os.path.basename(os.path.splitext(path)[0])
+        stem = re.sub(r'[^\w\-]', '_', stem)
+        names.append(f'{idx + 1}-{stem}')
+    return names
+
+
+class _Capture:
+
+    def __init__(self, index, name, path, tile_cache):
+        self.index = index  # into the paths setting
+        self.name = name
+        self.path = path
+        self.collector = _Collector()
+        self.reader = JlsV2(path, self.collector, 'c', tile_cache=tile_cache)
+        self.device = None  # the reader's subsource name
+        self.utc_start = None
+        self.offset = 0
+        self.signals = {}  # quantity -> reader signal name
+        prefix = 'c/settings/signals/'
+        for topic, value in self.collector.topics.items():
+            if not topic.startswith(prefix) or not topic.endswith('/range'):
+                continue
+            signal_name = topic[len(prefix):-len('/range')]
+            device, quantity = signal_name.split('.')
+            if self.device is None:
+                self.device = device
+            elif device != self.device:
+                continue  # only overlay the first device in each capture
+            self.signals[quantity] = signal_name
+            t0 = value['utc'][0]
+            self.utc_start = t0 if self.utc_start is None else min(self.utc_start, t0)
+
+    def topic(self, signal_name, item):
+        return self.collector.topics[f'c/settings/signals/{signal_name}/{item}']
+
+    def close(self):
+        self.reader.close()
+
+
+@register
+class JlsComparisonSource:
+    """Overlay multiple JLS captures time-shifted to a common origin."""
+
+    CAPABILITIES = []
+    SETTINGS = {}
+
+    def __init__(self, paths=None):
+        self._queue = queue.Queue()
+        if paths is not None:
+            paths = [os.path.abspath(p) for p in paths]
+            for path in paths:
+                if not os.path.isfile(path):
+                    raise ValueError(f'File not found: {path}')
+        self.SETTINGS = {
+            'name': {
+                'dtype': 'str',
+                'brief': 'The name for this JLS comparison source',
+                'default': 'Comparison',
+            },
+            'paths': {
+                'dtype': 'obj',
+                'brief': 'The list of JLS file paths.',
+                'default': paths,
+                'flags': ['hide'],
+            },
+            'offsets': {
+                'dtype': 'obj',
+                'brief': 'The additional time64 offset for each capture.',
+                'detail': 'None aligns the start of each capture to the start of the first.',
+                'default': None,
+                'flags': ['hide'],
+            },
+        }
+        self._captures = {}  # name -> _Capture
+        self._tile_cache = TileCache()
+        self.pubsub = None
+        self.CAPABILITIES = [CAPABILITIES.SOURCE, CAPABILITIES.SIGNAL_BUFFER_SOURCE]
+        self._thread = None
+
+    def on_pubsub_register(self):
+        topic = get_topic_name(self)
+        pubsub = self.pubsub
+        paths = pubsub.query(f'{topic}/settings/paths')
+        offsets = pubsub.query(f'{topic}/settings/offsets')
+        _log.info('jls_comparison_source register %s', topic)
+        pubsub.topic_remove(f'{topic}/settings/sources')
+        pubsub.topic_remove(f'{topic}/settings/signals')
+        pubsub.topic_add(f'{topic}/settings/sources', Metadata('node', 'Sources', flags=['hide', 'ro', 'skip_undo']))
+        pubsub.topic_add(f'{topic}/settings/signals', Metadata('node', 'Signals', flags=['hide', 'ro', 'skip_undo']))
+        for index, (name, path) in enumerate(zip(capture_names(paths), paths)):
+            try:
+                if _jls_version_detect(path) != 2:
+                    raise ValueError('Only JLS v2 files support comparison')
+                capture = _Capture(index, name, path, self._tile_cache)
+            except Exception as ex:
+                pubsub.publish('registry/ui/actions/!error_msg', f'Could not load JLS file\n{path}\n{ex}')
+                continue
+            if capture.utc_start is not None:
+                self._captures[name] = capture
+            else:
+                capture.close()
+        self._align(offsets)
+        for idx, capture in enumerate(self._captures.values()):
+            self._topics_add(idx + 1, capture)
+        self._thread = threading.Thread(target=self.run)
+        self._thread.start()
+
+    def _align(self, offsets):
+        captures = list(self._captures.values())
+        if not len(captures):
+            return
+        origin = captures[0].utc_start
+        for capture in captures:
+            capture.offset = origin - capture.utc_start
+            idx = capture.index
+            if offsets is not None and idx < len(offsets) and offsets[idx]:
+                capture.offset += int(offsets[idx])
+
+    def _topics_add(self, source_id, capture):
+        pubsub, topic = self.pubsub, get_topic_name(self)
+        info = {
+            'source': str(source_id),
+            'name': capture.name,
+            'path': capture.path,
+        }
+        pubsub.topic_add(f'{topic}/settings/sources/{source_id}/name',
+                         Metadata('str', 'Source name', default=capture.name))
+        pubsub.topic_add(f'{topic}/settings/sources/{source_id}/info',
+                         Metadata('obj', 'Source metadata', default=info,
+                                  flags=['hide', 'ro', 'skip_undo']))
+        for quantity, signal_name in capture.signals.items():
+            signal_topic = f'{topic}/settings/signals/{capture.name}.{quantity}'
+            meta = copy.deepcopy(capture.topic(signal_name, 'meta'))
+            range_meta = copy.deepcopy(capture.topic(signal_name, 'range'))
+            range_meta['utc'] = [t + capture.offset for t in range_meta['utc']]
+            pubsub.topic_add(f'{signal_topic}/name',
+                             Metadata('str', 'Signal name', default=capture.topic(signal_name, 'name')))
+            pubsub.topic_add(f'{signal_topic}/meta',
+                             Metadata('obj', 'Signal metadata', default=meta,
+                                      flags=['hide', 'ro', 'skip_undo']))
+            pubsub.topic_add(f'{signal_topic}/range',
+                             Metadata('obj', 'Signal range', default=range_meta,
+                                      flags=['hide', 'ro', 'skip_undo']))
+
+    def on_pubsub_unregister(self):
+        self.close()
+
+    def run(self):
+        do_quit = False
+        requests = _Dedup()
+        while not do_quit:
+            timeout = 0.0 if len(requests) else 2.0
+            try:
+                cmd, value = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                if len(requests):
+                    value = requests.pop()
+                    try:
+                        if 'requests' in value:
+                            rsp = self._process_batch(value)
+                        else:
+                            rsp = self.process(value)
+                        self.pubsub.publish(value['rsp_topic'], rsp)
+                    except Exception:
+                        _log.exception('During jls comparison process')
+                continue
+            if cmd == 'request':
+                key = (value['rsp_topic'], value['rsp_id'])
+                requests.insert(key, value)
+            elif cmd == 'request_batch':
+                key = (value['rsp_topic'], value.get('rsp_id'), 'batch')
+                requests.insert(key, _batch_merge(requests.get(key), value))
+            elif cmd == 'close':
+                do_quit = True
+            else:
+                _log.warning('unsupported command %s', cmd)
+
+    def process(self, req):
+        """Handle a buffer request for one capture.
+
+        :param req: The buffer request structure.
+            See joulescope_ui.capabilities SIGNAL_BUFFER_SOURCE
+        :return: The response with the time shifted to the common origin,
+            or None if the request is outside the capture.
+        """
+        capture_name, quantity = req['signal_id'].split('.')[-2:]
+        capture = self._captures[capture_name]
+        signal_name = capture.signals[quantity]
+        signal = capture.reader.signals[signal_name]
+        req = dict(req)
+        req['signal_id'] = signal_name
+        if req['time_type'] == 'utc':
+            tmap = signal['tmap']
+            req['time_type'] = 'samples'
+            req['start'] = tmap.timestamp_to_sample_id(req['start'] - capture.offset)
+            if req.get('end'):
+                req['end'] = tmap.timestamp_to_sample_id(req['end'] - capture.offset)
+        start, end, length = req['start'], req.get('end', 0), req.get('length', 0)
+        last = signal['length'] - 1
+        if start > last or (end and end < 0):
+            return None
+        if not end:
+            req['length'] = min(length, last + 1 - start)
+        elif not length or length > (end - start + 1) // 2:
+            # samples response: clip to the capture.  Summary responses
+            # are not clipped so that the increment, and the cached
+            # tiles, remain stable as the capture end scrolls into view.
+            req['start'], req['end'] = max(0, start), min(end, last)
+        rsp = capture.reader.process(req)
+        if rsp is None:
+            return None
+        info = rsp['info']
+        info['time_range_utc']['start'] += capture.offset
+        info['time_range_utc']['end'] += capture.offset
+        info['time_map']['offset_time'] += capture.offset
+        info['tmap'] = _ShiftedTimeMap(info['tmap'], capture.offset)
+        return rsp
+
+    def _process_batch(self, value):
+        responses = []
+        for req in value['requests']:
+            try:
+                rsp = self.process(req)
+            except Exception:
+                _log.exception('During jls comparison batch process')
+                rsp = None
+            responses.append(rsp)
+        return {
+            'version': 1,
+            'rsp_id': value.get('rsp_id'),
+            'responses': responses,
+        }
+
+    def close(self):
+        _log.info('close %s', getattr(self, 'unique_id', None))
+        captures, self._captures = self._captures, {}
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(['close', None])
+            thread.join()
+        for capture in captures.values():
+            capture.close()
+        self._tile_cache.clear()
+
+    def on_action_close(self):
+        self.close()
+        self.pubsub.unregister(self, delete=True)
+
+    def on_action_request(self, value):
+        self._queue.put(['request', value])
+
+    def on_action_request_batch(self, value):
+        self._queue.put(['request_batch', value])
+
+    def on_action_annotations_request(self, value):
+        # Capture annotations use each capture's own time base, so only
+        # provide the plot configuration covering all captures.
+        plots = {}
+        for capture in self._captures.values():
+            m = capture.reader.metadata()
+            if m is None:
+                continue
+            for plot, plot_value in m['plots'].items():
+                if plot_value['enabled'] or plot not in plots:
+                    plots[plot] = plot_value
+        if len(plots):
+            a = {
+                'annotation_type': 'user_data',
+                'chunk_meta': ChunkMeta.UI_WAVEFORM,
+                'value': {
+                    'id': 'joulescope.ui.waveform_widget',
+                    'version': '1.0',
+                    'plots': plots,
+                },
+            }
+            self.pubsub.publish(value['rsp_topic'], [a])
+
+    @staticmethod
+    def on_cls_action_open(pubsub, topic, value):
+        """Open a comparison of multiple JLS files.
+
+        :param value: The list of JLS file paths.
+        """
+        paths = [p for p in value if os.path.isfile(p)]
+        if len(paths) != len(value):
+            _log.warning('open: files not found in %s', value)
+        if not len(paths):
+            return
+        _log.info('open %s', paths)
+        pubsub.register(JlsComparisonSource(paths))
+
+    @staticmethod
+    def on_cls_action_finalize(pubsub, topic, value):
+        instances = pubsub.query(f'{get_topic_name(JlsComparisonSource)}/instances')
+        for instance_unique_id in list(instances):
+            instance = get_instance(instance_unique_id, default=None)
+            if instance is not None:
+                instance.close()
@@ -66,6 +66,9 @@ class _Dedup:
     def __len__(self):
         return len(self._order)
 
+    def get(self, key, default=None):
+        return self._dict.get(key, default)
+
     def insert(self, key, value):
         if key not in self._dict:
             self._order.append(key)
@@ -76,6 +79,23 @@ class _Dedup:
         return self._dict.pop(key)
 
 
+def _batch_merge(pending, value):
+    """Merge a newer batch request into a pending batch request.
+
+    :param pending: The pending batch request, which may be None.
+    :param value: The newer batch request.
+    :return: The merged batch request.  Requests in value replace
+        pending requests with the same rsp_id.
+    """
+    if pending is None:
+        return value
+    rsp_ids = set([r.get('rsp_id') for r in value['requests']])
+    requests = [r for r in pending['requests'] if r.get('rsp_id') not in rsp_ids]
+    value = dict(value)
+    value['requests'] = requests + list(value['requests'])
+    return value
+
+
 def jls_path_normalize(path):
     """Normalize a JLS path to match the JlsSource settings/path value.
 
@@ -166,7 +186,10 @@ class JlsSource:
                 if len(requests):
                     value = requests.pop()
                     try:
-                        rsp = self._jls.process(value)
+                        if 'requests' in value:
+                            rsp = self._process_batch(value)
+                        else:
+                            rsp = self._jls.process(value)
                         self.pubsub.publish(value['rsp_topic'], rsp)
                     except Exception:
                         _log.exception('During jls process')
@@ -174,11 +197,29 @@ class JlsSource:
             if cmd == 'request':
                 key = (value['rsp_topic'], value['rsp_id'])
                 requests.insert(key, value)
+            elif cmd == 'request_batch':
+                key = (value['rsp_topic'], value.get('rsp_id'), 'batch')
+                requests.insert(key, _batch_merge(requests.get(key), value))
             elif cmd == 'close':
                 do_quit = True
             else:
                 _log.warning('unsupported command %s', cmd)
 
+    def _process_batch(self, value):
+        responses = []
+        for req in value['requests']:
+            try:
+                rsp = self._jls.process(req)
+            except Exception:
+                _log.exception('During jls batch process')
+                rsp = None
+            responses.append(rsp)
+        return {
+            'version': 1,
+            'rsp_id': value.get('rsp_id'),
+            'responses': responses,
+        }
+
     def close(self):
         _log.info('close %s', self.path)
         jls, self._jls, thread, self._thread = self._jls, None, self._thread, None
@@ -196,6 +237,9 @@ class JlsSource:
     def on_action_request(self, value):
         self._queue.put(['request', value])
 
+    def on_action_request_batch(self, value):
+        self._queue.put(['request_batch', value])
+
     def on_action_annotations_request(self, value):
         rsp_topic = value['rsp_topic']
         if self._jls is not None:
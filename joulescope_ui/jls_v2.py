@@ -19,6 +19,7 @@ The JLS v2 reader and common definitions for JLS v2 file format use.
 
 
 from joulescope_ui import Metadata
+from joulescope_ui.summary_cache import SummaryCache
 import logging
 from pyjls import Reader, SignalType, data_type_as_str, DataType, TimeMap, time64
 import copy
@@ -67,13 +68,19 @@ _init()
 
 class JlsV2:
 
-    def __init__(self, path, pubsub, topic):
+    def __init__(self, path, pubsub, topic, tile_cache=None):
         self._log = logging.getLogger(__name__ + '.jls_v2')
         self._path = path
         self._jls = None
         self._signals = {}
+        self._tile_cache = tile_cache  # optional, shared tile_cache.TileCache
         self.open(pubsub, topic)
 
+    @property
+    def signals(self):
+        """The signal information dict, signal_name -> dict.  Do not modify."""
+        return self._signals
+
     def open(self, pubsub, topic):
         if self._jls is not None:
             self.close()
@@ -146,6 +153,7 @@ class JlsV2:
                 'data_type': data_type_as_str(signal.data_type),
                 'length': signal.length,
                 'tmap': TimeMap(jls, signal_id),
+                'summary_cache': None,
                 'sample_rate': {
                     'in_nominal': fs_in_nominal,
                     'in_estimated': fs_estimated * decimate_factor,
@@ -171,6 +179,21 @@ class JlsV2:
                 m['plots'][signal_name] = {'enabled': True}
         return m
 
+    def _summary_cache(self, signal):
+        cache = signal['summary_cache']
+        if cache is None:
+            signal_id = signal['signal_id']
+            jls_signal = self._jls.signals[signal_id]
+            decimate = max(1, int(jls_signal.sample_decimate_factor))
+            block_size = decimate * max(1, 65536 // decimate)
+            cache = SummaryCache(
+                signal['length'],
+                lambda start, increment, length: self._jls.fsr_statistics(signal_id, start, increment, length),
+                lambda start, length: self._jls.fsr(signal_id, start, length),
+                block_size=block_size)
+            signal['summary_cache'] = cache
+        return cache
+
     def process(self, req):
         """Handle a buffer request.
 
@@ -213,8 +236,20 @@ class JlsV2:
             # round increment down
             increment = interval // length
             length = interval // increment
-            # self._log.info('fsr_statistics(%d, %d, %d, %d)', signal_id, start, increment, length)
-            data = self._jls.fsr_statistics(signal_id, start, increment, length)
+            if length == 1 and data_type == 'f32':
+                # dual marker statistics: use cached blocks with exact edges
+                cache = self._summary_cache(signal)
+                data = cache.statistics(start, start + increment - 1, req.get('rsp_id'))
+            elif self._tile_cache is not None and start >= 0:
+                # align to the tile grid so that panning reuses cached tiles
+                start -= start % increment
+                data = self._tile_cache.get(
+                    (self._path, signal_id), start, increment, length,
+                    lambda s0, incr, n: self._jls.fsr_statistics(signal_id, s0, incr, n),
+                    signal['length'])
+            else:
+                # self._log.info('fsr_statistics(%d, %d, %d, %d)', signal_id, start, increment, length)
+                data = self._jls.fsr_statistics(signal_id, start, increment, length)
             response_type = 'summary'
             data_type = 'f32'
         else:
@@ -268,4 +303,7 @@ class JlsV2:
         jls, self._jls = self._jls, None
         if jls is not None:
             jls.close()
+        if self._tile_cache is not None:
+            for signal in self._signals.values():
+                self._tile_cache.clear((self._path, signal['signal_id']))
 
@@ -40,13 +40,18 @@ from .error_window import ErrorWindow
 from .help_ui import HelpHtmlMessageBox
 from joulescope_ui.widgets.report_issue import ReportIssueDialog
 from joulescope_ui.disk_monitor import DiskMonitor
+from joulescope_ui.batch_runner import BatchRunner
+from joulescope_ui.statistics_history import StatisticsHistory
 from joulescope_ui.error_dialog import ErrorMessageBox
 from joulescope_ui.locale_dialog import LocaleDialog
 from .exporter import ExporterDialog   # register the exporter
 from .jls_source import JlsSource, jls_path_normalize      # register the source
+from .jls_comparison_source import JlsComparisonSource    # register the source
+from .range_tool import process_executor_shutdown
 from .resources import load_resources, load_fonts
 from joulescope_ui.devices.jsdrv.jsdrv_wrapper import JsdrvWrapper
 from joulescope_ui.devices.serial import ExternalSerialManager
+from joulescope_ui.devices.sim import SimDeviceManager, SIM_STREAM_BUFFER
 from joulescope_ui.windows import run_w32time_high_accuracy
 from .styles import StyleManager
 from .app import App
@@ -236,7 +241,7 @@ def _menu_setup(parent, d):
     return k
 
 
-def _device_factory_add():
+def _device_factory_add(sim=None):
     # pubsub_singleton.register(DevSignalBufferSource())
     jsdrv = JsdrvWrapper()
     pubsub_singleton.register(jsdrv, 'jsdrv')
@@ -247,6 +252,10 @@ def _device_factory_add():
     ext_serial = ExternalSerialManager()
     pubsub_singleton.register(ext_serial, 'ext_serial')
     pubsub_singleton.process()
+    if sim is not None and sim.get('count', 0) > 0:
+        sim_manager = SimDeviceManager(sim['count'], sim.get('path'))
+        pubsub_singleton.register(sim_manager, 'sim')
+        pubsub_singleton.process()
 
 
 def _device_factory_finalize():
@@ -285,7 +294,7 @@ class MainWindow(QtWidgets.QMainWindow):
         'blink_fast': Metadata('bool', 'Periodic fast blink signal (2 Hz).', flags=['ro', 'skip_undo']),
     }
 
-    def __init__(self, filename=None, is_config_load=False):
+    def __init__(self, filename=None, is_config_load=False, sim=None):
         self._log = logging.getLogger(__name__)
         self._filename = filename
         self._resync_event = None
@@ -390,10 +399,12 @@ class MainWindow(QtWidgets.QMainWindow):
             self._center(resize=True)
 
         else:
-            _device_factory_add()
+            _device_factory_add(sim)
             # open JLS sources
             for source_unique_id in self.pubsub.query('registry/JlsSource/instances', default=[]):
                 self.pubsub.register(JlsSource(), source_unique_id)
+            for source_unique_id in self.pubsub.query('registry/JlsComparisonSource/instances', default=[]):
+                self.pubsub.register(JlsComparisonSource(), source_unique_id)
 
             if not is_config_load:
                 self.pubsub.publish('registry/view/actions/!add', 'view:multimeter')
@@ -452,6 +463,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 ['file_menu', N_('File'), [
                     ['open', N_('Open'), ['registry/ui/actions/!file_open_request', '']],
                     ['open_recent_menu', N_('Open recent'), []],  # dynamically populated from MRU
+                    ['compare', N_('Compare'), ['registry/ui/actions/!file_compare_request', '']],
                     ['config_menu', N_('Config'), [
                         ['export', N_('Export'), ['registry/ui/actions/!config_export_request', '']],
                         ['import_restart', N_('Import and restart'), ['registry/ui/actions/!config_import_request', 'restart']],
@@ -493,6 +505,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 self._center(resize=False)
             else:
                 self.pubsub.publish('registry/view/settings/active', view_active)
+            if sim is not None and sim.get('count', 0) > 0:
+                self._sim_waveform_open()
         else:
             self._menu_bar = QtWidgets.QMenuBar(self)
             self._menu_items = _menu_setup(self._menu_bar, [
@@ -551,6 +565,10 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.pubsub.register(DiskMonitor)
         self.pubsub.register(DiskMonitor(), 'DiskMonitor:0')
+        self.pubsub.register(BatchRunner)
+        self.pubsub.register(BatchRunner(), 'batch_runner')
+        self.pubsub.register(StatisticsHistory)
+        self.pubsub.register(StatisticsHistory(), 'statistics_history')
 
         self._blink_timer = QtCore.QTimer(self)
         self._blink_timer.timeout.connect(self._on_blink_timer)
@@ -716,6 +734,22 @@ class MainWindow(QtWidgets.QMainWindow):
                     except KeyError:
                         pass
 
+    def _sim_waveform_open(self):
+        """Show the simulated device stream buffer in the oscilloscope view."""
+        for unique_id in self.pubsub.query('registry/WaveformWidget/instances', default=[]):
+            topic = f'{get_topic_name(unique_id)}/settings/source_filter'
+            if self.pubsub.query(topic, default=None) == SIM_STREAM_BUFFER:
+                return  # restored from the configuration
+        view_active = self.pubsub.query('registry/view/settings/active')
+        if 'view:oscilloscope' in self.pubsub.query('registry/view/instances', default=[]):
+            self.pubsub.publish('registry/view/settings/active', 'view:oscilloscope')
+        self.pubsub.publish('registry/view/actions/!widget_open', {
+            'value': 'WaveformWidget',
+            'kwargs': {'source_filter': SIM_STREAM_BUFFER},
+            'settings': {'name': N_('Simulated waveform')},
+        })
+        self.pubsub.publish('registry/view/settings/active', view_active)
+
     def _center(self, resize=None):
         screen = self.screen()
         sz = screen.size()
@@ -873,6 +907,53 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             self._log.info('file_open cancelled')
 
+    def on_action_file_compare_request(self):
+        """Request file comparison; prompt user to select the files."""
+        self._log.info('file_compare_request')
+        path = self.pubsub.query('registry/paths/settings/path')
+        self._dialog = QtWidgets.QFileDialog(self, N_('Select files to compare'), path)
+        self._dialog.setNameFilter('Joulescope Data (*.jls)')
+        self._dialog.setFileMode(QtWidgets.QFileDialog.ExistingFiles)
+        self._dialog.updateGeometry()
+        self._dialog.open()
+        self._dialog.finished.connect(self._on_file_compare_request_dialog_finished)
+
+    def _on_file_compare_request_dialog_finished(self, result):
+        if result == QtWidgets.QDialog.DialogCode.Accepted:
+            files = self._dialog.selectedFiles()
+            if files and len(files) >= 2:
+                self.pubsub.publish(f'{get_topic_name(self)}/actions/!file_compare', files, defer=True)
+            else:
+                self._log.info('file_compare invalid files: %s', files)
+        else:
+            self._log.info('file_compare cancelled')
+
+    def on_action_file_compare(self, paths):
+        """Overlay the specified files in a single waveform.
+
+        :param paths: The list of JLS file paths.
+        """
+        self._log.info('file_compare %s', paths)
+        topic = f'registry_manager/capabilities/{CAPABILITIES.SIGNAL_BUFFER_SOURCE}/list'
+        sources_start = self.pubsub.query(topic)
+        self.pubsub.publish('registry/JlsComparisonSource/actions/!open', paths)
+        sources = [s for s in self.pubsub.query(topic) if s not in sources_start]
+        if not len(sources):
+            self._log.warning('file_compare: no source added')
+            self.on_action_status_msg('No sources found')
+            return
+        source = sources[-1]
+        self.pubsub.publish(
+            'registry/view/actions/!widget_open',
+            {
+                'value': 'WaveformWidget',
+                'kwargs': {
+                    'name': N_('Comparison'),
+                    'source_filter': source,
+                    'close_actions': [[f'{get_topic_name(source)}/actions/!close', None]],
+                 }
+            })
+
     def on_action_config_export_request(self, value):
         """Request configuration export; prompt user to select the destination file."""
         self._log.info('config_export_request')
@@ -1067,6 +1148,8 @@ class MainWindow(QtWidgets.QMainWindow):
         pubsub.publish('registry/app/settings/statistics_stream_record', False)
         pubsub.publish('registry/view/actions/!ui_disconnect', None)
         pubsub.publish('registry/JlsSource/actions/!finalize', None)
+        pubsub.publish('registry/JlsComparisonSource/actions/!finalize', None)
+        process_executor_shutdown()
         event.accept()
         self._log.info('closeEvent() done')
 
@@ -1172,7 +1255,7 @@ def _opengl_config(renderer):
         QtCore.QCoreApplication.setAttribute(renderer_qt)
 
 
-def run(log_level=None, file_log_level=None, filename=None, safe_mode=False, tcp_server=False):
+def run(log_level=None, file_log_level=None, filename=None, safe_mode=False, tcp_server=False, sim=None):
     """Run the Joulescope UI application.
 
     :param log_level: The logging level for the stdout console stream log.
@@ -1184,6 +1267,8 @@ def run(log_level=None, file_log_level=None, filename=None, safe_mode=False, tcp
     :param filename: The optional filename to display immediately.
     :param safe_mode: When True, start in safe mode.
     :param tcp_server: When True, enable the TCP server for remote access.
+    :param sim: The optional simulated device dict with keys count and
+        path.  See :class:`joulescope_ui.devices.sim.SimDeviceManager`.
 
     :return: 0 on success or error code on failure.
     """
@@ -1248,7 +1333,7 @@ def run(log_level=None, file_log_level=None, filename=None, safe_mode=False, tcp
                 fonts = load_fonts()
                 appnope.nope()
 
-                ui = MainWindow(filename=filename, is_config_load=is_config_load)
+                ui = MainWindow(filename=filename, is_config_load=is_config_load, sim=sim)
                 pubsub_singleton.notify_fn = ui.resync_request
                 ui.show()
 
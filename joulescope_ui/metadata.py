@@ -13,7 +13,6 @@
 # limitations under the License.
 
 
-from PySide6 import QtGui
 import collections.abc
 import json
 
@@ -57,6 +56,7 @@ def _validate_font(x):
 
 
 def _validate_color(x):
+    from PySide6 import QtGui  # lazy, keep Qt out of worker processes
     c = None
     if isinstance(x, str):
         c = QtGui.QColor(x)
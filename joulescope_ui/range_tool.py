@@ -14,7 +14,13 @@
 
 import numpy as np
 from joulescope_ui import get_topic_name, time64
+from joulescope_ui.result_cache import result_cache, result_key, source_identity, DISK_SETTING
+from joulescope_ui.range_tool_kernels import kernel_map_shm
+from collections import deque
 import logging
+import multiprocessing
+from multiprocessing import shared_memory
+import os
 import queue
 import threading
 import time
@@ -22,7 +28,11 @@ import time
 
 _PUSH_TIMEOUT_DEFAULT = 0.5  # should never happen
 _TIMEOUT_DEFAULT = 5.0
+_CHUNK_DEFAULT = 100_000
 _PROGRESS_TOPIC = 'registry/progress/actions/!update'
+_PROCESS_SETTING = 'registry/app/settings/range_tool_process'
+_process_executor = None
+_process_lock = threading.Lock()
 
 
 def rsp_as_f32(rsp):
@@ -52,6 +62,112 @@ def rsp_as_f32(rsp):
     return y
 
 
+def _process_workers():
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def process_executor():
+    """Get the shared process pool for range tool kernels.
+
+    :return: The concurrent.futures.ProcessPoolExecutor, created on first use.
+    """
+    global _process_executor
+    with _process_lock:
+        if _process_executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            ctx = multiprocessing.get_context('spawn')
+            _process_executor = ProcessPoolExecutor(max_workers=_process_workers(), mp_context=ctx)
+        return _process_executor
+
+
+def process_executor_shutdown():
+    """Shut down the shared process pool, if started."""
+    global _process_executor
+    with _process_lock:
+        executor, _process_executor = _process_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _SharedSlots:
+    """Reusable shared memory blocks for worker process chunks."""
+
+    def __init__(self):
+        self._free = []
+        self._all = []
+
+    def acquire(self, nbytes):
+        for idx, shm in enumerate(self._free):
+            if shm.size >= nbytes:
+                return self._free.pop(idx)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+        self._all.append(shm)
+        return shm
+
+    def release(self, shm):
+        self._free.append(shm)
+
+    def close(self):
+        for shm in self._all:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._free.clear()
+        self._all.clear()
+
+
+def kernel_run(kernel, chunks, executor=None, inflight=2, abort_fn=None):
+    """Run a kernel over chunks.
+
+    :param kernel: The kernel.  See joulescope_ui.range_tool_kernels.
+    :param chunks: The iterable of (sample_id, data), such as from
+        :meth:`RangeTool.iter_chunks`.
+    :param executor: The process pool executor.  None runs the kernel
+        on the calling thread.
+    :param inflight: The maximum number of chunks submitted to the executor.
+    :param abort_fn: The optional callable that returns True to abort.
+    :return: The kernel result, or None if aborted.
+
+    With an executor, each chunk is copied once into shared memory, and
+    the workers map it without further copies.  The calling thread only
+    copies and reduces, so it holds the GIL for very little time.
+    """
+    abort_fn = (lambda: False) if abort_fn is None else abort_fn
+    partial = None
+
+    def reduce(p):
+        return p if partial is None else kernel.reduce(partial, p)
+
+    if executor is None:
+        for sample_id, data in chunks:
+            partial = reduce(kernel.map(sample_id, data))
+        return None if abort_fn() else kernel.finalize(partial)
+
+    slots = _SharedSlots()
+    futures = deque()
+    try:
+        for sample_id, data in chunks:
+            while len(futures) >= max(1, inflight):
+                future, shm = futures.popleft()
+                partial = reduce(future.result())
+                slots.release(shm)
+            n = len(data)
+            shm = slots.acquire(n * 4)
+            np.ndarray((n, ), dtype=np.float32, buffer=shm.buf)[:] = data
+            futures.append((executor.submit(kernel_map_shm, kernel, shm.name, n, sample_id), shm))
+        while len(futures) and not abort_fn():
+            future, shm = futures.popleft()
+            partial = reduce(future.result())
+            slots.release(shm)
+    finally:
+        for future, _ in futures:
+            future.cancel()
+        slots.close()
+    return None if abort_fn() else kernel.finalize(partial)
+
+
 class RangeTool:
     """Provides common range tool behaviors.
 
@@ -78,6 +194,7 @@ class RangeTool:
         self.rsp_topic = None
         self._rsp_id = 1
         self._queue = queue.Queue()
+        self._pending = {}  # rsp_id -> response, shared by concurrent iter_chunks
 
     def push(self, value):
         """Push a response onto the queue for processing.
@@ -199,6 +316,104 @@ class RangeTool:
                 rsp_total['data'] = np.concatenate(rsp_total['data'])
                 return rsp_total
 
+    def sample_range(self, signal_id, x_range, time_type='utc', timeout=None):
+        """Get the sample range for a signal.
+
+        :param signal_id: The signal_id string as '{source}.{device}.{quantity}'
+        :param x_range: The [start, end] range, inclusive.
+        :param time_type: The x_range time type, utc or samples.
+        :param timeout: The timeout in float seconds.  None uses the default.
+        :return: The sample range [start, end] with end exclusive.
+        """
+        if time_type == 'samples':
+            return int(x_range[0]), int(x_range[1]) + 1
+        rsp = self.request(signal_id, 'utc', *x_range, 1, timeout=timeout)
+        r = rsp['info']['time_range_samples']
+        return r['start'], r['end'] + 1
+
+    def _wait(self, rsp_id, pending, timeout):
+        if timeout is None:
+            timeout = _TIMEOUT_DEFAULT
+        t_end = time.time() + timeout
+        while rsp_id not in pending:
+            try:
+                rsp = self.pop(timeout=max(0.0, t_end - time.time()))
+            except queue.Empty:
+                raise TimeoutError(f'request timed out for rsp_id {rsp_id}')
+            pending[rsp.get('rsp_id')] = rsp
+        return pending.pop(rsp_id)
+
+    def iter_chunks(self, signal_id, x_range, chunk=None, overlap=0, prefetch=2,
+                    time_type='utc', as_f32=True, progress_fn=None, timeout=None):
+        """Iterate over the samples in a range.
+
+        :param signal_id: The signal_id string as '{source}.{device}.{quantity}'
+        :param x_range: The [start, end] range, inclusive.
+        :param chunk: The number of new samples per chunk.  None uses the default.
+        :param overlap: The number of samples from the end of the previous
+            chunk to repeat at the start of each chunk.  Requires as_f32.
+        :param prefetch: The number of requests to keep in flight, which
+            overlaps the source reading with the caller's processing.
+        :param time_type: The x_range time type, utc or samples.
+        :param as_f32: True to convert the data using :func:`rsp_as_f32`.
+            False to provide the data in the source's data_type.
+        :param progress_fn: The optional callable(fraction) called after
+            each chunk is processed.
+        :param timeout: The timeout in float seconds for each response.
+            None uses the default.
+        :return: The generator that yields (sample_id, data) where
+            sample_id is the sample id of data[0].
+
+        Multiple generators may be interleaved on the same thread,
+        such as to zip the chunks of two signals.
+        """
+        chunk = _CHUNK_DEFAULT if chunk is None else int(chunk)
+        overlap = int(overlap)
+        if chunk <= 0 or overlap < 0:
+            raise ValueError(f'invalid chunk {chunk} or overlap {overlap}')
+        if overlap and not as_f32:
+            raise ValueError('overlap requires as_f32')
+        s_start, s_end = self.sample_range(signal_id, x_range, time_type, timeout)
+        total = max(1, s_end - s_start)
+        s_next = s_start
+        inflight = deque()
+        pending = self._pending
+        tail = None
+        while len(inflight) or s_next < s_end:
+            if self.abort:
+                return
+            while len(inflight) < max(1, prefetch) and s_next < s_end:
+                length = min(chunk, s_end - s_next)
+                rsp_id = self.request(signal_id, 'samples', s_next, 0, length, timeout=0)
+                inflight.append((rsp_id, s_next, length))
+                s_next += length
+            rsp_id, start, length = inflight.popleft()
+            rsp = self._wait(rsp_id, pending, timeout)
+            sample_id = rsp['info']['time_range_samples']['start']
+            if sample_id != start:
+                self._log.warning('sample_id mismatch: %d != %d', sample_id, start)
+            data = rsp_as_f32(rsp) if as_f32 else rsp['data']
+            received = rsp['info']['time_range_samples']['length']
+            while 0 < received < length:
+                # partial response: fetch the remainder
+                rsp_id = self.request(signal_id, 'samples', start + received, 0, length - received, timeout=0)
+                rsp = self._wait(rsp_id, pending, timeout)
+                n = rsp['info']['time_range_samples']['length']
+                if n <= 0:
+                    self._log.warning('request %s: data ends at %d before requested end',
+                                      signal_id, start + received - 1)
+                    break
+                data = np.concatenate((data, rsp_as_f32(rsp) if as_f32 else rsp['data']))
+                received += n
+            if overlap:
+                if tail is not None:
+                    sample_id -= len(tail)
+                    data = np.concatenate((tail, data))
+                tail = data[-overlap:]
+            yield sample_id, data
+            if progress_fn is not None:
+                progress_fn((start + length - s_start) / total)
+
     def progress_start(self, progress_id, name, cancel_topic=None, brief=None, description=None):
         """Start tracking progress.
 
@@ -330,6 +545,88 @@ class RangeToolBase:
         if self._rt is not None:
             self._rt.error(msg)
 
+    def iter_chunks(self, signal, x_range=None, chunk=None, overlap=0, prefetch=2,
+                    time_type='utc', as_f32=True, progress=(0.0, 1.0), timeout=None):
+        """Iterate over the samples in a range.
+
+        :param signal: The signal_id string as '{source}.{device}.{quantity}'
+        :param x_range: The [start, end] range, inclusive.  None uses self.x_range.
+        :param progress: The (start, end) progress fraction to report
+            while iterating, or None to not report progress.
+        :return: The generator that yields (sample_id, data).
+
+        See :meth:`RangeTool.iter_chunks` for the other parameters.
+        """
+        if self._rt is None:
+            raise RuntimeError('iter_chunks but closed')
+        x_range = self.x_range if x_range is None else x_range
+        progress_fn = None
+        if progress is not None:
+            p0, p1 = progress
+            progress_fn = lambda f: self.progress(p0 + f * (p1 - p0))
+        return self._rt.iter_chunks(signal, x_range, chunk=chunk, overlap=overlap, prefetch=prefetch,
+                                    time_type=time_type, as_f32=as_f32, progress_fn=progress_fn,
+                                    timeout=timeout)
+
+    def run_kernel(self, kernel, signal, x_range=None, chunk=None, prefetch=2,
+                   time_type='utc', progress=(0.0, 1.0), process=None):
+        """Run a numeric kernel over the samples in a range.
+
+        :param kernel: The kernel.  See joulescope_ui.range_tool_kernels.
+        :param signal: The signal_id string as '{source}.{device}.{quantity}'
+        :param process: True to run the kernel in worker processes,
+            False to run on this thread.  None uses the
+            registry/app/settings/range_tool_process setting.
+        :return: The kernel result, or None if aborted.
+
+        See :meth:`iter_chunks` for the other parameters.
+        """
+        if process is None:
+            process = bool(self.pubsub.query(_PROCESS_SETTING, default=False))
+        executor = process_executor() if process else None
+        chunks = self.iter_chunks(signal, x_range, chunk=chunk, overlap=kernel.overlap, prefetch=prefetch,
+                                  time_type=time_type, progress=progress)
+        return kernel_run(kernel, chunks, executor, inflight=2 * _process_workers(),
+                          abort_fn=lambda: self.abort)
+
+    def _cache_address(self, tool, signal, sample_range, params):
+        source = '.'.join(signal.split('.')[:-2])
+        identity, path = source_identity(self.pubsub, source)
+        if identity is None:
+            return None, None
+        if not self.pubsub.query(DISK_SETTING, default=False):
+            path = None
+        return result_key(identity, signal, sample_range, tool, params), path
+
+    def cache_get(self, tool, signal, sample_range, params):
+        """Get a cached result.
+
+        :param tool: The name of the computation.
+        :param signal: The signal_id string as '{source}.{device}.{quantity}'
+        :param sample_range: The [start, end] sample range, inclusive.
+        :param params: The JSON-serializable dict of parameters that
+            affect the result.
+        :return: The cached result or None.
+
+        See joulescope_ui.result_cache.
+        """
+        key, path = self._cache_address(tool, signal, sample_range, params)
+        if key is None:
+            return None
+        return result_cache().get(key, path)
+
+    def cache_put(self, tool, signal, sample_range, params, value):
+        """Store a result for :meth:`cache_get`.
+
+        :param value: The result containing numpy arrays and
+            JSON-serializable values.  The arrays become read-only.
+
+        See :meth:`cache_get` for the other parameters.
+        """
+        key, path = self._cache_address(tool, signal, sample_range, params)
+        if key is not None:
+            result_cache().put(key, value, path)
+
     def __run_outer(self):
         for cbk in self.range_tool_kwargs.get('start_callbacks', []):
             self.pubsub.publish(cbk, self.value)
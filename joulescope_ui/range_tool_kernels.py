@@ -0,0 +1,612 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Numeric kernels for range tools.
+
+A kernel processes a range in chunks using map and reduce so that
+:meth:`joulescope_ui.range_tool.RangeToolBase.run_kernel` can run it
+either on the range tool thread or in worker processes.  A kernel
+must be picklable and provide:
+
+* overlap: The number of samples from the previous chunk to repeat
+  at the start of each chunk.
+* map(sample_id, data): Process one chunk and return a picklable partial
+  result.  data may reference shared memory, so never retain or
+  return views into data.
+* reduce(a, b): Combine two partial results in range order.
+* finalize(partial): Convert the combined partial result to the result.
+
+This module must not import Qt, since worker processes import it.
+"""
+
+from multiprocessing import shared_memory
+import numpy as np
+
+
+def kernel_map_shm(kernel, name, length, sample_id):
+    """Run kernel.map in a worker process on a shared memory chunk.
+
+    :param kernel: The kernel instance.
+    :param name: The shared memory block name.
+    :param length: The number of float32 samples in the block.
+    :param sample_id: The sample id for the first sample.
+    :return: The partial result from kernel.map.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = np.ndarray((length, ), dtype=np.float32, buffer=shm.buf)
+        rv = kernel.map(sample_id, data)
+        del data
+        return rv
+    finally:
+        shm.close()
+
+
+def _select(sums, offset, width, count, find_min):
+    """Greedily select the best non-overlapping windows.
+
+    :param sums: The np.ndarray of window sums.  Non-finite entries are ignored.
+    :param offset: The sample index of sums[0].
+    :param width: The window width in samples.
+    :param count: The maximum number of windows to select.
+    :param find_min: True to select the smallest sums, False for the largest.
+    :return: The list of (sum, index) tuples, best first.
+    """
+    v = -sums if find_min else sums
+    v = np.where(np.isfinite(v), v, -np.inf)
+    result = []
+    for _ in range(count):
+        idx = int(np.argmax(v))
+        if v[idx] == -np.inf:
+            break
+        result.append((float(sums[idx]), offset + idx))
+        v[max(0, idx - width + 1):idx + width] = -np.inf  # exclude overlapping windows
+    return result
+
+
+def _merge(a, b, width, count, find_min):
+    """Merge two selections, keeping the best non-overlapping windows."""
+    items = sorted(a + b, key=lambda x: x[0], reverse=not find_min)
+    result = []
+    for v, idx in items:
+        if len(result) >= count:
+            break
+        if all(abs(idx - k) >= width for _, k in result):
+            result.append((v, idx))
+    return result
+
+
+class WindowSearch:
+    """Streaming search for the windows with the largest and smallest sums.
+
+    :param width: The window width in samples.
+    :param count: The number of non-overlapping windows to report.
+    :param find_min: True to also search for the smallest windows.
+    :param offset: The sample index of the first sample.
+
+    Call :meth:`add` with consecutive chunks of samples.  Each chunk
+    computes all window sums using one cumulative sum, carrying the
+    last width - 1 samples to the next chunk, so memory is bounded by
+    the chunk size plus the window width regardless of the total length.
+    With count 1, the result is exact.  With larger counts, windows are
+    selected greedily per chunk and then merged.
+    """
+
+    def __init__(self, width, count=1, find_min=False, offset=0):
+        self.width = int(width)
+        if self.width < 1:
+            raise ValueError(f'invalid width {width}')
+        self.count = max(1, int(count))
+        self.find_min = bool(find_min)
+        self._carry = np.empty(0, dtype=np.float64)
+        self._offset = int(offset)  # sample index of self._carry[0]
+        self.max = []  # list of (sum, index), best first
+        self.min = []
+
+    def add(self, data):
+        """Add the next chunk of samples.
+
+        :param data: The np.ndarray of samples.
+        """
+        x = np.concatenate((self._carry, np.asarray(data, dtype=np.float64)))
+        w = self.width
+        if len(x) >= w:
+            finite = np.isfinite(x)
+            c = np.empty(len(x) + 1, dtype=np.float64)
+            c[0] = 0.0
+            np.cumsum(np.where(finite, x, 0.0), out=c[1:])
+            n = np.empty(len(x) + 1, dtype=np.int64)
+            n[0] = 0
+            np.cumsum(~finite, out=n[1:])
+            sums = c[w:] - c[:-w]
+            sums[(n[w:] - n[:-w]) > 0] = np.nan  # windows with NaN samples
+            self.max = _merge(self.max, _select(sums, self._offset, w, self.count, False),
+                              w, self.count, False)
+            if self.find_min:
+                self.min = _merge(self.min, _select(sums, self._offset, w, self.count, True),
+                                  w, self.count, True)
+        keep = min(len(x), w - 1)
+        self._offset += len(x) - keep
+        self._carry = x[len(x) - keep:]
+
+
+class WindowKernel:
+    """Find the windows with the largest and smallest sums.
+
+    :param width: The window width in samples.
+    :param count: The number of non-overlapping windows to report.
+    :param find_min: True to also search for the smallest windows.
+
+    The result is (max, min) where each is the list of (sum, index) tuples.
+    """
+
+    def __init__(self, width, count=1, find_min=False):
+        self.width = int(width)
+        self.count = max(1, int(count))
+        self.find_min = bool(find_min)
+        self.overlap = self.width - 1
+
+    def map(self, sample_id, data):
+        search = WindowSearch(self.width, self.count, self.find_min, offset=sample_id)
+        search.add(data)
+        return search.max, search.min
+
+    def reduce(self, a, b):
+        w, n = self.width, self.count
+        return _merge(a[0], b[0], w, n, False), _merge(a[1], b[1], w, n, True)
+
+    def finalize(self, partial):
+        return ([], []) if partial is None else partial
+
+
+class HistogramKernel:
+    """Count the samples in each histogram bin.
+
+    :param bin_edges: The np.ndarray of bin edges.
+
+    The result is the np.ndarray of counts with length len(bin_edges) - 1.
+    """
+
+    overlap = 0
+
+    def __init__(self, bin_edges):
+        self.bin_edges = np.asarray(bin_edges, dtype=np.float64)
+
+    def map(self, sample_id, data):
+        return np.histogram(data, bins=self.bin_edges)[0]
+
+    def reduce(self, a, b):
+        return a + b
+
+    def finalize(self, partial):
+        if partial is None:
+            return np.zeros(len(self.bin_edges) - 1, dtype=np.int64)
+        return partial
+
+
+_FFT_BATCH_ELEMENTS = 1 << 22  # bounds the temporary segment matrix size
+
+
+def psd_segments(data, nfft, step, window, first=0):
+    """Compute the power of the windowed segments in a block of samples.
+
+    :param data: The np.ndarray of samples.
+    :param nfft: The segment length.
+    :param step: The number of samples between segment starts.
+    :param window: The np.ndarray window with length nfft.
+    :param first: The index into data of the first segment start.
+    :return: The np.ndarray with shape (segments, nfft // 2 + 1) containing
+        the unscaled power, |rfft(segment * window)|^2, for every segment
+        that fits completely in data.
+
+    The segments are strided views into data, so each batch of segments
+    is windowed and transformed with a single rfft call.
+    """
+    data = np.asarray(data)
+    n = len(data) - first
+    count = 0 if n < nfft else (n - nfft) // step + 1
+    y = np.empty((count, nfft // 2 + 1), dtype=np.float64)
+    if not count:
+        return y
+    segments = np.lib.stride_tricks.sliding_window_view(data[first:], nfft)[::step]
+    batch = max(1, _FFT_BATCH_ELEMENTS // nfft)
+    for k in range(0, count, batch):
+        z = np.fft.rfft(segments[k:k + batch] * window, axis=1)
+        y[k:k + batch] = z.real * z.real + z.imag * z.imag
+    return y
+
+
+class _SegmentKernel:
+    """Common segment alignment for the spectral kernels.
+
+    Segments start at start + k * step.  The overlap of nfft - 1 samples
+    ensures that each segment is contained by exactly one chunk: the chunk
+    that holds its last sample.
+    """
+
+    def __init__(self, nfft, step, window, start):
+        self.nfft = int(nfft)
+        self.step = int(step)
+        if self.nfft < 2 or self.step < 1:
+            raise ValueError(f'invalid nfft {nfft} or step {step}')
+        self.window = np.asarray(window, dtype=np.float64)
+        self.start = int(start)
+        self.overlap = self.nfft - 1
+
+    def _segments(self, sample_id, data):
+        """Return (segment_index, power) for the segments in data."""
+        k0 = max(0, -((self.start - sample_id) // self.step))  # ceil((sample_id - start) / step)
+        first = self.start + k0 * self.step - sample_id
+        return k0, psd_segments(data, self.nfft, self.step, self.window, first)
+
+
+class WelchKernel(_SegmentKernel):
+    """Compute the average power spectrum using Welch's method.
+
+    :param nfft: The segment length.
+    :param step: The number of samples between segment starts.
+    :param window: The np.ndarray window with length nfft.
+    :param start: The sample id of the first segment.
+
+    The result is (power, count) where power is the np.ndarray mean of the
+    unscaled segment power with length nfft // 2 + 1, or None when the
+    range contains no complete segment.
+    """
+
+    def map(self, sample_id, data):
+        _, y = self._segments(sample_id, data)
+        return np.sum(y, axis=0), len(y)
+
+    def reduce(self, a, b):
+        return a[0] + b[0], a[1] + b[1]
+
+    def finalize(self, partial):
+        if partial is None or not partial[1]:
+            return None, 0
+        return partial[0] / partial[1], partial[1]
+
+
+class SpectrogramKernel(_SegmentKernel):
+    """Compute a spectrogram with a bounded number of time columns.
+
+    :param nfft: The segment length.
+    :param step: The number of samples between segment starts.
+    :param window: The np.ndarray window with length nfft.
+    :param start: The sample id of the first segment.
+    :param length: The number of samples in the range.
+    :param columns: The maximum number of time columns.
+
+    When the range contains more segments than columns, each column
+    averages the power of group consecutive segments, so the result
+    size does not depend on the range length.  The result is the
+    np.ndarray with shape (columns, nfft // 2 + 1) of mean unscaled power.
+    """
+
+    def __init__(self, nfft, step, window, start, length, columns):
+        super().__init__(nfft, step, window, start)
+        length = int(length)
+        self.segments = 0 if length < self.nfft else (length - self.nfft) // self.step + 1
+        columns = max(1, int(columns))
+        self.group = max(1, -(-self.segments // columns))
+        self.columns = -(-self.segments // self.group)
+
+    def map(self, sample_id, data):
+        k0, y = self._segments(sample_id, data)
+        k0 = min(k0, self.segments)
+        y = y[:self.segments - k0]
+        if not len(y):
+            return 0, np.zeros((0, y.shape[1])), np.zeros(0, dtype=np.int64)
+        col = (k0 + np.arange(len(y))) // self.group
+        c0 = col[0]
+        col -= c0
+        edges = np.flatnonzero(np.diff(col)) + 1
+        idx = np.concatenate(([0], edges))
+        return c0, np.add.reduceat(y, idx, axis=0), np.diff(np.concatenate((idx, [len(y)])))
+
+    def reduce(self, a, b):
+        if len(a[1]) != self.columns:
+            c0, y, n = a
+            y_full = np.zeros((self.columns, self.nfft // 2 + 1), dtype=np.float64)
+            n_full = np.zeros(self.columns, dtype=np.int64)
+            y_full[c0:c0 + len(y)] = y
+            n_full[c0:c0 + len(n)] = n
+            a = (0, y_full, n_full)
+        c0, y, n = b
+        a[1][c0:c0 + len(y)] += y
+        a[2][c0:c0 + len(n)] += n
+        return a
+
+    def finalize(self, partial):
+        if partial is None:
+            return np.zeros((0, self.nfft // 2 + 1), dtype=np.float64)
+        partial = self.reduce(partial, (0, partial[1][:0], partial[2][:0]))
+        _, y, n = partial
+        return y / np.maximum(n, 1)[:, np.newaxis]
+
+
+SKETCH_BITS = 16  # high bits of the ordered float32 key per sketch bucket
+_SKETCH_LOW_MASK = (1 << (32 - SKETCH_BITS)) - 1
+
+
+def f32_keys(data):
+    """Convert finite samples to order-preserving uint32 keys.
+
+    :param data: The np.ndarray of samples.
+    :return: The np.ndarray of uint32 keys for the finite samples.
+        The keys sort in the same order as the float32 values.
+    """
+    x = np.asarray(data, dtype=np.float32)
+    x = x[np.isfinite(x)]
+    u = x.view(np.uint32)
+    return np.where(u & 0x80000000, ~u, u | 0x80000000).astype(np.uint32)
+
+
+def f32_from_keys(keys):
+    """Convert keys from :func:`f32_keys` back to float32 values."""
+    k = np.asarray(keys, dtype=np.uint32)
+    u = np.where(k & 0x80000000, k & 0x7fffffff, ~k).astype(np.uint32)
+    return u.view(np.float32)
+
+
+def quantile_ranks(total, quantiles):
+    """Compute the zero-based sample rank for each quantile.
+
+    :param total: The total number of samples.
+    :param quantiles: The iterable of quantiles in the range [0, 1].
+    :return: The list of ranks, matching numpy's 'inverted_cdf' method.
+    """
+    return [min(total - 1, max(0, int(np.ceil(q * total)) - 1)) for q in quantiles]
+
+
+def sketch_locate(sketch, ranks):
+    """Find the sketch bucket that contains each rank.
+
+    :param sketch: The np.ndarray of sketch bucket counts.
+    :param ranks: The list of zero-based sample ranks.
+    :return: The list of (bucket, rank within bucket).
+    """
+    c = np.cumsum(sketch)
+    result = []
+    for rank in ranks:
+        bucket = int(np.searchsorted(c, rank, side='right'))
+        result.append((bucket, int(rank - (c[bucket] - sketch[bucket]))))
+    return result
+
+
+class DistributionKernel:
+    """Compute a histogram and a mergeable quantile sketch in one pass.
+
+    :param bin_edges: The np.ndarray of histogram bin edges.  Samples
+        outside the edges are counted in the first or last bin.
+
+    The sketch counts samples by the high SKETCH_BITS bits of their
+    ordered float32 key, which is a fixed-size histogram with log-spaced
+    buckets of about 0.8% relative width over the entire float32 range.
+    The result is (hist, sketch).
+    """
+
+    overlap = 0
+
+    def __init__(self, bin_edges):
+        self.bin_edges = np.asarray(bin_edges, dtype=np.float64)
+
+    def map(self, sample_id, data):
+        x = np.asarray(data, dtype=np.float32)
+        x = x[np.isfinite(x)]
+        keys = f32_keys(x)
+        hist = np.histogram(np.clip(x, self.bin_edges[0], self.bin_edges[-1]), bins=self.bin_edges)[0]
+        sketch = np.bincount(keys >> (32 - SKETCH_BITS), minlength=1 << SKETCH_BITS)
+        return hist, sketch.astype(np.int64)
+
+    def reduce(self, a, b):
+        return a[0] + b[0], a[1] + b[1]
+
+    def finalize(self, partial):
+        if partial is None:
+            return (np.zeros(len(self.bin_edges) - 1, dtype=np.int64),
+                    np.zeros(1 << SKETCH_BITS, dtype=np.int64))
+        return partial
+
+
+class QuantileRefineKernel:
+    """Count the low key bits for samples within selected sketch buckets.
+
+    :param buckets: The iterable of sketch buckets to refine.
+
+    Together with the sketch from :class:`DistributionKernel`, this second
+    pass finds exact quantile values with fixed memory.  The result is the
+    np.ndarray with shape (len(buckets), 2 ** (32 - SKETCH_BITS)) of counts.
+    """
+
+    overlap = 0
+
+    def __init__(self, buckets):
+        self.buckets = np.unique(np.asarray(list(buckets), dtype=np.int64))
+
+    def map(self, sample_id, data):
+        keys = f32_keys(data).astype(np.int64)
+        n = len(self.buckets)
+        low_size = _SKETCH_LOW_MASK + 1
+        hi = keys >> (32 - SKETCH_BITS)
+        idx = np.minimum(np.searchsorted(self.buckets, hi), n - 1)
+        mask = self.buckets[idx] == hi
+        counts = np.bincount(idx[mask] * low_size + (keys[mask] & _SKETCH_LOW_MASK), minlength=n * low_size)
+        return counts.reshape((n, low_size))
+
+    def reduce(self, a, b):
+        return a + b
+
+    def finalize(self, partial):
+        if partial is None:
+            return np.zeros((len(self.buckets), _SKETCH_LOW_MASK + 1), dtype=np.int64)
+        return partial
+
+    def values(self, counts, locations):
+        """Compute the exact values.
+
+        :param counts: The result of this kernel.
+        :param locations: The list of (bucket, rank within bucket)
+            from :func:`sketch_locate`.
+        :return: The list of float values.
+        """
+        result = []
+        for bucket, rank in locations:
+            row = counts[int(np.searchsorted(self.buckets, bucket))]
+            low = int(np.searchsorted(np.cumsum(row), rank, side='right'))
+            result.append(float(f32_from_keys((bucket << (32 - SKETCH_BITS)) | low)))
+        return result
+
+
+EVENT_CONDITIONS = ['>', '<', 'between', 'outside']
+EVENT_TYPES = ['rising', 'falling', 'both', 'pulse', 'burst']
+
+
+def condition_predicate(condition, value1, value2=None):
+    """Construct a vectorized threshold condition.
+
+    :param condition: One of EVENT_CONDITIONS.
+    :param value1: The threshold or the first range value.
+    :param value2: The second range value for 'between' and 'outside'.
+    :return: Callable(data) that returns the boolean np.ndarray.
+        NaN samples are always False.
+    """
+    v1 = float(value1)
+    if condition == '>':
+        return lambda x: x > v1
+    elif condition == '<':
+        return lambda x: x < v1
+    elif condition not in EVENT_CONDITIONS:
+        raise ValueError(f'Invalid condition {condition}')
+    v1, v2 = sorted([v1, float(value2)])
+    if condition == 'between':
+        return lambda x: np.logical_and(x >= v1, x <= v2)
+    return lambda x: np.logical_or(x < v1, x > v2)
+
+
+def condition_mask(data, condition, value1, value2=None):
+    """Evaluate a threshold condition for each sample.
+
+    :param data: The np.ndarray of samples.
+    :param condition: One of EVENT_CONDITIONS.
+    :param value1: The threshold or the first range value.
+    :param value2: The second range value for 'between' and 'outside'.
+    :return: The boolean np.ndarray.  NaN samples are always False.
+    """
+    return condition_predicate(condition, value1, value2)(data)
+
+
+class EventKernel:
+    """Find the runs of samples that satisfy a condition.
+
+    :param condition: One of EVENT_CONDITIONS.
+    :param value1: The threshold or the first range value.
+    :param value2: The second range value for 'between' and 'outside'.
+
+    Each chunk finds its runs with a single np.diff, and reduce joins
+    the runs that continue across the chunk boundary.  The result is
+    the dict with:
+
+    * range: The [start, end) sample ids of the processed range.
+    * starts: The np.ndarray of run start sample ids.
+    * ends: The np.ndarray of run end sample ids, exclusive.
+
+    Use :func:`event_select` to convert the runs into events.
+    """
+
+    overlap = 0
+
+    def __init__(self, condition, value1, value2=None):
+        if condition not in EVENT_CONDITIONS:
+            raise ValueError(f'Invalid condition {condition}')
+        self.condition = condition
+        self.value1 = float(value1)
+        self.value2 = None if value2 is None else float(value2)
+
+    def map(self, sample_id, data):
+        mask = condition_mask(data, self.condition, self.value1, self.value2)
+        d = np.diff(mask.view(np.int8), prepend=np.int8(0), append=np.int8(0))
+        starts = np.flatnonzero(d > 0) + sample_id
+        ends = np.flatnonzero(d < 0) + sample_id
+        runs = [[starts], [ends]] if len(starts) else [[], []]
+        return [sample_id, sample_id + len(data)] + runs
+
+    def reduce(self, a, b):
+        # arrays are never empty, so a[3][-1][-1] is the last run end
+        if len(a[3]) and len(b[2]) and a[3][-1][-1] == a[1] and b[2][0][0] == b[0]:
+            a[3][-1] = a[3][-1][:-1]
+            b[2][0] = b[2][0][1:]
+        a[1] = b[1]
+        a[2].extend(b[2])
+        a[3].extend(b[3])
+        return a
+
+    def finalize(self, partial):
+        if partial is None:
+            partial = [0, 0, [], []]
+        empty = np.zeros(0, dtype=np.int64)
+        return {
+            'range': [int(partial[0]), int(partial[1])],
+            'starts': np.concatenate([empty] + partial[2]).astype(np.int64),
+            'ends': np.concatenate([empty] + partial[3]).astype(np.int64),
+        }
+
+
+def event_select(runs, event_type, length_min=0, length_max=None, gap=0):
+    """Convert runs from :class:`EventKernel` into events.
+
+    :param runs: The EventKernel result.
+    :param event_type: One of EVENT_TYPES:
+        * rising: The condition becomes true.
+        * falling: The condition becomes false.
+        * both: Both rising and falling.
+        * pulse: A complete run.
+        * burst: A complete group of runs separated by less than gap samples.
+    :param length_min: The minimum pulse or burst length in samples.
+    :param length_max: The maximum pulse or burst length in samples, or None.
+    :param gap: The burst gap in samples.
+    :return: (starts, ends, rising).  Each is an np.ndarray with one entry
+        per event.  For edges, ends equals starts.  rising is True for
+        rising edges, pulses and bursts, and False for falling edges.
+
+    Runs that touch the range boundaries do not have edges there, and
+    pulses and bursts that touch a boundary are excluded since their
+    length is unknown.
+    """
+    first, last = runs['range']
+    starts, ends = runs['starts'], runs['ends']
+    if event_type in ['rising', 'falling', 'both']:
+        r = starts[starts != first]
+        f = ends[ends != last]
+        if event_type == 'rising':
+            f = f[:0]
+        elif event_type == 'falling':
+            r = r[:0]
+        t = np.concatenate((r, f))
+        rising = np.concatenate((np.ones(len(r), dtype=bool), np.zeros(len(f), dtype=bool)))
+        order = np.argsort(t, kind='stable')
+        return t[order], t[order], rising[order]
+    elif event_type == 'burst':
+        split = (starts[1:] - ends[:-1]) >= max(1, int(gap))
+        starts = starts[np.concatenate(([True], split))] if len(starts) else starts
+        ends = ends[np.concatenate((split, [True]))] if len(ends) else ends
+    elif event_type != 'pulse':
+        raise ValueError(f'Invalid event type {event_type}')
+    length = ends - starts
+    keep = np.logical_and(starts != first, ends != last)
+    keep &= length >= length_min
+    if length_max is not None:
+        keep &= length <= length_max
+    starts, ends = starts[keep], ends[keep]
+    return starts, ends, np.ones(len(starts), dtype=bool)
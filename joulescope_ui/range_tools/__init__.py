@@ -17,3 +17,5 @@ from .histogram import HistogramRangeTool
 from .cdf import CdfRangeTool
 from .frequency import FrequencyRangeTool
 from .max_window import MaxWindowRangeTool
+from .spectrogram import SpectrogramRangeTool
+from .events import EventsRangeTool
@@ -15,7 +15,8 @@
 
 from joulescope_ui import register, N_, pubsub_singleton, P_
 from joulescope_ui.range_tool import RangeToolBase
-from .plugin_helpers import calculate_histogram, normalize_hist, signal_combobox_config
+from .plugin_helpers import calculate_distribution, normalize_hist, signal_combobox_config, \
+    PERCENTILES, SCALES, percentile_lines
 import logging
 import numpy as np
 from PySide6 import QtCore, QtWidgets
@@ -42,8 +43,12 @@ class CdfRangeTool(RangeToolBase):
         signal = kwargs['signal']
         num_bins = kwargs['num_bins']
         complimentary = kwargs['complimentary']
-        hist, bin_edges = calculate_histogram(self, self.value, signal, num_bins)
-        hist, bin_edges = normalize_hist(hist, bin_edges, 'unity')
+        scale = kwargs.get('scale', 'linear')
+        percentiles = PERCENTILES if kwargs.get('percentiles') else None
+        rv = calculate_distribution(self, self.value, signal, num_bins, scale, percentiles)
+        if rv is None:
+            return  # aborted
+        hist, bin_edges = normalize_hist(rv['hist'], rv['bin_edges'], 'unity')
         y = np.cumsum(hist)
         if complimentary:
             y = 1 - y
@@ -55,7 +60,9 @@ class CdfRangeTool(RangeToolBase):
                     'x': bin_edges,
                     'y': y,
                     'signal_name': signal[1],
-                    'type': 'CCDF' if complimentary else 'CDF'
+                    'type': 'CCDF' if complimentary else 'CDF',
+                    'scale': scale,
+                    'percentiles': [[p, v] for p, v in rv['percentiles'].items()],
                 },
             },
             'floating': True,
@@ -83,6 +90,8 @@ class CdfRangeToolWidget(QtWidgets.QWidget):
         import pyqtgraph as pg  # deferred: expensive import off the startup path (#206)
         self._data = data
         self._plot_item = None
+        self._log_x = False
+        self._percentile_lines = []
         super().__init__()
         self._layout = QtWidgets.QHBoxLayout(self)
         self._layout.setSpacing(0)
@@ -124,6 +133,8 @@ class CdfRangeToolWidget(QtWidgets.QWidget):
         if p.sceneBoundingRect().contains(pos):
             mousePoint = p.vb.mapSceneToView(pos)
             xval = mousePoint.x()
+            if self._log_x:
+                xval = 10 ** xval
             x_i = self._data['x'][1:]
             idx = np.searchsorted(x_i, xval)
             idx = min(max(0, idx), len(x_i) - 1)
@@ -133,7 +144,7 @@ class CdfRangeToolWidget(QtWidgets.QWidget):
                 "<span style='font-size: 12pt'>{:.5f}</span>,   <span style='color: yellow; font-size:12pt'>probability: {:.5f}</span>".format(
                     xval, yval)
             )
-            self._vLine.setPos(xval)
+            self._vLine.setPos(np.log10(xval) if self._log_x else xval)
             self._hLine.setPos(yval)
 
     def on_setting_data(self, value):
@@ -149,10 +160,17 @@ class CdfRangeToolWidget(QtWidgets.QWidget):
             left_label = f'1 - {left_label}'
         p.setLabels(left=left_label, bottom=value['signal_name'])
         x, y = value['x'], value['y']
+        self._log_x = value.get('scale') == 'log'
+        p.setLogMode(x=self._log_x)
 
         self._plot_item = pg.PlotDataItem(x=x[1:], y=y, pen='r')
         p.addItem(self._plot_item)
-        p.setXRange(x[0], x[-1], padding=0.05)
+        self._percentile_lines = percentile_lines(p, self._percentile_lines,
+                                                  value.get('percentiles'), self._log_x)
+        if self._log_x:
+            p.setXRange(np.log10(x[0]), np.log10(x[-1]), padding=0.05)
+        else:
+            p.setXRange(x[0], x[-1], padding=0.05)
         p.setYRange(0, 1, padding=0.05)
 
 
@@ -191,6 +209,18 @@ class CdfRangeToolDialog(QtWidgets.QDialog):
         self._complimentary.setCheckable(True)
         self._layout.addWidget(self._complimentary, 2, 1, 1, 1)
 
+        self._scale_label = QtWidgets.QLabel(N_('Bin scale'), self)
+        self._layout.addWidget(self._scale_label, 3, 0, 1, 1)
+        self._scale = QtWidgets.QComboBox(self)
+        for name in SCALES:
+            self._scale.addItem(name)
+        self._layout.addWidget(self._scale, 3, 1, 1, 1)
+
+        self._percentiles_label = QtWidgets.QLabel(N_('Percentiles'), self)
+        self._layout.addWidget(self._percentiles_label, 4, 0, 1, 1)
+        self._percentiles = QtWidgets.QCheckBox(self)
+        self._layout.addWidget(self._percentiles, 4, 1, 1, 1)
+
         self.verticalLayout.addLayout(self._layout)
         self._buttons = QtWidgets.QDialogButtonBox(self)
         self._buttons.setOrientation(QtCore.Qt.Horizontal)
@@ -213,6 +243,8 @@ class CdfRangeToolDialog(QtWidgets.QDialog):
                 'signal': self._value['signals'][self._signal.currentIndex()],
                 'num_bins': int(self._num_bins.value()),
                 'complimentary': self._complimentary.isChecked(),
+                'scale': str(self._scale.currentText()),
+                'percentiles': bool(self._percentiles.isChecked()),
             }
             w = CdfRangeTool(self._value)
             pubsub_singleton.register(w)
@@ -0,0 +1,402 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from joulescope_ui import register, N_, pubsub_singleton, get_topic_name, time64, P_
+from joulescope_ui.range_tool import RangeToolBase
+from joulescope_ui.range_tool_kernels import EventKernel, event_select, EVENT_CONDITIONS, EVENT_TYPES
+from joulescope_ui.styles import styled_widget
+from .plugin_helpers import signal_combobox_config
+import logging
+import numpy as np
+import os
+from PySide6 import QtCore, QtWidgets
+
+
+_NAME = N_('Events')
+_CHUNK_SIZE = 1_000_000  # samples per request, bounds memory
+_ANNOTATIONS_MAX = 1000  # waveform text annotations, the table has all events
+_CSV_BLOCK = 100_000     # rows per write
+_EVENT_TYPE_NAMES = {
+    'rising': N_('Rising edge'),
+    'falling': N_('Falling edge'),
+    'both': N_('Both edges'),
+    'pulse': N_('Pulse'),
+    'burst': N_('Burst'),
+}
+_CONDITION_NAMES = {
+    '>': '>',
+    '<': '<',
+    'between': N_('between'),
+    'outside': N_('outside'),
+}
+
+
+def _duration_str(t):
+    if t >= 1.0:
+        return f'{t:.3f} s'
+    elif t >= 1e-3:
+        return f'{t * 1e3:.3f} ms'
+    return f'{t * 1e6:.1f} µs'
+
+
+@register
+class EventsRangeTool(RangeToolBase):
+    NAME = _NAME
+    BRIEF = N_('Find all edges, pulses and bursts')
+    DESCRIPTION = P_([
+        N_("""Find every threshold crossing, pulse and burst in the range,
+        such as every radio transmission in a long capture."""),
+        N_("""The range is processed in chunks, and events that span
+        chunk boundaries are joined.  Pulses are contiguous samples that
+        satisfy the condition.  Bursts group pulses separated by less
+        than the burst gap."""),
+        N_("""When complete, this tool shows the events in a table
+        and optionally adds annotations to the waveform.""")])
+
+    def __init__(self, value):
+        super().__init__(value)
+
+    def _run(self):
+        kwargs = self.kwargs
+        signal = kwargs['signal']
+        event_type = kwargs['event_type']
+        condition = kwargs['condition']
+        value1 = kwargs['value1']
+        value2 = kwargs.get('value2')
+
+        d = self.request(signal, 'utc', *self.x_range, 1)
+        fs = d['info']['time_map']['counter_rate']
+        t_start = d['info']['time_range_utc']['start']
+        s_start = d['info']['time_range_samples']['start']
+        s_end = d['info']['time_range_samples']['end'] + 1
+        cache_args = ('events', signal, [s_start, s_end - 1],
+                      {'condition': condition, 'value1': value1, 'value2': value2})
+        runs = self.cache_get(*cache_args)
+        if runs is None:
+            runs = self.run_kernel(EventKernel(condition, value1, value2), signal,
+                                   [s_start, s_end - 1], _CHUNK_SIZE, time_type='samples')
+            if runs is None:
+                return
+            self.cache_put(*cache_args, runs)
+
+        length_min = int(np.rint(kwargs.get('duration_min', 0.0) * fs))
+        duration_max = kwargs.get('duration_max')
+        length_max = None if not duration_max else int(np.rint(duration_max * fs))
+        gap = int(np.rint(kwargs.get('gap', 0.0) * fs))
+        starts, ends, rising = event_select(runs, event_type, length_min, length_max, gap)
+        self._log.info('%d %s events', len(starts), event_type)
+        data = {
+            'event_type': event_type,
+            'signal': signal,
+            'fs': fs,
+            't_start': int(t_start),
+            'start': (starts - s_start).astype(np.int64),
+            'end': (ends - s_start).astype(np.int64),
+            'rising': rising,
+        }
+
+        origin = self.value.get('origin')
+        if kwargs.get('annotations') and origin is not None and 'Waveform' in origin:
+            self._annotations_add(origin, data)
+        if kwargs.get('table', True):
+            self.pubsub.publish('registry/view/actions/!widget_open', {
+                'value': 'EventsRangeToolWidget',
+                'kwargs': {'data': data},
+                'floating': True,
+            })
+
+    def _annotations_add(self, origin, data):
+        topic = get_topic_name(origin)
+        quantity = data['signal'].split('.')[-1]
+        state = self.pubsub.query(f'{topic}/settings/state', default=None) or {}
+        plot_index = 0
+        for idx, plot in enumerate(state.get('plots', [])):
+            if plot['quantity'] == quantity:
+                plot_index = idx
+                break
+        fs, t_start = data['fs'], data['t_start']
+        count = min(_ANNOTATIONS_MAX, len(data['start']))
+        if count < len(data['start']):
+            self._log.warning('annotate first %d of %d events', count, len(data['start']))
+        is_edge = data['event_type'] in ['rising', 'falling', 'both']
+        annotations = []
+        for k in range(count):
+            start, end = int(data['start'][k]), int(data['end'][k])
+            if is_edge:
+                text = '↑' if data['rising'][k] else '↓'
+            else:
+                text = _duration_str((end - start) / fs)
+            annotations.append({
+                'plot_index': plot_index,
+                'text': text,
+                'text_show': True,
+                'shape': 0 if is_edge else 7,  # diamond or triangle up
+                'x': t_start + int(start * time64.SECOND / fs),
+                'y': 0.0,
+                'y_mode': 'centered',
+            })
+        if len(annotations):
+            self.pubsub.publish(f'{topic}/actions/!text_annotation', ['add'] + annotations)
+
+    @staticmethod
+    def on_cls_action_run(value):
+        EventsRangeToolDialog(value)
+
+
+class _EventsModel(QtCore.QAbstractTableModel):
+    """Present the event arrays without a per-row Python object."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._data = None
+        self._columns = []
+
+    def data_set(self, data):
+        self.beginResetModel()
+        self._data = data
+        if data is None:
+            self._columns = []
+        elif data['event_type'] in ['rising', 'falling', 'both']:
+            self._columns = [N_('Time (s)'), N_('Edge')]
+        else:
+            self._columns = [N_('Time (s)'), N_('Duration (s)')]
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if self._data is None else len(self._data['start'])
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self._columns)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self._columns[section]
+        return str(section + 1)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole or self._data is None or not index.isValid():
+            return None
+        d, row = self._data, index.row()
+        fs = d['fs']
+        if index.column() == 0:
+            return f'{d["start"][row] / fs:.6f}'
+        elif self._columns[1] == N_('Edge'):
+            return N_('rising') if d['rising'][row] else N_('falling')
+        return f'{(d["end"][row] - d["start"][row]) / fs:.6f}'
+
+
+@register
+@styled_widget(_NAME)
+class EventsRangeToolWidget(QtWidgets.QWidget):
+
+    SETTINGS = {
+        'data': {
+            'dtype': 'obj',
+            'brief': 'Hold the events data',
+            'default': None,
+            'flags': ['hide', 'tmp'],  # may contain millions of events
+        }
+    }
+
+    def __init__(self, data=None):
+        self._data = data
+        self._dialog = None
+        super().__init__()
+        self._log = logging.getLogger(f'{__name__}.widget')
+        self._layout = QtWidgets.QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+        self._header = QtWidgets.QWidget(self)
+        self._header_layout = QtWidgets.QHBoxLayout(self._header)
+        self._header_layout.setContentsMargins(3, 3, 3, 3)
+        self._summary = QtWidgets.QLabel(self._header)
+        self._header_layout.addWidget(self._summary)
+        self._header_layout.addStretch(1)
+        self._save = QtWidgets.QPushButton(N_('Save CSV'), self._header)
+        self._save.pressed.connect(self._on_save)
+        self._header_layout.addWidget(self._save)
+        self._layout.addWidget(self._header)
+
+        self._model = _EventsModel(self)
+        self._table = QtWidgets.QTableView(self)
+        self._table.setModel(self._model)
+        self._table.horizontalHeader().setStretchLastSection(True)
+        self._layout.addWidget(self._table)
+
+    def on_pubsub_register(self):
+        if self._data is not None:
+            self.data = self._data
+
+    def on_setting_data(self, value):
+        self._data = value
+        self._model.data_set(value)
+        self._save.setEnabled(value is not None)
+        if value is None:
+            self._summary.setText('')
+            return
+        t = time64.as_datetime(value['t_start']).isoformat()
+        name = _EVENT_TYPE_NAMES[value['event_type']]
+        self._summary.setText(f'{len(value["start"])} × {name}, t=0 at {t}')
+
+    def _on_save(self):
+        filter_str = 'CSV (*.csv)'
+        path = self.pubsub.query('registry/paths/settings/path')
+        path = os.path.join(path, time64.filename('_events.csv'))
+        dialog = QtWidgets.QFileDialog(self, N_('Save events to CSV file'), path, filter_str)
+        dialog.setFileMode(QtWidgets.QFileDialog.AnyFile)
+        dialog.setAcceptMode(QtWidgets.QFileDialog.AcceptSave)
+        dialog.finished.connect(self._on_save_dialog_finished)
+        self._dialog = dialog
+        dialog.show()
+
+    @QtCore.Slot(int)
+    def _on_save_dialog_finished(self, value):
+        dialog, self._dialog = self._dialog, None
+        if value != QtWidgets.QDialog.DialogCode.Accepted or self._data is None:
+            return
+        filenames = dialog.selectedFiles()
+        if len(filenames) == 1:
+            self._log.info('save %s', filenames[0])
+            events_csv_write(filenames[0], self._data)
+
+
+def events_csv_write(path, data):
+    """Write events to a CSV file.
+
+    :param path: The output path.
+    :param data: The events data dict produced by :class:`EventsRangeTool`.
+    """
+    fs, t_start = data['fs'], data['t_start']
+    with open(path, 'wt') as f:
+        f.write(f'#event_type={data["event_type"]},signal={data["signal"]},'
+                f't0={time64.as_datetime(t_start).isoformat()}\n')
+        f.write('time,duration,rising\n')
+        for k in range(0, len(data['start']), _CSV_BLOCK):
+            start = data['start'][k:k + _CSV_BLOCK]
+            end = data['end'][k:k + _CSV_BLOCK]
+            rising = data['rising'][k:k + _CSV_BLOCK]
+            values = np.column_stack((start / fs, (end - start) / fs, rising.astype(np.float64)))
+            np.savetxt(f, values, ['%.9f', '%.9f', '%d'], delimiter=',')
+
+
+class EventsRangeToolDialog(QtWidgets.QDialog):
+
+    def __init__(self, value):
+        self._value = value
+        parent = pubsub_singleton.query('registry/ui/instance')
+        super().__init__(parent=parent)
+        self._log = logging.getLogger(f'{__name__}.dialog')
+        self.setObjectName('EventsRangeToolDialog')
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        self.setWindowTitle(N_('Events configuration'))
+        self._layout = QtWidgets.QVBoxLayout(self)
+        self._form = QtWidgets.QFormLayout()
+
+        self._signal = QtWidgets.QComboBox(self)
+        signal_combobox_config(self._signal, value)
+        self._form.addRow(N_('Signal'), self._signal)
+
+        self._event_type = QtWidgets.QComboBox(self)
+        for event_type in EVENT_TYPES:
+            self._event_type.addItem(_EVENT_TYPE_NAMES[event_type])
+        self._event_type.setCurrentIndex(EVENT_TYPES.index('pulse'))
+        self._form.addRow(N_('Event'), self._event_type)
+
+        self._condition = QtWidgets.QComboBox(self)
+        for condition in EVENT_CONDITIONS:
+            self._condition.addItem(_CONDITION_NAMES[condition])
+        self._form.addRow(N_('Condition'), self._condition)
+
+        self._value1 = self._value_spinbox(0.5)
+        self._form.addRow(N_('Value 1'), self._value1)
+        self._value2 = self._value_spinbox(1.0)
+        self._form.addRow(N_('Value 2'), self._value2)
+
+        self._duration_min = self._duration_spinbox(0.0)
+        self._form.addRow(N_('Minimum duration (s)'), self._duration_min)
+        self._duration_max = self._duration_spinbox(0.0)
+        self._duration_max.setSpecialValueText(N_('none'))
+        self._form.addRow(N_('Maximum duration (s)'), self._duration_max)
+        self._gap = self._duration_spinbox(0.001)
+        self._form.addRow(N_('Burst gap (s)'), self._gap)
+
+        self._annotations = QtWidgets.QCheckBox(self)
+        self._annotations.setChecked(True)
+        self._form.addRow(N_('Annotate waveform'), self._annotations)
+
+        self._layout.addLayout(self._form)
+        self._buttons = QtWidgets.QDialogButtonBox(self)
+        self._buttons.setOrientation(QtCore.Qt.Horizontal)
+        self._buttons.setStandardButtons(QtWidgets.QDialogButtonBox.Cancel | QtWidgets.QDialogButtonBox.Ok)
+        self._layout.addWidget(self._buttons)
+        self._buttons.accepted.connect(self.accept)
+        self._buttons.rejected.connect(self.reject)
+        self._event_type.currentIndexChanged.connect(self._on_enable_update)
+        self._condition.currentIndexChanged.connect(self._on_enable_update)
+        self.finished.connect(self._on_finished)
+        self._on_enable_update()
+        self.resize(360, 300)
+        self._log.info('open')
+        self.open()
+
+    def _value_spinbox(self, value):
+        w = QtWidgets.QDoubleSpinBox(self)
+        w.setDecimals(6)
+        w.setRange(-1e6, 1e6)
+        w.setStepType(QtWidgets.QAbstractSpinBox.AdaptiveDecimalStepType)
+        w.setValue(value)
+        return w
+
+    def _duration_spinbox(self, value):
+        w = QtWidgets.QDoubleSpinBox(self)
+        w.setDecimals(6)
+        w.setRange(0.0, 1e6)
+        w.setStepType(QtWidgets.QAbstractSpinBox.AdaptiveDecimalStepType)
+        w.setValue(value)
+        return w
+
+    @QtCore.Slot(int)
+    def _on_enable_update(self, index=None):
+        event_type = EVENT_TYPES[self._event_type.currentIndex()]
+        condition = EVENT_CONDITIONS[self._condition.currentIndex()]
+        is_edge = event_type in ['rising', 'falling', 'both']
+        self._value2.setEnabled(condition in ['between', 'outside'])
+        self._duration_min.setEnabled(not is_edge)
+        self._duration_max.setEnabled(not is_edge)
+        self._gap.setEnabled(event_type == 'burst')
+
+    @QtCore.Slot(int)
+    def _on_finished(self, value):
+        self._log.info('finished: %d', value)
+        if value == QtWidgets.QDialog.DialogCode.Accepted:
+            self._log.info('finished: accept - start events')
+            condition = EVENT_CONDITIONS[self._condition.currentIndex()]
+            self._value['kwargs'] = {
+                'signal': self._value['signals'][self._signal.currentIndex()],
+                'event_type': EVENT_TYPES[self._event_type.currentIndex()],
+                'condition': condition,
+                'value1': float(self._value1.value()),
+                'value2': float(self._value2.value()) if condition in ['between', 'outside'] else None,
+                'duration_min': float(self._duration_min.value()),
+                'duration_max': float(self._duration_max.value()) or None,
+                'gap': float(self._gap.value()),
+                'annotations': bool(self._annotations.isChecked()),
+            }
+            w = EventsRangeTool(self._value)
+            pubsub_singleton.register(w)
+        else:
+            self._log.info('finished: reject - abort events')  # no action required
+        self.close()
@@ -13,7 +13,8 @@
 # limitations under the License.
 
 from joulescope_ui import register, N_, pubsub_singleton
-from joulescope_ui.range_tool import RangeToolBase, rsp_as_f32
+from joulescope_ui.range_tool import RangeToolBase
+from joulescope_ui.range_tool_kernels import WelchKernel
 from .plugin_helpers import signal_combobox_config
 import logging
 import numpy as np
@@ -58,42 +59,31 @@ class FrequencyRangeTool(RangeToolBase):
 
         if nfft > sample_count:
             nfft = sample_count & 0xfffffffe  # make even
+        if nfft < 2:
+            self.error('range too short')
+            return
 
         overlap = int(min(1.0, max(0.0, overlap)) * nfft)
         sample_jump = nfft - overlap
         window = _WINDOWS[window](nfft)
-        x = np.zeros(nfft)
-        y = np.zeros(nfft // 2 + 1)
-        k = 0
-        x_offset = 0
-
         window_factor = np.sum(window * window)
         fft_factor = 2.0 / (fs * window_factor)
 
         # Video explaining periodogram: https://www.youtube.com/watch?v=Qs-Zai0F2Pw
         # Example: https://github.com/matplotlib/matplotlib/blob/d7feb03da5b78e15b002b7438779068a318a3024/lib/matplotlib/mlab.py#L405
-        while s_now < s_end:
-            length = min(int(fs), s_end - s_now)
-            rsp = self.request(signal, 'samples', s_now, 0, length)
-            d = rsp_as_f32(rsp)
-            data_offset = 0
-            d_len = len(d)
-            while (d_len + x_offset) >= nfft:
-                d_len_this = nfft - x_offset
-                x[x_offset:] = d[data_offset:(data_offset + d_len_this)]
-                z = np.fft.rfft(x * window)
-                y += np.real((z * np.conj(z))) * fft_factor
-                k += 1
-                d_len -= d_len_this
-                data_offset += d_len_this
-                x[:overlap] = x[sample_jump:]
-                x_offset = overlap
-            x[x_offset:(x_offset + d_len)] = d[data_offset:]
-            x_offset += d_len
-            s_now += length
-            self.progress(s_now / (length + 1))
-
-        y *= (1.0 / k)  # average
+        cache_args = ('welch', signal, [s_now, s_end - 1],
+                      {'window': kwargs['window'], 'nfft': nfft, 'step': sample_jump})
+        rv = self.cache_get(*cache_args)
+        if rv is None:
+            kernel = WelchKernel(nfft, sample_jump, window, s_now)
+            rv = self.run_kernel(kernel, signal, [s_now, s_end - 1], max(int(fs), 4 * nfft), time_type='samples')
+            if rv is None:
+                return
+            self.cache_put(*cache_args, rv)
+        y, k = rv
+        if not k:
+            return
+        y = y * fft_factor
         y = 20 * np.log10(y)  # convert to dB
 
         self.pubsub.publish('registry/view/actions/!widget_open', {
@@ -17,7 +17,8 @@ from joulescope_ui import register, N_, pubsub_singleton
 from joulescope_ui.range_tool import RangeToolBase
 import logging
 import numpy as np
-from .plugin_helpers import calculate_histogram, normalize_hist, signal_combobox_config
+from .plugin_helpers import calculate_distribution, normalize_hist, signal_combobox_config, \
+    PERCENTILES, SCALES, percentile_lines
 from joulescope_ui.styles import styled_widget
 
 
@@ -60,6 +61,18 @@ class HistogramRangeToolDialog(QtWidgets.QDialog):
         for name in _NORMALIZATIONS.keys():
             self._normalization.addItem(name)
 
+        self._scale_label = QtWidgets.QLabel(N_('Bin scale'), self)
+        self._form.setWidget(3, QtWidgets.QFormLayout.LabelRole, self._scale_label)
+        self._scale = QtWidgets.QComboBox(self)
+        self._form.setWidget(3, QtWidgets.QFormLayout.FieldRole, self._scale)
+        for name in SCALES:
+            self._scale.addItem(name)
+
+        self._percentiles_label = QtWidgets.QLabel(N_('Percentiles'), self)
+        self._form.setWidget(4, QtWidgets.QFormLayout.LabelRole, self._percentiles_label)
+        self._percentiles = QtWidgets.QCheckBox(self)
+        self._form.setWidget(4, QtWidgets.QFormLayout.FieldRole, self._percentiles)
+
         self._layout.addLayout(self._form)
         self._buttons = QtWidgets.QDialogButtonBox(self)
         self._buttons.setOrientation(QtCore.Qt.Horizontal)
@@ -85,6 +98,8 @@ class HistogramRangeToolDialog(QtWidgets.QDialog):
                 'signal': self._value['signals'][self._signal.currentIndex()],
                 'num_bins': int(self._num_bins.value()),
                 'norm': str(self._normalization.currentText()),
+                'scale': str(self._scale.currentText()),
+                'percentiles': bool(self._percentiles.isChecked()),
             }
             w = HistogramRangeTool(self._value)
             pubsub_singleton.register(w)
@@ -111,7 +126,9 @@ class HistogramRangeToolWidget(QtWidgets.QWidget):
         self._data = data
         self._hist = None
         self._bin_edges = None
+        self._log_x = False
         self._bg = None
+        self._percentile_lines = []
         super().__init__()
         self._layout = QtWidgets.QHBoxLayout(self)
         self._layout.setSpacing(0)
@@ -143,6 +160,8 @@ class HistogramRangeToolWidget(QtWidgets.QWidget):
         if p.sceneBoundingRect().contains(pos):
             mouse_point = p.vb.mapSceneToView(pos)
             xval = mouse_point.x()
+            if self._log_x:
+                xval = 10 ** xval
             index = np.searchsorted(self._bin_edges, xval) - 1
             signal_name = self.data['signal_name']
             axis_label = self.data['axis_label']
@@ -164,20 +183,26 @@ class HistogramRangeToolWidget(QtWidgets.QWidget):
             return
         self._hist = np.array(value['hist'], dtype=float)
         self._bin_edges = np.array(value['bin_edges'], dtype=float)
+        self._log_x = value.get('scale') == 'log'
         signal_name = value['signal_name']
         axis_label = value['axis_label']
 
         if self._bg is not None:
             self._p.removeItem(self._bg)
+        x0 = np.log10(self._bin_edges) if self._log_x else self._bin_edges
+        width = value.get('bin_width', x0[1] - x0[0] if len(x0) > 1 else 1.0)
         self._bg = pg.BarGraphItem(
-            x0=self._bin_edges,
+            x0=x0,
             height=self._hist,
-            width=self._bin_edges[1] - self._bin_edges[0],
+            width=width,
             brushes=[(128, 128, 128)] * len(self._bin_edges),
         )
         self._brushes = [(128, 128, 128)] * len(self._bin_edges)
         self._p.addItem(self._bg)
-        self._p.setXRange(self._bin_edges[0], self._bin_edges[-1], padding=0.05)
+        self._p.getAxis('bottom').setLogMode(self._log_x)
+        self._percentile_lines = percentile_lines(self._p, self._percentile_lines,
+                                                  value.get('percentiles'), self._log_x)
+        self._p.setXRange(x0[0], x0[-1] + width, padding=0.05)
         self._p.setYRange(np.nanmin(self._hist), np.nanmax(self._hist), padding=0.05)
         self._p.setLabels(left=axis_label, bottom=signal_name)
         value['hist'] = self._hist.tolist()  # json-serializable
@@ -199,9 +224,17 @@ class HistogramRangeTool(RangeToolBase):
         num_bins = kwargs['num_bins']
         signal_id = kwargs['signal']
         norm, norm_label = _NORMALIZATIONS[kwargs['norm']]
+        scale = kwargs.get('scale', 'linear')
+        percentiles = PERCENTILES if kwargs.get('percentiles') else None
 
-        hist, bin_edges = calculate_histogram(self, self.value, signal_id, num_bins)
-        hist, bin_edges = normalize_hist(hist, bin_edges, norm)
+        rv = calculate_distribution(self, self.value, signal_id, num_bins, scale, percentiles)
+        if rv is None:
+            return  # aborted
+        hist, bin_edges = normalize_hist(rv['hist'], rv['bin_edges'], norm)
+        if scale == 'log':
+            bin_width = float(np.log10(bin_edges[1] / bin_edges[0]))
+        else:
+            bin_width = float(bin_edges[1] - bin_edges[0])
         bin_edges = bin_edges[:-1]
         if hist.size == 0 or bin_edges.size == 0:
             self._log.error('Histogram is empty')
@@ -215,6 +248,9 @@ class HistogramRangeTool(RangeToolBase):
                     'bin_edges': bin_edges,
                     'signal_name': signal_id,
                     'axis_label': norm_label,
+                    'scale': scale,
+                    'bin_width': bin_width,
+                    'percentiles': [[p, v] for p, v in rv['percentiles'].items()],
                 },
             },
             'floating': True,
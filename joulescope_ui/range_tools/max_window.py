@@ -13,13 +13,58 @@
 # limitations under the License.
 
 from joulescope_ui import N_, time64, register, pubsub_singleton, get_topic_name, P_
-from joulescope_ui.range_tool import RangeToolBase, rsp_as_f32
+from joulescope_ui.range_tool import RangeToolBase
+from joulescope_ui.range_tool_kernels import WindowKernel
 from .plugin_helpers import signal_combobox_config
 import logging
 import numpy as np
 from PySide6 import QtCore, QtWidgets
 
 
+_CHUNK_SIZE = 1_000_000  # samples per request, bounds memory
+
+
+def find_windows(tool, signal, x_range, utc_width, count=1, find_min=False):
+    """Find the windows with the largest and smallest mean values.
+
+    :param tool: The RangeToolBase instance.
+    :param signal: The signal_id string as '{source}.{device}.{quantity}'
+    :param x_range: The [start, end] range in UTC time64.
+    :param utc_width: The window width in float seconds.
+    :param count: The number of non-overlapping windows to find.
+    :param find_min: True to also find the smallest windows.
+    :return: The (windows_max, windows_min) lists of
+        (mean, t_start, t_end) tuples in UTC time64, best first,
+        or None if aborted.
+    :raise ValueError: If the width exceeds the range.
+    """
+    d = tool.request(signal, 'utc', *x_range, 1)
+    fs = d['info']['time_map']['counter_rate']
+    t_start = d['info']['time_range_utc']['start']
+    t_end = d['info']['time_range_utc']['end']
+    t_width = t_end - t_start
+    s_start = d['info']['time_range_samples']['start']
+    s_end = d['info']['time_range_samples']['end'] + 1
+    length = s_end - s_start
+    width = int(np.rint(utc_width * fs))
+    if width > length:
+        raise ValueError('width > region')
+    cache_args = ('max_window', signal, [s_start, s_end - 1],
+                  {'width': width, 'count': count, 'find_min': find_min})
+    rv = tool.cache_get(*cache_args)
+    if rv is None:
+        kernel = WindowKernel(width, count, find_min)
+        rv = tool.run_kernel(kernel, signal, [s_start, s_end - 1], _CHUNK_SIZE, time_type='samples')
+        if rv is None:
+            return None
+        tool.cache_put(*cache_args, rv)
+
+    def to_time(idx):
+        return int(t_start + (idx - s_start) / max(1, length - 1) * t_width)
+
+    return tuple([(v / width, to_time(idx), to_time(idx + width)) for v, idx in items] for items in rv)
+
+
 @register
 class MaxWindowRangeTool(RangeToolBase):
     NAME = N_('Max window')
@@ -28,6 +73,8 @@ class MaxWindowRangeTool(RangeToolBase):
         N_("""Search the range for the window that has the maximum value.
         This is an exhaustive search made by sliding the window 
         duration across the entire range."""),
+        N_("""Optionally, find multiple non-overlapping windows
+        and the minimum value windows."""),
         N_("""When complete, this tool will add dual markers to the
         waveform.""")])
 
@@ -37,50 +84,23 @@ class MaxWindowRangeTool(RangeToolBase):
     def _run(self):
         origin = self.value.get('origin')
         kwargs = self.kwargs
-        utc_width = kwargs['width']  # in float seconds
-        signal = kwargs['signal']
-        d = self.request(signal, 'utc', *self.x_range, 1)
-        fs = d['info']['time_map']['counter_rate']
-        t_start = d['info']['time_range_utc']['start']
-        t_end = d['info']['time_range_utc']['end']
-        t_width = t_end - t_start
-        s_now = d['info']['time_range_samples']['start']
-        s_end = d['info']['time_range_samples']['end'] + 1
-        length = s_end - s_now
-        if length > 250_000_000:
-            self.error('window size too big')
+        try:
+            rv = find_windows(self, kwargs['signal'], self.x_range, kwargs['width'],
+                              kwargs.get('count', 1), kwargs.get('find_min', False))
+        except ValueError as ex:
+            self.error(str(ex))
             return
-        width = int(np.rint(utc_width * fs))
-        if width > length:
-            self.error('width > region')
+        if rv is None:
             return
-        rsp = self.request(signal, 'samples', s_now, 0, s_end - s_now)
-        data = rsp_as_f32(rsp)
-        i0 = 0
-        i1 = width
-        m = np.sum(data[i0:i1])
-        max_v = m
-        max_i = 0
-        progress_counter = 0
-        while i1 < length:
-            m += data[i1] - data[i0]
-            if m > max_v:
-                m = max_v
-                max_i = i0
-            i0 += 1
-            i1 += 1
-            progress_counter += 1
-            if progress_counter >= 10_000:
-                self.progress(i0 / length)
-                progress_counter = 0
-
-        pos0 = max_i / (length - 1) * t_width + t_start
-        pos1 = (max_i + width) / (length - 1) * t_width + t_start
+        windows_max, windows_min = rv
+
         if origin is not None and 'Waveform' in origin:
-            action = ['add_dual', pos0, pos1]
-            pubsub_singleton.publish(f'{get_topic_name(origin)}/actions/!x_markers', action)
-        else:
-            self._log.info('Found range: %r', [pos0, pos1])
+            for _, t0, t1 in windows_max + windows_min:
+                action = ['add_dual', t0, t1]
+                pubsub_singleton.publish(f'{get_topic_name(origin)}/actions/!x_markers', action)
+        for name, items in [('max', windows_max), ('min', windows_min)]:
+            for v, t0, t1 in items:
+                self._log.info('%s window: mean=%g, range=%r', name, v, [t0, t1])
 
     @staticmethod
     def on_cls_action_run(value):
@@ -124,7 +144,17 @@ class MaxWindowDialog(QtWidgets.QDialog):
         self._form.setWidget(1, QtWidgets.QFormLayout.FieldRole, self._signal)
         signal_combobox_config(self._signal, value)
 
-        self._layout.addLayout(self._form)
+        self._count_label = QtWidgets.QLabel(N_('Windows'), self)
+        self._form.setWidget(2, QtWidgets.QFormLayout.LabelRole, self._count_label)
+        self._count = QtWidgets.QSpinBox(self)
+        self._count.setRange(1, 100)
+        self._count.setValue(1)
+        self._form.setWidget(2, QtWidgets.QFormLayout.FieldRole, self._count)
+
+        self._find_min_label = QtWidgets.QLabel(N_('Also find minimum'), self)
+        self._form.setWidget(3, QtWidgets.QFormLayout.LabelRole, self._find_min_label)
+        self._find_min = QtWidgets.QCheckBox(self)
+        self._form.setWidget(3, QtWidgets.QFormLayout.FieldRole, self._find_min)
 
         self._layout.addLayout(self._form)
         self._buttons = QtWidgets.QDialogButtonBox(self)
@@ -147,6 +177,8 @@ class MaxWindowDialog(QtWidgets.QDialog):
             self._value['kwargs'] = {
                 'width': float(self._width.value()),
                 'signal': self._value['signals'][self._signal.currentIndex()],
+                'count': int(self._count.value()),
+                'find_min': bool(self._find_min.isChecked()),
             }
             w = MaxWindowRangeTool(self._value)
             pubsub_singleton.register(w)
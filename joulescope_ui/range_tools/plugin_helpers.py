@@ -12,41 +12,102 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from joulescope_ui.range_tool_kernels import DistributionKernel, QuantileRefineKernel, \
+    quantile_ranks, sketch_locate
 import logging
 import numpy as np
 from math import ceil
-from PySide6 import QtWidgets
+from PySide6 import QtCore, QtWidgets
 
 _log = logging.getLogger(__name__)
+PERCENTILES = (50.0, 99.0, 99.9)
+SCALES = ['linear', 'log']
+_LOG_DECADES = 6          # log scale span when the range includes values <= 0
+_LOG_BINS_PER_DECADE = 20
+_CHUNK_SIZE = 1_000_000
 
 
-def calculate_histogram(range_tool, range_tool_value, signal, num_bins: int = 0):
+def _bin_edges(stats, length, num_bins, scale):
+    _, v_std, v_min, v_max = stats
+    if scale == 'log' and v_max > 0:
+        v_min = v_min if v_min > 0 else v_max / 10 ** _LOG_DECADES
+        decades = np.log10(v_max / v_min)
+        if num_bins <= 0:
+            num_bins = max(1, ceil(decades * _LOG_BINS_PER_DECADE))
+        return np.logspace(np.log10(v_min), np.log10(v_max), num_bins + 1)
+    if scale == 'log':
+        _log.warning('log scale requires positive values, use linear')
+    if num_bins <= 0:
+        width = 3.5 * v_std / (length ** (1. / 3))
+        num_bins = ceil((v_max - v_min) / width) if width > 0 else 1  # constant signal
+    return np.linspace(v_min, v_max, num_bins + 1)
+
+
+def calculate_distribution(range_tool, range_tool_value, signal, num_bins: int = 0,
+                           scale: str = None, percentiles=None):
+    """Compute the distribution of a signal's values over a range.
+
+    :param range_tool: The RangeToolBase instance.
+    :param range_tool_value: The range tool value containing x_range.
+    :param signal: The signal_id string.
+    :param num_bins: The number of histogram bins.  0 computes the bins
+        automatically.
+    :param scale: The bin scale, one of SCALES.  None is linear.  The log
+        scale spaces the bins logarithmically, which suits current.
+    :param percentiles: The optional iterable of percentiles in the
+        range [0, 100] to compute exactly, such as PERCENTILES.
+    :return: The dict with keys hist, bin_edges, sketch and percentiles,
+        which maps each percentile to its value.  Returns None if aborted.
+
+    The histogram and the quantile sketch are computed together in one
+    pass.  Exact percentiles require a second pass over only the samples
+    in the sketch buckets that contain them.  Results are stored in the
+    range tool result cache, so repeated analyses of the same range,
+    such as with a different normalization, are fast.
+    """
+    scale = 'linear' if scale is None else str(scale)
     d = range_tool.request(signal, 'utc', *range_tool_value['x_range'], 1)
     s_now = d['info']['time_range_samples']['start']
     s_end = d['info']['time_range_samples']['end'] + 1  # +1 for inclusive to exclusive
+    cache_args = ('distribution', signal, [s_now, s_end - 1], {'num_bins': int(num_bins), 'scale': scale})
+    entry = range_tool.cache_get(*cache_args)
+    modified = entry is None
 
-    length = s_end - s_now
-    _, v_std, v_min, v_max = s_data = d['data'][0, :]
-    width = 3.5 * v_std / (length ** (1. / 3))
-    if num_bins <= 0:
-        num_bins = ceil((v_max - v_min) / width)
-    hist = None
-    bin_edges = None
-
-    while True:
-        if s_now >= s_end:
-            break
-        length = min(100_000, s_end - s_now)
-        d_iter = range_tool.request(signal, 'samples', s_now, 0, length)
-        y = d_iter['data']
-        if bin_edges is None:
-            hist, bin_edges = np.histogram(y, range=(v_min, v_max), bins=num_bins)
-        else:
-            hist += np.histogram(y, bins=bin_edges)[0]
-        s_now += length
-        range_tool.progress(s_now / s_end)
-
-    return hist, bin_edges
+    if entry is None:
+        bin_edges = _bin_edges(d['data'][0, :], s_end - s_now, num_bins, scale)
+        kernel = DistributionKernel(bin_edges)
+        rv = range_tool.run_kernel(kernel, signal, [s_now, s_end - 1], _CHUNK_SIZE, time_type='samples')
+        if rv is None:
+            return None
+        hist, sketch = rv
+        entry = {'hist': hist, 'bin_edges': bin_edges, 'sketch': sketch, 'percentiles': {}}
+
+    missing = [float(p) for p in (percentiles or []) if float(p) not in entry['percentiles']]
+    total = int(np.sum(entry['sketch']))
+    if len(missing) and total:
+        locations = sketch_locate(entry['sketch'], quantile_ranks(total, [p / 100.0 for p in missing]))
+        kernel = QuantileRefineKernel([b for b, _ in locations])
+        counts = range_tool.run_kernel(kernel, signal, [s_now, s_end - 1], _CHUNK_SIZE, time_type='samples')
+        if counts is None:
+            return None
+        entry = dict(entry)
+        entry['percentiles'] = dict(entry['percentiles'])
+        entry['percentiles'].update(zip(missing, kernel.values(counts, locations)))
+        modified = True
+
+    if modified:
+        range_tool.cache_put(*cache_args, entry)
+    rv = dict(entry)
+    rv['percentiles'] = {p: entry['percentiles'][float(p)]
+                         for p in (percentiles or []) if float(p) in entry['percentiles']}
+    return rv
+
+
+def calculate_histogram(range_tool, range_tool_value, signal, num_bins: int = 0):
+    rv = calculate_distribution(range_tool, range_tool_value, signal, num_bins)
+    if rv is None:
+        return None, None
+    return rv['hist'], rv['bin_edges']
 
 
 def normalize_hist(hist, bin_edges, norm: str = None):
@@ -70,3 +131,30 @@ def signal_combobox_config(combobox: QtWidgets.QComboBox, value):
         signal_name = '.'.join(signal_id.split('.')[-2:])
         combobox.addItem(signal_name)
     combobox.setCurrentIndex(default_idx)
+
+
+def percentile_lines(plot, lines, percentiles, log_x=False):
+    """Show vertical percentile marker lines on a plot.
+
+    :param plot: The pyqtgraph PlotItem.
+    :param lines: The list of lines previously returned by this function.
+    :param percentiles: The list of [percentile, value] pairs, or None.
+    :param log_x: True when the plot x-axis uses log10 coordinates.
+    :return: The new list of lines.
+    """
+    import pyqtgraph as pg  # deferred: expensive import off the startup path (#206)
+    for line in lines:
+        plot.removeItem(line)
+    lines = []
+    for p, v in (percentiles or []):
+        x = v
+        if log_x:
+            if v <= 0:
+                continue
+            x = np.log10(v)
+        line = pg.InfiniteLine(pos=x, angle=90, movable=False,
+                               pen=pg.mkPen((255, 255, 0), style=QtCore.Qt.DashLine),
+                               label=f'p{p:g}={v:.6g}', labelOpts={'position': 0.95})
+        plot.addItem(line, ignoreBounds=True)
+        lines.append(line)
+    return lines
@@ -0,0 +1,272 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from joulescope_ui import register, N_, pubsub_singleton, P_
+from joulescope_ui.range_tool import RangeToolBase
+from joulescope_ui.range_tool_kernels import SpectrogramKernel
+from .frequency import _WINDOWS
+from .plugin_helpers import signal_combobox_config
+import logging
+import numpy as np
+from PySide6 import QtCore, QtWidgets
+from joulescope_ui.styles import styled_widget
+
+
+_NAME = N_('Spectrogram')
+_COLUMNS_DEFAULT = 1024
+_COLUMNS_MAX = 4096
+
+
+@register
+class SpectrogramRangeTool(RangeToolBase):
+    NAME = _NAME
+    BRIEF = N_('Compute the frequency spectrum over time')
+    DESCRIPTION = P_([
+        N_("""Compute the frequency spectrum of the signal's data values
+        over time across the selected range."""),
+        N_("""The range is processed in chunks.  When the range contains more
+        spectra than the display width, adjacent spectra are averaged so
+        that memory use does not depend on the range duration.""")])
+
+    def __init__(self, value):
+        super().__init__(value)
+
+    def _run(self):
+        kwargs = self.kwargs
+        signal = kwargs['signal']
+        window = kwargs['window']
+        nfft = kwargs['nfft']
+        overlap = kwargs['overlap']
+        columns = kwargs.get('columns', _COLUMNS_DEFAULT)
+
+        d = self.request(signal, 'utc', *self.x_range, 1)
+        fs = d['info']['time_map']['counter_rate']
+        s_start = d['info']['time_range_samples']['start']
+        s_end = d['info']['time_range_samples']['end'] + 1
+        sample_count = s_end - s_start
+
+        if nfft > sample_count:
+            nfft = sample_count & 0xfffffffe  # make even
+        if nfft < 2:
+            self.error('range too short')
+            return
+
+        overlap = int(min(1.0, max(0.0, overlap)) * nfft)
+        sample_jump = nfft - overlap
+        window = _WINDOWS[window](nfft)
+        fft_factor = 2.0 / (fs * np.sum(window * window))
+
+        kernel = SpectrogramKernel(nfft, sample_jump, window, s_start, sample_count, columns)
+        cache_args = ('spectrogram', signal, [s_start, s_end - 1],
+                      {'window': kwargs['window'], 'nfft': nfft, 'step': sample_jump, 'columns': kernel.columns})
+        y = self.cache_get(*cache_args)
+        if y is None:
+            y = self.run_kernel(kernel, signal, [s_start, s_end - 1], max(int(fs), 4 * nfft), time_type='samples')
+            if y is None:
+                return
+            self.cache_put(*cache_args, y)
+        if not len(y):
+            return
+        with np.errstate(divide='ignore'):
+            y = 10 * np.log10(y * fft_factor)  # convert to dB
+        column_duration = kernel.group * sample_jump / fs
+
+        self.pubsub.publish('registry/view/actions/!widget_open', {
+            'value': 'SpectrogramRangeToolWidget',
+            'kwargs': {
+                'data': {
+                    'x': np.arange(len(y)) * column_duration,
+                    'y': np.arange(nfft // 2 + 1) * (fs / nfft),
+                    'z': y.astype(np.float32),
+                },
+            },
+            'floating': True,
+        })
+
+    @staticmethod
+    def on_cls_action_run(value):
+        SpectrogramRangeToolDialog(value)
+
+
+@register
+@styled_widget(_NAME)
+class SpectrogramRangeToolWidget(QtWidgets.QWidget):
+
+    SETTINGS = {
+        'data': {
+            'dtype': 'obj',
+            'brief': 'Hold the spectrogram data',
+            'default': None,
+            'flags': ['hide', 'tmp'],  # large array, do not persist
+        }
+    }
+
+    def __init__(self, data=None):
+        import pyqtgraph as pg  # deferred: expensive import off the startup path (#206)
+        self._data = data
+        self._image = None
+        self._colorbar = None
+        self._t = None
+        self._f = None
+        self._z = None
+        super().__init__()
+        self._layout = QtWidgets.QHBoxLayout(self)
+        self._layout.setSpacing(0)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+        self._win = pg.GraphicsLayoutWidget(parent=self, title=_NAME)
+        self._win.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        self._layout.addWidget(self._win)
+
+        self._label = pg.LabelItem(justify='right')
+        self._win.addItem(self._label, row=0, col=0)
+        self._p = self._win.addPlot(row=1, col=0)
+        p = self._p
+        p.setLabels(left='Frequency (Hz)', bottom='Time (s)')
+
+        self.proxy = pg.SignalProxy(
+            p.scene().sigMouseMoved, rateLimit=60, slot=self._on_mouse_moved)
+
+    def on_pubsub_register(self):
+        if self._data is not None:
+            self.data = self._data
+
+    @QtCore.Slot(object)
+    def _on_mouse_moved(self, evt):
+        pos = evt[0]
+        p = self._p
+        if self._z is None or not p.sceneBoundingRect().contains(pos):
+            return
+        pt = p.vb.mapSceneToView(pos)
+        t_idx = int(np.clip(np.searchsorted(self._t, pt.x(), side='right') - 1, 0, len(self._t) - 1))
+        f_idx = int(np.clip(np.rint(pt.y() / max(self._f[-1], 1e-15) * (len(self._f) - 1)), 0, len(self._f) - 1))
+        z = self._z[t_idx, f_idx]
+        self._label.setText(f't={self._t[t_idx]:.6f} s, f={self._f[f_idx]:.1f} Hz, {z:.1f} dB')
+
+    def on_setting_data(self, value):
+        import pyqtgraph as pg  # deferred: expensive import off the startup path (#206)
+        if value is None:
+            self._t = None
+            self._f = None
+            self._z = None
+            return
+        self._data = value
+        self._t, self._f, self._z = value['x'], value['y'], value['z']
+        p = self._p
+        if self._image is not None:
+            p.removeItem(self._image)
+        z = self._z
+        finite = z[np.isfinite(z)]
+        if len(finite):
+            z_min, z_max = np.percentile(finite, [1, 99.9])
+        else:
+            z_min, z_max = -1.0, 0.0
+        cmap = pg.colormap.get('viridis')
+        self._image = pg.ImageItem(z, levels=(z_min, z_max))  # image[time, frequency]
+        self._image.setColorMap(cmap)
+        t_step = self._t[1] - self._t[0] if len(self._t) > 1 else 1.0
+        f_end = self._f[-1] if self._f[-1] > 0 else 1.0
+        f_step = f_end / max(1, len(self._f) - 1)
+        x0, x1 = 0.0, t_step * len(self._t)
+        y0, y1 = -f_step / 2, f_end + f_step / 2
+        self._image.setRect(QtCore.QRectF(x0, y0, x1 - x0, y1 - y0))
+        p.addItem(self._image)
+        if self._colorbar is None:
+            self._colorbar = p.addColorBar(self._image, colorMap=cmap, values=(z_min, z_max))
+        else:
+            self._colorbar.setImageItem(self._image)
+            self._colorbar.setLevels((z_min, z_max))
+        p.getViewBox().setLimits(xMin=x0, xMax=x1, yMin=y0, yMax=y1)
+        p.setXRange(x0, x1, padding=0.0)
+        p.setYRange(y0, y1, padding=0.0)
+
+
+class SpectrogramRangeToolDialog(QtWidgets.QDialog):
+
+    def __init__(self, value):
+        self._value = value
+        parent = pubsub_singleton.query('registry/ui/instance')
+        super().__init__(parent=parent)
+        self._log = logging.getLogger(f'{__name__}.dialog')
+        self.setObjectName('SpectrogramRangeToolDialog')
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        self.setWindowTitle(N_('Spectrogram configuration'))
+        self._layout = QtWidgets.QVBoxLayout(self)
+        self._form = QtWidgets.QFormLayout()
+
+        self._signal_label = QtWidgets.QLabel(N_('Signal'), self)
+        self._form.setWidget(0, QtWidgets.QFormLayout.LabelRole, self._signal_label)
+        self._signal = QtWidgets.QComboBox(self)
+        signal_combobox_config(self._signal, value)
+        self._form.setWidget(0, QtWidgets.QFormLayout.FieldRole, self._signal)
+
+        self._window_label = QtWidgets.QLabel(N_('Window'), self)
+        self._form.setWidget(1, QtWidgets.QFormLayout.LabelRole, self._window_label)
+        self._window = QtWidgets.QComboBox(self)
+        for key in _WINDOWS.keys():
+            self._window.addItem(key)
+        self._window.setCurrentIndex(2)  # hamming
+        self._form.setWidget(1, QtWidgets.QFormLayout.FieldRole, self._window)
+
+        self._fft_length_label = QtWidgets.QLabel(N_('FFT Length'), self)
+        self._form.setWidget(2, QtWidgets.QFormLayout.LabelRole, self._fft_length_label)
+        self._fft_length = QtWidgets.QComboBox(self)
+        for pow2 in range(6, 15):
+            self._fft_length.addItem(str(2 ** pow2))
+        self._fft_length.setCurrentIndex(4)  # 1024
+        self._form.setWidget(2, QtWidgets.QFormLayout.FieldRole, self._fft_length)
+
+        self._overlap_label = QtWidgets.QLabel(N_('Overlap %'), self)
+        self._form.setWidget(3, QtWidgets.QFormLayout.LabelRole, self._overlap_label)
+        self._overlap = QtWidgets.QSpinBox(self)
+        self._overlap.setRange(0, 75)
+        self._overlap.setValue(50)
+        self._form.setWidget(3, QtWidgets.QFormLayout.FieldRole, self._overlap)
+
+        self._layout.addLayout(self._form)
+        self._buttons = QtWidgets.QDialogButtonBox(self)
+        self._buttons.setOrientation(QtCore.Qt.Horizontal)
+        self._buttons.setStandardButtons(QtWidgets.QDialogButtonBox.Cancel | QtWidgets.QDialogButtonBox.Ok)
+        self._layout.addWidget(self._buttons)
+        self._buttons.accepted.connect(self.accept)
+        self._buttons.rejected.connect(self.reject)
+        self.finished.connect(self._on_finished)
+        self.resize(259, 140)
+        self._log.info('open')
+        self.open()
+
+    def _columns(self):
+        screen = self.screen()
+        if screen is None:
+            return _COLUMNS_DEFAULT
+        return int(min(_COLUMNS_MAX, max(64, screen.size().width())))
+
+    @QtCore.Slot(int)
+    def _on_finished(self, value):
+        self._log.info('finished: %d', value)
+
+        if value == QtWidgets.QDialog.DialogCode.Accepted:
+            self._log.info('finished: accept - start spectrogram')
+            self._value['kwargs'] = {
+                'signal': self._value['signals'][self._signal.currentIndex()],
+                'window': self._window.currentText(),
+                'nfft': int(self._fft_length.currentText()),
+                'overlap': self._overlap.value() / 100.0,
+                'columns': self._columns(),
+            }
+            w = SpectrogramRangeTool(self._value)
+            pubsub_singleton.register(w)
+        else:
+            self._log.info('finished: reject - abort spectrogram')  # no action required
+        self.close()
@@ -25,6 +25,7 @@ import logging
 
 
 _log = logging.getLogger(__name__)
+_CHUNK_SIZE = 100_000  # samples per request, bounds memory
 USBET20_PATHS = [
     r"C:\Program Files\USB-IF Test Suite\USBET20\USBET20.exe",
     r"C:\Program Files (x86)\USB-IF Test Suite\USBET20\USBET20.exe",
@@ -48,6 +49,32 @@ def construct_path(base_path):
     return p
 
 
+def inrush_csv_write(path, chunks, fs):
+    """Write the USBET inrush current CSV file incrementally.
+
+    :param path: The output CSV file path.
+    :param chunks: The iterable of (offset, current, voltage) where offset
+        is the sample offset from the start of the range and current and
+        voltage are aligned np.ndarray blocks.
+    :param fs: The sample rate in Hz.
+    :return: The mean voltage over the valid current samples,
+        or None when no current samples are valid.
+    """
+    v_sum = 0.0
+    v_count = 0
+    with open(path, 'wt') as f:
+        for offset, current, voltage in chunks:
+            n = min(len(current), len(voltage))
+            current, voltage = current[:n], voltage[:n]
+            valid = np.isfinite(current)
+            k = np.flatnonzero(valid)
+            v_sum += float(np.sum(voltage[valid], dtype=np.float64))
+            v_count += len(k)
+            values = np.column_stack(((k + offset) * (1.0 / fs), current[k]))
+            np.savetxt(f, values, ['%.8f', '%.3f'], delimiter=',')
+    return (v_sum / v_count) if v_count else None
+
+
 class UsbInrush(RangeToolBase):
     NAME = N_('USB Inrush')
     BRIEF = N_('Perform USB Inrush testing')
@@ -88,22 +115,21 @@ class UsbInrush(RangeToolBase):
             self.error(f'Current and voltage signals not found.')
             return
 
-        i = self.request(i_signal, 'utc', *self.x_range, 0, timeout=30000.0)
-        v = self.request(v_signal, 'utc', *self.x_range, 0, timeout=30000.0)
-        fs = i['info']['time_map']['counter_rate']
-
-        current = i['data']
-        voltage = v['data']
-        x = np.arange(len(current), dtype=np.float64) * (1.0 / fs)
-        valid = np.isfinite(current)
-        voltage = np.mean(voltage[valid])
-        x = x[valid].reshape((-1, 1))
-        i_mean = current[valid].reshape((-1, 1))
-        values = np.hstack((x, i_mean))
-
+        d = self.request(i_signal, 'utc', *self.x_range, 1)
+        fs = d['info']['time_map']['counter_rate']
+        s_start = d['info']['time_range_samples']['start']
+        s_end = d['info']['time_range_samples']['end']
+        # same sample range for both, so the chunks align
+        i_chunks = self.iter_chunks(i_signal, [s_start, s_end], _CHUNK_SIZE, time_type='samples')
+        v_chunks = self.iter_chunks(v_signal, [s_start, s_end], _CHUNK_SIZE, time_type='samples', progress=None)
+        chunks = ((i_id - s_start, i, v) for (i_id, i), (_, v) in zip(i_chunks, v_chunks))
         filename = os.path.join(dpath, 'inrush.csv')
-        with open(filename, 'wt') as f:
-            np.savetxt(f, values, ['%.8f', '%.3f'], delimiter=',')
+        voltage = inrush_csv_write(filename, chunks, fs)
+        if self.abort:
+            return
+        if voltage is None:
+            self.error('No valid current samples.')
+            return
         args = ','.join(['usbinrushcheck', filename, '%.3f' % voltage])
         # USBET has a very strange argument handler that expects the argument to split at spaces
         args = args.split(' ')
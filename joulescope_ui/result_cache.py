@@ -0,0 +1,299 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Content-addressed cache for range tool results.
+
+Each result is addressed by the digest of its source identity, signal,
+sample range, tool and parameters.  The memory tier is a bounded LRU.
+The optional disk tier stores results for JLS files in a directory
+next to the file, so that results survive closing and reopening.
+"""
+
+from collections import OrderedDict
+import hashlib
+import io
+import json
+import logging
+import numpy as np
+import os
+import threading
+
+
+MEMORY_BYTES_MAX = 256 * 1024 ** 2
+DISK_BYTES_MAX = 64 * 1024 ** 2
+DISK_DIR_SUFFIX = '.results'
+DISK_SETTING = 'registry/app/settings/range_tool_cache_disk'
+_ITEM_OVERHEAD = 64
+_log = logging.getLogger(__name__)
+_singleton = None
+_singleton_lock = threading.Lock()
+
+
+def source_identity(pubsub, source):
+    """Get the identity for a SIGNAL_BUFFER_SOURCE.
+
+    :param pubsub: The pubsub instance.
+    :param source: The source unique id.
+    :return: (identity, path).  identity is the JSON-serializable object
+        that changes whenever the source data changes, or None when the
+        source data cannot be identified.  path is the JLS file path for
+        the disk tier, or None.
+
+    File sources are identified by path, modification time and size.
+    Streaming sources are identified by their unique id and
+    settings/generation, which changes when the buffer is cleared.
+    """
+    topic = f'registry/{source}/settings'
+    path = pubsub.query(f'{topic}/path', default=None)
+    paths = pubsub.query(f'{topic}/paths', default=None)
+    if path:
+        paths = [path]
+    if paths:
+        files = []
+        for p in paths:
+            try:
+                s = os.stat(p)
+            except OSError:
+                return None, None
+            files.append([os.path.abspath(p), s.st_mtime_ns, s.st_size])
+        identity = {'files': files}
+        offsets = pubsub.query(f'{topic}/offsets', default=None)
+        if offsets:
+            identity['offsets'] = offsets
+        return identity, (files[0][0] if path else None)
+    generation = pubsub.query(f'{topic}/generation', default=None)
+    if generation is not None:
+        return {'source': source, 'generation': int(generation)}, None
+    return None, None
+
+
+def result_key(identity, signal, sample_range, tool, params):
+    """Compute the content address for a result.
+
+    :param identity: The source identity from :func:`source_identity`.
+    :param signal: The signal_id as '{source}.{device}.{quantity}'.  Only
+        the device and quantity are used, since the identity
+        already describes the source.
+    :param sample_range: The [start, end] sample ids.
+    :param tool: The tool name.
+    :param params: The JSON-serializable dict of parameters that affect
+        the result.
+    :return: The hex digest string.
+    """
+    key = {
+        'identity': identity,
+        'signal': '.'.join(signal.split('.')[-2:]),
+        'range': [int(x) for x in sample_range],
+        'tool': tool,
+        'params': params,
+    }
+    s = json.dumps(key, sort_keys=True, default=_json_default)
+    return hashlib.sha256(s.encode('utf-8')).hexdigest()
+
+
+def _json_default(obj):
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, (np.ndarray, tuple)):
+        return list(obj)
+    raise TypeError(f'unsupported key type {type(obj)}')
+
+
+def _encode(value, arrays):
+    """Replace arrays with references for storage in an npz file."""
+    if isinstance(value, np.ndarray):
+        name = f'a{len(arrays)}'
+        arrays[name] = value
+        return {'__array__': name}
+    elif isinstance(value, dict):
+        return {'__dict__': [[_encode(k, arrays), _encode(v, arrays)] for k, v in value.items()]}
+    elif isinstance(value, tuple):
+        return {'__tuple__': [_encode(v, arrays) for v in value]}
+    elif isinstance(value, list):
+        return [_encode(v, arrays) for v in value]
+    elif isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _decode(value, arrays):
+    if isinstance(value, list):
+        return [_decode(v, arrays) for v in value]
+    elif isinstance(value, dict):
+        if '__array__' in value:
+            return arrays[value['__array__']]
+        elif '__tuple__' in value:
+            return tuple(_decode(v, arrays) for v in value['__tuple__'])
+        elif '__dict__' in value:
+            return {_decode(k, arrays): _decode(v, arrays) for k, v in value['__dict__']}
+    return value
+
+
+def _freeze(value):
+    """Make the arrays in a value read-only and return its size in bytes."""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+        return value.nbytes
+    elif isinstance(value, dict):
+        return sum(_freeze(k) + _freeze(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        return sum(_freeze(v) for v in value) + _ITEM_OVERHEAD
+    return _ITEM_OVERHEAD
+
+
+class ResultCache:
+    """A two tier cache for range tool results.
+
+    :param bytes_max: The maximum memory tier size in bytes.
+    :param disk_bytes_max: The maximum disk tier size in bytes per directory.
+
+    Values are dicts, lists and tuples containing numpy arrays and
+    JSON-serializable scalars.  Cached arrays are read-only, since
+    multiple tools may share them.  This class is thread-safe.
+    """
+
+    def __init__(self, bytes_max=None, disk_bytes_max=None):
+        self._bytes_max = MEMORY_BYTES_MAX if bytes_max is None else int(bytes_max)
+        self._disk_bytes_max = DISK_BYTES_MAX if disk_bytes_max is None else int(disk_bytes_max)
+        self._lock = threading.Lock()
+        self._items = OrderedDict()  # digest -> (value, size)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        """Clear the memory tier."""
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    @staticmethod
+    def disk_dir(path):
+        """The disk tier directory for a JLS file path."""
+        return path + DISK_DIR_SUFFIX
+
+    def get(self, key, path=None):
+        """Get a cached result.
+
+        :param key: The digest from :func:`result_key`.
+        :param path: The JLS file path to enable the disk tier, or None.
+        :return: The cached value or None.
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[0]
+        value = None if path is None else self._disk_get(key, path)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._memory_put(key, value)
+        return value
+
+    def put(self, key, value, path=None):
+        """Store a result.
+
+        :param key: The digest from :func:`result_key`.
+        :param value: The value.
+        :param path: The JLS file path to enable the disk tier, or None.
+        """
+        self._memory_put(key, value)
+        if path is not None:
+            self._disk_put(key, value, path)
+
+    def _memory_put(self, key, value):
+        size = _freeze(value)
+        with self._lock:
+            item = self._items.pop(key, None)
+            if item is not None:
+                self._bytes -= item[1]
+            if size > self._bytes_max:
+                return
+            self._items[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self._bytes_max:
+                _, (_, sz) = self._items.popitem(last=False)
+                self._bytes -= sz
+
+    def _disk_get(self, key, path):
+        fname = os.path.join(self.disk_dir(path), f'{key}.npz')
+        try:
+            with np.load(fname, allow_pickle=False) as f:
+                arrays = {k: f[k] for k in f.files}
+            structure = json.loads(bytes(arrays.pop('__structure__')).decode('utf-8'))
+            os.utime(fname)  # least recently used eviction
+            return _decode(structure, arrays)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            _log.warning('invalid cache file %s', fname)
+            return None
+
+    def _disk_put(self, key, value, path):
+        d = self.disk_dir(path)
+        fname = os.path.join(d, f'{key}.npz')
+        arrays = {}
+        structure = json.dumps(_encode(value, arrays)).encode('utf-8')
+        arrays['__structure__'] = np.frombuffer(structure, dtype=np.uint8)
+        b = io.BytesIO()
+        np.savez(b, **arrays)
+        try:
+            os.makedirs(d, exist_ok=True)
+            tmp = f'{fname}.{os.getpid()}.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(b.getbuffer())
+            os.replace(tmp, fname)
+            self._disk_evict(d)
+        except OSError:
+            _log.warning('could not write cache file %s', fname)
+
+    def _disk_evict(self, d):
+        entries = []
+        for name in os.listdir(d):
+            if not name.endswith('.npz'):
+                continue
+            p = os.path.join(d, name)
+            try:
+                s = os.stat(p)
+            except OSError:
+                continue
+            entries.append((s.st_mtime_ns, s.st_size, p))
+        entries.sort()
+        total = sum(e[1] for e in entries)
+        for _, size, p in entries[:-1]:
+            if total <= self._disk_bytes_max:
+                break
+            try:
+                os.remove(p)
+                total -= size
+            except OSError:
+                pass
+
+
+def result_cache():
+    """Get the shared result cache instance."""
+    global _singleton
+    with _singleton_lock:
+        if _singleton is None:
+            _singleton = ResultCache()
+        return _singleton
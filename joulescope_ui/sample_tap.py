@@ -0,0 +1,86 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Direct access to streaming sample data on the device threads.
+
+Devices publish each sample data message to PubSub, which queues the
+message for processing on the UI thread.  Consumers that must not depend
+on the UI thread, such as the trigger engine, add a tap instead.  The
+device calls the tap on its own thread before the PubSub publish.
+"""
+
+import logging
+import threading
+
+
+class SampleTap:
+    """Dispatch signal data messages from device threads to consumers.
+
+    Taps are keyed by the full PubSub data topic, such as
+    'registry/JS220-001122/events/signals/i/!data', and called as
+    fn(topic, value) on the device thread.  A tap must return quickly,
+    typically by queueing the message for its own thread, and must not
+    modify the value.
+    """
+
+    def __init__(self):
+        self._log = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._taps = {}  # topic -> tuple of callables
+
+    def add(self, topic, fn):
+        """Add a tap.
+
+        :param topic: The signal data topic.
+        :param fn: The callable(topic, value).
+        """
+        with self._lock:
+            self._taps[topic] = self._taps.get(topic, ()) + (fn,)
+
+    def remove(self, fn, topic=None):
+        """Remove a tap.
+
+        :param fn: The callable provided to add().
+        :param topic: The signal data topic.  None removes fn from all topics.
+        """
+        with self._lock:
+            topics = list(self._taps.keys()) if topic is None else [topic]
+            for t in topics:
+                fns = tuple([f for f in self._taps.get(t, ()) if f != fn])
+                if len(fns):
+                    self._taps[t] = fns
+                else:
+                    self._taps.pop(t, None)
+
+    def publish(self, topic, value):
+        """Provide a signal data message to the taps.
+
+        :param topic: The signal data topic.
+        :param value: The signal data message.
+
+        Call from the device thread.  The cost is a single dict lookup
+        when the topic has no taps.
+        """
+        fns = self._taps.get(topic)
+        if not fns:
+            return
+        for fn in fns:
+            try:
+                fn(topic, value)
+            except Exception:
+                self._log.exception('tap %s', topic)
+
+
+sample_tap = SampleTap()
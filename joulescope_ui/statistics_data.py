@@ -0,0 +1,207 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The compact statistics data message for events/statistics/!data.
+
+The driver provides each statistics message as a nested dict.  Rather than
+copying and mutating that dict for each message, the statistics stream
+sources publish a read-only StatisticsData instance that holds the values in
+a flat numpy array.  All subscribers share the same instance, so subscribers
+must not modify it.  Use to_dict() to get the nested dict format, which the
+caller owns.
+"""
+
+from collections.abc import Mapping
+import numpy as np
+
+
+SIGNALS = ['current', 'voltage', 'power']
+STATISTICS = ['avg', 'std', 'min', 'max', 'p2p']
+ACCUMULATORS = ['charge', 'energy']
+FIELDS = [f'{s}_{stat}' for s in SIGNALS for stat in STATISTICS] + ACCUMULATORS
+FIELD_INDEX = {name: idx for idx, name in enumerate(FIELDS)}
+UNITS = {
+    'current': 'A',
+    'voltage': 'V',
+    'power': 'W',
+    'charge': 'C',
+    'energy': 'J',
+}
+_INTEGRAL_UNITS = {
+    'current': 'C',
+    'power': 'J',
+}
+
+
+def _range(time, key):
+    v = time.get(key)
+    return None if v is None else tuple(v['value'])
+
+
+class StatisticsData(Mapping):
+    """A read-only statistics data message.
+
+    :param value: The statistics data message in the nested dict format
+        provided by the driver or returned by to_dict().
+    :param unique_id: The source unique id.  None uses the value's
+        source unique_id, if present.
+    :param offsets: The optional [accum_sample_start, charge, energy]
+        accumulator offsets.  The message reports accum_samples from
+        accum_sample_start and the charge and energy relative to the
+        offsets.
+
+    The instance never modifies value.  Subscribers should use the
+    attributes, which do not allocate:
+
+    * unique_id: The source unique id.
+    * values: The read-only float64 array with one entry for each FIELDS
+      name.  Use FIELD_INDEX to find the entry for a field name.
+    * utc: The (start, end) time64 range.
+    * samples: The (start, end) sample id range.
+    * accum_samples: The (start, end) sample id range for charge and energy.
+    * sample_freq: The sample frequency in Hz.
+    * delta: The message duration in seconds.
+
+    For compatibility, the instance also provides read-only mapping access
+    to the nested dict format, such as value['signals']['current']['avg'].
+    The first mapping access builds and caches the nested dict.
+    """
+
+    __slots__ = ('unique_id', 'values', 'utc', 'samples', 'accum_samples',
+                 'sample_freq', 'delta', '_src', '_dict')
+
+    def __init__(self, value, unique_id=None, offsets=None):
+        time = value['time']
+        signals = value['signals']
+        accumulators = value['accumulators']
+        x = [signals[s][stat]['value'] for s in SIGNALS for stat in STATISTICS]
+        x.extend([accumulators[name]['value'] for name in ACCUMULATORS])
+        values = np.array(x, dtype=np.float64)
+        self.accum_samples = _range(time, 'accum_samples')
+        if offsets is not None:
+            accum_sample_start, charge, energy = offsets
+            values[-2] -= charge
+            values[-1] -= energy
+            if self.accum_samples is not None:
+                self.accum_samples = (accum_sample_start, self.accum_samples[1])
+        values.flags.writeable = False
+        if unique_id is None:
+            unique_id = value.get('source', {}).get('unique_id')
+        self.unique_id = unique_id
+        self.values = values
+        self.utc = _range(time, 'utc')
+        self.samples = _range(time, 'samples')
+        self.sample_freq = time.get('sample_freq', {}).get('value')
+        self.delta = time.get('delta', {}).get('value')
+        self._src = value
+        self._dict = None
+
+    def field(self, name):
+        """Get a field value.
+
+        :param name: The field name in FIELDS.
+        :return: The field value.
+        """
+        return float(self.values[FIELD_INDEX[name]])
+
+    def replace(self, values=None, samples=None):
+        """Create a modified copy.
+
+        :param values: The new array of values for each FIELDS name.
+            None keeps the existing values.
+        :param samples: The new (start, end) sample id range.
+            None keeps the existing range.
+        :return: The new StatisticsData instance.
+        """
+        rv = object.__new__(StatisticsData)
+        for name in StatisticsData.__slots__:
+            setattr(rv, name, getattr(self, name))
+        if values is not None:
+            values = np.array(values, dtype=np.float64)
+            values.flags.writeable = False
+            rv.values = values
+        if samples is not None:
+            rv.samples = tuple(samples)
+        rv._dict = None
+        return rv
+
+    def to_dict(self):
+        """Get the statistics data message in the nested dict format.
+
+        :return: The new nested dict, which the caller owns.
+        """
+        x = self.values.tolist()
+        time = {}
+        for key, v in self._src['time'].items():
+            v = dict(v)
+            if isinstance(v.get('value'), list):
+                v['value'] = list(v['value'])
+            time[key] = v
+        if self.samples is not None:
+            time['samples'] = {'value': list(self.samples), 'units': 'samples'}
+        if self.accum_samples is not None:
+            time['accum_samples'] = {'value': list(self.accum_samples), 'units': 'samples'}
+        signals = {}
+        for signal in SIGNALS:
+            units = UNITS[signal]
+            s = {}
+            for stat in STATISTICS:
+                s[stat] = {'value': x[FIELD_INDEX[f'{signal}_{stat}']], 'units': units}
+            integral_units = _INTEGRAL_UNITS.get(signal)
+            if integral_units is not None and self.delta is not None:
+                s['integral'] = {'value': s['avg']['value'] * self.delta, 'units': integral_units}
+            signals[signal] = s
+        accumulators = {}
+        for name in ACCUMULATORS:
+            v = dict(self._src['accumulators'][name])
+            v['value'] = x[FIELD_INDEX[name]]
+            v['units'] = UNITS[name]
+            accumulators[name] = v
+        rv = {
+            'time': time,
+            'signals': signals,
+            'accumulators': accumulators,
+        }
+        if self.unique_id is not None:
+            rv['source'] = {'unique_id': self.unique_id}
+        return rv
+
+    def _nested(self):
+        if self._dict is None:
+            self._dict = self.to_dict()
+        return self._dict
+
+    def __getitem__(self, key):
+        return self._nested()[key]
+
+    def __iter__(self):
+        return iter(self._nested())
+
+    def __len__(self):
+        return len(self._nested())
+
+    def __repr__(self):
+        return f'StatisticsData({self.unique_id}, utc={self.utc})'
+
+
+def as_statistics_data(value):
+    """Get the StatisticsData for a statistics data message.
+
+    :param value: The StatisticsData or the nested dict format.
+    :return: The StatisticsData instance.
+    """
+    if isinstance(value, StatisticsData):
+        return value
+    return StatisticsData(value)
@@ -0,0 +1,295 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Keep the recent statistics history for each statistics stream source.
+
+Each source stores every statistics message in the 'raw' tier along with
+the 1 second, 1 minute and 1 hour rollup tiers.  Each tier is a
+preallocated ring of numpy columns, so memory stays bounded.
+
+Publish to registry/statistics_history/actions/!query with the obj value:
+
+* id: The optional caller-provided query identifier, returned in the result.
+* source: The STATISTIC_STREAM_SOURCE unique id.
+* start: The optional start time64, which defaults to the oldest entry.
+* end: The optional end time64, which defaults to the newest entry.
+* tier: The optional tier name in TIERS.  When omitted, select the
+  finest tier that covers start and has at most max_points entries.
+* max_points: The optional maximum number of entries for tier selection.
+* rsp_topic: The optional topic to also receive the result.
+
+The history publishes the result to events/response as the obj with
+id, source, tier, period, fields, time and values.  The time is the
+int64 numpy array of the entry times, which is the message time for
+'raw' and the period start for the rollup tiers.  The values is the
+float64 numpy array with one row per entry and one column per field.
+"""
+
+from joulescope_ui import N_, CAPABILITIES, Metadata, get_topic_name, time64
+from joulescope_ui.statistics_data import FIELD_INDEX, as_statistics_data
+import logging
+import numpy as np
+
+
+TIERS = ['raw', '1s', '1m', '1h']
+_TIER_DEF = {          # period in seconds, capacity in entries
+    'raw': (0, 36_000),
+    '1s': (1, 86_400),      # 1 day
+    '1m': (60, 43_200),     # 30 days
+    '1h': (3600, 8_760),    # 1 year
+}
+_SIGNALS = ['current', 'voltage', 'power']
+_STATISTICS = ['avg', 'min', 'max', 'std']
+_ACCUMULATORS = ['charge', 'energy']
+FIELDS = [f'{s}_{stat}' for s in _SIGNALS for stat in _STATISTICS] + _ACCUMULATORS
+_AVG_IDX = [FIELDS.index(f'{s}_avg') for s in _SIGNALS]
+_MIN_IDX = [FIELDS.index(f'{s}_min') for s in _SIGNALS]
+_MAX_IDX = [FIELDS.index(f'{s}_max') for s in _SIGNALS]
+_STD_IDX = [FIELDS.index(f'{s}_std') for s in _SIGNALS]
+_ACCUM_IDX = [FIELDS.index(a) for a in _ACCUMULATORS]
+_DATA_IDX = np.array([FIELD_INDEX[f] for f in FIELDS], dtype=np.intp)  # StatisticsData.values index
+_SOURCES_TOPIC = f'registry_manager/capabilities/{CAPABILITIES.STATISTIC_STREAM_SOURCE}/list'
+
+
+class _Tier:
+    """One ring of history entries with its pending rollup period."""
+
+    def __init__(self, name, period, capacity):
+        self.name = name
+        self.period = period
+        self.capacity = capacity
+        self.time = np.zeros(capacity, dtype=np.int64)
+        self.data = np.zeros((capacity, len(FIELDS)), dtype=np.float64)
+        self.head = 0    # the next entry index
+        self.length = 0
+        self._bucket = None
+        self._n = 0
+        self._s1 = np.zeros(len(_SIGNALS))
+        self._s2 = np.zeros(len(_SIGNALS))
+        self._min = np.zeros(len(_SIGNALS))
+        self._max = np.zeros(len(_SIGNALS))
+        self._accum = np.zeros(len(_ACCUMULATORS))
+
+    def append(self, t, row):
+        """Append an entry."""
+        self.time[self.head] = t
+        self.data[self.head, :] = row
+        self.head = (self.head + 1) % self.capacity
+        self.length = min(self.length + 1, self.capacity)
+
+    def rollup(self, t, n, s1, s2, v_min, v_max, accum):
+        """Add to the pending rollup period.
+
+        :return: The completed period as the args for the next rollup()
+            or None.
+        """
+        bucket = t // (self.period * time64.SECOND)
+        rv = None
+        if bucket != self._bucket:
+            rv = self.flush()
+            self._bucket = bucket
+            self._n = n
+            self._s1[:] = s1
+            self._s2[:] = s2
+            self._min[:] = v_min
+            self._max[:] = v_max
+        else:
+            self._n += n
+            self._s1 += s1
+            self._s2 += s2
+            np.minimum(self._min, v_min, out=self._min)
+            np.maximum(self._max, v_max, out=self._max)
+        self._accum[:] = accum
+        return rv
+
+    def flush(self):
+        """Complete the pending rollup period.
+
+        :return: The completed period as the args for the next rollup()
+            or None.
+        """
+        if not self._n:
+            return None
+        t = int(self._bucket * self.period * time64.SECOND)
+        avg = self._s1 / self._n
+        row = np.empty(len(FIELDS))
+        row[_AVG_IDX] = avg
+        row[_MIN_IDX] = self._min
+        row[_MAX_IDX] = self._max
+        row[_STD_IDX] = np.sqrt(np.maximum(0.0, self._s2 / self._n - avg * avg))
+        row[_ACCUM_IDX] = self._accum
+        self.append(t, row)
+        rv = (t, self._n, self._s1.copy(), self._s2.copy(), self._min.copy(), self._max.copy(), self._accum.copy())
+        self._n = 0
+        return rv
+
+    def _order(self):
+        if self.length < self.capacity:
+            return np.arange(self.length)
+        return (np.arange(self.capacity) + self.head) % self.capacity
+
+    def range(self, start, end):
+        """Get the entry indices from start to end, inclusive, oldest first."""
+        if not self.length:
+            return np.zeros(0, dtype=np.int64)
+        idx = self._order()
+        t = self.time[idx]
+        i0 = 0 if start is None else np.searchsorted(t, start, side='left')
+        i1 = len(t) if end is None else np.searchsorted(t, end, side='right')
+        return idx[i0:i1]
+
+    @property
+    def time_first(self):
+        if not self.length:
+            return None
+        return int(self.time[0 if self.length < self.capacity else self.head])
+
+
+class SourceHistory:
+    """The statistics history for one source.
+
+    :param capacity: The optional dict of tier name to capacity in entries.
+    """
+
+    def __init__(self, capacity=None):
+        capacity = {} if capacity is None else capacity
+        self.tiers = {}
+        for name in TIERS:
+            period, n = _TIER_DEF[name]
+            self.tiers[name] = _Tier(name, period, capacity.get(name, n))
+
+    def append(self, value):
+        """Append a statistics data message."""
+        value = as_statistics_data(value)
+        t = value.utc[1]  # time64 format
+        row = value.values[_DATA_IDX]
+        self.tiers['raw'].append(t, row)
+        avg = row[_AVG_IDX]
+        std = row[_STD_IDX]
+        args = (t, 1, avg, std * std + avg * avg, row[_MIN_IDX], row[_MAX_IDX], row[_ACCUM_IDX])
+        for name in TIERS[1:]:
+            args = self.tiers[name].rollup(*args)
+            if args is None:
+                break
+
+    def query(self, start=None, end=None, tier=None, max_points=None):
+        """Get the history entries.
+
+        :param start: The start time64, None for the oldest.
+        :param end: The end time64, None for the newest.
+        :param tier: The tier name, None to select automatically.
+        :param max_points: The maximum entries for automatic tier selection.
+        :return: The (tier, time, data) tuple.
+        """
+        if tier is None:
+            tier = TIERS[-1]
+            for name in TIERS:
+                t = self.tiers[name]
+                if start is not None and (t.time_first is None or t.time_first > start):
+                    continue  # does not cover start
+                if max_points and len(t.range(start, end)) > max_points:
+                    continue
+                tier = name
+                break
+        elif tier not in self.tiers:
+            raise ValueError(f'invalid tier {tier}')
+        t = self.tiers[tier]
+        idx = t.range(start, end)
+        return tier, t.time[idx], t.data[idx, :]
+
+
+class StatisticsHistory:
+    """Keep the recent statistics history for all statistics sources."""
+
+    SETTINGS = {
+        'enable': {
+            'dtype': 'bool',
+            'brief': N_('Keep the statistics history.'),
+            'default': True,
+        },
+    }
+
+    EVENTS = {
+        'response': Metadata(dtype='obj',
+                             brief='Statistics history query result',
+                             detail='The dict with id, source, tier, period, fields, time and values',
+                             flags=['ro', 'skip_undo']),
+    }
+
+    def __init__(self):
+        self._log = logging.getLogger(__name__)
+        self._history = {}        # source unique id -> SourceHistory
+        self._subscriptions = {}  # source unique id -> unsubscribe fn
+
+    def on_pubsub_register(self):
+        self.pubsub.subscribe(_SOURCES_TOPIC, self._on_sources, ['pub', 'retain'])
+
+    def on_pubsub_unregister(self):
+        self.pubsub.unsubscribe(_SOURCES_TOPIC, self._on_sources)
+        self._on_sources([])
+
+    def _on_sources(self, value):
+        value = [] if value is None else value
+        for unique_id in list(self._subscriptions.keys()):
+            if unique_id not in value:
+                self.pubsub.unsubscribe(self._subscriptions.pop(unique_id))
+        for unique_id in value:
+            if unique_id not in self._subscriptions:
+                topic = f'{get_topic_name(unique_id)}/events/statistics/!data'
+                self._subscriptions[unique_id] = self.pubsub.subscribe(topic, self._on_data, ['pub'])
+
+    def _on_data(self, topic, value):
+        if not self.enable:
+            return
+        unique_id = topic.split('/')[1]
+        history = self._history.get(unique_id)
+        if history is None:
+            self._log.info('add source %s', unique_id)
+            history = SourceHistory()
+            self._history[unique_id] = history
+        history.append(value)
+
+    def on_action_query(self, value):
+        """Query the history.  See the module documentation for the value format."""
+        source = value.get('source')
+        rv = {
+            'id': value.get('id'),
+            'source': source,
+            'fields': FIELDS,
+        }
+        history = self._history.get(source)
+        try:
+            if history is None:
+                raise ValueError(f'no history for source {source}')
+            tier, t, data = history.query(value.get('start'), value.get('end'),
+                                          value.get('tier'), value.get('max_points'))
+            rv.update({'tier': tier, 'period': _TIER_DEF[tier][0], 'time': t, 'values': data})
+        except Exception as ex:
+            self._log.warning('query %s: %s', source, ex)
+            rv['error'] = str(ex)
+        self.pubsub.publish(f'{get_topic_name(self)}/events/response', rv)
+        rsp_topic = value.get('rsp_topic')
+        if rsp_topic:
+            self.pubsub.publish(rsp_topic, rv)
+
+    def on_action_clear(self, value):
+        """Clear the history.
+
+        :param value: The source unique id, or None to clear all sources.
+        """
+        if value is None:
+            self._history.clear()
+        else:
+            self._history.pop(value, None)
@@ -0,0 +1,248 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Span statistics from cached summary blocks.
+
+The dual markers request the mean, standard deviation, minimum and
+maximum over an arbitrary sample span.  This module computes them
+from cached fixed-size summary blocks for the span interior plus
+the exact samples at the span edges.  When a span moves by a few
+blocks, such as while dragging a marker, only the blocks that
+entered or left the span are added or removed.
+"""
+
+from collections import OrderedDict
+import numpy as np
+
+
+BLOCK_SIZE_DEFAULT = 65536
+PAGE_BLOCKS_DEFAULT = 1024
+PAGES_MAX_DEFAULT = 128
+SPANS_MAX_DEFAULT = 64
+_SPAN_UPDATES_MAX = 1024  # recompute from scratch to bound rounding drift
+
+# accumulator columns
+_N, _S1, _S2, _MIN, _MAX = range(5)
+
+
+def _acc_empty():
+    return np.array([0.0, 0.0, 0.0, np.inf, -np.inf], dtype=np.float64)
+
+
+def _acc_from_samples(x):
+    """Compute the accumulator for samples.
+
+    :param x: The sample np.ndarray.
+    :return: The accumulator [n, sum, sum of squares, min, max].
+    """
+    x = np.asarray(x, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    if not len(x):
+        return _acc_empty()
+    return np.array([len(x), np.sum(x), np.dot(x, x), np.min(x), np.max(x)], dtype=np.float64)
+
+
+def _acc_from_blocks(blocks):
+    """Reduce block accumulators into a single accumulator."""
+    if not len(blocks):
+        return _acc_empty()
+    acc = np.sum(blocks[:, :_MIN], axis=0)
+    return np.concatenate((acc, [np.min(blocks[:, _MIN]), np.max(blocks[:, _MAX])]))
+
+
+def _acc_merge(a, b):
+    return np.array([
+        a[_N] + b[_N],
+        a[_S1] + b[_S1],
+        a[_S2] + b[_S2],
+        min(a[_MIN], b[_MIN]),
+        max(a[_MAX], b[_MAX]),
+    ], dtype=np.float64)
+
+
+def acc_to_statistics(acc):
+    """Convert an accumulator into statistics.
+
+    :param acc: The accumulator [n, sum, sum of squares, min, max].
+    :return: The np.ndarray with shape (1, 4) containing
+        [mean, std, min, max], the same as a summary response.
+    """
+    n = acc[_N]
+    if n <= 0:
+        return np.full((1, 4), np.nan, dtype=np.float64)
+    mean = acc[_S1] / n
+    var = max(0.0, acc[_S2] / n - mean * mean)
+    return np.array([[mean, np.sqrt(var), acc[_MIN], acc[_MAX]]], dtype=np.float64)
+
+
+class _Span:
+
+    def __init__(self, b0, b1, acc):
+        self.b0 = b0
+        self.b1 = b1
+        self.acc = acc
+        self.updates = 0
+
+
+class SummaryCache:
+    """Compute span statistics from cached summary blocks.
+
+    :param length: The total number of samples.
+    :param block_fn: The callable(start, increment, length) that returns
+        the np.ndarray with shape (length, 4) containing [mean, std, min, max]
+        for each of length consecutive blocks of increment samples.
+        The std is the sample standard deviation (ddof=1), like
+        pyjls fsr_statistics.  Blocks with non-finite values are
+        recomputed from samples_fn.
+    :param samples_fn: The callable(start, length) that returns the
+        np.ndarray of exact samples.
+    :param block_size: The number of samples per summary block.  For the best
+        accuracy, use a multiple of the source's own summary decimation.
+    :param page_blocks: The number of blocks fetched and cached together.
+    :param pages_max: The maximum number of cached pages, which bounds memory.
+
+    This class is not thread-safe.  The caller must serialize access.
+    """
+
+    def __init__(self, length, block_fn, samples_fn, block_size=None, page_blocks=None, pages_max=None):
+        self._length = int(length)
+        self._block_fn = block_fn
+        self._samples_fn = samples_fn
+        self._block_size = int(BLOCK_SIZE_DEFAULT if block_size is None else block_size)
+        self._page_blocks = int(PAGE_BLOCKS_DEFAULT if page_blocks is None else page_blocks)
+        self._pages_max = int(PAGES_MAX_DEFAULT if pages_max is None else pages_max)
+        self._block_count = self._length // self._block_size
+        self._pages = OrderedDict()  # page_idx -> np.ndarray (N, 5) block accumulators
+        self._spans = OrderedDict()  # key -> _Span
+
+    @property
+    def block_size(self):
+        return self._block_size
+
+    def clear(self):
+        """Clear all cached blocks and spans."""
+        self._pages.clear()
+        self._spans.clear()
+
+    def _page(self, page_idx):
+        page = self._pages.get(page_idx)
+        if page is not None:
+            self._pages.move_to_end(page_idx)
+            return page
+        b0 = page_idx * self._page_blocks
+        count = min(self._page_blocks, self._block_count - b0)
+        d = np.asarray(self._block_fn(b0 * self._block_size, self._block_size, count), dtype=np.float64)
+        d = d.reshape((-1, 4))[:count]
+        mean, std = d[:, 0], d[:, 1]
+        n = float(self._block_size)
+        page = np.empty((count, 5), dtype=np.float64)
+        page[:, _N] = n
+        page[:, _S1] = mean * n
+        page[:, _S2] = std * std * (n - 1) + mean * mean * n  # std is the sample std, ddof=1
+        page[:, _MIN] = d[:, 2]
+        page[:, _MAX] = d[:, 3]
+        invalid = np.logical_not(np.all(np.isfinite(d), axis=1))
+        for idx in np.flatnonzero(invalid):  # blocks with NaN samples
+            page[idx] = _acc_from_samples(self._samples_fn((b0 + idx) * self._block_size, self._block_size))
+        self._pages[page_idx] = page
+        while len(self._pages) > self._pages_max:
+            self._pages.popitem(last=False)
+        return page
+
+    def _blocks(self, b0, b1):
+        """Get the block accumulators.
+
+        :param b0: The first block index, inclusive.
+        :param b1: The last block index, exclusive.
+        :return: The np.ndarray with shape (b1 - b0, 5).
+        """
+        if b1 <= b0:
+            return np.empty((0, 5), dtype=np.float64)
+        p_sz = self._page_blocks
+        parts = []
+        for page_idx in range(b0 // p_sz, (b1 - 1) // p_sz + 1):
+            page = self._page(page_idx)
+            offset = page_idx * p_sz
+            parts.append(page[max(b0, offset) - offset:min(b1, offset + p_sz) - offset])
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
+
+    def _interior(self, key, b0, b1):
+        span = None if key is None else self._spans.get(key)
+        if span is None or span.updates >= _SPAN_UPDATES_MAX or max(b0, span.b0) >= min(b1, span.b1):
+            acc = _acc_from_blocks(self._blocks(b0, b1))
+            span = _Span(b0, b1, acc)
+        elif span.b0 != b0 or span.b1 != b1:
+            acc = span.acc.copy()
+            extrema_removed = False
+            added = []
+            removed = []
+            if b0 < span.b0:
+                added.append(self._blocks(b0, span.b0))
+            elif b0 > span.b0:
+                removed.append(self._blocks(span.b0, b0))
+            if b1 > span.b1:
+                added.append(self._blocks(span.b1, b1))
+            elif b1 < span.b1:
+                removed.append(self._blocks(b1, span.b1))
+            for blocks in added:
+                acc = _acc_merge(acc, _acc_from_blocks(blocks))
+            for blocks in removed:
+                r = _acc_from_blocks(blocks)
+                acc[:_MIN] -= r[:_MIN]
+                if r[_MIN] <= acc[_MIN] or r[_MAX] >= acc[_MAX]:
+                    extrema_removed = True
+            if extrema_removed:
+                blocks = self._blocks(b0, b1)
+                acc[_MIN] = np.min(blocks[:, _MIN])
+                acc[_MAX] = np.max(blocks[:, _MAX])
+            span.b0, span.b1, span.acc = b0, b1, acc
+            span.updates += 1
+        if key is not None:
+            self._spans[key] = span
+            self._spans.move_to_end(key)
+            while len(self._spans) > SPANS_MAX_DEFAULT:
+                self._spans.popitem(last=False)
+        return span.acc
+
+    def statistics(self, start, end, key=None):
+        """Compute the statistics over a sample span.
+
+        :param start: The starting sample id, inclusive.
+        :param end: The ending sample id, inclusive.
+        :param key: The optional hashable key that identifies this span
+            across calls, such as the request rsp_id.  When provided,
+            subsequent calls with the same key only process the blocks
+            that entered or left the span.
+        :return: The np.ndarray with shape (1, 4) containing
+            [mean, std, min, max].
+        """
+        start = max(0, int(start))
+        end = min(int(end), self._length - 1)
+        if end < start:
+            return acc_to_statistics(_acc_empty())
+        sz = self._block_size
+        b0 = -(-start // sz)
+        b1 = min((end + 1) // sz, self._block_count)
+        if b1 <= b0:
+            return acc_to_statistics(_acc_from_samples(self._samples_fn(start, end - start + 1)))
+        acc = self._interior(key, b0, b1)
+        s0, s1 = b0 * sz, b1 * sz
+        if start < s0:
+            acc = _acc_merge(acc, _acc_from_samples(self._samples_fn(start, s0 - start)))
+        if end >= s1:
+            acc = _acc_merge(acc, _acc_from_samples(self._samples_fn(s1, end + 1 - s1)))
+        return acc_to_statistics(acc)
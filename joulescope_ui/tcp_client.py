@@ -211,6 +211,83 @@ class Client:
             header['absolute'] = absolute
         return self._request(MSG_ENUMERATE, header, MSG_ENUMERATE_RESPONSE)['topics']
 
+    def batch_run(self, value, timeout=None):
+        """Run range tool analyses over many ranges and wait for the result.
+
+        :param value: The batch dict.  See joulescope_ui.batch_runner
+            for the format.  When 'id' is not provided, this method
+            assigns one.
+        :param timeout: The maximum time to wait in seconds.
+            None waits forever.
+        :return: The result dict with id, columns, rows, output and elapsed_s.
+        :raises TimeoutError: If no result within timeout.
+        """
+        value = dict(value)
+        if value.get('id') is None:
+            value['id'] = f'tcp_{self._allocate_id()}'
+        topic = 'registry/batch_runner/events/done'
+        event = threading.Event()
+        result = {}
+
+        def on_done(_topic, rv):
+            if isinstance(rv, dict) and rv.get('id') == value['id']:
+                result['value'] = rv
+                event.set()
+
+        self.subscribe(topic, on_done)
+        try:
+            self.publish('registry/batch_runner/actions/!run', value)
+            if not event.wait(timeout):
+                raise TimeoutError(f'batch {value["id"]} timed out')
+        finally:
+            self.unsubscribe(topic, on_done)
+        return result['value']
+
+    def statistics_history(self, source, start=None, end=None, tier=None, max_points=None, timeout=None):
+        """Get the statistics history for a source.
+
+        :param source: The statistics source unique id, such as 'JS220-001122'.
+        :param start: The optional start time64.
+        :param end: The optional end time64.
+        :param tier: The optional tier name.  See
+            joulescope_ui.statistics_history.
+        :param max_points: The optional maximum number of entries.
+        :param timeout: The maximum time to wait in seconds.
+            None waits forever.
+        :return: The result dict with id, source, tier, period, fields,
+            time and values.
+        :raises TimeoutError: If no result within timeout.
+        """
+        value = {
+            'id': f'tcp_{self._allocate_id()}',
+            'source': source,
+            'start': start,
+            'end': end,
+            'tier': tier,
+            'max_points': max_points,
+        }
+        topic = 'registry/statistics_history/events/response'
+        event = threading.Event()
+        result = {}
+
+        def on_response(_topic, rv):
+            if isinstance(rv, dict) and rv.get('id') == value['id']:
+                result['value'] = rv
+                event.set()
+
+        self.subscribe(topic, on_response)
+        try:
+            self.publish('registry/statistics_history/actions/!query', value)
+            if not event.wait(timeout):
+                raise TimeoutError(f'statistics history {value["id"]} timed out')
+        finally:
+            self.unsubscribe(topic, on_response)
+        rv = result['value']
+        for key in ['time', 'values']:
+            if key in rv:
+                rv[key] = _deserialize_value(rv[key])
+        return rv
+
     def qt_inspect(self, path='', max_depth=50):
         """Inspect the Qt widget tree.
 
@@ -234,15 +311,8 @@ class Client:
         return self._qt_result(MSG_QT_ACTION, header)
 
     def _qt_result(self, msg_type, header):
-        """Send a Qt request and return the result dict.
-
-        Large results (e.g. a deep widget tree) are delivered in the binary
-        payload to avoid the uint16 header-length limit; parse them when flagged.
-        """
-        _, resp_header, payload = self._request_raw(msg_type, header, MSG_QT_INSPECT_RESPONSE)
-        if resp_header.get('json_in_payload'):
-            return json.loads(payload)
-        return resp_header
+        """Send a Qt request and return the result dict."""
+        return self._request(msg_type, header, MSG_QT_INSPECT_RESPONSE)
 
     def qt_screenshot(self, path=''):
         """Capture a screenshot of a widget.
@@ -299,6 +369,10 @@ class Client:
                 _log.exception('Error in receive loop')
 
     def _dispatch(self, msg_type, header, payload):
+        # Large JSON bodies are delivered in the binary payload to avoid the
+        # uint16 header-length limit
+        if header.get('json_in_payload'):
+            header, payload = json.loads(payload), b''
         # Check if this is a response to a pending request
         request_id = header.get('id')
         if request_id is not None and request_id in self._pending:
@@ -23,7 +23,7 @@ import json
 import logging
 import numpy as np
 
-# Max JSON header bytes before moving the payload-less response body into the
+# Max JSON header bytes before moving the payload-less message body into the
 # binary payload: the frame header_length field is a uint16 (<= 65535).
 _HEADER_MAX = 60000
 
@@ -35,6 +35,7 @@ from joulescope_ui.tcp_server.protocol import (
     MSG_ERROR,
     encode, encode_publish_data, topic_match,
 )
+from joulescope_ui.statistics_data import StatisticsData
 
 _log = logging.getLogger(__name__)
 
@@ -175,7 +176,7 @@ class PubSubBridge:
             response_header = {'topic': topic, 'value': _serialize_value(value)}
             if request_id is not None:
                 response_header['id'] = request_id
-            frame = encode(MSG_QUERY_RESPONSE, response_header)
+            frame = _encode_json(MSG_QUERY_RESPONSE, response_header)
         except Exception as ex:
             frame = encode(MSG_ERROR, {'message': str(ex), 'id': request_id})
         self._server.send_to_client(client, frame)
@@ -209,7 +210,7 @@ class PubSubBridge:
             # (the Qt inspector builds the header and does not carry it).
             if request_id is not None and isinstance(result_header, dict):
                 result_header = {**result_header, 'id': request_id}
-            frame = _encode_qt_response(result_msg_type, result_header, result_payload)
+            frame = _encode_json(result_msg_type, result_header, result_payload)
         except Exception as ex:
             frame = encode(MSG_ERROR, {'message': str(ex), 'id': request_id})
         self._server.send_to_client(client, frame)
@@ -227,7 +228,7 @@ class PubSubBridge:
         if isinstance(value, dict) and 'data' in value and isinstance(value.get('data'), np.ndarray):
             frame = encode_publish_data(topic, value)
         else:
-            frame = encode(MSG_PUBLISH, {'topic': topic, 'value': _serialize_value(value)})
+            frame = _encode_json(MSG_PUBLISH, {'topic': topic, 'value': _serialize_value(value)})
 
         for client_id in sub.client_ids:
             client = self._server._clients.get(client_id)
@@ -235,19 +236,21 @@ class PubSubBridge:
                 self._server.send_to_client(client, frame)
 
 
-def _encode_qt_response(msg_type, header, payload):
-    """Encode a Qt response, moving an oversized JSON header into the payload.
+def _encode_json(msg_type, header, payload=None):
+    """Encode a message, moving an oversized JSON header into the payload.
 
-    A populated widget tree exceeds the uint16 header_length limit, so when the
-    response has no binary payload and a large header, serialize the header to
-    the payload (covered by the uint32 frame length) and flag it for the client.
+    A populated widget tree or a long statistics history exceeds the uint16
+    header_length limit, so when the message has no binary payload and a
+    large header, serialize the header to the payload (covered by the uint32
+    frame length) and flag it for the client.
     """
     if payload is None and isinstance(header, dict):
         body = json.dumps(header, separators=(',', ':')).encode('utf-8')
         if len(body) > _HEADER_MAX:
             small = {'json_in_payload': True}
-            if 'id' in header:
-                small['id'] = header['id']
+            for key in ['id', 'topic']:
+                if key in header:
+                    small[key] = header[key]
             return encode(msg_type, small, body)
     return encode(msg_type, header, payload)
 
@@ -280,6 +283,8 @@ def _serialize_value(value):
         return [_serialize_value(v) for v in value]
     elif isinstance(value, dict):
         return {k: _serialize_value(v) for k, v in value.items()}
+    elif isinstance(value, StatisticsData):
+        return _serialize_value(value.to_dict())
     elif value is None or isinstance(value, (bool, int, float, str)):
         return value
     else:
@@ -20,7 +20,8 @@ import unittest
 import threading
 import time
 import numpy as np
-from joulescope_ui.pubsub import PubSub
+from joulescope_ui import CAPABILITIES, statistics_history, time64
+from joulescope_ui.pubsub import PubSub, Metadata
 from joulescope_ui.tcp_server import TcpServer
 from joulescope_ui.tcp_client import Client
 from joulescope_ui.tcp_server.bridge import PubSubBridge
@@ -223,6 +224,54 @@ class TestServerClient(unittest.TestCase):
             client2.close()
 
 
+class TestStatisticsHistory(unittest.TestCase):
+    """Regression: a long statistics history exceeds the uint16 header limit."""
+
+    def setUp(self):
+        self.pubsub = PubSub(app='test_tcp_statistics_history', skip_core_undo=True)
+        self.pubsub.registry_initialize()
+        self.sources = f'registry_manager/capabilities/{CAPABILITIES.STATISTIC_STREAM_SOURCE}/list'
+        self.pubsub.topic_add(self.sources, Metadata('obj', 'sources'))
+        self.pubsub.topic_add('registry/dev1/events/statistics/!data', Metadata('obj', 'statistics'))
+        self.pubsub.register(statistics_history.StatisticsHistory)
+        self.pubsub.register(statistics_history.StatisticsHistory(), 'statistics_history')
+        self.server = TcpServer(self.pubsub, host='127.0.0.1', port=0, token='test_token')
+        self.server.start()
+        self.client = Client(host='127.0.0.1', port=self.server.port, token='test_token')
+        self.client.open()
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        self.pubsub.unregister('statistics_history', delete=True)
+        self.pubsub.unregister(statistics_history.StatisticsHistory, delete=True)
+
+    def test_large_query(self):
+        self.pubsub.publish(self.sources, ['dev1'])
+        count = 2000
+        for k in range(count):
+            stat = {'avg': {'value': float(k)}, 'std': {'value': 0.0},
+                    'min': {'value': float(k)}, 'max': {'value': float(k)}, 'p2p': {'value': 0.0}}
+            self.pubsub.publish('registry/dev1/events/statistics/!data', {
+                'time': {'utc': {'value': [0, time64.MINUTE + k * time64.SECOND // 10]}},
+                'signals': {'current': stat, 'voltage': stat, 'power': stat},
+                'accumulators': {'charge': {'value': 0.0}, 'energy': {'value': 0.0}},
+            })
+        # The client blocks, so keep processing PubSub on this thread
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            future = executor.submit(self.client.statistics_history, 'dev1', tier='raw', timeout=5.0)
+            t_end = time.time() + 5.0
+            while not future.done() and time.time() < t_end:
+                self.pubsub.process()
+                time.sleep(0.005)
+            rv = future.result(timeout=0.1)
+        self.assertEqual('raw', rv['tier'])
+        self.assertEqual(count, len(rv['time']))
+        self.assertEqual((count, len(statistics_history.FIELDS)), rv['values'].shape)
+        idx = statistics_history.FIELDS.index('current_avg')
+        np.testing.assert_equal(np.arange(count), rv['values'][:, idx])
+
+
 class _CaptureServer:
     """Minimal TcpServer stand-in that records frames sent to a client."""
 
@@ -287,10 +336,10 @@ class TestQtResponseCorrelation(unittest.TestCase):
         # delivered in the binary payload (the header_length field is a uint16,
         # so a >64 KB header overflows with "'H' format requires 0 <= number").
         import json
-        from joulescope_ui.tcp_server.bridge import _encode_qt_response
+        from joulescope_ui.tcp_server.bridge import _encode_json
         big = {'id': 5, 'children': ['x' * 100 for _ in range(2000)]}  # > 60 KB
         frames = FrameDecoder().feed(
-            _encode_qt_response(MSG_QT_INSPECT_RESPONSE, big, None))
+            _encode_json(MSG_QT_INSPECT_RESPONSE, big, None))
         msg_type, header, payload = frames[0]
         self.assertEqual(msg_type, MSG_QT_INSPECT_RESPONSE)
         self.assertTrue(header.get('json_in_payload'))
@@ -298,10 +347,10 @@ class TestQtResponseCorrelation(unittest.TestCase):
         self.assertEqual(json.loads(payload), big)
 
     def test_small_qt_response_stays_inline(self):
-        from joulescope_ui.tcp_server.bridge import _encode_qt_response
+        from joulescope_ui.tcp_server.bridge import _encode_json
         small = {'id': 6, 'class': 'MainWindow'}
         frames = FrameDecoder().feed(
-            _encode_qt_response(MSG_QT_INSPECT_RESPONSE, small, None))
+            _encode_json(MSG_QT_INSPECT_RESPONSE, small, None))
         _, header, payload = frames[0]
         self.assertEqual(header, small)
         self.assertEqual(payload, b'')
@@ -0,0 +1,166 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the batch range tool runner.
+"""
+
+import unittest
+from joulescope_ui import time64
+from joulescope_ui.batch_runner import BatchRunner, _ranges_resolve, _signal_resolve, \
+    _paths_expand, _analyses_normalize, write_table
+import csv
+import json
+import os
+import tempfile
+
+
+class _PubSub:
+
+    def __init__(self, topics=None):
+        self.topics = {} if topics is None else topics
+        self.published = []
+        self.registered = []
+
+    def query(self, topic, **kwargs):
+        if topic in self.topics:
+            return self.topics[topic]
+        if 'default' in kwargs:
+            return kwargs['default']
+        raise KeyError(topic)
+
+    def enumerate(self, topic):
+        prefix = topic + '/'
+        names = [t[len(prefix):] for t in self.topics if t.startswith(prefix)]
+        return [n for n in names if '/' not in n]
+
+    def publish(self, topic, value):
+        self.published.append((topic, value))
+
+    def register(self, obj):
+        obj.unique_id = f'BatchJob:{len(self.registered)}'
+        self.registered.append(obj)
+
+
+def _topics():
+    return {
+        'registry/src/settings/signals/dev.i': {},
+        'registry/src/settings/signals/dev.v': {},
+        'registry/src/settings/signals/dev.i/range': {'utc': [10, 20], 'samples': [0, 10]},
+        'registry/src/settings/signals/dev.v/range': {'utc': [10, 20], 'samples': [0, 10]},
+        'registry/WaveformWidget:0/settings/annotations': {'x': {
+            2: {'dtype': 'dual', 'pos1': 500, 'pos2': 400},
+            1: {'dtype': 'dual', 'pos1': 100, 'pos2': 200},
+            3: {'dtype': 'single', 'pos1': 300},
+        }},
+    }
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def test_signal_resolve(self):
+        p = _PubSub(_topics())
+        self.assertEqual('src.dev.i', _signal_resolve(p, 'src', 'i'))
+        self.assertEqual('src.dev.v', _signal_resolve(p, 'src', 'dev.v'))
+        self.assertEqual('other.dev.i', _signal_resolve(p, 'src', 'other.dev.i'))
+        with self.assertRaises(ValueError):
+            _signal_resolve(p, 'src', 'p')
+
+    def test_ranges_resolve(self):
+        p = _PubSub(_topics())
+        self.assertEqual([('', [10, 20])], _ranges_resolve(p, 'src.dev.i', None))
+        self.assertEqual([('', [3, 7])], _ranges_resolve(p, 'src.dev.i', [7, 3]))
+        r = _ranges_resolve(p, 'src.dev.i', {'waveform': 'WaveformWidget:0'})
+        self.assertEqual([('1', [100, 200]), ('2', [400, 500])], r)
+        self.assertEqual([], _ranges_resolve(p, 'src.dev.i', {'waveform': 'WaveformWidget:1'}))
+
+    def test_paths_expand(self):
+        with tempfile.TemporaryDirectory() as d:
+            for name in ['b.jls', 'a.jls', 'c.txt']:
+                with open(os.path.join(d, name), 'wt') as f:
+                    f.write('x')
+            expect = [os.path.join(d, n) for n in ['a.jls', 'b.jls']]
+            self.assertEqual(expect, _paths_expand(d))
+            self.assertEqual(expect, _paths_expand(os.path.join(d, '*.jls')))
+            self.assertEqual([expect[0]], _paths_expand(expect[0]))
+
+    def test_analyses_normalize(self):
+        self.assertEqual([{'name': 'statistics'}], _analyses_normalize(None))
+        a = _analyses_normalize(['histogram', {'name': 'max_window', 'width': 0.1}])
+        self.assertEqual([{'name': 'histogram'}, {'name': 'max_window', 'width': 0.1}], a)
+        with self.assertRaises(ValueError):
+            _analyses_normalize(['unknown'])
+
+    def test_write_table(self):
+        columns = ['job', 'status', 'mean']
+        rows = [{'job': 0, 'status': 'ok', 'mean': 1.5}, {'job': 1, 'status': 'aborted'}]
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'out.csv')
+            write_table(path, columns, rows)
+            with open(path, 'rt', newline='') as f:
+                r = list(csv.DictReader(f))
+            self.assertEqual(['0', 'ok', '1.5'], [r[0][c] for c in columns])
+            self.assertEqual('', r[1]['mean'])
+            path = os.path.join(d, 'out.json')
+            write_table(path, columns, rows)
+            with open(path, 'rt') as f:
+                self.assertEqual({'columns': columns, 'rows': rows}, json.load(f))
+
+    def test_run_parallelism(self):
+        p = _PubSub(_topics())
+        runner = BatchRunner()
+        runner.pubsub = p
+        runner.unique_id = 'batch_runner'
+        runner.parallelism = 2
+        runner.on_action_run({
+            'id': 'b1',
+            'jobs': [
+                {'source': 'src', 'signal': 'i', 'range': {'waveform': 'WaveformWidget:0'}},
+                {'source': 'src', 'signal': 'v'},
+            ],
+            'rsp_topic': 'test/rsp',
+        })
+        self.assertEqual(2, len(p.registered))
+        job = p.registered[0]
+        self.assertEqual(['src.dev.i'], job.signals)
+        self.assertEqual(['registry/batch_runner/callbacks/!job_done'],
+                         job.range_tool_kwargs['done_callbacks'])
+        p.registered[0].value['row']['status'] = 'ok'
+        runner.on_callback_job_done(p.registered[0].value)
+        self.assertEqual(3, len(p.registered))
+        self.assertEqual([], p.published)
+        for job in p.registered[1:]:
+            job.value['row']['status'] = 'ok'
+            runner.on_callback_job_done(job.value)
+        topic, rv = p.published[0]
+        self.assertEqual('registry/batch_runner/events/done', topic)
+        self.assertEqual(('test/rsp', rv), p.published[1])
+        self.assertEqual('b1', rv['id'])
+        self.assertEqual(3, len(rv['rows']))
+        self.assertEqual([0, 1, 2], [row['job'] for row in rv['rows']])
+        self.assertEqual(['1', '2', ''], [row['marker'] for row in rv['rows']])
+        self.assertEqual(100 / time64.SECOND, rv['rows'][0]['range_s'])
+        self.assertEqual(['ok', 'ok', 'ok'], [row['status'] for row in rv['rows']])
+
+    def test_run_invalid(self):
+        p = _PubSub(_topics())
+        runner = BatchRunner()
+        runner.pubsub = p
+        runner.unique_id = 'batch_runner'
+        runner.parallelism = 2
+        runner.on_action_run({'jobs': [{'source': 'src', 'signal': 'p'}]})
+        self.assertEqual(0, len(p.registered))
+        topic, rv = p.published[0]
+        self.assertEqual(1, rv['id'])
+        self.assertIn('error', rv)
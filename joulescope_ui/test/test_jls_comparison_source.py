@@ -0,0 +1,112 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the JLS comparison source.
+"""
+
+import unittest
+from joulescope_ui import time64
+from joulescope_ui.jls_comparison_source import JlsComparisonSource, _Capture, capture_names
+from joulescope_ui.test.test_jls_source import jls_write, SAMPLE_RATE, LENGTH
+from joulescope_ui.tile_cache import TileCache
+import numpy as np
+import os
+import tempfile
+
+
+class TestJlsComparisonSource(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.paths = [os.path.join(self._tempdir.name, f'{name}.jls') for name in ['a.b', 'c']]
+        jls_write(self.paths[0])
+        jls_write(self.paths[1], length=LENGTH // 2)
+        self.source = JlsComparisonSource(self.paths)
+        self.source._captures = {}
+        names = capture_names(self.paths)
+        for index, (name, path) in enumerate(zip(names, self.paths)):
+            self.source._captures[name] = _Capture(index, name, path, self.source._tile_cache)
+        self.source._align([0, 5 * time64.SECOND])
+        self.names = names
+
+    def tearDown(self):
+        self.source.close()
+        self._tempdir.cleanup()
+
+    def test_names(self):
+        self.assertEqual(['1-a_b', '2-c'], self.names)
+
+    def test_samples_shifted(self):
+        rsp = self.source.process({
+            'signal_id': f'JlsComparisonSource-1.{self.names[1]}.i',
+            'time_type': 'utc',
+            'start': 5 * time64.SECOND,
+            'end': 5 * time64.SECOND + 9 * time64.SECOND // SAMPLE_RATE,
+            'length': 10,
+            'rsp_id': 1,
+        })
+        np.testing.assert_equal(np.arange(10, dtype=np.float32), rsp['data'])
+        self.assertEqual(5 * time64.SECOND, rsp['info']['time_range_utc']['start'])
+        tmap = rsp['info']['tmap']
+        self.assertEqual(5 * time64.SECOND, tmap.sample_id_to_timestamp(0))
+        self.assertEqual(0, tmap.timestamp_to_sample_id(5 * time64.SECOND))
+
+    def test_samples_clipped(self):
+        rsp = self.source.process({
+            'signal_id': f'{self.names[1]}.i',
+            'time_type': 'samples',
+            'start': LENGTH // 2 - 10,
+            'end': LENGTH // 2 + 10,
+            'length': 21,
+        })
+        self.assertEqual(10, len(rsp['data']))
+        self.assertIsNone(self.source.process({
+            'signal_id': f'{self.names[1]}.i',
+            'time_type': 'samples',
+            'start': LENGTH,
+            'end': LENGTH + 10,
+            'length': 11,
+        }))
+
+    def test_summary_uses_shared_tiles(self):
+        req = {
+            'signal_id': f'{self.names[0]}.i',
+            'time_type': 'samples',
+            'start': 0,
+            'end': LENGTH - 1,
+            'length': 100,
+        }
+        rsp = self.source.process(req)
+        self.assertEqual('summary', rsp['response_type'])
+        np.testing.assert_allclose(np.arange(100) * 100 + 49.5, rsp['data'][:, 0])
+        tiles = len(self.source._tile_cache)
+        rsp = self.source.process(dict(req, signal_id=f'{self.names[1]}.i'))
+        self.assertTrue(np.all(np.isnan(rsp['data'][50:, 0])))  # past the shorter capture
+        self.assertGreater(len(self.source._tile_cache), tiles)
+        hits = self.source._tile_cache.hits
+        self.source.process(req)
+        self.assertGreater(self.source._tile_cache.hits, hits)
+
+    def test_batch(self):
+        rsp = self.source._process_batch({
+            'rsp_topic': 't',
+            'rsp_id': 3,
+            'requests': [
+                {'signal_id': f'{n}.v', 'time_type': 'samples', 'start': 0, 'end': 9, 'length': 10, 'rsp_id': i}
+                for i, n in enumerate(self.names)
+            ],
+        })
+        self.assertEqual(3, rsp['rsp_id'])
+        self.assertEqual([0, 1], [r['rsp_id'] for r in rsp['responses']])
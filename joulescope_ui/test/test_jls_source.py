@@ -0,0 +1,103 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the JLS source.
+"""
+
+import unittest
+from unittest.mock import Mock
+from joulescope_ui import time64
+from joulescope_ui.jls_source import JlsSource, _batch_merge
+from joulescope_ui.jls_v2 import JlsV2
+from pyjls import Writer, SignalType, DataType
+import numpy as np
+import os
+import tempfile
+
+
+SAMPLE_RATE = 1000
+LENGTH = 10000
+
+
+def jls_write(path, length=None):
+    """Write a small JLS file with current and voltage signals."""
+    length = LENGTH if length is None else length
+    t_end = int((length - 1) * time64.SECOND // SAMPLE_RATE)
+    with Writer(path) as w:
+        w.source_def(source_id=1, name='js220', vendor='Jetperch', model='JS220',
+                     version='1', serial_number='000001')
+        for signal_id, name, units in [(1, 'current', 'A'), (2, 'voltage', 'V')]:
+            w.signal_def(signal_id=signal_id, source_id=1, signal_type=SignalType.FSR,
+                         data_type=DataType.F32, sample_rate=SAMPLE_RATE, name=name, units=units)
+            w.utc(signal_id, 0, 0)
+        w.fsr_f32(1, 0, np.arange(length, dtype=np.float32))
+        w.fsr_f32(2, 0, np.ones(length, dtype=np.float32))
+        for signal_id in [1, 2]:
+            w.utc(signal_id, length - 1, t_end)
+
+
+def _req(signal_id, start, end, length, rsp_id):
+    return {
+        'signal_id': signal_id,
+        'time_type': 'samples',
+        'start': start,
+        'end': end,
+        'length': length,
+        'rsp_id': rsp_id,
+    }
+
+
+class TestJlsSource(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tempdir.name, 'test.jls')
+        jls_write(self.path)
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_batch_merge(self):
+        a = {'rsp_topic': 't', 'rsp_id': 0, 'requests': [_req('d.i', 0, 9, 0, 1), _req('d.v', 0, 9, 0, 2)]}
+        b = {'rsp_topic': 't', 'rsp_id': 0, 'requests': [_req('d.i', 10, 19, 0, 1)]}
+        self.assertIs(a, _batch_merge(None, a))
+        m = _batch_merge(a, b)
+        self.assertEqual([2, 1], [r['rsp_id'] for r in m['requests']])
+        self.assertEqual(10, m['requests'][1]['start'])
+        self.assertEqual(2, len(a['requests']))  # unmodified
+
+    def test_process_batch(self):
+        source = JlsSource(self.path)
+        source._jls = JlsV2(self.path, Mock(), 'registry/JlsSource-test')
+        try:
+            rsp = source._process_batch({
+                'rsp_topic': 't',
+                'rsp_id': 7,
+                'requests': [
+                    _req('JS220-000001.i', 10, 19, 0, 1),
+                    _req('JS220-000001.v', 0, LENGTH - 1, 1, 2),
+                    _req('JS220-000001.x', 0, 9, 0, 3),
+                ],
+            })
+        finally:
+            source._jls.close()
+        self.assertEqual(7, rsp['rsp_id'])
+        r1, r2, r3 = rsp['responses']
+        self.assertEqual(1, r1['rsp_id'])
+        np.testing.assert_equal(np.arange(10, 20, dtype=np.float32), r1['data'])
+        self.assertEqual(2, r2['rsp_id'])
+        self.assertEqual('summary', r2['response_type'])
+        self.assertEqual(1.0, r2['data'][0, 0])
+        self.assertIsNone(r3)
@@ -0,0 +1,89 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the max window search against a brute-force reference.
+"""
+
+import unittest
+from joulescope_ui.range_tool_kernels import WindowSearch
+import numpy as np
+
+
+def _brute_force(x, width, count, find_min):
+    sums = np.array([np.sum(x[i:i + width], dtype=np.float64) for i in range(len(x) - width + 1)])
+    order = np.argsort(sums if find_min else -sums, kind='stable')
+    result = []
+    for idx in order:
+        if len(result) >= count:
+            break
+        if all(abs(int(idx) - k) >= width for _, k in result):
+            result.append((sums[idx], int(idx)))
+    return result
+
+
+def _search(x, width, chunk, count=1, find_min=False):
+    s = WindowSearch(width, count, find_min)
+    for k in range(0, len(x), chunk):
+        s.add(x[k:k + chunk])
+    return s
+
+
+class TestMaxWindow(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.x = rng.normal(size=5_000).astype(np.float32)
+
+    def _assert_equal(self, expect, actual):
+        self.assertEqual([k for _, k in expect], [k for _, k in actual])
+        np.testing.assert_allclose([v for v, _ in expect], [v for v, _ in actual], rtol=1e-6, atol=1e-9)
+
+    def test_max_min(self):
+        for width in [1, 7, 100, 999]:
+            for chunk in [13, 500, 10_000]:
+                s = _search(self.x, width, chunk, find_min=True)
+                self._assert_equal(_brute_force(self.x, width, 1, False), s.max)
+                self._assert_equal(_brute_force(self.x, width, 1, True), s.min)
+
+    def test_top_k_separated_peaks(self):
+        x = np.zeros(10_000, dtype=np.float32)
+        for idx, v in [(500, 5.0), (2_000, 9.0), (7_777, 7.0), (9_000, 3.0)]:
+            x[idx:idx + 10] = v
+        for chunk in [97, 1000, 20_000]:
+            s = _search(x, 10, chunk, count=3)
+            self._assert_equal(_brute_force(x, 10, 3, False), s.max)
+
+    def test_top_k_random(self):
+        s = _search(self.x, 50, 100_000, count=5, find_min=True)
+        self._assert_equal(_brute_force(self.x, 50, 5, False), s.max)
+        self._assert_equal(_brute_force(self.x, 50, 5, True), s.min)
+
+    def test_nan_ignored(self):
+        x = self.x.copy()
+        x[100:200] = np.nan
+        s = _search(x, 20, 333)
+        sums = np.array([np.sum(x[i:i + 20], dtype=np.float64) for i in range(len(x) - 19)])
+        self.assertEqual(int(np.nanargmax(sums)), s.max[0][1])
+
+    def test_nan_before_peak_in_chunk(self):
+        x = np.zeros(10000, dtype=np.float32)
+        x[50:60] = np.nan
+        x[5000:5010] = 10
+        s = _search(x, 10, len(x))
+        self.assertEqual([(100.0, 5000)], s.max)
+
+    def test_width_longer_than_data(self):
+        s = _search(self.x[:10], 20, 3)
+        self.assertEqual([], s.max)
@@ -0,0 +1,87 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the range tool distribution helpers.
+"""
+
+import unittest
+from joulescope_ui.range_tool import kernel_run
+from joulescope_ui.result_cache import ResultCache, result_key
+from joulescope_ui.range_tools.plugin_helpers import calculate_distribution, calculate_histogram, PERCENTILES
+import numpy as np
+
+
+class _RangeTool:
+
+    def __init__(self, x):
+        self.x = x
+        self.kernels = []
+        self.cache = ResultCache()
+
+    def request(self, signal, time_type, start, end, length):
+        x = self.x.astype(np.float64)
+        return {
+            'info': {'time_range_samples': {'start': 0, 'end': len(x) - 1, 'length': length}},
+            'data': np.array([[np.mean(x), np.std(x), np.min(x), np.max(x)]]),
+        }
+
+    def run_kernel(self, kernel, signal, x_range, chunk=None, time_type='utc'):
+        self.kernels.append(kernel)
+        chunks = ((k, self.x[k:k + 1000]) for k in range(x_range[0], x_range[1] + 1, 1000))
+        return kernel_run(kernel, chunks)
+
+    def cache_get(self, tool, signal, sample_range, params):
+        return self.cache.get(result_key({'source': 's'}, signal, sample_range, tool, params))
+
+    def cache_put(self, tool, signal, sample_range, params, value):
+        self.cache.put(result_key({'source': 's'}, signal, sample_range, tool, params), value)
+
+
+class TestPluginHelpers(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.x = np.exp(rng.normal(size=25_000) * 3 - 8).astype(np.float32)
+        self.rt = _RangeTool(self.x)
+        self.value = {'x_range': [0, 1]}
+
+    def test_histogram(self):
+        hist, bin_edges = calculate_histogram(self.rt, self.value, 'a.b.i', 20)
+        self.assertEqual(21, len(bin_edges))
+        np.testing.assert_equal(np.histogram(self.x, bins=bin_edges)[0], hist)
+
+    def test_percentiles_exact_and_cached(self):
+        rv = calculate_distribution(self.rt, self.value, 'a.b.i', 0, 'log', PERCENTILES)
+        expect = np.quantile(self.x, np.array(PERCENTILES) / 100, method='inverted_cdf')
+        np.testing.assert_equal(expect, [rv['percentiles'][p] for p in PERCENTILES])
+        self.assertEqual(2, len(self.rt.kernels))
+        rv2 = calculate_distribution(self.rt, self.value, 'a.b.i', 0, 'log', PERCENTILES)
+        self.assertEqual(2, len(self.rt.kernels))  # cached
+        self.assertEqual(rv['percentiles'], rv2['percentiles'])
+        calculate_distribution(self.rt, self.value, 'a.b.v', 0, 'log')
+        self.assertEqual(3, len(self.rt.kernels))  # different signal
+
+    def test_log_bins(self):
+        rv = calculate_distribution(self.rt, self.value, 'a.b.i', 0, 'log')
+        edges = rv['bin_edges']
+        self.assertAlmostEqual(float(np.min(self.x)), edges[0], delta=1e-12)
+        np.testing.assert_allclose(np.diff(np.log10(edges)), np.log10(edges[1] / edges[0]))
+        self.assertEqual(len(self.x), np.sum(rv['hist']))
+
+    def test_constant(self):
+        rt = _RangeTool(np.ones(5000, dtype=np.float32))
+        rv = calculate_distribution(rt, self.value, 'a.b.v', 0, None, PERCENTILES)
+        self.assertEqual(5000, np.sum(rv['hist']))
+        self.assertEqual([1.0, 1.0, 1.0], [rv['percentiles'][p] for p in PERCENTILES])
@@ -218,6 +218,88 @@ class TestRangeTool(unittest.TestCase):
         self.assertEqual(2, len(pubsub.requests))
 
 
+class _SamplesPubSub(PubSub):
+    """Fake pubsub whose buffer source returns the sample ids as data."""
+
+    def __init__(self, rsp_length_max=None):
+        super().__init__()
+        self.rsp_length_max = rsp_length_max
+        self.requests = []
+
+    def publish(self, topic, value):
+        if not topic.endswith('!request'):
+            return
+        self.requests.append(dict(value))
+        start = value['start']
+        if value['time_type'] == 'utc':
+            rsp = _rsp('summary', 1000, 1999, 1, np.zeros((1, 4), dtype=np.float32))
+        else:
+            length = value['length']
+            if self.rsp_length_max is not None:
+                length = min(length, self.rsp_length_max)
+            data = np.arange(start, start + length, dtype=np.float32)
+            rsp = _rsp('samples', start, start + length - 1, length, data)
+        rsp['rsp_id'] = value['rsp_id']
+        for cbk in self._subscribe.get(value['rsp_topic'], []):
+            cbk(rsp)
+
+
+class TestRangeToolIterChunks(unittest.TestCase):
+
+    def _construct(self, **kwargs):
+        pubsub = _SamplesPubSub(**kwargs)
+        rt = RangeTool(pubsub.range_tool_init_value())
+        rt.pubsub = pubsub
+        rt.rsp_topic = 'registry/rt1/callbacks/!data'
+        pubsub.subscribe(rt.rsp_topic, rt.push)
+        return rt, pubsub, list(pubsub.signals.keys())
+
+    def test_utc(self):
+        rt, pubsub, signals = self._construct()
+        progress = []
+        chunks = list(rt.iter_chunks(signals[0], pubsub.x_range, 300, progress_fn=progress.append))
+        self.assertEqual([1000, 1300, 1600, 1900], [s for s, _ in chunks])
+        np.testing.assert_equal(np.arange(1000, 2000), np.concatenate([d for _, d in chunks]))
+        self.assertEqual(1.0, progress[-1])
+        self.assertEqual(sorted(progress), progress)
+
+    def test_prefetch_in_flight(self):
+        rt, pubsub, signals = self._construct()
+        it = rt.iter_chunks(signals[0], [0, 999], 100, prefetch=3, time_type='samples')
+        next(it)
+        self.assertEqual(3, len(pubsub.requests))
+        self.assertEqual(10, len(list(it)) + 1)
+
+    def test_overlap(self):
+        rt, pubsub, signals = self._construct()
+        chunks = list(rt.iter_chunks(signals[0], [0, 999], 400, overlap=10, time_type='samples'))
+        self.assertEqual([0, 390, 790], [s for s, _ in chunks])
+        for s, d in chunks:
+            np.testing.assert_equal(np.arange(s, s + len(d)), d)
+
+    def test_partial_responses(self):
+        rt, pubsub, signals = self._construct(rsp_length_max=70)
+        chunks = list(rt.iter_chunks(signals[0], [0, 499], 200, time_type='samples'))
+        self.assertEqual([200, 200, 100], [len(d) for _, d in chunks])
+        np.testing.assert_equal(np.arange(500), np.concatenate([d for _, d in chunks]))
+
+    def test_interleaved(self):
+        rt, pubsub, signals = self._construct()
+        a = rt.iter_chunks(signals[0], [0, 999], 100, time_type='samples')
+        b = rt.iter_chunks(signals[0], [5000, 5999], 100, time_type='samples')
+        for (sa, da), (sb, db) in zip(a, b):
+            self.assertEqual(sa + 5000, sb)
+            np.testing.assert_equal(np.arange(sa, sa + 100), da)
+            np.testing.assert_equal(np.arange(sb, sb + 100), db)
+
+    def test_abort(self):
+        rt, pubsub, signals = self._construct()
+        it = rt.iter_chunks(signals[0], [0, 999], 100, time_type='samples')
+        next(it)
+        rt.abort = True
+        self.assertEqual([], list(it))
+
+
 class _MyRangeTool(RangeToolBase):
     NAME = 'test_range_tool'
     BRIEF = 'brief'
@@ -0,0 +1,207 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the range tool kernels, inline and in worker processes.
+"""
+
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from joulescope_ui.range_tool import kernel_run
+from joulescope_ui.range_tool_kernels import HistogramKernel, WindowKernel, WindowSearch, \
+    WelchKernel, SpectrogramKernel, DistributionKernel, QuantileRefineKernel, \
+    f32_keys, f32_from_keys, quantile_ranks, sketch_locate, EventKernel, event_select, condition_mask
+import numpy as np
+
+
+def _chunks(x, chunk, overlap):
+    tail = None
+    for k in range(0, len(x), chunk):
+        data, sample_id = x[k:k + chunk], k
+        if overlap:
+            if tail is not None:
+                sample_id -= len(tail)
+                data = np.concatenate((tail, data))
+            tail = data[-overlap:]
+        yield sample_id, data
+
+
+def _psd_loop(x, nfft, step, window):
+    y = []
+    for k in range(0, len(x) - nfft + 1, step):
+        z = np.fft.rfft(x[k:k + nfft] * window)
+        y.append(np.real(z * np.conj(z)))
+    return np.array(y)
+
+
+class TestRangeToolKernels(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        ctx = multiprocessing.get_context('spawn')
+        cls.executor = ProcessPoolExecutor(max_workers=2, mp_context=ctx)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.x = rng.normal(size=20_000).astype(np.float32)
+
+    def test_worker_without_qt(self):
+        expr = "__import__('joulescope_ui.range_tool_kernels') and 'PySide6' in __import__('sys').modules"
+        self.assertFalse(self.executor.submit(eval, expr).result())
+
+    def test_histogram(self):
+        edges = np.linspace(-4, 4, 33)
+        expect = np.histogram(self.x, bins=edges)[0]
+        k = HistogramKernel(edges)
+        for executor in [None, self.executor]:
+            hist = kernel_run(k, _chunks(self.x, 3000, 0), executor)
+            np.testing.assert_equal(expect, hist)
+
+    def test_window(self):
+        width = 250
+        s = WindowSearch(width, 3, True)
+        s.add(self.x)
+        k = WindowKernel(width, 3, True)
+        for executor in [None, self.executor]:
+            w_max, w_min = kernel_run(k, _chunks(self.x, 1000, k.overlap), executor)
+            self.assertEqual([i for _, i in s.max], [i for _, i in w_max])
+            self.assertEqual([i for _, i in s.min], [i for _, i in w_min])
+
+    def test_abort(self):
+        k = HistogramKernel(np.linspace(-4, 4, 9))
+        self.assertIsNone(kernel_run(k, _chunks(self.x, 1000, 0), self.executor, abort_fn=lambda: True))
+        self.assertIsNone(kernel_run(k, _chunks(self.x, 1000, 0), None, abort_fn=lambda: True))
+
+    def test_welch(self):
+        nfft, step = 256, 192
+        window = np.hamming(nfft)
+        expect = _psd_loop(self.x, nfft, step, window)
+        k = WelchKernel(nfft, step, window, 0)
+        for executor in [None, self.executor]:
+            for chunk in [100, 1000, 4096]:
+                y, count = kernel_run(k, _chunks(self.x, chunk, k.overlap), executor)
+                self.assertEqual(len(expect), count)
+                np.testing.assert_allclose(np.mean(expect, axis=0), y, rtol=1e-9)
+
+    def test_welch_offset_start(self):
+        nfft, step = 64, 64
+        window = np.hanning(nfft)
+        start = 1000
+        expect = _psd_loop(self.x[30:], nfft, step, window)
+        k = WelchKernel(nfft, step, window, start + 30)
+        chunks = ((sample_id + start, data) for sample_id, data in _chunks(self.x, 777, k.overlap))
+        y, count = kernel_run(k, chunks)
+        self.assertEqual(len(expect), count)
+        np.testing.assert_allclose(np.mean(expect, axis=0), y, rtol=1e-9)
+
+    def test_welch_too_short(self):
+        k = WelchKernel(256, 128, np.ones(256), 0)
+        y, count = kernel_run(k, _chunks(self.x[:100], 1000, k.overlap))
+        self.assertIsNone(y)
+        self.assertEqual(0, count)
+
+    def test_spectrogram(self):
+        nfft, step = 128, 64
+        window = np.hamming(nfft)
+        p = _psd_loop(self.x, nfft, step, window)
+        for columns in [10_000, 100, 7]:
+            k = SpectrogramKernel(nfft, step, window, 0, len(self.x), columns)
+            self.assertLessEqual(k.columns, columns)
+            expect = np.array([np.mean(p[c:c + k.group], axis=0) for c in range(0, len(p), k.group)])
+            for executor in [None, self.executor]:
+                y = kernel_run(k, _chunks(self.x, 1500, k.overlap), executor)
+                self.assertEqual((k.columns, nfft // 2 + 1), y.shape)
+                np.testing.assert_allclose(expect, y, rtol=1e-9)
+
+    def test_f32_keys_order(self):
+        x = np.array([-np.inf, -3.5, -1e-30, -0.0, 0.0, 1e-30, 2.0, 7e20, np.inf, np.nan], dtype=np.float32)
+        keys = f32_keys(x)
+        self.assertEqual(7, len(keys))  # non-finite removed
+        self.assertTrue(np.all(np.diff(keys.astype(np.int64)) >= 0))
+        np.testing.assert_equal(x[1:8], f32_from_keys(keys))
+
+    def test_distribution_percentiles(self):
+        x = np.concatenate((self.x, np.abs(self.x) * 1e-6, [np.nan]))
+        edges = np.linspace(np.nanmin(x), np.nanmax(x), 51)
+        quantiles = [0.0, 0.5, 0.99, 0.999, 1.0]
+        y = x[np.isfinite(x)]
+        expect = np.quantile(y, quantiles, method='inverted_cdf')
+        k = DistributionKernel(edges)
+        for executor in [None, self.executor]:
+            hist, sketch = kernel_run(k, _chunks(x, 3000, 0), executor)
+            np.testing.assert_equal(np.histogram(y, bins=edges)[0], hist)
+            self.assertEqual(len(y), np.sum(sketch))
+            locations = sketch_locate(sketch, quantile_ranks(len(y), quantiles))
+            r = QuantileRefineKernel([b for b, _ in locations])
+            counts = kernel_run(r, _chunks(x, 3000, 0), executor)
+            np.testing.assert_equal(expect, r.values(counts, locations))
+
+    def test_distribution_clips_to_edges(self):
+        x = np.array([1e-9, 2e-3, 2e-2, 1.0], dtype=np.float32)
+        edges = np.logspace(-6, 0, 7)
+        hist, _ = kernel_run(DistributionKernel(edges), _chunks(x, 10, 0))
+        np.testing.assert_equal([1, 0, 0, 1, 1, 1], hist)
+
+    def test_events_across_chunks(self):
+        x = (self.x > 0.5).astype(np.float32)
+        k = EventKernel('>', 0.5)
+        expect = kernel_run(k, _chunks(x, len(x), 0))
+        d = np.diff(x.astype(np.int8), prepend=0, append=0)
+        np.testing.assert_equal(np.flatnonzero(d > 0), expect['starts'])
+        np.testing.assert_equal(np.flatnonzero(d < 0), expect['ends'])
+        for executor in [None, self.executor]:
+            for chunk in [1, 7, 1000]:
+                if chunk == 1 and executor is not None:
+                    continue
+                runs = kernel_run(k, _chunks(x, chunk, 0), executor)
+                self.assertEqual([0, len(x)], runs['range'])
+                np.testing.assert_equal(expect['starts'], runs['starts'])
+                np.testing.assert_equal(expect['ends'], runs['ends'])
+
+    def test_condition_mask(self):
+        x = np.array([0.0, 1.0, 2.0, 3.0, np.nan], dtype=np.float32)
+        np.testing.assert_equal([0, 0, 1, 1, 0], condition_mask(x, '>', 1.5))
+        np.testing.assert_equal([1, 1, 0, 0, 0], condition_mask(x, '<', 1.5))
+        np.testing.assert_equal([0, 1, 1, 0, 0], condition_mask(x, 'between', 2.0, 1.0))
+        np.testing.assert_equal([1, 0, 0, 1, 0], condition_mask(x, 'outside', 1.0, 2.0))
+        with self.assertRaises(ValueError):
+            condition_mask(x, '==', 1.0)
+
+    def test_event_select(self):
+        x = np.array([1, 0, 1, 1, 0, 0, 0, 1, 0, 1, 1, 1, 0, 1], dtype=np.float32)
+        runs = kernel_run(EventKernel('>', 0.5), _chunks(x, 4, 0))
+        starts, ends, rising = event_select(runs, 'rising')
+        np.testing.assert_equal([2, 7, 9, 13], starts)
+        starts, _, _ = event_select(runs, 'falling')
+        np.testing.assert_equal([1, 4, 8, 12], starts)
+        starts, _, rising = event_select(runs, 'both')
+        np.testing.assert_equal([1, 2, 4, 7, 8, 9, 12, 13], starts)
+        np.testing.assert_equal([0, 1, 0, 1, 0, 1, 0, 1], rising)
+        starts, ends, _ = event_select(runs, 'pulse')
+        np.testing.assert_equal([2, 7, 9], starts)
+        np.testing.assert_equal([4, 8, 12], ends)
+        starts, ends, _ = event_select(runs, 'pulse', 2, 2)
+        np.testing.assert_equal([2], starts)
+        starts, _, _ = event_select(runs, 'burst', 0, None, 2)
+        self.assertEqual(0, len(starts))  # bursts touch the range boundaries
+        runs = kernel_run(EventKernel('>', 0.5), _chunks(np.concatenate(([0], x, [0])), 4, 0))
+        starts, ends, _ = event_select(runs, 'burst', 0, None, 2)
+        np.testing.assert_equal([[1, 5], [8, 15]], np.column_stack((starts, ends)))
+        starts, ends, _ = event_select(runs, 'burst', 5, None, 2)
+        np.testing.assert_equal([[8, 15]], np.column_stack((starts, ends)))
@@ -0,0 +1,219 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the signal record writer thread.
+"""
+
+import unittest
+from joulescope_ui import time64
+from joulescope_ui.widgets.signal_record.record_writer import RecordWriter, segment_path, decimate_factor
+from pyjls import Writer, Reader
+import numpy as np
+import os
+import tempfile
+import threading
+
+
+FS = 1000
+_SOURCE = {'vendor': 'Jetperch', 'model': 'JS220', 'serial_number': '000001', 'version': '1'}
+
+
+def _msg(field, sample_id, data, dtype='f32', units='A'):
+    return {
+        'source': _SOURCE,
+        'sample_id': sample_id,
+        'sample_freq': FS,
+        'utc': time64.SECOND + int(sample_id * time64.SECOND / FS),
+        'field': field,
+        'dtype': dtype,
+        'units': units,
+        'data': data,
+    }
+
+
+class _BlockingWriter:
+    """Wrap a pyjls Writer with fsr() held until released."""
+
+    def __init__(self, jls):
+        self._jls = jls
+        self.release = threading.Event()
+
+    def fsr(self, *args):
+        self.release.wait()
+        return self._jls.fsr(*args)
+
+    def __getattr__(self, item):
+        return getattr(self._jls, item)
+
+
+class TestRecordWriter(unittest.TestCase):
+
+    def setUp(self):
+        self._d = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._d.name, 'out.jls')
+
+    def tearDown(self):
+        self._d.cleanup()
+
+    def test_write(self):
+        status = []
+        w = RecordWriter(Writer(self.path), on_status=status.append)
+        ti = 'registry/JS220-000001/events/signals/i/!data'
+        tv = 'registry/JS220-000001/events/signals/v/!data'
+        for k in range(10):
+            x = np.arange(k * 100, (k + 1) * 100, dtype=np.float32)
+            self.assertTrue(w.push(ti, _msg('current', k * 100, x)))
+            self.assertTrue(w.push(tv, _msg('voltage', k * 100, x * 2, units='V')))
+        w.close()
+        with Reader(self.path) as r:
+            signals = {s.name: s for s in r.signals.values()}
+            self.assertEqual(1000, signals['current'].length)
+            self.assertEqual(1000, signals['voltage'].length)
+            np.testing.assert_equal(np.arange(1000), r.fsr(signals['current'].signal_id, 0, 1000))
+            np.testing.assert_equal(np.arange(1000) * 2, r.fsr(signals['voltage'].signal_id, 0, 1000))
+        s = status[-1]['signals']['JS220-000001.current']
+        self.assertEqual(1000, s['written'])
+        self.assertEqual(0, s['dropped'])
+        self.assertGreaterEqual(s['latency_max'], s['latency_mean'])
+        self.assertEqual(0, status[-1]['queue_bytes'])
+
+    def test_packed(self):
+        w = RecordWriter(Writer(self.path))
+        topic = 'registry/JS220-000001/events/signals/0/!data'
+        bits = np.array([1, 0, 1, 1, 0, 0, 0, 1] * 32, dtype=np.uint8)
+        for k in range(4):
+            x = np.packbits(bits, bitorder='little')
+            w.push(topic, _msg('gpi[0]', k * len(bits), x, dtype='u1', units=''))
+        w.close()
+        with Reader(self.path) as r:
+            signal = [s for s in r.signals.values() if s.name == 'gpi[0]'][0]
+            self.assertEqual(4 * len(bits), signal.length)
+
+    def test_drop_when_full(self):
+        jls = _BlockingWriter(Writer(self.path))
+        status = []
+        w = RecordWriter(jls, queue_bytes=1000, on_status=status.append)
+        topic = 'registry/JS220-000001/events/signals/i/!data'
+        x = np.zeros(100, dtype=np.float32)  # 400 bytes
+        self.assertTrue(w.push(topic, _msg('current', 0, x)))
+        self.assertTrue(w.push(topic, _msg('current', 100, x)))
+        self.assertFalse(w.push(topic, _msg('current', 200, x)))
+        jls.release.set()
+        w.close()
+        s = status[-1]['signals']['JS220-000001.current']
+        self.assertEqual(200, s['written'])
+        self.assertEqual(100, s['dropped'])
+        self.assertEqual(100, s['dropped_total'])
+
+    def _segments(self, w, paths):
+        rv = []
+        for path in paths:
+            with Reader(path) as r:
+                signal = [s for s in r.signals.values() if s.name == 'current'][0]
+                rv.append(r.fsr(signal.signal_id, 0, signal.length))
+        return rv
+
+    def test_segment_size(self):
+        segment = {'path': self.path, 'size': 1000, 'duration': 0, 'count': 0}
+        w = RecordWriter(Writer(segment_path(self.path, 0)), segment=segment)
+        topic = 'registry/JS220-000001/events/signals/i/!data'
+        for k in range(10):
+            w.push(topic, _msg('current', k * 100, np.arange(k * 100, (k + 1) * 100, dtype=np.float32)))
+        w.close()
+        paths = w.paths
+        self.assertGreater(len(paths), 1)
+        self.assertEqual([segment_path(self.path, k) for k in range(len(paths))], paths)
+        data = np.concatenate(self._segments(w, paths))
+        np.testing.assert_equal(np.arange(1000), data)
+
+    def test_segment_ring(self):
+        segment = {'path': self.path, 'size': 0, 'duration': 0.099, 'count': 2}
+        w = RecordWriter(Writer(segment_path(self.path, 0)), segment=segment)
+        topic = 'registry/JS220-000001/events/signals/i/!data'
+        for k in range(10):
+            w.push(topic, _msg('current', k * 100, np.arange(k * 100, (k + 1) * 100, dtype=np.float32)))
+        w.close()
+        paths = w.paths
+        self.assertEqual([segment_path(self.path, 8), segment_path(self.path, 9)], paths)
+        self.assertFalse(os.path.exists(segment_path(self.path, 0)))
+        np.testing.assert_equal(np.arange(800, 1000), np.concatenate(self._segments(w, paths)))
+
+    def _signals(self):
+        rv = {}
+        with Reader(self.path) as r:
+            for s in r.signals.values():
+                if s.signal_type == 0 and s.length:
+                    rv[s.name] = (s.sample_rate, r.fsr(s.signal_id, 0, s.length),
+                                  r.sample_id_to_timestamp(s.signal_id, 0))
+        return rv
+
+    def test_decimate_factor(self):
+        self.assertEqual(1000, decimate_factor(1000000, 1000))
+        self.assertEqual(100, decimate_factor(1000000, 9900))
+        self.assertEqual(1, decimate_factor(1000, 2000))
+        self.assertEqual(7, decimate_factor(7, 1))
+
+    def test_decimate_mean(self):
+        w = RecordWriter(Writer(self.path), decimate={'rate': 100, 'mode': 'mean'})
+        topic = 'registry/JS220-000001/events/signals/i/!data'
+        for k in range(10):
+            w.push(topic, _msg('current', k * 95, np.arange(k * 95, (k + 1) * 95, dtype=np.float32)))
+        w.close()
+        signals = self._signals()
+        fs, x, utc = signals['current']
+        self.assertEqual(100, fs)
+        np.testing.assert_allclose(np.arange(95) * 10 + 4.5, x)
+        self.assertEqual(time64.SECOND, utc)
+
+    def test_decimate_mean_min_max(self):
+        w = RecordWriter(Writer(self.path), decimate={'rate': 250, 'mode': 'mean_min_max'})
+        topic = 'registry/JS220-000001/events/signals/i/!data'
+        w.push(topic, _msg('current', 100, np.arange(1000, dtype=np.float32)))
+        w.close()
+        signals = self._signals()
+        self.assertEqual(250, signals['current_min'][0])
+        np.testing.assert_allclose(np.arange(250) * 4 + 1.5, signals['current'][1])
+        np.testing.assert_allclose(np.arange(250) * 4, signals['current_min'][1])
+        np.testing.assert_allclose(np.arange(250) * 4 + 3, signals['current_max'][1])
+
+    def test_decimate_digital_with_gap(self):
+        w = RecordWriter(Writer(self.path), decimate={'rate': 125, 'mode': 'mean'})
+        topic = 'registry/JS220-000001/events/signals/0/!data'
+        bits = np.array([1, 1, 0, 0, 0, 0, 0, 0] * 4, dtype=np.uint8)
+        w.push(topic, _msg('gpi[0]', 0, np.packbits(bits, bitorder='little'), dtype='u1', units=''))
+        # skip 4 samples, which discards the partial window
+        w.push(topic, _msg('gpi[0]', 36, np.packbits(bits, bitorder='little'), dtype='u1', units=''))
+        w.close()
+        fs, x, _ = self._signals()['gpi[0]']
+        self.assertEqual(125, fs)
+        np.testing.assert_allclose([0.25] * 4, x[:4])
+        self.assertTrue(np.isnan(x[4]))
+        np.testing.assert_allclose([0.25] * 3, x[5:])
+
+    def test_utc_range(self):
+        w = RecordWriter(Writer(self.path))
+        ti = 'registry/JS220-000001/events/signals/i/!data'
+        tv = 'registry/JS220-000001/events/signals/v/!data'
+        for k in range(10):
+            x = np.zeros(100, dtype=np.float32)
+            w.push(ti, _msg('current', k * 100, x))
+            if k >= 2:
+                w.push(tv, _msg('voltage', k * 100, x, units='V'))
+        w.close()
+        t0, t1 = w.utc_range()
+        with Reader(self.path) as r:
+            signals = {s.name: s for s in r.signals.values()}
+            self.assertEqual(r.sample_id_to_timestamp(signals['voltage'].signal_id, 0), t0)
+            self.assertAlmostEqual(r.sample_id_to_timestamp(signals['current'].signal_id, 999), t1, delta=1)
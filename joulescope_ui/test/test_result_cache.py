@@ -0,0 +1,111 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the range tool result cache.
+"""
+
+import unittest
+import os
+import tempfile
+from joulescope_ui.result_cache import ResultCache, result_key, source_identity
+import numpy as np
+
+
+class _PubSub:
+
+    def __init__(self, values):
+        self.values = values
+
+    def query(self, topic, default=None):
+        return self.values.get(topic, default)
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'capture.jls')
+        with open(self.path, 'wb') as f:
+            f.write(b'jls')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _value(self):
+        return {
+            'hist': np.arange(10, dtype=np.int64),
+            'percentiles': {50.0: 1.5, 99.9: 2.5},
+            'windows': ([(1.0, 2)], []),
+            'count': 3,
+        }
+
+    def _assert_value(self, value):
+        np.testing.assert_equal(np.arange(10), value['hist'])
+        self.assertEqual({50.0: 1.5, 99.9: 2.5}, value['percentiles'])
+        self.assertEqual(([(1.0, 2)], []), value['windows'])
+        self.assertEqual(3, value['count'])
+
+    def test_key(self):
+        k1 = result_key({'source': 'a'}, 'JlsSource:1.dev.i', [0, 9], 'hist', {'b': 1, 'a': 2})
+        k2 = result_key({'source': 'a'}, 'JlsSource:2.dev.i', [0, 9], 'hist', {'a': 2, 'b': 1})
+        self.assertEqual(k1, k2)
+        self.assertNotEqual(k1, result_key({'source': 'a'}, 'JlsSource:1.dev.i', [0, 10], 'hist', {'a': 2, 'b': 1}))
+        self.assertNotEqual(k1, result_key({'source': 'a'}, 'JlsSource:1.dev.v', [0, 9], 'hist', {'a': 2, 'b': 1}))
+
+    def test_memory(self):
+        c = ResultCache()
+        self.assertIsNone(c.get('k'))
+        c.put('k', self._value())
+        v = c.get('k')
+        self._assert_value(v)
+        self.assertFalse(v['hist'].flags.writeable)
+        self.assertEqual(1, c.hits)
+        self.assertEqual(1, c.misses)
+
+    def test_memory_eviction(self):
+        c = ResultCache(bytes_max=1000)
+        for k in range(5):
+            c.put(k, np.zeros(50))  # 400 bytes
+        self.assertEqual(2, len(c))
+        self.assertIsNone(c.get(0))
+        self.assertIsNotNone(c.get(4))
+
+    def test_disk(self):
+        c = ResultCache()
+        c.put('k', self._value(), self.path)
+        self.assertTrue(os.path.isfile(os.path.join(c.disk_dir(self.path), 'k.npz')))
+        c2 = ResultCache()
+        self._assert_value(c2.get('k', self.path))
+        self.assertEqual(1, len(c2))  # promoted to memory
+
+    def test_disk_eviction(self):
+        c = ResultCache(disk_bytes_max=20_000)
+        for k in range(5):
+            c.put(f'k{k}', np.zeros(1000), self.path)
+        files = os.listdir(c.disk_dir(self.path))
+        self.assertLess(len(files), 5)
+        self.assertIn('k4.npz', files)
+
+    def test_source_identity(self):
+        pubsub = _PubSub({'registry/JlsSource:1/settings/path': self.path})
+        identity, path = source_identity(pubsub, 'JlsSource:1')
+        self.assertEqual(self.path, path)
+        os.utime(self.path, ns=(0, 0))
+        identity2, _ = source_identity(pubsub, 'JlsSource:1')
+        self.assertNotEqual(identity, identity2)
+
+        pubsub = _PubSub({'registry/Buf:1/settings/generation': 3})
+        self.assertEqual(({'source': 'Buf:1', 'generation': 3}, None), source_identity(pubsub, 'Buf:1'))
+        self.assertEqual((None, None), source_identity(_PubSub({}), 'Dev:1'))
@@ -0,0 +1,123 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the compact statistics data message.
+"""
+
+import copy
+import unittest
+from joulescope_ui.statistics_data import StatisticsData, FIELDS, FIELD_INDEX, as_statistics_data
+import numpy as np
+
+
+def _stat(avg, units):
+    return {
+        'avg': {'value': avg, 'units': units},
+        'std': {'value': 0.5, 'units': units},
+        'min': {'value': avg - 1, 'units': units},
+        'max': {'value': avg + 1, 'units': units},
+        'p2p': {'value': 2.0, 'units': units},
+    }
+
+
+def _driver_msg():
+    """Get a statistics message in the driver format."""
+    current = _stat(2.0, 'A')
+    current['integral'] = {'value': 0.2, 'units': 'C'}
+    power = _stat(6.0, 'W')
+    power['integral'] = {'value': 0.6, 'units': 'J'}
+    return {
+        'time': {
+            'samples': {'value': [1000, 2000], 'units': 'samples'},
+            'utc': {'value': [10, 20], 'units': 'time64'},
+            'delta': {'value': 0.1, 'units': 's'},
+            'sample_freq': {'value': 10000, 'units': 'Hz'},
+            'accum_samples': {'value': [0, 2000], 'units': 'samples'},
+            'time_map': {'offset_time': 0, 'offset_counter': 0, 'counter_rate': 10000.0},
+        },
+        'signals': {
+            'current': current,
+            'voltage': _stat(3.0, 'V'),
+            'power': power,
+        },
+        'accumulators': {
+            'charge': {'value': 10.0, 'units': 'C', 'int_value': 1, 'int_scale': 2 ** -31},
+            'energy': {'value': 30.0, 'units': 'J', 'int_value': 3, 'int_scale': 2 ** -27},
+        },
+    }
+
+
+class TestStatisticsData(unittest.TestCase):
+
+    def test_attributes(self):
+        msg = _driver_msg()
+        msg_orig = copy.deepcopy(msg)
+        s = StatisticsData(msg, 'js220_1', [500, 4.0, 10.0])
+        self.assertEqual(msg_orig, msg)  # not modified
+        self.assertEqual('js220_1', s.unique_id)
+        self.assertEqual(len(FIELDS), len(s.values))
+        self.assertEqual(2.0, s.field('current_avg'))
+        self.assertEqual(4.0, s.field('voltage_max'))
+        self.assertEqual(6.0, s.field('charge'))
+        self.assertEqual(20.0, s.field('energy'))
+        self.assertEqual((10, 20), s.utc)
+        self.assertEqual((1000, 2000), s.samples)
+        self.assertEqual((500, 2000), s.accum_samples)
+        self.assertEqual(10000, s.sample_freq)
+        self.assertEqual(0.1, s.delta)
+        with self.assertRaises(ValueError):
+            s.values[0] = 1.0
+
+    def test_to_dict(self):
+        msg = _driver_msg()
+        d = StatisticsData(msg, 'js220_1').to_dict()
+        expect = copy.deepcopy(msg)
+        expect['source'] = {'unique_id': 'js220_1'}
+        self.assertEqual(expect['time'], d['time'])
+        self.assertEqual(expect['accumulators'], d['accumulators'])
+        self.assertEqual(expect['source'], d['source'])
+        for signal in ['current', 'voltage', 'power']:
+            self.assertEqual(expect['signals'][signal].keys(), d['signals'][signal].keys())
+        self.assertAlmostEqual(0.2, d['signals']['current']['integral']['value'])
+        d['time']['samples']['value'][0] = 0  # owned by the caller
+        self.assertEqual(1000, msg['time']['samples']['value'][0])
+
+    def test_mapping(self):
+        s = StatisticsData(_driver_msg(), 'js220_1', [500, 4.0, 10.0])
+        self.assertEqual(6.0, s['accumulators']['charge']['value'])
+        self.assertEqual([500, 2000], s['time']['accum_samples']['value'])
+        self.assertEqual('js220_1', s.get('source')['unique_id'])
+        self.assertIn('signals', s)
+        self.assertIs(s['signals'], s['signals'])
+
+    def test_from_dict(self):
+        s1 = StatisticsData(_driver_msg(), 'js220_1', [500, 4.0, 10.0])
+        s2 = as_statistics_data(s1.to_dict())
+        self.assertIsNot(s1, s2)
+        self.assertIs(s1, as_statistics_data(s1))
+        self.assertEqual('js220_1', s2.unique_id)
+        self.assertEqual(s1.accum_samples, s2.accum_samples)
+        np.testing.assert_equal(s1.values, s2.values)
+
+    def test_replace(self):
+        s1 = StatisticsData(_driver_msg(), 'js220_1')
+        values = np.array(s1.values)
+        values[FIELD_INDEX['current_avg']] = 7.0
+        s2 = s1.replace(values=values, samples=[0, 2000])
+        self.assertEqual(2.0, s1.field('current_avg'))
+        self.assertEqual(7.0, s2.field('current_avg'))
+        self.assertEqual((0, 2000), s2.samples)
+        self.assertEqual(7.0, s2['signals']['current']['avg']['value'])
+        self.assertEqual([0, 2000], s2['time']['samples']['value'])
@@ -0,0 +1,156 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the statistics history.
+"""
+
+import unittest
+from joulescope_ui.pubsub import PubSub, Metadata
+from joulescope_ui import statistics_history, get_topic_name, time64, CAPABILITIES
+from joulescope_ui.statistics_history import SourceHistory, FIELDS
+import numpy as np
+
+
+T0 = 16 * time64.MINUTE
+_SOURCES_TOPIC = f'registry_manager/capabilities/{CAPABILITIES.STATISTIC_STREAM_SOURCE}/list'
+
+
+def _stat(avg, std=0.0):
+    return {
+        'avg': {'value': avg},
+        'std': {'value': std},
+        'min': {'value': avg - 1},
+        'max': {'value': avg + 1},
+        'p2p': {'value': 2.0},
+    }
+
+
+def _msg(k, rate=10):
+    """Get the statistics message k at rate messages per second."""
+    return {
+        'time': {'utc': {'value': [0, T0 + k * time64.SECOND // rate]}},
+        'signals': {
+            'current': _stat(float(k), 0.5),
+            'voltage': _stat(3.0),
+            'power': _stat(3.0 * k),
+        },
+        'accumulators': {
+            'charge': {'value': 0.1 * k},
+            'energy': {'value': 0.3 * k},
+        },
+    }
+
+
+class TestSourceHistory(unittest.TestCase):
+
+    def test_rollup(self):
+        h = SourceHistory()
+        for k in range(25):
+            h.append(_msg(k))
+        tier, t, data = h.query(tier='1s')
+        self.assertEqual('1s', tier)
+        self.assertEqual(2, len(t))
+        np.testing.assert_equal([T0, T0 + time64.SECOND], t)
+        d = data[0]
+        self.assertEqual(4.5, d[FIELDS.index('current_avg')])
+        self.assertEqual(-1.0, d[FIELDS.index('current_min')])
+        self.assertEqual(10.0, d[FIELDS.index('current_max')])
+        # pooled: within-message variance 0.25 + variance of means over 0..9
+        std = np.sqrt(0.25 + np.var(np.arange(10)))
+        self.assertAlmostEqual(std, d[FIELDS.index('current_std')])
+        self.assertAlmostEqual(0.9, d[FIELDS.index('charge')])
+        tier, t, data = h.query(tier='raw')
+        self.assertEqual(25, len(t))
+        np.testing.assert_equal(np.arange(25), data[:, FIELDS.index('current_avg')])
+
+    def test_cascade(self):
+        h = SourceHistory()
+        for k in range(185):
+            h.append(_msg(k, rate=1))
+        _, t, data = h.query(tier='1m')
+        self.assertEqual(3, len(t))
+        self.assertEqual(29.5, data[0, FIELDS.index('current_avg')])
+        self.assertAlmostEqual(5.9, data[0, FIELDS.index('charge')])
+
+    def test_bounded(self):
+        h = SourceHistory(capacity={'raw': 100})
+        for k in range(250):
+            h.append(_msg(k))
+        self.assertEqual((100, len(FIELDS)), h.tiers['raw'].data.shape)
+        _, t, data = h.query(tier='raw')
+        np.testing.assert_equal(np.arange(150, 250), data[:, FIELDS.index('current_avg')])
+        self.assertTrue(np.all(np.diff(t) > 0))
+
+    def test_query_range_and_tier_select(self):
+        h = SourceHistory(capacity={'raw': 100})
+        for k in range(250):
+            h.append(_msg(k))
+        t_start = T0 + 200 * time64.SECOND // 10
+        tier, t, _ = h.query(start=t_start)
+        self.assertEqual('raw', tier)
+        self.assertEqual(50, len(t))
+        tier, t, _ = h.query(start=t_start, max_points=10)
+        self.assertEqual('1s', tier)
+        self.assertEqual(4, len(t))
+        tier, t, _ = h.query(start=T0)  # older than raw
+        self.assertEqual('1s', tier)
+        with self.assertRaises(ValueError):
+            h.query(tier='1d')
+
+
+class TestStatisticsHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.pubsub = PubSub(app='test_statistics_history')
+        self.pubsub.registry_initialize()
+        self.pubsub.topic_add(_SOURCES_TOPIC, Metadata('obj', 'sources'))
+        self.pubsub.topic_add('registry/dev1/events/statistics/!data', Metadata('obj', 'statistics'))
+        self.pubsub.register(statistics_history.StatisticsHistory)
+        self.history = statistics_history.StatisticsHistory()
+        self.pubsub.register(self.history, 'statistics_history')
+        self.topic = get_topic_name(self.history)
+        self.responses = []
+        self.pubsub.subscribe(f'{self.topic}/events/response', self._on_response)
+
+    def tearDown(self):
+        self.pubsub.unregister('statistics_history', delete=True)
+        self.pubsub.unregister(statistics_history.StatisticsHistory, delete=True)
+
+    def _on_response(self, value):
+        self.responses.append(value)
+
+    def test_query(self):
+        self.pubsub.publish(_SOURCES_TOPIC, ['dev1'])
+        for k in range(20):
+            self.pubsub.publish('registry/dev1/events/statistics/!data', _msg(k))
+        self.pubsub.publish(f'{self.topic}/actions/!query', {'id': 7, 'source': 'dev1', 'tier': '1s'})
+        rv = self.responses[-1]
+        self.assertEqual(7, rv['id'])
+        self.assertEqual('1s', rv['tier'])
+        self.assertEqual(1, rv['period'])
+        self.assertEqual(FIELDS, rv['fields'])
+        self.assertEqual(1, len(rv['time']))
+        self.assertEqual((1, len(FIELDS)), rv['values'].shape)
+
+    def test_query_unknown_source(self):
+        self.pubsub.publish(f'{self.topic}/actions/!query', {'source': 'dev2'})
+        self.assertIn('error', self.responses[-1])
+
+    def test_source_removed(self):
+        self.pubsub.publish(_SOURCES_TOPIC, ['dev1'])
+        self.pubsub.publish(_SOURCES_TOPIC, [])
+        self.pubsub.publish('registry/dev1/events/statistics/!data', _msg(0))
+        self.pubsub.publish(f'{self.topic}/actions/!query', {'source': 'dev1'})
+        self.assertIn('error', self.responses[-1])
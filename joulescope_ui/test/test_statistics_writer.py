@@ -0,0 +1,120 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the statistics record writer thread.
+"""
+
+import unittest
+from pyjoulescope_driver import time64
+from joulescope_ui.widgets.statistics_record.statistics_writer import StatisticsWriter, field_names
+import numpy as np
+import os
+import tempfile
+
+
+T0 = time64.as_time64(1767225600.0)  # 2026-01-01T00:00:00Z
+
+
+def _stat(avg, std, min_, max_):
+    return {
+        'avg': {'value': avg},
+        'std': {'value': std},
+        'min': {'value': min_},
+        'max': {'value': max_},
+        'p2p': {'value': max_ - min_},
+    }
+
+
+def _msg(k):
+    return {
+        'time': {
+            'utc': {'value': [0, T0 + k * time64.SECOND // 10]},
+            'delta': {'value': 0.1},
+        },
+        'signals': {
+            'current': _stat(k * 0.5, 0.1, k * 0.5 - 1, k * 0.5 + 1),
+            'voltage': _stat(3.0, 0.01, 2.5, 3.5),
+            'power': _stat(k * 1.5, 0.2, 0.0, k * 2.0),
+        },
+        'accumulators': {
+            'charge': {'value': 10.0 + k},
+            'energy': {'value': 20.0 + 3 * k},
+        },
+    }
+
+
+class TestStatisticsWriter(unittest.TestCase):
+
+    def setUp(self):
+        self._d = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._d.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self._d.name, name)
+
+    def test_field_names(self):
+        self.assertEqual(['current', 'voltage', 'power', 'charge', 'energy'], field_names())
+        self.assertEqual(['current', 'current_max', 'voltage', 'voltage_max', 'power', 'power_max',
+                          'charge', 'energy'], field_names(['max', 'avg']))
+
+    def test_csv_relative(self):
+        path = self._path('out.csv')
+        w = StatisticsWriter(path)
+        for k in range(3):
+            w.push(_msg(k))
+        w.close()
+        with open(path, 'rt') as f:
+            lines = f.read().splitlines()
+        self.assertEqual('#time,current,voltage,power,charge,energy', lines[0])
+        self.assertEqual('0.0,0,3,0,0,0', lines[1])
+        self.assertEqual('0.1,0.5,3,1.5,1,3', lines[2])
+        self.assertEqual('0.2,1,3,3,2,6', lines[3])
+
+    def test_csv_utc_fields(self):
+        path = self._path('out.csv')
+        w = StatisticsWriter(path, fields=['current_min', 'current_max'], time_format='UTC')
+        for k in range(2):
+            w.push(_msg(k))
+        w.close()
+        with open(path, 'rt') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(['#time,current_min,current_max',
+                          '20260101T000000.0Z,-1,1',
+                          '20260101T000000.1Z,-0.5,1.5'], lines)
+
+    def test_npy(self):
+        path = self._path('out.npy')
+        w = StatisticsWriter(path, fmt='npy', fields=field_names(['avg', 'std']))
+        for k in range(2500):
+            w.push(_msg(k))
+        w.close()
+        y = np.load(path)
+        self.assertEqual(2500, len(y))
+        self.assertEqual(('time', 'current', 'current_std', 'voltage', 'voltage_std', 'power', 'power_std',
+                          'charge', 'energy'), y.dtype.names)
+        np.testing.assert_equal([_msg(k)['time']['utc']['value'][1] for k in range(2500)], y['time'])
+        np.testing.assert_allclose(np.arange(2500) * 0.5, y['current'])
+        np.testing.assert_allclose(np.arange(2500) * 3.0, y['energy'])
+
+    def test_npy_empty(self):
+        path = self._path('out.npy')
+        StatisticsWriter(path, fmt='npy').close()
+        self.assertEqual(0, len(np.load(path)))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            StatisticsWriter(self._path('out.csv'), fields=['current_rms'])
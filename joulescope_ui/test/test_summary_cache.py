@@ -0,0 +1,101 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the summary cache span statistics.
+"""
+
+import unittest
+from joulescope_ui.summary_cache import SummaryCache
+import numpy as np
+
+
+class TestSummaryCache(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.x = (rng.normal(size=100_000) + 3.0).astype(np.float32)
+        self.block_calls = []
+        self.sample_calls = []
+
+    def _block_fn(self, start, increment, length):
+        self.block_calls.append((start, increment, length))
+        d = self.x[start:start + increment * length].astype(np.float64).reshape((length, increment))
+        return np.stack([d.mean(axis=1), d.std(axis=1, ddof=1), d.min(axis=1), d.max(axis=1)], axis=1)
+
+    def _samples_fn(self, start, length):
+        self.sample_calls.append((start, length))
+        return self.x[start:start + length]
+
+    def _cache(self, **kwargs):
+        kwargs.setdefault('block_size', 100)
+        kwargs.setdefault('page_blocks', 16)
+        return SummaryCache(len(self.x), self._block_fn, self._samples_fn, **kwargs)
+
+    def _assert_span(self, stats, start, end):
+        y = self.x[start:end + 1].astype(np.float64)
+        expect = [np.mean(y), np.std(y), np.min(y), np.max(y)]
+        np.testing.assert_allclose(expect, stats[0], rtol=1e-9, atol=1e-9)
+
+    def test_small_span_uses_samples(self):
+        c = self._cache()
+        self._assert_span(c.statistics(10, 150), 10, 150)
+        self.assertEqual(0, len(self.block_calls))
+
+    def test_spans(self):
+        c = self._cache()
+        for start, end in [(0, 99_999), (0, 99), (1, 100), (50, 12_345), (99_900, 200_000), (37, 99_998)]:
+            self._assert_span(c.statistics(start, end), start, min(end, len(self.x) - 1))
+
+    def test_incremental_drag(self):
+        c = self._cache()
+        start, end = 1234, 87_654
+        self._assert_span(c.statistics(start, end, key=1), start, end)
+        block_calls = len(self.block_calls)
+        for k in range(50):
+            start += 137
+            end -= 211
+            self._assert_span(c.statistics(start, end, key=1), start, end)
+        self.assertEqual(block_calls, len(self.block_calls))  # pages cached
+
+    def test_incremental_extrema_removed(self):
+        c = self._cache()
+        idx_min = int(np.argmin(self.x))
+        start = max(0, idx_min - 5000)
+        end = min(len(self.x) - 1, idx_min + 5000)
+        self._assert_span(c.statistics(start, end, key='m'), start, end)
+        start = idx_min + 500
+        self._assert_span(c.statistics(start, end, key='m'), start, end)
+
+    def test_page_eviction(self):
+        c = self._cache(pages_max=2)
+        self._assert_span(c.statistics(0, 99_999), 0, 99_999)
+        self.assertLessEqual(len(c._pages), 2)
+
+    def test_nan_samples(self):
+        self.x[500:700] = np.nan
+        c = self._cache()
+        stats = c.statistics(0, 9_999)
+        y = self.x[:10_000].astype(np.float64)
+        y = y[np.isfinite(y)]
+        np.testing.assert_allclose([np.mean(y), np.std(y), np.min(y), np.max(y)], stats[0], rtol=1e-9)
+
+    def test_nan_samples_unaligned(self):
+        self.x[1234:1250] = np.nan
+        self.x[5050] = np.nan
+        c = self._cache()
+        stats = c.statistics(0, 9_999)
+        y = self.x[:10_000].astype(np.float64)
+        y = y[np.isfinite(y)]
+        np.testing.assert_allclose([np.mean(y), np.std(y), np.min(y), np.max(y)], stats[0], rtol=1e-9)
@@ -0,0 +1,76 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the summary tile cache.
+"""
+
+import unittest
+from joulescope_ui.tile_cache import TileCache
+import numpy as np
+
+
+class TestTileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.arange(100_000, dtype=np.float64)
+        self.calls = []
+
+    def _fn(self, start, increment, length):
+        self.calls.append((start, increment, length))
+        d = self.x[start:start + increment * length].reshape((length, increment))
+        return np.stack([d.mean(axis=1), d.std(axis=1), d.min(axis=1), d.max(axis=1)], axis=1)
+
+    def _expect(self, start, increment, length):
+        d = self.x[start:start + increment * length].reshape((length, increment))
+        return d.mean(axis=1)
+
+    def test_get(self):
+        c = TileCache(tile_entries=16)
+        y = c.get('a', 100, 10, 50, self._fn, len(self.x))
+        self.assertEqual((50, 4), y.shape)
+        np.testing.assert_allclose(self._expect(100, 10, 50), y[:, 0])
+
+    def test_pan_reuses_tiles(self):
+        c = TileCache(tile_entries=16)
+        c.get('a', 0, 10, 64, self._fn, len(self.x))
+        calls = len(self.calls)
+        y = c.get('a', 80, 10, 64, self._fn, len(self.x))
+        np.testing.assert_allclose(self._expect(80, 10, 64), y[:, 0])
+        self.assertEqual(calls + 1, len(self.calls))  # only the new tile
+
+    def test_keys_and_increments_independent(self):
+        c = TileCache(tile_entries=16)
+        c.get('a', 0, 10, 16, self._fn, len(self.x))
+        c.get('b', 0, 10, 16, self._fn, len(self.x))
+        c.get('a', 0, 20, 16, self._fn, len(self.x))
+        self.assertEqual(3, len(self.calls))
+        c.clear('a')
+        self.assertEqual(1, len(c))
+
+    def test_past_end_is_nan(self):
+        c = TileCache(tile_entries=16)
+        y = c.get('a', 99_900, 10, 20, self._fn, len(self.x))
+        np.testing.assert_allclose(self._expect(99_900, 10, 10), y[:10, 0])
+        self.assertTrue(np.all(np.isnan(y[10:])))
+
+    def test_eviction(self):
+        c = TileCache(tile_entries=16, entries_max=32)
+        c.get('a', 0, 10, 64, self._fn, len(self.x))
+        self.assertEqual(2, len(c))
+
+    def test_unaligned(self):
+        c = TileCache()
+        with self.assertRaises(ValueError):
+            c.get('a', 5, 10, 4, self._fn, len(self.x))
@@ -0,0 +1,49 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the USB inrush CSV output.
+"""
+
+import unittest
+from joulescope_ui.range_tools.usb_inrush import inrush_csv_write
+import numpy as np
+import os
+import tempfile
+
+
+class TestUsbInrush(unittest.TestCase):
+
+    def test_csv_chunks(self):
+        fs = 1000.0
+        current = np.linspace(0.0, 1.0, 25, dtype=np.float32)
+        current[[3, 11, 12]] = np.nan
+        voltage = np.full(25, 5.0, dtype=np.float32)
+        voltage[[3, 11, 12]] = 100.0  # excluded with the invalid current
+        voltage[0] = 4.0
+        chunks = [(k, current[k:k + 10], voltage[k:k + 10]) for k in range(0, 25, 10)]
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'inrush.csv')
+            v = inrush_csv_write(path, chunks, fs)
+            values = np.loadtxt(path, delimiter=',')
+        valid = np.isfinite(current)
+        self.assertAlmostEqual(np.mean(voltage[valid]), v)
+        np.testing.assert_allclose(np.flatnonzero(valid) / fs, values[:, 0])
+        np.testing.assert_allclose(current[valid], values[:, 1], atol=5e-4)
+
+    def test_no_valid(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'inrush.csv')
+            chunk = np.full(10, np.nan, dtype=np.float32)
+            self.assertIsNone(inrush_csv_write(path, [(0, chunk, chunk)], 1000.0))
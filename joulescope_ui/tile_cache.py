@@ -0,0 +1,108 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Summary tile cache shared by multiple signal readers.
+
+Summary requests are split into fixed-size tiles aligned to the
+summary increment.  Panning at a constant zoom level then reuses
+the cached tiles and only fetches the tiles that scrolled into view.
+"""
+
+from collections import OrderedDict
+import numpy as np
+
+
+TILE_ENTRIES_DEFAULT = 256
+ENTRIES_MAX_DEFAULT = 1 << 20  # 32 MB of (N, 4) float64 summary entries
+
+
+class TileCache:
+    """A bounded LRU cache of summary tiles.
+
+    :param tile_entries: The number of summary entries per tile.
+    :param entries_max: The maximum number of cached summary entries
+        across all tiles and all keys.
+
+    This class is not thread-safe.  The caller must serialize access.
+    """
+
+    def __init__(self, tile_entries=None, entries_max=None):
+        self._tile_entries = int(TILE_ENTRIES_DEFAULT if tile_entries is None else tile_entries)
+        self._entries_max = int(ENTRIES_MAX_DEFAULT if entries_max is None else entries_max)
+        self._tiles = OrderedDict()  # (key, increment, tile_idx) -> np.ndarray
+        self._entries = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def clear(self, key=None):
+        """Clear cached tiles.
+
+        :param key: The key to clear.  None clears all keys.
+        """
+        for k in list(self._tiles.keys()):
+            if key is None or k[0] == key:
+                self._entries -= len(self._tiles.pop(k))
+
+    def _tile(self, key, increment, tile_idx, fn, sample_length):
+        k = (key, increment, tile_idx)
+        tile = self._tiles.get(k)
+        if tile is not None:
+            self._tiles.move_to_end(k)
+            self.hits += 1
+            return tile
+        self.misses += 1
+        n = self._tile_entries
+        start = tile_idx * n * increment
+        count = min(n, max(0, (sample_length - start) // increment))
+        tile = np.full((n, 4), np.nan, dtype=np.float64)
+        if count:
+            tile[:count] = np.asarray(fn(start, increment, count), dtype=np.float64).reshape((-1, 4))[:count]
+        self._tiles[k] = tile
+        self._entries += n
+        while self._entries > self._entries_max and len(self._tiles) > 1:
+            _, t = self._tiles.popitem(last=False)
+            self._entries -= len(t)
+        return tile
+
+    def get(self, key, start, increment, length, fn, sample_length):
+        """Get summary entries.
+
+        :param key: The hashable key that identifies the signal.
+        :param start: The starting sample id, which must be a multiple of increment.
+        :param increment: The number of samples per summary entry.
+        :param length: The number of summary entries.
+        :param fn: The callable(start, increment, length) that returns the
+            np.ndarray with shape (length, 4) containing [mean, std, min, max],
+            such as pyjls Reader.fsr_statistics bound to a signal.
+        :param sample_length: The total number of samples for the signal.
+            Entries beyond the end are NaN.
+        :return: The np.ndarray with shape (length, 4).
+        """
+        if start % increment:
+            raise ValueError(f'start {start} not aligned to increment {increment}')
+        n = self._tile_entries
+        e0 = start // increment
+        e1 = e0 + length
+        parts = []
+        for tile_idx in range(e0 // n, (e1 - 1) // n + 1):
+            tile = self._tile(key, increment, tile_idx, fn, sample_length)
+            offset = tile_idx * n
+            parts.append(tile[max(e0, offset) - offset:min(e1, offset + n) - offset])
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
@@ -15,6 +15,7 @@
 from PySide6 import QtWidgets, QtGui, QtCore
 from joulescope_ui import N_, register, CAPABILITIES, get_topic_name
 from joulescope_ui.source_selector import SourceSelector
+from joulescope_ui.statistics_data import UNITS, as_statistics_data
 from joulescope_ui.widget_tools import CallableAction, settings_action_create, context_menu_show
 from joulescope_ui.styles import styled_widget
 from joulescope_ui.units import UNITS_SETTING, convert_units, unit_prefix, elapsed_time_formatter
@@ -102,15 +103,14 @@ class AccumulatorWidget(QtWidgets.QWidget):
     def _on_statistics(self, pubsub, topic, value):
         if self._hold_global:
             return
+        value = as_statistics_data(value)
         self._statistics = value
-        signal = value['accumulators'][self.field]
-        signal_value, signal_units = convert_units(signal['value'], signal['units'], self.units)
+        signal_value, signal_units = convert_units(value.field(self.field), UNITS[self.field], self.units)
         _, prefix, scale = unit_prefix(signal_value)
         v_str = ('%+6f' % (signal_value / scale))[:8]
 
-        a_start, a_end = self._statistics['time']['accum_samples']['value']
-        sample_freq = self._statistics['time']['sample_freq']['value']
-        duration = (a_end - a_start) / sample_freq
+        a_start, a_end = value.accum_samples
+        duration = (a_end - a_start) / value.sample_freq
         duration_txt, duration_units = elapsed_time_formatter(duration, fmt='standard', precision=3)
         if duration_units == 's':
             duration_units = ' s'
@@ -27,6 +27,8 @@ _FILENAME = N_('Filename: ')
 _STOP_SET = N_('Set stop duration/time')
 _STOP_CLEAR = N_('Clear scheduled stop')
 _REMAINING = N_('left')
+_DROPPED = N_('dropped')
+_LATENCY = N_('Write latency')
 
 
 _UNIQUE_IDS = {
@@ -50,6 +52,8 @@ class RecordStatusWidget(QtWidgets.QWidget):
     def __init__(self, parent, source_unique_id):
         self._time = None
         self._stop_utc = None
+        self._detail = ''
+        self._dropped = 0
         self._source_unique_id = source_unique_id
         self._brief = _UNIQUE_IDS[source_unique_id]
         super().__init__(parent=parent)
@@ -74,6 +78,8 @@ class RecordStatusWidget(QtWidgets.QWidget):
         self.pubsub.subscribe(f'{topic}/actions/!start', self._on_start, ['pub'])
         self.pubsub.subscribe(f'{topic}/events/!stop', self._on_stop, ['pub'])
         self.pubsub.subscribe(f'{topic}/events/!stop_changed', self._on_stop_changed, ['pub'])
+        if self._source_unique_id == 'SignalRecord':
+            self.pubsub.subscribe(f'{topic}/events/!status', self._on_status, ['pub'])
         self.pubsub.subscribe('registry/ui/events/blink_fast', self._on_tick, ['pub'])
 
     def _on_context_menu(self, pos):
@@ -106,13 +112,30 @@ class RecordStatusWidget(QtWidgets.QWidget):
             path = os.path.dirname(sources[0])
         filenames = [os.path.basename(s) for s in sources]
         filenames_str = '\n'.join(filenames)
-        detail = f'{_PATH}{path}\n\n{filenames_str}'
+        self._detail = f'{_PATH}{path}\n\n{filenames_str}'
+        self._dropped = 0
         self._time = time.time()
-        self.setToolTip(tooltip_format(self._brief, detail))
+        self.setToolTip(tooltip_format(self._brief, self._detail))
         self.setVisible(True)
 
+    def _on_status(self, value):
+        if self._time is None:
+            return
+        lines = []
+        for name, s in value['signals'].items():
+            line = f'{name}: {s["latency_mean"] * 1000:.1f} / {s["latency_max"] * 1000:.1f} ms'
+            if s['dropped_total']:
+                line += f', {s["dropped_total"]} {_DROPPED}'
+            lines.append(line)
+        self._dropped = sum([s['dropped_total'] for s in value['signals'].values()])
+        detail = self._detail
+        if len(lines):
+            detail += f'\n\n{_LATENCY} (mean / max)\n' + '\n'.join(lines)
+        self.setToolTip(tooltip_format(self._brief, detail))
+
     def _on_stop(self):
         self._time = None
+        self._dropped = 0
         self._stop_utc = None
         self._text.setText('')
         self.setToolTip('')
@@ -135,4 +158,6 @@ class RecordStatusWidget(QtWidgets.QWidget):
             rs, ru = elapsed_time_formatter(remaining, precision=1, trim_trailing_zeros=True)
             rs = f'{rs} {ru}' if ru else rs
             text = f'{text} ({rs} {_REMAINING})'
+        if self._dropped:
+            text = f'{text}, {self._dropped} {_DROPPED}'
         self._text.setText(text)
@@ -17,16 +17,83 @@ from joulescope_ui.source_selector import SourceSelector
 from joulescope_ui import N_, register, get_topic_name
 from joulescope_ui.styles import styled_widget
 from joulescope_ui.widget_tools import CallableAction, settings_action_create
+from .serial_log import SerialLog
 from pyjoulescope_driver import time64
 import datetime
 
 
+_FLUSH_INTERVAL_MS = 50
+
+
 def _str_to_time64(t_str):
     t_datetime = datetime.datetime.fromisoformat(t_str)
     t_time64 = time64.as_time64(t_datetime)
     return t_time64
 
 
+class _SerialLogModel(QtCore.QAbstractTableModel):
+    """Present the SerialLog rows without a per-row Qt item."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log = SerialLog()
+        self._columns = [N_('Time'), N_('Message')]
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.log)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self._columns[section]
+        return str(section + 1)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole or not index.isValid():
+            return None
+        if index.column() == 0:
+            return self.log.time_str(index.row())
+        return self.log.message(index.row())
+
+    def clear(self):
+        self.beginResetModel()
+        self.log.clear()
+        self.endResetModel()
+
+    def remove(self, count):
+        """Remove the oldest rows."""
+        count = min(count, len(self.log))
+        if count > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, count - 1)
+            self.log.remove(count)
+            self.endRemoveRows()
+
+    def extend(self, messages):
+        """Append rows, discarding the oldest rows beyond max_lines.
+
+        :param messages: The list of (time64, message) tuples.
+        """
+        max_lines = self.log.max_lines
+        if max_lines is not None and len(messages) > max_lines:
+            messages = messages[-max_lines:]
+        self.remove(self.log.overflow(len(messages)))
+        if not len(messages):
+            return
+        row = len(self.log)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row + len(messages) - 1)
+        for t, message in messages:
+            self.log.append(t, message)
+        self.endInsertRows()
+
+    def max_lines_set(self, value):
+        self.log.max_lines = value
+        self.remove(self.log.overflow())
+
+
 @register
 @styled_widget(N_('Serial Console'))
 class SerialConsoleWidget(QtWidgets.QWidget):
@@ -47,7 +114,12 @@ class SerialConsoleWidget(QtWidgets.QWidget):
             'dtype': 'int',
             'brief': 'Plot index',
             'default': -1,
-        }
+        },
+        'max_lines': {
+            'dtype': 'int',
+            'brief': N_('The maximum number of messages to keep.'),
+            'default': 1000000,
+        },
     }
 
     def __init__(self, parent=None):
@@ -66,10 +138,17 @@ class SerialConsoleWidget(QtWidgets.QWidget):
         self._layout.setContentsMargins(0, 0, 0, 0)
         self._layout.setSpacing(0)
 
-        self._table = QtWidgets.QTableWidget(rowCount=0, columnCount=2, parent=self)
+        self._pending = []  # (time64, message) not yet in the model
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(_FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush)
+
+        self._model = _SerialLogModel(self)
+        self._table = QtWidgets.QTableView(self)
+        self._table.setModel(self._model)
         self._table.setShowGrid(False)
         self._table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
-        self._table.setHorizontalHeaderLabels([N_('Time'), N_('Message')])
         self._table.setContextMenuPolicy(QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
         self._table.customContextMenuRequested.connect(self._context_menu)
         self._table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
@@ -79,24 +158,33 @@ class SerialConsoleWidget(QtWidgets.QWidget):
         hdr.setStretchLastSection(True)
         hdr = self._table.verticalHeader()
         hdr.setVisible(False)
-        hdr.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
-        self._table.itemSelectionChanged.connect(self._on_selection)
-        #self._table.cellClicked.connect(self._on_cell_clicked)
+        # Fixed rows so that the view never measures rows outside the viewport.
+        hdr.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        hdr.setDefaultSectionSize(self._table.fontMetrics().height() + 4)
+        self._table.selectionModel().selectionChanged.connect(self._on_selection)
         self._layout.addWidget(self._table)
 
     def on_pubsub_register(self):
         topic = f'{get_topic_name(self)}/settings/source'
         self.source_selector.on_pubsub_register(self.pubsub, topic)
+        self._model.max_lines_set(self.max_lines)
         self.pubsub.subscribe('registry/app/settings/signal_stream_enable',
                               self._on_global_signal_stream_enable, ['retain', 'pub'])
         view = self.pubsub.query('registry/view/settings/active')
         self.pubsub.subscribe(f'{get_topic_name(view)}/children', self._on_view_update, ['retain', 'pub'])
 
+    def on_pubsub_unregister(self):
+        self._flush_timer.stop()
+        self._pending.clear()
+
+    def on_setting_max_lines(self, value):
+        self._model.max_lines_set(value)
+
     def _on_global_signal_stream_enable(self, topic, value):
         self._enable = bool(value)
         if self._enable:
-            for idx in range(self._table.rowCount(), -1, -1):
-                self._table.removeRow(idx)
+            self._pending.clear()
+            self._model.clear()
 
     def _waveform_subscribe(self):
         topic = f'{get_topic_name(self.waveform_widget)}/settings/x_extent'
@@ -118,8 +206,8 @@ class SerialConsoleWidget(QtWidgets.QWidget):
 
     def _on_waveform_extent(self, topic, value):
         x0, _ = value
-        while self._table.rowCount() and self._row_time64(0) < x0:
-            self._table.removeRow(0)
+        self._flush()
+        self._model.remove(self._model.log.index(x0))
 
     def _connect(self):
         self.pubsub.unsubscribe(self._subscription)
@@ -131,7 +219,7 @@ class SerialConsoleWidget(QtWidgets.QWidget):
 
     def _on_data(self, pubsub, topic, value):
         if self._enable:
-            self._add(value['time_str'], value['message'])
+            self._add(value['time_str'], value['message'], value.get('time64'))
 
     @QtCore.Slot()
     def _on_source_changed(self, value):
@@ -141,13 +229,15 @@ class SerialConsoleWidget(QtWidgets.QWidget):
     def _on_resolved_changed(self, value):
         self._connect()
 
-    def _add(self, timestamp, message):
-        row = self._table.rowCount()
-        self._table.insertRow(row)
-        self._table.setItem(row, 0, QtWidgets.QTableWidgetItem(str(timestamp)))
-        self._table.setItem(row, 1, QtWidgets.QTableWidgetItem(str(message)))
-        if self.plot_index >= 0:
+    def _add(self, timestamp, message, t_time64=None):
+        if t_time64 is None:
             t_time64 = _str_to_time64(timestamp)
+        self._pending.append((t_time64, message))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+        if self.plot_index >= 0:
+            if isinstance(message, bytes):
+                message = message.decode('utf-8', errors='backslashreplace')
             topic = f'{get_topic_name(self.waveform_widget)}/actions/!text_annotation'
             a = {
                 'plot_index': self.plot_index,
@@ -160,17 +250,17 @@ class SerialConsoleWidget(QtWidgets.QWidget):
             }
             self.pubsub.publish(topic, ['add', a])
 
-    def _row_time64(self, row_idx):
-        t_str = self._table.item(row_idx, 0).text()
-        return _str_to_time64(t_str)
+    @QtCore.Slot()
+    def _flush(self):
+        pending, self._pending = self._pending, []
+        self._model.extend(pending)
+
+    def _selected_rows(self):
+        return sorted([index.row() for index in self._table.selectionModel().selectedRows()])
 
     @QtCore.Slot()
     def _on_selection(self):
-        t_time64 = []
-        for item in self._table.selectedItems():
-            if item.column() == 0:
-                t_time64.append(self._row_time64(item.row()))
-        t_time64.sort()
+        t_time64 = sorted([self._model.log.time64(row) for row in self._selected_rows()])
         topic = f'{get_topic_name(self.waveform_widget)}/actions/!x_markers'
         if len(t_time64) == 0:
             self.pubsub.publish(topic, ['show_single', 'serial_console', None])
@@ -180,20 +270,12 @@ class SerialConsoleWidget(QtWidgets.QWidget):
             self.pubsub.publish(topic, ['show_dual', 'serial_console', t_time64[0], t_time64[-1]])
 
     def _action_copy_selection_to_clipboard(self, time_mode=None):
-        items = []
-        for item in self._table.selectedItems():
-            row_idx = item.row()
-            if item.column() == 0:
-                items.append([
-                    row_idx,
-                    item.text(),
-                    self._table.item(row_idx, 1).text()
-                ])
-        items.sort()
+        log = self._model.log
+        rows = self._selected_rows()
         if time_mode in [True, 'on', None]:
-            parts = [f'{x[1]} {x[2]}' for x in items]
+            parts = [f'{log.time_str(row)} {log.message(row)}' for row in rows]
         else:
-            parts = [x[2] for x in items]
+            parts = [log.message(row) for row in rows]
         self._clipboard = '\n'.join(parts)
         QtWidgets.QApplication.clipboard().setText(self._clipboard)
 
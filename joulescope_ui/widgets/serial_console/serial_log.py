@@ -0,0 +1,153 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compact storage for serial console messages.
+"""
+
+from pyjoulescope_driver import time64
+import numpy as np
+
+
+_CAPACITY_MIN = 1024
+
+
+class SerialLog:
+    """Store serial messages with bounded retention.
+
+    :param max_lines: The maximum number of messages to keep.  Appending
+        beyond max_lines discards the oldest messages.
+
+    The log stores the message times in one int64 numpy array and the
+    message text as UTF-8 in one bytearray, with an int64 numpy array of
+    offsets into the bytearray.  Rows are only converted to str by
+    time_str() and message(), so a view only converts the visible rows.
+    Row 0 is always the oldest message.  The message times must be
+    non-decreasing for index().
+    """
+
+    def __init__(self, max_lines=None):
+        self._max_lines = None
+        self._time = np.zeros(_CAPACITY_MIN, dtype=np.int64)
+        self._offset = np.zeros(_CAPACITY_MIN + 1, dtype=np.int64)
+        self._data = bytearray()
+        self._head = 0  # the index of row 0
+        self._tail = 0  # the index after the last row
+        self.max_lines = max_lines
+
+    def __len__(self):
+        return self._tail - self._head
+
+    @property
+    def max_lines(self):
+        return self._max_lines
+
+    @max_lines.setter
+    def max_lines(self, value):
+        self._max_lines = None if value is None or value <= 0 else int(value)
+
+    def clear(self):
+        """Remove all messages."""
+        self._data.clear()
+        self._offset[0] = 0
+        self._head = 0
+        self._tail = 0
+
+    def overflow(self, count=0):
+        """Get the number of messages to remove to add more messages.
+
+        :param count: The number of messages to add.
+        :return: The number of oldest messages that retention discards.
+        """
+        if self._max_lines is None:
+            return 0
+        return max(0, len(self) + count - self._max_lines)
+
+    def append(self, t, message):
+        """Append a message.
+
+        :param t: The message time64.
+        :param message: The message str or bytes.
+        """
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        if self._tail >= len(self._time):
+            self._grow()
+        self._data += message
+        self._time[self._tail] = t
+        self._tail += 1
+        self._offset[self._tail] = len(self._data)
+
+    def remove(self, count):
+        """Remove the oldest messages.
+
+        :param count: The number of messages to remove.
+        """
+        count = min(int(count), len(self))
+        if count <= 0:
+            return
+        self._head += count
+        if self._head == self._tail:
+            self.clear()
+        elif self._head > len(self) and self._head >= _CAPACITY_MIN:
+            self._compact()
+
+    def _compact(self):
+        n = len(self)
+        data_start = int(self._offset[self._head])
+        del self._data[:data_start]
+        self._time[:n] = self._time[self._head:self._tail]
+        self._offset[:n + 1] = self._offset[self._head:self._tail + 1] - data_start
+        self._head = 0
+        self._tail = n
+
+    def _grow(self):
+        if self._head:
+            self._compact()
+            if self._tail < len(self._time):
+                return
+        sz = len(self._time) * 2
+        t = np.zeros(sz, dtype=np.int64)
+        t[:self._tail] = self._time[:self._tail]
+        offset = np.zeros(sz + 1, dtype=np.int64)
+        offset[:self._tail + 1] = self._offset[:self._tail + 1]
+        self._time = t
+        self._offset = offset
+
+    def time64(self, row):
+        """Get the message time.
+
+        :param row: The row index.
+        :return: The time64 message time.
+        """
+        return int(self._time[self._head + row])
+
+    def time_str(self, row):
+        """Get the message time as an ISO 8601 string."""
+        return time64.as_datetime(self.time64(row)).isoformat()
+
+    def message(self, row):
+        """Get the message text."""
+        idx = self._head + row
+        b = self._data[self._offset[idx]:self._offset[idx + 1]]
+        return b.decode('utf-8', errors='backslashreplace')
+
+    def index(self, t):
+        """Find a message by time.
+
+        :param t: The time64.
+        :return: The first row index with a message time at or after t,
+            which is len(self) when all messages are before t.
+        """
+        return int(np.searchsorted(self._time[self._head:self._tail], t, side='left'))
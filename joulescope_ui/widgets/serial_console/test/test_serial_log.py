@@ -0,0 +1,70 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the serial console message log.
+"""
+
+import unittest
+from joulescope_ui.widgets.serial_console.serial_log import SerialLog
+from pyjoulescope_driver import time64
+
+
+T0 = time64.as_time64(1767225600.0)  # 2026-01-01T00:00:00Z
+
+
+class TestSerialLog(unittest.TestCase):
+
+    def test_append(self):
+        log = SerialLog()
+        self.assertEqual(0, len(log))
+        log.append(T0, 'hello')
+        log.append(T0 + time64.SECOND, b'w\xc3\xb6rld')
+        log.append(T0 + 2 * time64.SECOND, b'\xff')
+        self.assertEqual(3, len(log))
+        self.assertEqual('hello', log.message(0))
+        self.assertEqual('wörld', log.message(1))
+        self.assertEqual('\\xff', log.message(2))
+        self.assertEqual(T0 + time64.SECOND, log.time64(1))
+        self.assertEqual('2026-01-01T00:00:01+00:00', log.time_str(1))
+
+    def test_retention(self):
+        log = SerialLog(max_lines=1000)
+        for k in range(5000):
+            log.remove(log.overflow(1))
+            log.append(T0 + k, f'msg {k}')
+        self.assertEqual(1000, len(log))
+        self.assertEqual('msg 4000', log.message(0))
+        self.assertEqual('msg 4999', log.message(999))
+        self.assertEqual(T0 + 4000, log.time64(0))
+        self.assertLessEqual(len(log._time), 4096)
+
+    def test_remove_all(self):
+        log = SerialLog()
+        for k in range(10):
+            log.append(T0 + k, f'msg {k}')
+        log.remove(20)
+        self.assertEqual(0, len(log))
+        log.append(T0, 'again')
+        self.assertEqual('again', log.message(0))
+
+    def test_index(self):
+        log = SerialLog()
+        for k in range(3000):
+            log.append(T0 + 10 * k, f'msg {k}')
+        log.remove(1500)
+        self.assertEqual(0, log.index(T0))
+        self.assertEqual(0, log.index(T0 + 15000))
+        self.assertEqual(1, log.index(T0 + 15001))
+        self.assertEqual(1500, log.index(T0 + 100000))
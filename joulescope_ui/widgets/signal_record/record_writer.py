@@ -0,0 +1,583 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Write signal sample data messages to a JLS file on a dedicated thread.
+"""
+
+from pyjls import Writer, SignalType
+from joulescope_ui import time64
+from joulescope_ui.jls_v2 import DTYPE_MAP
+import copy
+import json
+import logging
+import numpy as np
+import os
+import queue
+import threading
+import time
+
+
+QUEUE_BYTES_DEFAULT = 256 * 1024 * 1024
+DECIMATE_MODES = ['mean', 'mean_min_max']
+_UTC_INTERVAL = 10 * time64.MINUTE
+_BATCH_MAX = 64             # queue items processed per batch
+_STATUS_INTERVAL = 1.0      # seconds
+
+_SAMPLES_PER_ELEMENT = {
+    'u1': 8,
+    'u4': 2,
+    'i4': 2,
+}
+
+
+def _samples(value):
+    return len(value['data']) * _SAMPLES_PER_ELEMENT.get(value['dtype'], 1)
+
+
+def _unpack(value, x):
+    dtype = value['dtype']
+    if dtype == 'u1':
+        return np.unpackbits(x, bitorder='little')
+    elif dtype in ['u4', 'i4']:
+        y = np.empty(len(x) * 2, dtype=np.uint8)
+        y[0::2] = np.bitwise_and(x, 0x0f)
+        y[1::2] = np.right_shift(x, 4)
+        return y
+    return x
+
+
+def decimate_factor(sample_freq, rate):
+    """Get the decimation factor for a target output rate.
+
+    :param sample_freq: The input sample rate in Hz.
+    :param rate: The target output sample rate in Hz.
+    :return: The integer factor closest to sample_freq / rate that also
+        gives an integer output sample rate, as JLS requires.
+    """
+    sample_freq = int(sample_freq)
+    n = max(1, int(round(sample_freq / rate)))
+    for d in range(n):
+        for k in (n - d, n + d):
+            if k >= 1 and sample_freq % k == 0:
+                return k
+    return 1
+
+
+class _Decimator:
+    """Reduce one signal to fixed windows of samples.
+
+    :param factor: The number of input samples per output sample.
+    :param mode: The decimation mode in DECIMATE_MODES.
+
+    Windows align to the first input sample.  A sample_id discontinuity
+    discards the partial window and skips to the next aligned window.
+    """
+
+    def __init__(self, factor, mode):
+        self.factor = int(factor)
+        self.reductions = ['mean'] if mode == 'mean' else ['mean', 'min', 'max']
+        self._sample_id0 = None      # the first input sample_id
+        self._sample_id_next = None  # the next expected input sample_id
+        self._buf = np.empty(0, dtype=np.float32)
+        self._buf_sample_id = 0      # the input sample_id for _buf[0]
+
+    def process(self, value, x):
+        """Process contiguous input samples.
+
+        :param value: The signal data message for the first sample in x.
+        :param x: The unpacked input samples.
+        :return: (sample_id, utc, [arrays]) in output samples for each
+            reduction, or None when no window completed.
+        """
+        n = self.factor
+        sample_id = value['sample_id']
+        sample_id_next = sample_id + len(x)
+        if self._sample_id0 is None:
+            self._sample_id0 = sample_id
+            self._buf_sample_id = sample_id
+        elif sample_id != self._sample_id_next:
+            skip = (self._sample_id0 - sample_id) % n
+            x = x[skip:]
+            self._buf = self._buf[:0]
+            self._buf_sample_id = sample_id + skip
+        self._sample_id_next = sample_id_next
+        if len(self._buf):
+            x = np.concatenate((self._buf, x))
+        k = (len(x) // n) * n
+        self._buf = x[k:].astype(np.float32)
+        buf_sample_id, self._buf_sample_id = self._buf_sample_id, self._buf_sample_id + k
+        if not k:
+            return None
+        windows = x[:k].reshape((-1, n))
+        y = []
+        for reduction in self.reductions:
+            if reduction == 'mean':
+                y.append(np.mean(windows, axis=1, dtype=np.float64).astype(np.float32))
+            elif reduction == 'min':
+                y.append(np.min(windows, axis=1).astype(np.float32))
+            else:
+                y.append(np.max(windows, axis=1).astype(np.float32))
+        fs = value['sample_freq']
+        utc = value['utc'] + int(round((buf_sample_id - sample_id) * time64.SECOND / fs))
+        return (buf_sample_id - self._sample_id0) // n, utc, y
+
+
+def segment_path(path, index):
+    """Get the path for a segmented recording.
+
+    :param path: The recording path.
+    :param index: The segment index, starting from 0.
+    :return: The path with the segment index inserted before the extension.
+    """
+    base, ext = os.path.splitext(path)
+    return f'{base}_{index:04d}{ext}'
+
+
+class RecordWriter:
+    """Write signal data messages to a JLS file on a dedicated thread.
+
+    :param jls: The open pyjls.Writer instance.  This instance takes
+        ownership and closes it.
+    :param queue_bytes: The maximum sample data bytes waiting to be
+        written.  When full, push() drops blocks and counts them.
+    :param on_status: The optional callable(status) called from the writer
+        thread about once per second while data flows, and once more at
+        close.  See status().
+    :param segment: The optional segmented recording dict with:
+
+        * path: The recording path.  jls must be open to
+          segment_path(path, 0).
+        * duration: The segment duration in seconds, 0 for no limit.
+        * size: The segment sample data size in bytes, 0 for no limit.
+        * count: The number of newest segments to keep, 0 to keep all.
+
+    :param decimate: The optional decimated recording dict with:
+
+        * rate: The target output sample rate in Hz, 0 for full rate.
+          The writer reduces each signal by decimate_factor() and
+          writes the actual rate to the JLS signal definition.
+        * mode: One of DECIMATE_MODES.  'mean_min_max' adds the
+          '{field}_min' and '{field}_max' signals.
+
+        Decimated signals are f32.  Digital signals become the fraction
+        of time high over each window.
+
+    The caller thread only enqueues references to the message data, which
+    must not be modified after push().  The writer thread defines the JLS
+    sources and signals on first use, writes the UTC entries and merges
+    contiguous blocks for each signal into a single write.
+
+    With segment limits, the writer closes the file and continues in the
+    next segment file between blocks, so no samples are lost at the
+    boundary.  Each segment defines its own sources, signals, UTC entries
+    and user data.
+    """
+
+    def __init__(self, jls, queue_bytes=None, on_status=None, segment=None, decimate=None):
+        self._log = logging.getLogger(__name__)
+        self._jls = jls
+        self._decimate = decimate
+        self._decimators = {}  # topic -> _Decimator or None for full rate
+        self._segment = segment
+        self._segment_index = 0
+        self._segment_utc = None     # the first sample time64 in this segment
+        self._segment_bytes = 0      # the sample data bytes in this segment
+        self._paths = [] if segment is None else [segment_path(segment['path'], 0)]
+        self._user_data = []
+        self._queue_bytes = QUEUE_BYTES_DEFAULT if queue_bytes is None else int(queue_bytes)
+        self._on_status = on_status
+        self._lock = threading.Lock()
+        self._bytes = 0  # bytes in the queue, protected by _lock
+        self._queue = queue.Queue()
+        self._source_idx = 1
+        self._signal_idx = 1
+        self._sources = {}
+        self._signals = {}   # topic -> signal info, writer thread only
+        self._counters = {}  # topic -> counters, protected by _lock
+        self._status_time = time.perf_counter()
+        self._thread = threading.Thread(name='signal_record_writer', target=self._run, daemon=True)
+        self._thread.start()
+
+    def _counter(self, topic, value):
+        c = self._counters.get(topic)
+        if c is None:
+            c = {
+                'name': f"{topic.split('/')[1]}.{value['field']}",
+                'written': 0,
+                'dropped': 0,
+                'dropped_total': 0,
+                'latency_sum': 0.0,
+                'latency_count': 0,
+                'latency_max': 0.0,
+            }
+            self._counters[topic] = c
+        return c
+
+    def push(self, topic, value):
+        """Enqueue a signal data message for writing.
+
+        :param topic: The signal data topic.
+        :param value: The signal data message.
+        :return: True if queued, False if dropped.
+        """
+        nbytes = value['data'].nbytes
+        with self._lock:
+            if self._bytes + nbytes > self._queue_bytes:
+                c = self._counter(topic, value)
+                samples = _samples(value)
+                c['dropped'] += samples
+                c['dropped_total'] += samples
+                return False
+            self._bytes += nbytes
+        self._queue.put(('data', (topic, value, time.perf_counter())))
+        return True
+
+    def user_data(self, chunk_meta, data):
+        """Enqueue a JLS user data entry, which repeats in each segment."""
+        self._queue.put(('user_data', (chunk_meta, data)))
+
+    @property
+    def paths(self):
+        """The list of segment paths that currently exist, oldest first."""
+        return list(self._paths)
+
+    def close(self):
+        """Write all queued data, close the JLS file and stop the thread."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(('close', None))
+        thread.join()
+
+    def utc_range(self):
+        """Get the time range common to all signals in the last file.
+
+        :return: The (utc_first, utc_last) time64 tuple, or None when no
+            signal data was written.  Only call after close().
+        """
+        t_start = [s['utc_first'] for s in self._signals.values() if s['utc_first'] is not None]
+        t_stop = [s['utc_last'] for s in self._signals.values() if s['utc_last'] is not None]
+        if not len(t_start):
+            return None
+        return max(t_start), min(t_stop)
+
+    @property
+    def queue_bytes(self):
+        """The sample data bytes waiting to be written."""
+        return self._bytes
+
+    def status(self):
+        """Get the status and reset the interval counters.
+
+        :return: dict with 'queue_bytes' and 'signals'.  The 'signals'
+            entry maps each '{source}.{field}' name to a dict with 'written',
+            'dropped' and 'dropped_total' samples, along with the
+            'latency_mean' and 'latency_max' in seconds from push() until
+            written.  All values except 'dropped_total' cover the interval
+            since the previous call.
+        """
+        signals = {}
+        with self._lock:
+            for c in self._counters.values():
+                n = c['latency_count']
+                signals[c['name']] = {
+                    'written': c['written'],
+                    'dropped': c['dropped'],
+                    'dropped_total': c['dropped_total'],
+                    'latency_mean': c['latency_sum'] / n if n else 0.0,
+                    'latency_max': c['latency_max'],
+                }
+                c.update({'written': 0, 'dropped': 0, 'latency_sum': 0.0, 'latency_count': 0, 'latency_max': 0.0})
+            queue_bytes = self._bytes
+        rv = {'queue_bytes': queue_bytes, 'signals': signals}
+        if self._segment is not None:
+            rv['segment'] = self._segment_index
+            rv['path'] = self._paths[-1] if len(self._paths) else None
+        return rv
+
+    def _status_publish(self, force=False):
+        t = time.perf_counter()
+        if not force and t - self._status_time < _STATUS_INTERVAL:
+            return
+        self._status_time = t
+        if self._on_status is not None:
+            try:
+                self._on_status(self.status())
+            except Exception:
+                self._log.exception('on_status')
+
+    def _source_add(self, unique_id, info):
+        info = copy.deepcopy(info)
+        model = info.get('model', '')
+        serial_number = info.get('serial_number', '')
+        name = f'{model}-{serial_number}'
+        version = info.get('version')
+        if isinstance(version, dict):
+            version = json.dumps(version)
+        self._jls.source_def(
+            source_id=self._source_idx,
+            name=name,
+            vendor=info['vendor'],
+            model=model,
+            version=version,
+            serial_number=serial_number,
+        )
+        info['id'] = self._source_idx
+        info['name'] = name
+        self._sources[unique_id] = info
+        self._source_idx += 1
+
+    def _signal_add(self, source, key, value, name, dtype, sample_rate):
+        source_info = self._sources[source]
+        source_id = source_info['id']
+        self._jls.signal_def(
+            signal_id=self._signal_idx,
+            source_id=source_id,
+            signal_type=SignalType.FSR,
+            data_type=DTYPE_MAP[dtype],
+            sample_rate=sample_rate,
+            name=name.replace(' ', '_'),
+            units=value['units'],
+        )
+        self._signals[key] = {
+            'id': self._signal_idx,
+            'name': name,
+            'sample_rate': sample_rate,
+            'utc_first': None,       # the first sample time64
+            'utc_last': None,        # the last sample time64
+            'utc_entry_prev': None,    # the previous UTC entry
+            'utc_data_prev': None,   # the previous UTC info from streaming sample data
+        }
+        self._signal_idx += 1
+
+    def _signal_get(self, topic, value, key=None, name=None, dtype=None, sample_rate=None):
+        key = topic if key is None else key
+        if key not in self._signals:
+            source = topic.split('/')[1]
+            if source not in self._sources:
+                self._source_add(source, value['source'])
+            self._signal_add(source, key, value,
+                             value['field'] if name is None else name,
+                             value['dtype'] if dtype is None else dtype,
+                             value['sample_freq'] if sample_rate is None else sample_rate)
+        return self._signals[key]
+
+    def _decimator_get(self, topic, value):
+        if self._decimate is None:
+            return None
+        if topic not in self._decimators:
+            rate = self._decimate.get('rate') or 0
+            factor = decimate_factor(value['sample_freq'], rate) if rate > 0 else 1
+            mode = self._decimate.get('mode') or 'mean'
+            self._decimators[topic] = _Decimator(factor, mode) if factor > 1 else None
+        return self._decimators[topic]
+
+    def _write(self, topic, items):
+        """Write contiguous blocks for one signal.
+
+        :param topic: The signal data topic.
+        :param items: The list of (value, t_push) for this topic, in order.
+        """
+        if self._segment is None:
+            return self._write_run(topic, items)
+        run = []
+        nbytes = self._segment_bytes
+        for item in items:
+            value = item[0]
+            if self._segment_expired(value['utc'], nbytes):
+                if len(run):
+                    self._write_run(topic, run)
+                    run = []
+                self._segment_roll(value['utc'])
+                nbytes = 0
+            run.append(item)
+            nbytes += value['data'].nbytes
+        self._write_run(topic, run)
+
+    def _write_run(self, topic, items):
+        value = items[0][0]
+        samples = sum([_samples(v) for v, _ in items])
+        if self._jls is None:
+            self._counters_update(topic, value, items, 0, samples)
+            return
+        if len(items) == 1:
+            x = value['data']
+        else:
+            x = np.concatenate([v['data'] for v, _ in items])
+        written = 0
+        decimator = self._decimator_get(topic, value)
+        try:
+            if decimator is None:
+                last = items[-1][0]
+                signal = self._signal_get(topic, value)
+                self._fsr(signal, value['sample_id'], value['utc'], x, samples, [last['sample_id'], last['utc']])
+            else:
+                rv = decimator.process(value, _unpack(value, x))
+                if rv is not None:
+                    sample_id, utc, ys = rv
+                    sample_rate = int(value['sample_freq']) // decimator.factor
+                    for reduction, y in zip(decimator.reductions, ys):
+                        if reduction == 'mean':
+                            key, name = topic, value['field']
+                        else:
+                            key, name = f'{topic}/{reduction}', f'{value["field"]}_{reduction}'
+                        signal = self._signal_get(topic, value, key, name, 'f32', sample_rate)
+                        self._fsr(signal, sample_id, utc, y, len(y), [sample_id, utc])
+            written = samples
+        except Exception:
+            self._log.exception('fsr %s', topic)
+        self._counters_update(topic, value, items, written, samples)
+
+    def _fsr(self, signal, sample_id, utc, x, samples, utc_data):
+        if not samples:
+            return
+        if signal['utc_first'] is None:
+            signal['utc_first'] = utc
+        signal['utc_last'] = utc + int(round((samples - 1) * time64.SECOND / signal['sample_rate']))
+        if signal['utc_entry_prev'] is None or (utc - signal['utc_entry_prev'][1]) >= _UTC_INTERVAL:
+            self._log.info('utc %s: %s, %s', signal['name'], sample_id, utc)
+            self._jls.utc(signal['id'], sample_id, utc)
+            signal['utc_entry_prev'] = [sample_id, utc]
+        signal['utc_data_prev'] = utc_data
+        self._jls.fsr(signal['id'], sample_id, np.ascontiguousarray(x))
+        self._segment_bytes += x.nbytes
+
+    def _counters_update(self, topic, value, items, written, samples):
+        t = time.perf_counter()
+        with self._lock:
+            c = self._counter(topic, value)
+            c['written'] += written
+            c['dropped'] += samples - written
+            c['dropped_total'] += samples - written
+            for _, t_push in items:
+                latency = t - t_push
+                c['latency_sum'] += latency
+                c['latency_count'] += 1
+                c['latency_max'] = max(c['latency_max'], latency)
+
+    def _batch_process(self, batch):
+        runs = {}  # topic -> list of contiguous runs
+        nbytes = 0
+        for topic, value, t_push in batch:
+            nbytes += value['data'].nbytes
+            topic_runs = runs.setdefault(topic, [])
+            if len(topic_runs):
+                prev = topic_runs[-1][-1][0]
+                if prev['dtype'] == value['dtype'] and prev['sample_id'] + _samples(prev) == value['sample_id']:
+                    topic_runs[-1].append((value, t_push))
+                    continue
+            topic_runs.append([(value, t_push)])
+        for topic, topic_runs in runs.items():
+            for run in topic_runs:
+                self._write(topic, run)
+        with self._lock:
+            self._bytes -= nbytes
+
+    def _segment_expired(self, utc, nbytes):
+        """Check if the next block starts a new segment.
+
+        :param utc: The next block time64.
+        :param nbytes: The sample data bytes in the current segment.
+        :return: True to start a new segment.
+        """
+        if self._segment_utc is None:
+            self._segment_utc = utc
+            return False
+        duration = self._segment.get('duration') or 0
+        size = self._segment.get('size') or 0
+        if duration > 0 and (utc - self._segment_utc) >= duration * time64.SECOND:
+            return True
+        return 0 < size <= nbytes
+
+    def _segment_roll(self, utc):
+        try:
+            self._close()
+        except Exception:
+            self._log.exception('segment close')
+        self._sources = {}
+        self._signals = {}
+        self._source_idx = 1
+        self._signal_idx = 1
+        self._segment_index += 1
+        self._segment_utc = utc
+        self._segment_bytes = 0
+        path = segment_path(self._segment['path'], self._segment_index)
+        self._log.info('segment %d: %s', self._segment_index, path)
+        try:
+            self._jls = Writer(path)
+        except Exception:
+            self._log.exception('segment open %s', path)
+            return
+        self._paths.append(path)
+        for args in self._user_data:
+            self._jls.user_data(*args)
+        count = self._segment.get('count') or 0
+        while 0 < count < len(self._paths):
+            path_remove = self._paths.pop(0)
+            self._log.info('segment remove: %s', path_remove)
+            try:
+                os.remove(path_remove)
+            except Exception:
+                self._log.exception('segment remove %s', path_remove)
+
+    def _close(self):
+        jls, self._jls = self._jls, None
+        if jls is None:
+            return
+        for signal in self._signals.values():
+            if signal['utc_data_prev'] is not None and signal['utc_data_prev'] != signal['utc_entry_prev']:
+                self._log.info('utc %s: %s', signal['name'], signal['utc_data_prev'])
+                jls.utc(signal['id'], *signal['utc_data_prev'])
+        jls.close()
+
+    def _run(self):
+        self._log.info('start')
+        running = True
+        while running:
+            try:
+                item = self._queue.get(timeout=_STATUS_INTERVAL)
+            except queue.Empty:
+                continue
+            items = [item]
+            while len(items) < _BATCH_MAX:
+                try:
+                    items.append(self._queue.get(block=False))
+                except queue.Empty:
+                    break
+            batch = []
+            for cmd, args in items:
+                if cmd == 'data':
+                    batch.append(args)
+                    continue
+                if len(batch):
+                    self._batch_process(batch)
+                    batch = []
+                if cmd == 'user_data':
+                    self._user_data.append(args)
+                    if self._jls is not None:
+                        self._jls.user_data(*args)
+                elif cmd == 'close':
+                    running = False
+                else:
+                    self._log.warning('unsupported command %s', cmd)
+            if len(batch):
+                self._batch_process(batch)
+            self._status_publish()
+        try:
+            self._close()
+        except Exception:
+            self._log.exception('close')
+        self._status_publish(force=True)
+        self._log.info('stop')
@@ -12,19 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from pyjls import Writer, Reader, SignalType, AnnotationType
+from pyjls import Writer, AnnotationType
 from joulescope_ui import N_, pubsub_singleton, register, CAPABILITIES, time64, Metadata, get_topic_name
-from joulescope_ui.jls_v2 import ChunkMeta, DTYPE_MAP
+from joulescope_ui.jls_v2 import ChunkMeta
 from .signal_record_config_widget import SignalRecordConfigDialog
 from .disk_full_dialog import DiskFullDialog
-import copy
-import json
+from .record_writer import RecordWriter, segment_path
 import logging
-import numpy as np
-import time
+import os
+import threading
 
 
-_UTC_INTERVAL = 10 * time64.MINUTE
 _DISK_MONITOR_BASE = 'registry/DiskMonitor:0'
 _DISK_MONITOR_ADD = f'{_DISK_MONITOR_BASE}/actions/!add'
 _DISK_MONITOR_REMOVE = f'{_DISK_MONITOR_BASE}/actions/!remove'
@@ -41,38 +39,51 @@ class SignalRecord:
         '!stop': Metadata('bool', 'Recording stopped', flags=['ro', 'skip_undo']),
         '!stop_changed': Metadata('i64', 'Scheduled stop time (time64) or 0 when cleared',
                                   flags=['ro', 'skip_undo']),
+        '!status': Metadata('obj', 'Recording writer status with per-signal drop and latency counters',
+                            flags=['ro', 'skip_undo']),
     }
 
     def __init__(self, config):
         self._utc_stop = None
         self._utc_range = None
+        self._close_thread = None
         parent = pubsub_singleton.query('registry/app/instance')
         self._log = logging.getLogger(f'{__name__}.obj')
         self.CAPABILITIES = [CAPABILITIES.SIGNAL_STREAM_SINK]
         path = config['path']
+        segment = {
+            'path': path,
+            'duration': config.get('segment_duration') or 0,
+            'size': config.get('segment_size') or 0,
+            'count': config.get('segment_count') or 0,
+        }
+        if segment['duration'] or segment['size']:
+            path = segment_path(path, 0)
+        else:
+            segment = None
         self._log.info('JLS record to %s', path)
         self._path = path
+        self._path_last = path
+        # ring mode removes old segments, so monitor the directory instead
+        self._monitor_path = path if segment is None else os.path.dirname(os.path.abspath(path))
         try:
-            self._jls = Writer(path)
-            self._jls.flags = Writer.FLAG_DROP_ON_OVERFLOW
+            jls = Writer(path)
         except Exception as ex:
             pubsub_singleton.publish('registry/ui/actions/!error_msg',
                                      N_('Could not open file for write')
                                      + f'\n{ex}\n{path}')
             raise
+        decimate = None
+        if config.get('decimate_rate'):
+            decimate = {'rate': config['decimate_rate'], 'mode': config.get('decimate_mode') or 'mean'}
+        self._writer = RecordWriter(jls, config.get('queue_bytes'), self._on_writer_status,
+                                    segment=segment, decimate=decimate)
         self._log.info('Writer started')
-        self._source_idx = 1
-        self._signal_idx = 1
-        self._sources = {}
-        self._signals = {}
-        self._status = {
-            'time_last': time.time(),
-            'dropped': 0,
-        }
+        self._utc_data_prev = {}  # topic -> most recent utc
 
         notes = config.get('notes')
         if notes is not None:
-            self._jls.user_data(ChunkMeta.NOTES, notes)
+            self._writer.user_data(ChunkMeta.NOTES, notes)
         pubsub_singleton.register(self, parent=parent)
 
         for source in config['sources'].values():
@@ -80,87 +91,34 @@ class SignalRecord:
                 if signal['enabled'] and signal['selected']:
                     self.pubsub.subscribe(signal['data_topic'], self._on_data, ['pub'])
 
-        self.pubsub.publish(_DISK_MONITOR_ADD, self._path)
+        self.pubsub.publish(_DISK_MONITOR_ADD, self._monitor_path)
         self.pubsub.subscribe(_DISK_MONITOR_FULL, self._on_disk_full, ['pub'])
         self.pubsub.publish('registry/paths/actions/!mru_save', path)
 
     def _on_data(self, topic, value):
-        if self._jls is None:
+        writer = self._writer
+        if writer is None:
             return
-        if topic not in self._signals:
-            source = topic.split('/')[1]
-            if source not in self._sources:
-                self._source_add(source, value['source'])
-            self._signal_add(source, topic, value)
-        signal = self._signals[topic]
-        sample_id = value['sample_id']
+        writer.push(topic, value)
         utc_now = value['utc']
-        utc = [sample_id, utc_now]
-        if signal['utc_entry_prev'] is None or (utc_now - signal['utc_entry_prev'][1]) >= _UTC_INTERVAL:
-            self._log.info('utc %s: %s, %s', signal['name'], sample_id, utc_now)
-            self._jls.utc(signal['id'], sample_id, utc_now)
-            signal['utc_entry_prev'] = utc
-        signal['utc_data_prev'] = utc
-        x = value['data']
-        if len(x):
-            x = np.ascontiguousarray(x)
-            try:
-                self._jls.fsr(signal['id'], sample_id, x)
-            except Exception:
-                self._status['dropped'] += len(x)
-                t_now = time.time()
-                if t_now >= (1.0 + self._status['time_last']):
-                    dropped, self._status['dropped'] = self._status['dropped'], 0
-                    self.pubsub.publish('registry/ui/actions/!status_msg', f'JLS write dropped {dropped} samples')
-                    self._status['time_last'] = t_now
-        if self._utc_stop is not None:
-            u = min([signal['utc_data_prev'][1] for signal in self._signals.values()])
-            if u >= self._utc_stop:
+        self._utc_data_prev[topic] = utc_now
+        if self._utc_stop is not None and utc_now >= self._utc_stop:
+            if min(self._utc_data_prev.values()) >= self._utc_stop:
                 self.on_action_stop()
 
-    def _source_add(self, unique_id, info):
-        info = copy.deepcopy(info)
-        model = info.get('model', '')
-        serial_number = info.get('serial_number', '')
-        name = f'{model}-{serial_number}'
-        version = info.get('version')
-        if isinstance(version, dict):
-            version = json.dumps(version)
-        self._jls.source_def(
-            source_id=self._source_idx,
-            name=name,
-            vendor=info['vendor'],
-            model=model,
-            version=version,
-            serial_number=serial_number,
-        )
-        info['id'] = self._source_idx
-        info['name'] = name
-        self._sources[unique_id] = info
-        self._source_idx += 1
-
-    def _signal_add(self, source, topic, value):
-        source_info = self._sources[source]
-        source_id = source_info['id']
-        self._jls.signal_def(
-            signal_id=self._signal_idx,
-            source_id=source_id,
-            signal_type=SignalType.FSR,
-            data_type=DTYPE_MAP[value['dtype']],
-            sample_rate=value['sample_freq'],
-            name=value['field'].replace(' ', '_'),
-            units=value['units'],
-        )
-        self._signals[topic] = {
-            'id': self._signal_idx,
-            'name': value['field'],
-            'utc_entry_prev': None,    # the previous UTC entry
-            'utc_data_prev': None,   # the previous UTC info from streaming sample data
-        }
-        self._signal_idx += 1
+    def _on_writer_status(self, status):
+        # called from the writer thread, which may close after unregister
+        status.setdefault('path', self._path)
+        pubsub_singleton.publish(f'{get_topic_name(SignalRecord)}/events/!status', status)
+        dropped = sum([s['dropped'] for s in status['signals'].values()])
+        if dropped:
+            detail = ', '.join([f'{name}: {s["dropped"]}' for name, s in status['signals'].items() if s['dropped']])
+            self._log.warning('JLS write dropped %d samples (%s)', dropped, detail)
+            pubsub_singleton.publish('registry/ui/actions/!status_msg',
+                                     f'JLS write dropped {dropped} samples ({detail})')
 
     def _on_disk_full(self, pubsub, topic, value):
-        if self._path in value:
+        if self._monitor_path in value:
             self._log.info('disk full: stop JLS recording %s', self._path)
             self.pubsub.publish('registry/SignalRecord/actions/!stop', None)
             self.pubsub.publish('registry/app/settings/signal_stream_record', False)
@@ -172,39 +130,39 @@ class SignalRecord:
 
     def on_action_stop(self):
         self._log.info('stop')
-        jls, self._jls = self._jls, None
-        if jls is None:
+        writer, self._writer = self._writer, None
+        if writer is None:
             return
-        for signal in self._signals.values():
-            if signal['utc_data_prev'] is not None and signal['utc_data_prev'] != signal['utc_entry_prev']:
-                self._log.info('utc %s: %s', signal['name'], signal['utc_data_prev'])
-                jls.utc(signal['id'], *signal['utc_data_prev'])
-        jls.close()
         if self in SignalRecord._instances:
             SignalRecord._instances.remove(self)
         self.pubsub.unregister(self, delete=True)
-        self.pubsub.publish(_DISK_MONITOR_REMOVE, self._path)
-        self._annotation_create()
-
-    def _annotation_create(self):
-        if self._utc_range is None:
-            return
-        path = self._path.replace('.jls', '.anno.jls')
-        self._log.info('_annotation_create start')
-        z0, z1 = self._utc_range
+        self.pubsub.publish(_DISK_MONITOR_REMOVE, self._monitor_path)
+        # closing flushes the queued samples, so keep it off the Qt thread
+        self._close_thread = threading.Thread(
+            name='signal_record_close', target=self._close,
+            args=(writer, self._utc_range))
+        self._close_thread.start()
+
+    def _close(self, writer, marker_range):
+        # called from the close thread
+        try:
+            writer.close()
+            paths = writer.paths
+            if len(paths):
+                self._path_last = paths[-1]
+            utc_range = writer.utc_range()
+            if marker_range is not None and utc_range is not None:
+                self._annotation_write(self._path_last, utc_range, marker_range)
+        except Exception:
+            self._log.exception('_close')
+
+    def _annotation_write(self, jls_path, utc_range, marker_range):
+        path = jls_path.replace('.jls', '.anno.jls')
+        self._log.info('_annotation_write start')
+        z0, z1 = marker_range
+        x0, x1 = utc_range
         sample_rate = 1_000_000
 
-        t_start = []
-        t_stop = []
-        with Reader(self._path) as r:
-            for signal in r.signals.values():
-                if signal.signal_type != 0:
-                    continue
-                t_start.append(r.sample_id_to_timestamp(signal.signal_id, 0))
-                t_stop.append(r.sample_id_to_timestamp(signal.signal_id, signal.length - 1))
-        x0 = max(t_start)
-        x1 = min(t_stop)
-
         def x_map(x_i64):
             return int(round((x_i64 - x0) * (sample_rate / time64.SECOND)))
 
@@ -216,7 +174,7 @@ class SignalRecord:
             w.utc(signal_id, x_map(x1), x1)
             w.annotation(signal_id, x_map(z0), None, AnnotationType.VMARKER, 0, '1a')
             w.annotation(signal_id, x_map(z1), None, AnnotationType.VMARKER, 0, '1b')
-        self._log.info('_annotation_create done')
+        self._log.info('_annotation_write done')
 
     @staticmethod
     def on_cls_action_start(pubsub, topic, value):
@@ -16,6 +16,7 @@ from PySide6 import QtWidgets, QtGui, QtCore
 from joulescope_ui import CAPABILITIES, register, pubsub_singleton, N_, get_topic_name
 from joulescope_ui.filename_formatter import filename_tooltip, filename_formatter
 from joulescope_ui.styles import styled_widget
+from .record_writer import DECIMATE_MODES
 import copy
 import logging
 import os
@@ -23,6 +24,10 @@ import os
 
 _FILENAME_DEFAULT = '{timestamp}.jls'
 _FILENAME_TOPIC = 'registry/SignalRecordConfigWidget/settings/filename'
+_SETTINGS_TOPIC = 'registry/SignalRecordConfigWidget/settings'
+_SEGMENT_KEYS = ['segment_duration', 'segment_size', 'segment_count']
+_DECIMATE_MODE_NAMES = [N_('Mean'), N_('Mean, min, max')]
+_MB = 1024 * 1024
 
 
 def config_default() -> dict:
@@ -36,6 +41,9 @@ def config_default() -> dict:
         'sources': {},
         'notes': '',
     }
+    for key in _SEGMENT_KEYS + ['decimate_rate']:
+        config[key] = pubsub_singleton.query(f'{_SETTINGS_TOPIC}/{key}', default=0)
+    config['decimate_mode'] = pubsub_singleton.query(f'{_SETTINGS_TOPIC}/decimate_mode', default='mean')
 
     sources_ids = pubsub_singleton.query(f'registry_manager/capabilities/{CAPABILITIES.SIGNAL_STREAM_SOURCE}/list')
     for source_id in sorted(sources_ids):
@@ -107,6 +115,32 @@ class SignalRecordConfigWidget(QtWidgets.QWidget):
             'brief': N_('The filename with optional replacements.'),
             'default': _FILENAME_DEFAULT,
         },
+        'segment_duration': {
+            'dtype': 'float',
+            'brief': N_('The segment duration in seconds, 0 for no limit.'),
+            'default': 0,
+        },
+        'segment_size': {
+            'dtype': 'int',
+            'brief': N_('The segment size in bytes, 0 for no limit.'),
+            'default': 0,
+        },
+        'segment_count': {
+            'dtype': 'int',
+            'brief': N_('The number of newest segments to keep, 0 to keep all.'),
+            'default': 0,
+        },
+        'decimate_rate': {
+            'dtype': 'int',
+            'brief': N_('The decimated sample rate in Hz, 0 for full rate.'),
+            'default': 0,
+        },
+        'decimate_mode': {
+            'dtype': 'str',
+            'brief': N_('The decimation mode.'),
+            'options': [[m, n] for m, n in zip(DECIMATE_MODES, _DECIMATE_MODE_NAMES)],
+            'default': 'mean',
+        },
     }
 
     def __init__(self, parent=None, config=None):
@@ -163,6 +197,9 @@ class SignalRecordConfigWidget(QtWidgets.QWidget):
         self._layout.addWidget(self._location_sel, self._row, 3, 1, 1)
         self._row += 1
 
+        self._segment_add()
+        self._decimate_add()
+
         self._signals_to_record_label = QtWidgets.QLabel(N_('Signals to record'), self)
         self._layout.addWidget(self._signals_to_record_label, self._row, 0, 1, 4)
         self._row += 1
@@ -175,6 +212,99 @@ class SignalRecordConfigWidget(QtWidgets.QWidget):
         self._layout.addWidget(self._notes, self._row + 4, 0, 4, 4)
         self._row += 5
 
+    def _segment_add(self):
+        self._segment_label = QtWidgets.QLabel(N_('Segments'), self)
+        self._segment_label.setToolTip(N_('Split the recording into multiple files.'))
+        self._layout.addWidget(self._segment_label, self._row, 0, 1, 1)
+        w = QtWidgets.QWidget(self)
+        layout = QtWidgets.QHBoxLayout(w)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self._segment_duration = QtWidgets.QDoubleSpinBox(w)
+        self._segment_duration.setRange(0.0, 24 * 60.0)
+        self._segment_duration.setDecimals(1)
+        self._segment_duration.setSuffix(' min')
+        self._segment_duration.setSpecialValueText(N_('No duration limit'))
+        self._segment_duration.setValue(self._config.get('segment_duration', 0) / 60.0)
+        self._segment_duration.setToolTip(N_('The maximum duration for each file.'))
+        self._segment_duration.valueChanged.connect(self._on_segment_duration)
+        layout.addWidget(self._segment_duration)
+
+        self._segment_size = QtWidgets.QSpinBox(w)
+        self._segment_size.setRange(0, 1024 * 1024)
+        self._segment_size.setSuffix(' MB')
+        self._segment_size.setSpecialValueText(N_('No size limit'))
+        self._segment_size.setValue(self._config.get('segment_size', 0) // _MB)
+        self._segment_size.setToolTip(N_('The maximum sample data size for each file.'))
+        self._segment_size.valueChanged.connect(self._on_segment_size)
+        layout.addWidget(self._segment_size)
+
+        self._segment_count = QtWidgets.QSpinBox(w)
+        self._segment_count.setRange(0, 100000)
+        self._segment_count.setPrefix(N_('Keep') + ' ')
+        self._segment_count.setSpecialValueText(N_('Keep all'))
+        self._segment_count.setValue(self._config.get('segment_count', 0))
+        self._segment_count.setToolTip(N_('Keep only the newest files and delete older files.'))
+        self._segment_count.valueChanged.connect(self._on_segment_count)
+        layout.addWidget(self._segment_count)
+
+        self._layout.addWidget(w, self._row, 1, 1, 3)
+        self._row += 1
+
+    def _decimate_add(self):
+        self._decimate_label = QtWidgets.QLabel(N_('Sample rate'), self)
+        self._decimate_label.setToolTip(N_('Record reduced-rate signals to save disk space.'))
+        self._layout.addWidget(self._decimate_label, self._row, 0, 1, 1)
+        w = QtWidgets.QWidget(self)
+        layout = QtWidgets.QHBoxLayout(w)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self._decimate_rate = QtWidgets.QSpinBox(w)
+        self._decimate_rate.setRange(0, 1000000)
+        self._decimate_rate.setSuffix(' Hz')
+        self._decimate_rate.setSpecialValueText(N_('Full rate'))
+        self._decimate_rate.setValue(self._config.get('decimate_rate', 0))
+        self._decimate_rate.setToolTip(N_('The recorded sample rate.  The actual rate evenly divides the signal sample rate.'))
+        self._decimate_rate.valueChanged.connect(self._on_decimate_rate)
+        layout.addWidget(self._decimate_rate)
+
+        self._decimate_mode = QtWidgets.QComboBox(w)
+        for name in _DECIMATE_MODE_NAMES:
+            self._decimate_mode.addItem(name)
+        mode = self._config.get('decimate_mode', 'mean')
+        self._decimate_mode.setCurrentIndex(DECIMATE_MODES.index(mode) if mode in DECIMATE_MODES else 0)
+        self._decimate_mode.setEnabled(bool(self._decimate_rate.value()))
+        self._decimate_mode.currentIndexChanged.connect(self._on_decimate_mode)
+        layout.addWidget(self._decimate_mode)
+
+        self._layout.addWidget(w, self._row, 1, 1, 3)
+        self._row += 1
+
+    @QtCore.Slot(int)
+    def _on_decimate_rate(self, value):
+        self._decimate_mode.setEnabled(bool(value))
+        self._setting_set('decimate_rate', value)
+
+    @QtCore.Slot(int)
+    def _on_decimate_mode(self, index):
+        self._setting_set('decimate_mode', DECIMATE_MODES[index])
+
+    def _setting_set(self, key, value):
+        pubsub_singleton.publish(f'{_SETTINGS_TOPIC}/{key}', value)
+        self._config[key] = value
+
+    @QtCore.Slot(float)
+    def _on_segment_duration(self, value):
+        self._setting_set('segment_duration', value * 60.0)
+
+    @QtCore.Slot(int)
+    def _on_segment_size(self, value):
+        self._setting_set('segment_size', value * _MB)
+
+    @QtCore.Slot(int)
+    def _on_segment_count(self, value):
+        self._setting_set('segment_count', value)
+
     def _sources_add(self):
         sources = self._config['sources']
         for source_id in sorted(sources.keys()):
@@ -13,10 +13,10 @@
 # limitations under the License.
 
 from joulescope_ui import pubsub_singleton, register, CAPABILITIES, Metadata, get_topic_name
+from joulescope_ui.statistics_data import as_statistics_data
 from .statistics_record_config_widget import StatisticsRecordConfigDialog
-from pyjoulescope_driver import time64
+from .statistics_writer import StatisticsWriter, TIME_FORMATS, field_names
 import logging
-import numpy as np
 
 
 @register
@@ -33,20 +33,22 @@ class StatisticsRecord:
 
     def __init__(self, topic, filename, config=None):
         self._utc_stop = None
+        config = {} if config is None else config
         parent = pubsub_singleton.query('registry/app/instance')
         time_format = config.get('time_format', None)
         if time_format is None:
             time_format = 'relative'
-        if time_format not in ['relative', 'UTC', 'off']:
+        if time_format not in TIME_FORMATS:
             raise ValueError(f'invalid time_format {time_format}')
-        self._time_format = time_format
         self._topic = topic
         self._log = logging.getLogger(f'{__name__}.obj')
         self.CAPABILITIES = [CAPABILITIES.STATISTIC_STREAM_SINK]
         self._log.info('JLS record %s to %s', topic, filename)
-        self._file = open(filename, 'wt')
-        self._offsets = None
-        self._time_format_str = ''
+        fields = config.get('fields')
+        if fields is None:
+            fields = field_names(config.get('statistics'))
+        self._writer = StatisticsWriter(filename, fmt=config.get('format'), fields=fields,
+                                        time_format=time_format)
 
         pubsub_singleton.publish('registry/paths/actions/!mru_save', filename)
         pubsub_singleton.register(self, parent=parent)
@@ -59,75 +61,32 @@ class StatisticsRecord:
         self._utc_stop = utc_stop
 
     def _on_data(self, topic, value):
-        if self._file is None:
+        if self._writer is None:
             return
-        t = value['time']['utc']['value'][1]  # time64 format
-        i = value['signals']['current']['avg']['value']
-        v = value['signals']['voltage']['avg']['value']
-        p = value['signals']['power']['avg']['value']
-        c = value['accumulators']['charge']['value']
-        e = value['accumulators']['energy']['value']
-
-        if self._offsets is None:
-            self._offsets = {
-                'time': t,
-                'charge': c,
-                'energy': e,
-            }
-            hdr = '#' if self._time_format == 'off' else '#time,'
-            hdr += 'current,voltage,power,charge,energy\n'
-            self._file.write(hdr)
-            freq = 1.0 / value['time']['delta']['value']
-            freq_log10 = int(np.ceil(max(0, np.log10(freq))))
-            if self._time_format == 'relative':
-                fmt_str = f'%.{freq_log10}f,'
-                def relative_format(t_now):
-                    dt = (t_now - self._offsets['time'])
-                    dt /= time64.SECOND
-                    return fmt_str % dt
-                self._time_format_fn = relative_format
-            elif self._time_format == 'UTC':
-                def utc_format(t_now):
-                    d = time64.as_datetime(t_now)
-                    if freq_log10 == 0:
-                        s = d.strftime('%Y%m%dT%H%M%SZ,')
-                    else:
-                        s = d.strftime('%Y%m%dT%H%M%S.%f')
-                        if freq_log10 < 6:
-                            s = s[:-6+freq_log10]
-                        s += 'Z,'
-                    return s
-                self._time_format_fn = utc_format
-            else:
-                self._time_format_fn = lambda t_now: ''
-
-        c -= self._offsets['charge']
-        e -= self._offsets['energy']
-        line = '%g,%g,%g,%g,%g\n' % (i, v, p, c, e)
-        self._file.write(self._time_format_fn(t) + line)
-
-        if self._utc_stop is not None and t >= self._utc_stop:
+        value = as_statistics_data(value)
+        self._writer.push(value)
+        if self._utc_stop is not None and value.utc[1] >= self._utc_stop:
             self.on_action_stop()
 
     def on_action_stop(self):
-        if self._file is None:
+        if self._writer is None:
             return  # already stopped (idempotent)
         self._log.info('stop')
         self._close()
         pubsub_singleton.unregister(self, delete=True)
 
     def _close(self):
-        """Release the subscription and file handle.  Safe to call repeatedly."""
-        if self._file is not None:
+        """Release the subscription and writer.  Safe to call repeatedly."""
+        if self._writer is not None:
             pubsub_singleton.unsubscribe(self._topic, self._on_data, ['pub'])
-            f, self._file = self._file, None
-            f.close()
+            writer, self._writer = self._writer, None
+            writer.close()
         if self in StatisticsRecord._instances:
             StatisticsRecord._instances.remove(self)
 
     def on_pubsub_unregister(self):
         # Guarantee cleanup even when torn down via app/parent shutdown rather
-        # than the normal stop path, so we never leak the subscription or file.
+        # than the normal stop path, so we never leak the subscription or writer.
         self._close()
 
     @staticmethod
@@ -17,13 +17,13 @@ from joulescope_ui import CAPABILITIES, register, pubsub_singleton, N_, get_topi
 from joulescope_ui.filename_formatter import filename_tooltip, filename_formatter
 from joulescope_ui.styles import styled_widget
 from joulescope_ui.ui_util import comboBoxConfig
+from .statistics_writer import FORMATS, STATISTICS, TIME_FORMATS
 import copy
 import datetime
 import logging
 import os
 
 
-_TIME_FORMAT_OPTIONS = ['relative', 'UTC', 'off']
 _FILENAME_DEFAULT = '{timestamp}-{device_id}.csv'
 _FILENAME_TOPIC = 'registry/StatisticsRecordConfigWidget/settings/filename'
 
@@ -36,6 +36,8 @@ def config_default() -> dict:
     config = {
         'location': pubsub_singleton.query('registry/paths/settings/path'),
         'time_format': 'relative',
+        'format': 'csv',
+        'statistics': ['avg'],
         'sources': {},
     }
 
@@ -75,8 +77,12 @@ def config_update(config: dict, count: int, **kwargs) -> dict:
     """
     config = copy.deepcopy(config)
     location = config['location']
+    ext = '.' + config.get('format', 'csv')
     for source_id, source in config['sources'].items():
         filename = filename_formatter(source['filename'], count=count, device_id=source_id, **kwargs)
+        base, ext_orig = os.path.splitext(filename)
+        if ext_orig in ['.csv', '.npy'] and ext_orig != ext:
+            filename = base + ext
         source['filename'] = filename
         source['path'] = os.path.join(location, filename)
     return config
@@ -122,11 +128,35 @@ class StatisticsRecordConfigWidget(QtWidgets.QWidget):
 
         self._time_format_label = QtWidgets.QLabel(N_('Time Format'), self)
         self._time_format = QtWidgets.QComboBox(self)
-        comboBoxConfig(self._time_format, _TIME_FORMAT_OPTIONS, self._config['time_format'])
+        comboBoxConfig(self._time_format, TIME_FORMATS, self._config['time_format'])
         self._layout.addWidget(self._time_format_label, self._row, 0, 1, 2)
         self._layout.addWidget(self._time_format, self._row, 2, 1, 1)
         self._row += 1
 
+        self._format_label = QtWidgets.QLabel(N_('File Format'), self)
+        self._format = QtWidgets.QComboBox(self)
+        self._format.setToolTip(N_('csv is text.  npy is a binary numpy structured array.'))
+        comboBoxConfig(self._format, FORMATS, self._config.get('format', 'csv'))
+        self._layout.addWidget(self._format_label, self._row, 0, 1, 2)
+        self._layout.addWidget(self._format, self._row, 2, 1, 1)
+        self._row += 1
+
+        self._statistics_label = QtWidgets.QLabel(N_('Statistics'), self)
+        self._statistics_label.setToolTip(N_('The statistics to record for current, voltage and power.'))
+        self._layout.addWidget(self._statistics_label, self._row, 0, 1, 2)
+        w = QtWidgets.QWidget(self)
+        layout = QtWidgets.QHBoxLayout(w)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self._statistics = {}
+        statistics = self._config.get('statistics', ['avg'])
+        for stat in STATISTICS:
+            checkbox = QtWidgets.QCheckBox(stat, w)
+            checkbox.setChecked(stat in statistics)
+            layout.addWidget(checkbox)
+            self._statistics[stat] = checkbox
+        self._layout.addWidget(w, self._row, 2, 1, 2)
+        self._row += 1
+
         self._source_widgets = {}
         self._sources_add()
 
@@ -165,6 +195,8 @@ class StatisticsRecordConfigWidget(QtWidgets.QWidget):
         return {
             'location': path,
             'time_format': self._time_format.currentText(),
+            'format': self._format.currentText(),
+            'statistics': [stat for stat, checkbox in self._statistics.items() if checkbox.isChecked()],
             'sources': sources,
         }
 
@@ -0,0 +1,227 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Write statistics data messages to a file on a dedicated thread.
+"""
+
+from joulescope_ui.statistics_data import FIELD_INDEX, as_statistics_data
+from pyjoulescope_driver import time64
+import logging
+import numpy as np
+import queue
+import threading
+
+
+FORMATS = ['csv', 'npy']
+STATISTICS = ['avg', 'std', 'min', 'max', 'p2p']
+TIME_FORMATS = ['relative', 'UTC', 'off']
+_SIGNALS = ['current', 'voltage', 'power']
+_ACCUMULATORS = ['charge', 'energy']
+_BATCH_MAX = 1000           # rows per write
+_NPY_HEADER_SIZE = 1024     # bytes, reserved for the final shape
+
+
+def field_names(statistics=None):
+    """Get the recorded field names.
+
+    :param statistics: The list of STATISTICS to record for each signal.
+        None records only 'avg'.
+    :return: The list of field names.  The 'avg' fields use the signal
+        name, such as 'current', and the others add the statistic, such
+        as 'current_max'.  The accumulators 'charge' and 'energy' are
+        always last.
+    """
+    statistics = ['avg'] if not statistics else statistics
+    names = []
+    for signal in _SIGNALS:
+        for stat in STATISTICS:
+            if stat in statistics:
+                names.append(signal if stat == 'avg' else f'{signal}_{stat}')
+    return names + _ACCUMULATORS
+
+
+def _field_index(name):
+    if name in _ACCUMULATORS:
+        return FIELD_INDEX[name]
+    signal, _, stat = name.partition('_')
+    if signal not in _SIGNALS or (stat and stat not in STATISTICS):
+        raise ValueError(f'invalid field {name}')
+    return FIELD_INDEX[f'{signal}_{stat or "avg"}']
+
+
+def _utc_str(t, digits):
+    """Format time64 values as UTC strings, vectorized."""
+    us = np.round((t / time64.SECOND + time64.EPOCH) * 1e6).astype(np.int64)
+    s = np.datetime_as_string(us.astype('datetime64[us]'), unit='us')
+    s = np.char.replace(np.char.replace(s, '-', ''), ':', '')
+    n = 15 if digits == 0 else 16 + min(digits, 6)
+    return np.char.add(s.astype(f'U{n}'), 'Z')
+
+
+def _npy_header(dtype, rows):
+    header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (rows,)}
+    header = repr(header).encode('latin1')
+    prefix = np.lib.format.MAGIC_PREFIX + b'\x01\x00'
+    size = _NPY_HEADER_SIZE - len(prefix) - 2
+    if len(header) + 1 > size:
+        raise ValueError('too many fields for npy header')
+    header = header.ljust(size - 1) + b'\n'
+    return prefix + np.uint16(size).tobytes() + header
+
+
+class StatisticsWriter:
+    """Write statistics data messages to a file on a dedicated thread.
+
+    :param path: The output file path.
+    :param fmt: The file format in FORMATS:
+
+        * csv: text with one row per message, compatible with prior
+          releases when recording only 'avg'.
+        * npy: numpy structured array with the int64 'time' field in
+          time64 and a float64 field for each recorded field.  Load with
+          numpy.load(path).
+
+    :param fields: The list of field names from field_names().  None
+        records the 'avg' fields.
+    :param time_format: The CSV time format in TIME_FORMATS.
+
+    push() only extracts the field values, so the caller thread does
+    little work for each message.  The writer thread formats each batch
+    of rows with a single vectorized operation.  The charge and energy
+    fields are relative to the first message.
+    """
+
+    def __init__(self, path, fmt=None, fields=None, time_format=None):
+        self._log = logging.getLogger(__name__)
+        fmt = 'csv' if fmt is None else fmt
+        if fmt not in FORMATS:
+            raise ValueError(f'invalid format {fmt}')
+        time_format = 'relative' if time_format is None else time_format
+        if time_format not in TIME_FORMATS:
+            raise ValueError(f'invalid time_format {time_format}')
+        self._fmt = fmt
+        self._time_format = time_format
+        self._fields = field_names() if fields is None else list(fields)
+        self._index = np.array([_field_index(name) for name in self._fields], dtype=np.intp)
+        self._accumulator_idx = [idx for idx, name in enumerate(self._fields) if name in _ACCUMULATORS]
+        self._dtype = np.dtype([('time', '<i8')] + [(name, '<f8') for name in self._fields])
+        self._offsets = None     # writer thread only
+        self._time_digits = 0
+        self._rows = 0
+        self._f = open(path, 'wt' if fmt == 'csv' else 'wb')
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(name='statistics_record_writer', target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def fields(self):
+        """The list of recorded field names."""
+        return list(self._fields)
+
+    def push(self, value):
+        """Enqueue a statistics data message for writing.
+
+        :param value: The statistics data message.
+        """
+        value = as_statistics_data(value)
+        row = value.values[self._index]
+        self._queue.put(('data', (value.utc[1], value.delta, row)))
+
+    def close(self):
+        """Write all queued rows, close the file and stop the thread."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(('close', None))
+        thread.join()
+
+    def _start(self, t, delta, row):
+        self._offsets = (t, [row[idx] for idx in self._accumulator_idx])
+        freq = 1.0 / delta
+        self._time_digits = int(np.ceil(max(0, np.log10(freq))))
+        if self._fmt == 'npy':
+            self._f.write(_npy_header(self._dtype, 0))
+        else:
+            hdr = '#' if self._time_format == 'off' else '#time,'
+            self._f.write(hdr + ','.join(self._fields) + '\n')
+
+    def _write(self, rows):
+        if self._offsets is None:
+            self._start(*rows[0])
+        t = np.array([r[0] for r in rows], dtype=np.int64)
+        x = np.array([r[2] for r in rows], dtype=np.float64)
+        t0, accumulator_offsets = self._offsets
+        if len(self._accumulator_idx):
+            x[:, self._accumulator_idx] -= accumulator_offsets
+        if self._fmt == 'npy':
+            y = np.empty(len(rows), dtype=self._dtype)
+            y['time'] = t
+            for idx, name in enumerate(self._fields):
+                y[name] = x[:, idx]
+            self._f.write(y.tobytes())
+        else:
+            line = ','.join(['%g'] * x.shape[1]) + '\n'
+            if self._time_format == 'off':
+                cols = x
+            else:
+                if self._time_format == 'relative':
+                    tcol = (t - t0) / time64.SECOND
+                    line = f'%.{self._time_digits}f,' + line
+                else:
+                    tcol = _utc_str(t, self._time_digits)
+                    line = '%s,' + line
+                cols = np.empty((len(rows), x.shape[1] + 1), dtype=object)
+                cols[:, 0] = tcol
+                cols[:, 1:] = x
+            self._f.write((line * len(rows)) % tuple(cols.ravel().tolist()))
+        self._rows += len(rows)
+
+    def _close(self):
+        if self._fmt == 'npy':
+            if self._offsets is None:
+                self._f.write(_npy_header(self._dtype, 0))
+            self._f.seek(0)
+            self._f.write(_npy_header(self._dtype, self._rows))
+        self._f.close()
+
+    def _run(self):
+        self._log.info('start')
+        running = True
+        while running:
+            item = self._queue.get()
+            items = [item]
+            while len(items) < _BATCH_MAX:
+                try:
+                    items.append(self._queue.get(block=False))
+                except queue.Empty:
+                    break
+            rows = []
+            for cmd, args in items:
+                if cmd == 'data':
+                    rows.append(args)
+                elif cmd == 'close':
+                    running = False
+                else:
+                    self._log.warning('unsupported command %s', cmd)
+            if len(rows):
+                try:
+                    self._write(rows)
+                except Exception:
+                    self._log.exception('write')
+        try:
+            self._close()
+        except Exception:
+            self._log.exception('close')
+        self._log.info('stop')
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from joulescope_ui.range_tool_kernels import condition_predicate
 import numpy as np
 
 
@@ -45,21 +46,18 @@ class _DetectEdge:
         self._edge_type = edge_type.lower()
         if self._edge_type not in ['rising', 'falling', 'both']:
             raise ValueError(f'Invalid edge type {edge_type}')
-        self._threshold = 0.5 if threshold is None else float(threshold)
+        threshold = 0.5 if threshold is None else float(threshold)
+        self._fn = condition_predicate('<' if self._edge_type == 'falling' else '>', threshold)
 
     def clear(self):
         self._carryover = None
 
     def _detect(self, samples):
-        if self._edge_type == 'rising':
-            x = samples > self._threshold
-            z = np.logical_and(np.logical_not(x[0:-1]), x[1:])
-        elif self._edge_type == 'falling':
-            x = samples < self._threshold
-            z = np.logical_and(np.logical_not(x[0:-1]), x[1:])
-        else:
-            x = samples > self._threshold
+        x = self._fn(samples)
+        if self._edge_type == 'both':
             z = np.logical_xor(x[0:-1], x[1:])
+        else:
+            z = np.logical_and(np.logical_not(x[0:-1]), x[1:])
         k = np.where(z)[0]
         if len(k) == 0:
             self._carryover = samples[-1]
@@ -78,33 +76,40 @@ class _DetectEdge:
 
 
 class _DetectDuration:
+    """Detect when a condition holds for a duration.
+
+    The block is converted to runs of equal condition values, so the
+    cost is a few vectorized operations regardless of how often the
+    condition changes.  A true run that ends the block carries its
+    length into the next block.
+    """
 
     def __init__(self, duration, fn):
         self._duration = float(duration)
-        self._d = 0.0
+        self._carry = 0  # true samples that end the previous block
         self._fn = fn
 
     def clear(self):
-        self._d = 0.0
+        self._carry = 0
 
     def __call__(self, fs, samples):
-        s = self._fn(samples)
-        edges = np.where(np.diff(s))[0]
-        edges = np.concatenate((edges, np.array([len(s) - 1], dtype=edges.dtype)))
-        v = s[0]
-        edge_last = 0
-        for edge in edges:
-            if not v:
-                self._d = 0.0
-            else:
-                d = (edge - edge_last + 1) / fs
-                if (self._d + d) >= self._duration:
-                    idx = int(np.ceil((self._duration - self._d) * fs))
-                    self._d = 0.0
-                    return edge_last + idx
-                self._d += d
-            v = not v
-            edge_last = edge + 1
+        s = np.asarray(self._fn(samples), dtype=bool)
+        if not len(s):
+            return None
+        target = self._duration * fs
+        starts = np.concatenate(([0], np.flatnonzero(s[1:] != s[:-1]) + 1))
+        lengths = np.diff(starts, append=len(s))
+        values = s[starts]
+        carry = self._carry if values[0] else 0
+        lengths[0] += carry
+        qualify = np.logical_and(values, lengths >= target)
+        k = int(np.argmax(qualify))
+        if qualify[k]:
+            self._carry = 0
+            prior = carry if k == 0 else 0
+            return int(starts[k] + np.ceil(target - prior))
+        self._carry = int(lengths[-1]) if values[-1] else 0
+        return None
 
 
 def condition_detector_factory(config):
@@ -127,20 +132,6 @@ def condition_detector_factory(config):
         elif is_digital_signal(signal):
             v = int(config['condition'])
             return _DetectDuration(config['duration'], lambda x: v == x)
-        condition = config['condition']
-        v1 = float(config['value1'])
-        if condition in ['>', '<']:
-            if condition == '>':
-                fn = lambda x: x > v1
-            else:
-                fn = lambda x: x < v1
-        elif condition in ['between', 'outside']:
-            v2 = float(config['value2'])
-            if condition == 'between':
-                fn = lambda x: np.logical_and(x >= v1, x <= v2)
-            else:
-                fn = lambda x: np.logical_or(x < v1, x > v2)
-        else:
-            raise ValueError(f'Invalid condition {condition}')
+        fn = condition_predicate(config['condition'], config['value1'], config.get('value2'))
         return _DetectDuration(config['duration'], fn)
     raise ValueError(f'Unsupported config type {config_type}')
@@ -0,0 +1,205 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pre-trigger history buffers for the trigger sample and statistics records.
+"""
+
+from joulescope_ui import time64
+from joulescope_ui.statistics_data import StatisticsData
+import collections
+import numpy as np
+
+
+_SAMPLES_PER_ELEMENT = {
+    'u1': 8,
+    'u4': 2,
+    'i4': 2,
+}
+
+_META_KEYS = ['source', 'field', 'units', 'dtype', 'sample_freq',
+              'origin_sample_freq', 'origin_decimate_factor']
+
+
+class SampleRingBuffer:
+    """Keep the most recent samples from a signal data topic.
+
+    :param duration: The history duration in seconds.
+
+    The buffer stores the raw message data, including packed u1 and u4,
+    in one preallocated numpy array.  The capacity is sized from the
+    duration and the sample rate of the first message, and grows only when
+    a single message exceeds it.  Appending and trimming are O(1) in the
+    number of retained messages.
+
+    A sample_id discontinuity, such as dropped samples or a stream restart,
+    clears the existing history since it no longer precedes the new data.
+    """
+
+    def __init__(self, duration):
+        self._duration = float(duration)
+        self._buffer = None
+        self._meta = None
+        self._spe = 1        # samples per buffer element
+        self._head = 0       # next element index to write
+        self._length = 0     # valid elements
+        self._sample_id_end = None  # sample_id following the newest sample
+        self._utc_ref = None        # (sample_id, utc) of the newest message
+
+    def __len__(self):
+        """The number of buffered samples."""
+        return self._length * self._spe
+
+    @property
+    def capacity(self):
+        """The number of samples that fit without reallocation."""
+        return 0 if self._buffer is None else len(self._buffer) * self._spe
+
+    def clear(self):
+        """Discard all buffered samples, keeping the allocation."""
+        self._head = 0
+        self._length = 0
+        self._sample_id_end = None
+        self._utc_ref = None
+
+    def _allocate(self, data, elements):
+        buffer = np.empty(elements, dtype=data.dtype)
+        if self._buffer is not None and self._length:
+            buffer[:self._length] = np.concatenate(self._views())
+        self._buffer = buffer
+        self._head = self._length % len(buffer)
+
+    def append(self, value):
+        """Append a signal data message.
+
+        :param value: The signal data message with 'sample_id', 'utc',
+            'sample_freq', 'dtype' and 'data'.
+        """
+        data = np.asarray(value['data'])
+        if not len(data):
+            return
+        dtype = value['dtype']
+        if (self._meta is None or self._meta['dtype'] != dtype
+                or self._buffer is None or self._buffer.dtype != data.dtype):
+            self._meta = {k: value[k] for k in _META_KEYS if k in value}
+            self._spe = _SAMPLES_PER_ELEMENT.get(dtype, 1)
+            self._buffer = None
+            self.clear()
+        sample_id = value['sample_id']
+        if self._sample_id_end is not None and sample_id != self._sample_id_end:
+            self.clear()
+        elements = int(np.ceil(self._duration * value['sample_freq'] / self._spe))
+        elements = max(elements, len(data))
+        if self._buffer is None or len(self._buffer) < elements:
+            self._allocate(data, elements)
+
+        buffer = self._buffer
+        n = len(buffer)
+        if len(data) >= n:
+            buffer[:] = data[-n:]
+            self._head = 0
+            self._length = n
+        else:
+            k = min(len(data), n - self._head)
+            buffer[self._head:self._head + k] = data[:k]
+            buffer[:len(data) - k] = data[k:]
+            self._head = (self._head + len(data)) % n
+            self._length = min(n, self._length + len(data))
+        samples = len(data) * self._spe
+        self._sample_id_end = sample_id + samples
+        self._utc_ref = (sample_id, value['utc'])
+
+    def _views(self):
+        n = len(self._buffer)
+        start = (self._head - self._length) % n
+        if start + self._length <= n:
+            return [self._buffer[start:start + self._length]]
+        return [self._buffer[start:], self._buffer[:self._head]]
+
+    def messages(self):
+        """Get the buffered samples as signal data messages.
+
+        :return: The list of zero, one or two messages, oldest first.
+            The 'data' entries are views into the ring buffer, so
+            consume them before the next append.
+        """
+        if not self._length:
+            return []
+        fs = self._meta['sample_freq']
+        sample_id_ref, utc_ref = self._utc_ref
+        sample_id = self._sample_id_end - len(self)
+        rv = []
+        for data in self._views():
+            msg = dict(self._meta)
+            msg['sample_id'] = sample_id
+            msg['utc'] = utc_ref + int(round((sample_id - sample_id_ref) / fs * time64.SECOND))
+            msg['data'] = data
+            rv.append(msg)
+            sample_id += len(data) * self._spe
+        return rv
+
+    def flush(self, topic, fn):
+        """Flush the buffered samples and then clear.
+
+        :param topic: The signal data topic.
+        :param fn: The callable(topic, value) that receives each message,
+            such as SignalRecord._on_data.
+
+        The receiver may keep references to the message data, since the
+        buffer hands over its array and allocates a new one on the next
+        append.
+        """
+        for msg in self.messages():
+            fn(topic, msg)
+        self.clear()
+        self._buffer = None
+
+
+def _utc(value):
+    if isinstance(value, StatisticsData):
+        return value.utc
+    return value['time']['utc']['value']
+
+
+class StatisticsHistory:
+    """Keep the most recent statistics messages.
+
+    :param duration: The history duration in seconds.
+    """
+
+    def __init__(self, duration):
+        self._duration = int(float(duration) * time64.SECOND)
+        self._messages = collections.deque()
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __iter__(self):
+        return iter(self._messages)
+
+    def clear(self):
+        self._messages.clear()
+
+    def append(self, value):
+        """Append a statistics message and discard expired messages."""
+        b = self._messages
+        b.append(value)
+        utc_start = _utc(value)[0] - self._duration
+        while len(b) and (_utc(b[0])[1] <= utc_start):
+            b.popleft()
+
+    def flush(self, topic, fn):
+        """Flush the buffered messages and then clear."""
+        while len(self._messages):
+            fn(topic, self._messages.popleft())
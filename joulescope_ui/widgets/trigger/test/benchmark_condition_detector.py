@@ -0,0 +1,81 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the trigger condition detectors with chattering input.
+
+The input is a noisy signal centered on the threshold, so the condition
+changes state on most samples.  This is the worst case for duration
+detection.  Run with:
+
+    python -m joulescope_ui.widgets.trigger.test.benchmark_condition_detector
+"""
+
+from joulescope_ui.widgets.trigger.condition_detector import condition_detector_factory
+import argparse
+import numpy as np
+import time
+
+
+_CONFIGS = {
+    'edge rising': {'type': 'edge', 'signal': 'current', 'condition': 'rising', 'value1': 0.0},
+    'edge both': {'type': 'edge', 'signal': 'current', 'condition': 'both', 'value1': 0.0},
+    'duration >': {'type': 'duration', 'signal': 'current', 'condition': '>', 'value1': 0.0},
+    'duration between': {'type': 'duration', 'signal': 'current', 'condition': 'between',
+                         'value1': -0.1, 'value2': 2.0},
+    'duration digital': {'type': 'duration', 'signal': '0', 'condition': '1'},
+}
+
+
+def get_parser():
+    p = argparse.ArgumentParser(description='Benchmark the trigger condition detectors.')
+    p.add_argument('--fs', type=float, default=1_000_000, help='The sample rate in Hz.')
+    p.add_argument('--block', type=int, default=20_000, help='The samples per block.')
+    p.add_argument('--duration', type=float, default=1.0, help='The input duration in seconds.')
+    p.add_argument('--detect', type=float, default=0.01,
+                   help='The duration condition in seconds, longer than any run.')
+    return p
+
+
+def _input(fs, duration, digital):
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=int(fs * duration)).astype(np.float32)
+    if digital:
+        x = (x > 0).astype(np.uint8)
+    return x
+
+
+def run(fs, block, duration, detect):
+    print(f'{"detector":<18} {"Msps":>8} {"real time":>10} {"edges/block":>12}')
+    for name, config in _CONFIGS.items():
+        config = dict(config, duration=detect)
+        digital = config['signal'] == '0'
+        x = _input(fs, duration, digital)
+        edges = int(np.count_nonzero(np.diff(x[:block] > (0.5 if digital else 0.0))))
+        fn = condition_detector_factory(config)
+        t_start = time.perf_counter()
+        for k in range(0, len(x), block):
+            fn(fs, x[k:k + block])
+        elapsed = time.perf_counter() - t_start
+        rate = len(x) / elapsed
+        print(f'{name:<18} {rate / 1e6:8.1f} {rate / fs:9.1f}x {edges:12d}')
+
+
+def main():
+    args = get_parser().parse_args()
+    run(args.fs, args.block, args.duration, args.detect)
+
+
+if __name__ == '__main__':
+    main()
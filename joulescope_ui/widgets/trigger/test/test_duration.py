@@ -47,6 +47,30 @@ class TestConditionDetectorDurationDigital(unittest.TestCase):
         fn = factory({'type': 'duration', 'signal': '0', 'condition': '0', 'duration': 0.001})
         self.assertEqual(1000, fn(1_000_000, np.zeros(2000)))
 
+    def test_chatter_in_blocks(self):
+        rng = np.random.default_rng(7)
+        data = (rng.random(200_000) < 0.98).astype(np.uint8)  # runs of ~50 samples
+        ends = np.cumsum(rng.integers(1, 3000, size=200))
+        ends = np.concatenate((ends[ends < len(data)], [len(data)]))
+        starts = np.concatenate(([0], ends[:-1]))
+        width = 150
+        fn = factory({'type': 'duration', 'signal': '0', 'condition': '1', 'duration': width / 1_000_000})
+        detected = []
+        expect = []  # per-sample reference, restarts at the next block after a detection
+        count = 0
+        for start, end in zip(starts, ends):
+            idx = fn(1_000_000, data[start:end])
+            if idx is not None:
+                detected.append(int(start + idx))
+            for k in range(start, end):
+                count = count + 1 if data[k] else 0
+                if count >= width:
+                    expect.append(k + 1)
+                    count = 0
+                    break
+        self.assertGreater(len(expect), 10)
+        self.assertEqual(expect, detected)
+
 
 class TestConditionDetectorDurationAnalog(unittest.TestCase):
 
@@ -0,0 +1,133 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+import numpy as np
+from joulescope_ui import time64
+from joulescope_ui.widgets.trigger.pre_record import SampleRingBuffer, StatisticsHistory
+
+
+FS = 1000
+
+
+def _msg(sample_id, length, dtype='f32'):
+    if dtype == 'u1':
+        data = (np.arange(sample_id // 8, (sample_id + length) // 8) & 0xff).astype(np.uint8)
+    else:
+        data = np.arange(sample_id, sample_id + length, dtype=np.float32)
+    return {
+        'source': {'vendor': 'Jetperch'},
+        'field': 'current',
+        'units': 'A',
+        'dtype': dtype,
+        'sample_freq': FS,
+        'sample_id': sample_id,
+        'utc': time64.SECOND + int(round(sample_id / FS * time64.SECOND)),
+        'data': data,
+    }
+
+
+def _flush(b):
+    rv = []
+    b.flush('t', lambda topic, value: rv.append(value))
+    return rv
+
+
+class TestSampleRingBuffer(unittest.TestCase):
+
+    def test_empty(self):
+        b = SampleRingBuffer(0.1)
+        self.assertEqual(0, len(b))
+        self.assertEqual([], _flush(b))
+
+    def test_partial(self):
+        b = SampleRingBuffer(0.1)
+        b.append(_msg(0, 30))
+        b.append(_msg(30, 30))
+        self.assertEqual(100, b.capacity)
+        msgs = _flush(b)
+        self.assertEqual(1, len(msgs))
+        np.testing.assert_equal(np.arange(60), msgs[0]['data'])
+        self.assertEqual(0, msgs[0]['sample_id'])
+        self.assertEqual(time64.SECOND, msgs[0]['utc'])
+        self.assertEqual('current', msgs[0]['field'])
+        self.assertEqual(0, len(b))
+
+    def test_wrap(self):
+        b = SampleRingBuffer(0.1)
+        for k in range(0, 330, 30):
+            b.append(_msg(k, 30))
+        self.assertEqual(100, len(b))
+        msgs = _flush(b)
+        self.assertEqual(2, len(msgs))
+        np.testing.assert_equal(np.arange(230, 330), np.concatenate([m['data'] for m in msgs]))
+        self.assertEqual(230, msgs[0]['sample_id'])
+        self.assertEqual(230 + len(msgs[0]['data']), msgs[1]['sample_id'])
+        self.assertAlmostEqual(time64.SECOND + 0.23 * time64.SECOND, msgs[0]['utc'], delta=1)
+
+    def test_block_larger_than_duration(self):
+        b = SampleRingBuffer(0.01)
+        b.append(_msg(0, 30))
+        b.append(_msg(30, 50))
+        self.assertEqual(50, b.capacity)
+        msgs = _flush(b)
+        np.testing.assert_equal(np.arange(30, 80), np.concatenate([m['data'] for m in msgs]))
+
+    def test_append_after_flush(self):
+        b = SampleRingBuffer(0.1)
+        b.append(_msg(0, 30))
+        self.assertEqual(1, len(_flush(b)))
+        b.append(_msg(30, 30))
+        b.append(_msg(60, 30))
+        msgs = _flush(b)
+        self.assertEqual(1, len(msgs))
+        self.assertEqual(30, msgs[0]['sample_id'])
+        np.testing.assert_equal(np.arange(30, 90), msgs[0]['data'])
+
+    def test_discontinuity_clears(self):
+        b = SampleRingBuffer(0.1)
+        b.append(_msg(0, 30))
+        b.append(_msg(40, 30))
+        msgs = _flush(b)
+        self.assertEqual(1, len(msgs))
+        self.assertEqual(40, msgs[0]['sample_id'])
+        self.assertEqual(30, len(msgs[0]['data']))
+
+    def test_packed_u1(self):
+        b = SampleRingBuffer(0.1)
+        for k in range(0, 320, 32):
+            b.append(_msg(k, 32, dtype='u1'))
+        self.assertEqual(104, b.capacity)
+        self.assertEqual(104, len(b))
+        msgs = _flush(b)
+        self.assertEqual(320 - 104, msgs[0]['sample_id'])
+        np.testing.assert_equal(np.arange(27, 40), np.concatenate([m['data'] for m in msgs]))
+
+
+def _stats(k):
+    t0 = k * time64.SECOND // 2
+    return {'time': {'utc': {'value': [t0, t0 + time64.SECOND // 2]}}, 'k': k}
+
+
+class TestStatisticsHistory(unittest.TestCase):
+
+    def test_trim_and_flush(self):
+        b = StatisticsHistory(1.0)
+        for k in range(10):
+            b.append(_stats(k))
+        self.assertEqual([7, 8, 9], [m['k'] for m in b])
+        rv = []
+        b.flush('t', lambda topic, value: rv.append(value['k']))
+        self.assertEqual([7, 8, 9], rv)
+        self.assertEqual(0, len(b))
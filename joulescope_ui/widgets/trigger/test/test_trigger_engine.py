@@ -0,0 +1,173 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import queue
+import unittest
+import numpy as np
+from joulescope_ui import time64
+from joulescope_ui.sample_tap import SampleTap
+from joulescope_ui.widgets.trigger.trigger_engine import TriggerEngine, sample_unpack
+
+
+FS = 1000
+UTC0 = 100 * time64.SECOND
+
+
+def _topic(source, signal):
+    return f'registry/{source}/events/signals/{signal}/!data'
+
+
+def _msg(sample_id, data, dtype='f32'):
+    return {
+        'sample_id': sample_id,
+        'sample_freq': FS,
+        'utc': UTC0 + int(sample_id * time64.SECOND / FS),
+        'dtype': dtype,
+        'data': data,
+    }
+
+
+def _edge(signal, value1=0.5, condition='rising', **kwargs):
+    return dict({'type': 'edge', 'signal': signal, 'condition': condition,
+                 'value1': value1, 'value2': 0.0, 'duration': 0.0}, **kwargs)
+
+
+def _duration(signal, duration, condition='<', value1=0.5, **kwargs):
+    return dict({'type': 'duration', 'signal': signal, 'condition': condition,
+                 'value1': value1, 'value2': 0.0, 'duration': duration}, **kwargs)
+
+
+class TestTriggerEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tap = SampleTap()
+        self.events = queue.Queue()
+        self.engine = None
+
+    def tearDown(self):
+        if self.engine is not None:
+            self.engine.stop()
+
+    def _start(self, start_condition, stop_condition, run_mode='single'):
+        config = {
+            'source': 'dev1',
+            'run_mode': run_mode,
+            'start_condition': start_condition,
+            'stop_condition': stop_condition,
+        }
+        self.engine = TriggerEngine(config, self.events.put, tap=self.tap)
+        self.engine.start()
+
+    def _next(self, skip_status=True, timeout=2.0):
+        while True:
+            value = self.events.get(timeout=timeout)
+            if not skip_status or value['event'] != 'status':
+                return value
+
+    def test_unpack(self):
+        np.testing.assert_equal([1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
+                                sample_unpack({'dtype': 'u1', 'data': np.array([1, 2], dtype=np.uint8)}))
+        np.testing.assert_equal([3, 1, 0, 15],
+                                sample_unpack({'dtype': 'u4', 'data': np.array([0x13, 0xf0], dtype=np.uint8)}))
+
+    def test_topics(self):
+        c = _edge('i', terms=[_edge('v'), _edge('i', source='dev2'), _edge('i')])
+        self._start(c, _duration('always', 1.0))
+        self.assertEqual([_topic('dev1', 'i'), _topic('dev1', 'v'), _topic('dev2', 'i')],
+                         self.engine.topics)
+
+    def test_start_and_stop_in_one_block(self):
+        self._start(_edge('i'), _duration('i', 0.01), run_mode='continuous')
+        topic = _topic('dev1', 'i')
+        x = np.zeros(100, dtype=np.float32)
+        x[20:40] = 1.0
+        self.tap.publish(topic, _msg(0, x))
+        e = self._next()
+        self.assertEqual('start', e['event'])
+        self.assertEqual(UTC0 + int(20 * time64.SECOND / FS), e['utc'])
+        self.assertGreaterEqual(e['latency'], 0.0)
+        e = self._next()
+        self.assertEqual('stop', e['event'])
+        self.assertEqual('searching', e['state'])
+        self.assertAlmostEqual(UTC0 + 50 * time64.SECOND / FS, e['utc'], delta=2)
+
+    def test_single_done(self):
+        self._start(_edge('i'), _edge('i', condition='falling'))
+        topic = _topic('dev1', 'i')
+        x = np.zeros(100, dtype=np.float32)
+        x[10:20] = 1.0
+        x[50:60] = 1.0
+        self.tap.publish(topic, _msg(0, x))
+        self.assertEqual('start', self._next()['event'])
+        e = self._next()
+        self.assertEqual('stop', e['event'])
+        self.assertEqual('done', e['state'])
+        self.tap.publish(topic, _msg(100, x))
+        with self.assertRaises(queue.Empty):
+            self._next(timeout=0.5)
+
+    def test_digital(self):
+        self._start(_edge('0'), _edge('0', condition='falling'))
+        x = np.packbits(np.array([0] * 12 + [1] * 4, dtype=np.uint8), bitorder='little')
+        self.tap.publish(_topic('dev1', '0'), _msg(0, x, dtype='u1'))
+        e = self._next()
+        self.assertEqual('start', e['event'])
+        self.assertEqual(UTC0 + int(12 * time64.SECOND / FS), e['utc'])
+
+    def test_compound_any(self):
+        c = _edge('i', terms=[_edge('i', source='dev2')])
+        self._start(c, _duration('never', 0.0))
+        x = np.zeros(100, dtype=np.float32)
+        x[30:] = 1.0
+        self.tap.publish(_topic('dev2', 'i'), _msg(0, x))
+        e = self._next()
+        self.assertEqual('start', e['event'])
+        self.assertEqual(UTC0 + int(30 * time64.SECOND / FS), e['utc'])
+
+    def test_compound_all(self):
+        c = _edge('i', combine='all', terms=[_edge('v', value1=2.0, source='dev2')])
+        self._start(c, _duration('never', 0.0))
+        x = np.zeros(100, dtype=np.float32)
+        x[30:] = 1.0
+        self.tap.publish(_topic('dev1', 'i'), _msg(0, x))
+        with self.assertRaises(queue.Empty):
+            self._next(timeout=0.5)
+        x = np.zeros(100, dtype=np.float32)
+        x[70:] = 3.0
+        self.tap.publish(_topic('dev2', 'v'), _msg(0, x))
+        e = self._next()
+        self.assertEqual('start', e['event'])
+        self.assertEqual(UTC0 + int(70 * time64.SECOND / FS), e['utc'])
+
+    def test_always(self):
+        self._start(_duration('always', 0.05), _duration('never', 0.0))
+        e = self._next()
+        self.assertEqual('start', e['event'])
+        self.assertEqual('active', e['state'])
+
+    def test_status(self):
+        self._start(_edge('i'), _duration('never', 0.0))
+        self.tap.publish(_topic('dev1', 'i'), _msg(0, np.zeros(100, dtype=np.float32)))
+        e = self._next(skip_status=False)
+        self.assertEqual('status', e['event'])
+        self.assertEqual(1, e['blocks'])
+        self.assertEqual(100, e['samples'])
+        self.assertEqual(0, e['overflow'])
+        self.assertGreaterEqual(e['block_latency']['max'], e['block_latency']['mean'])
+
+    def test_stop_removes_taps(self):
+        self._start(_edge('i'), _duration('never', 0.0))
+        self.engine.stop()
+        self.engine = None
+        self.assertEqual(0, len(self.tap._taps))
@@ -0,0 +1,363 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Evaluate trigger conditions on a dedicated thread.
+
+The engine receives sample data messages directly from the device
+threads through :mod:`joulescope_ui.sample_tap`, so UI thread stalls do
+not delay detection.  It reports only detections and periodic status.
+
+A start or stop condition is the trigger widget condition dict.  It may
+also contain:
+
+* terms: list of additional condition dicts.  Each term may specify its
+  own 'source', which defaults to the trigger source.
+* combine: 'any' detects when any term detects.  'all' detects once every
+  term has detected since the condition was entered, at the time of the
+  last term to detect.  Defaults to 'any'.
+"""
+
+from .condition_detector import condition_detector_factory
+from joulescope_ui import get_topic_name, time64
+from joulescope_ui.sample_tap import sample_tap
+import collections
+import logging
+import numpy as np
+import queue
+import threading
+import time
+
+
+COMBINE_OPTIONS = ['any', 'all']
+_META_SIGNALS = ['always', 'never']
+_QUEUE_SIZE = 1000          # sample data messages
+_STATUS_INTERVAL = 1.0      # seconds
+
+
+def sample_unpack(value):
+    """Get the sample data message data as one array element per sample.
+
+    :param value: The signal data message.
+    :return: The numpy array with packed u1 and u4 data expanded.
+    """
+    data_type = value['dtype']
+    y = value['data']
+    if data_type == 'u1':
+        y = np.unpackbits(y, bitorder='little')
+    elif data_type in ['u4', 'i4']:
+        d = np.empty(len(y) * 2, dtype=np.uint8)
+        d[0::2] = np.bitwise_and(y, 0x0f)
+        d[1::2] = np.bitwise_and(np.right_shift(y, 4), 0x0f)
+        y = d
+    return y
+
+
+def condition_terms(condition, source):
+    """Get the terms for a trigger condition.
+
+    :param condition: The start or stop condition dict.
+    :param source: The default source unique id.
+    :return: The list of term condition dicts, each with 'source'.
+    """
+    terms = [dict(condition, source=condition.get('source') or source)]
+    for term in condition.get('terms') or []:
+        terms.append(dict(term, source=term.get('source') or source))
+    for term in terms:
+        term.pop('terms', None)
+    return terms
+
+
+class _Condition:
+
+    def __init__(self, condition, source):
+        self.combine = condition.get('combine') or 'any'
+        if self.combine not in COMBINE_OPTIONS:
+            raise ValueError(f'Invalid combine {self.combine}')
+        self.terms = []
+        for term in condition_terms(condition, source):
+            signal = term['signal']
+            if signal in _META_SIGNALS:
+                topic, fn = None, None
+            else:
+                topic = f'{get_topic_name(term["source"])}/events/signals/{signal}/!data'
+                fn = condition_detector_factory(term)
+            self.terms.append({
+                'signal': signal,
+                'duration': term.get('duration', 0.0),
+                'topic': topic,
+                'fn': fn,
+                'utc': None,      # the detection time64 since enter()
+            })
+        self.deadline = None  # the perf_counter for the 'always' term
+
+    def enter(self):
+        self.deadline = None
+        for term in self.terms:
+            term['utc'] = None
+            fn = term['fn']
+            if hasattr(fn, 'clear'):
+                fn.clear()
+            if term['signal'] == 'always':
+                deadline = time.perf_counter() + float(term['duration'])
+                self.deadline = deadline if self.deadline is None else min(self.deadline, deadline)
+
+    def topics(self):
+        return set([term['topic'] for term in self.terms if term['topic'] is not None])
+
+    def process(self, topic, value):
+        """Process one unpacked sample data message.
+
+        :return: The detection time64 or None.
+        """
+        fs = value['sample_freq']
+        for term in self.terms:
+            if term['topic'] != topic or term['utc'] is not None:
+                continue
+            idx = term['fn'](fs, value['data'])
+            if idx is not None:
+                term['utc'] = value['utc'] + int((idx / fs) * time64.SECOND)
+        return self._detect()
+
+    def timeout(self):
+        """Process the 'always' terms that reached their deadline.
+
+        :return: The detection time64 or None.
+        """
+        if self.deadline is None or time.perf_counter() < self.deadline:
+            return None
+        self.deadline = None
+        utc = time64.now()
+        for term in self.terms:
+            if term['signal'] == 'always' and term['utc'] is None:
+                term['utc'] = utc
+        return self._detect()
+
+    def _detect(self):
+        utcs = [term['utc'] for term in self.terms]
+        if self.combine == 'all':
+            return None if None in utcs else max(utcs)
+        utcs = [u for u in utcs if u is not None]
+        return min(utcs) if len(utcs) else None
+
+
+class TriggerEngine:
+    """Evaluate trigger start and stop conditions on a dedicated thread.
+
+    :param config: The trigger configuration with 'source', 'run_mode',
+        'start_condition' and 'stop_condition'.
+    :param on_event: The callable(value) called from the engine thread
+        for each event.  The value is a dict with 'event' as one of:
+
+        * start: the start condition detected, with 'utc' and 'latency'.
+        * stop: the stop condition detected, with 'utc' and 'latency'.
+        * status: periodic status with 'state', 'blocks', 'samples',
+          'overflow' and 'block_latency'.  The engine skips the status
+          when it received no sample data.
+
+        The detection 'latency' is the time in seconds from the arrival
+        of the detecting sample block at the tap until the event.  Events
+        also contain 'perf_counter' so that the receiver can measure its
+        own dispatch delay.
+    :param tap: The SampleTap instance, which defaults to the
+        application sample_tap.
+    """
+
+    def __init__(self, config, on_event, tap=None):
+        self._log = logging.getLogger(__name__)
+        self._source = config['source']
+        self._run_mode = config.get('run_mode', 'single')
+        self._conditions = {
+            'searching': _Condition(config['start_condition'], self._source),
+            'active': _Condition(config['stop_condition'], self._source),
+        }
+        self._on_event = on_event
+        self._tap = sample_tap if tap is None else tap
+        self._queue = queue.Queue(maxsize=_QUEUE_SIZE)
+        self._thread = None
+        self._state = 'searching'
+        self._last = {}  # topic -> most recent unpacked message
+        self._status = self._status_clear()
+        self._overflow = 0  # updated from the device threads
+
+    @property
+    def state(self):
+        """The engine state: 'searching', 'active' or 'done'."""
+        return self._state
+
+    @property
+    def topics(self):
+        """The signal data topics used by the start and stop conditions."""
+        topics = set()
+        for c in self._conditions.values():
+            topics |= c.topics()
+        return sorted(topics)
+
+    def start(self):
+        """Start the engine thread and connect the sample taps."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(name='trigger_engine', target=self._run, daemon=True)
+        self._thread.start()
+        for topic in self.topics:
+            self._log.info('tap %s', topic)
+            self._tap.add(topic, self._on_tap)
+
+    def stop(self):
+        """Disconnect the sample taps and stop the engine thread."""
+        self._tap.remove(self._on_tap)
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        while True:
+            try:
+                self._queue.put(('quit', None), timeout=0.1)
+                break
+            except queue.Full:
+                self._queue_drain()
+        thread.join()
+
+    def _queue_drain(self):
+        try:
+            while True:
+                self._queue.get(block=False)
+        except queue.Empty:
+            pass
+
+    def _on_tap(self, topic, value):
+        # called from the device threads
+        try:
+            self._queue.put_nowait(('data', (topic, value, time.perf_counter())))
+        except queue.Full:
+            self._overflow += 1
+
+    def _status_clear(self):
+        return {
+            'blocks': 0,
+            'samples': 0,
+            'latency_sum': 0.0,
+            'latency_max': 0.0,
+            'time': time.perf_counter(),
+        }
+
+    def _event(self, event, **kwargs):
+        value = {'event': event, 'state': self._state, 'perf_counter': time.perf_counter()}
+        value.update(kwargs)
+        try:
+            self._on_event(value)
+        except Exception:
+            self._log.exception('on_event')
+
+    def _status_publish(self):
+        s, self._status = self._status, self._status_clear()
+        overflow, self._overflow = self._overflow, 0
+        blocks = s['blocks']
+        if not blocks and not overflow:
+            return  # idle
+        self._event('status',
+                    blocks=blocks,
+                    samples=s['samples'],
+                    overflow=overflow,
+                    block_latency={
+                        'mean': s['latency_sum'] / blocks if blocks else 0.0,
+                        'max': s['latency_max'],
+                    })
+
+    def _detect(self, utc, t_rx):
+        event = 'start' if self._state == 'searching' else 'stop'
+        if event == 'start':
+            self._state = 'active'
+        elif self._run_mode == 'single':
+            self._state = 'done'
+        else:
+            self._state = 'searching'
+        latency = time.perf_counter() - t_rx
+        self._log.info('%s detected, latency=%.6f s', event, latency)
+        self._event(event, utc=utc, latency=latency)
+        if self._state != 'done':
+            self._conditions[self._state].enter()
+
+    def _replay(self, utc):
+        """Get the buffered data following a detection for the new condition."""
+        condition = self._conditions.get(self._state)
+        if condition is None:
+            return []
+        rv = []
+        for topic in condition.topics():
+            data = self._last.get(topic)
+            if data is None:
+                continue
+            if data['utc'] <= utc:
+                fs = data['sample_freq']
+                idx = int((utc - data['utc']) / time64.SECOND * fs)
+                if idx >= len(data['data']):
+                    continue
+                data = dict(data)
+                data['sample_id'] += idx
+                data['utc'] += int((idx / fs) * time64.SECOND)
+                data['data'] = data['data'][idx:]
+            rv.append((topic, data))
+        return rv
+
+    def _process(self, topic, value, t_rx):
+        value = dict(value)
+        value['data'] = sample_unpack(value)
+        self._last[topic] = value
+        work = collections.deque([(topic, value)])
+        while len(work) and self._state != 'done':
+            utc = self._conditions[self._state].process(*work.popleft())
+            if utc is not None:
+                self._detect(utc, t_rx)
+                work.clear()
+                work.extend(self._replay(utc))
+        latency = time.perf_counter() - t_rx
+        s = self._status
+        s['blocks'] += 1
+        s['samples'] += len(value['data'])
+        s['latency_sum'] += latency
+        s['latency_max'] = max(s['latency_max'], latency)
+
+    def _timeout(self, now):
+        condition = self._conditions.get(self._state)
+        if condition is None:
+            return _STATUS_INTERVAL
+        if condition.deadline is not None and now >= condition.deadline:
+            utc = condition.timeout()
+            if utc is not None:
+                self._detect(utc, now)
+                condition = self._conditions.get(self._state)
+        if condition is None or condition.deadline is None:
+            return _STATUS_INTERVAL
+        return max(0.0, min(_STATUS_INTERVAL, condition.deadline - time.perf_counter()))
+
+    def _run(self):
+        self._log.info('start')
+        self._conditions['searching'].enter()
+        while True:
+            now = time.perf_counter()
+            timeout = self._timeout(now)
+            if now - self._status['time'] >= _STATUS_INTERVAL:
+                self._status_publish()
+            try:
+                cmd, args = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            if cmd == 'quit':
+                break
+            elif cmd == 'data':
+                if self._state != 'done':
+                    self._process(*args)
+            else:
+                self._log.warning('unsupported command %s', cmd)
+        self._log.info('stop')
@@ -13,7 +13,9 @@
 # limitations under the License.
 
 from PySide6 import QtCore, QtGui, QtWidgets
-from .condition_detector import condition_detector_factory, is_digital_signal
+from .condition_detector import is_digital_signal
+from .pre_record import SampleRingBuffer, StatisticsHistory
+from .trigger_engine import TriggerEngine
 from joulescope_ui import N_, P_, tooltip_format, register, CAPABILITIES, get_topic_name, time64
 from joulescope_ui.ui_util import comboBoxConfig, comboBoxSelectItemByText
 from joulescope_ui.styles import styled_widget, color_as_qcolor
@@ -24,6 +26,7 @@ from joulescope_ui.source_selector import SourceSelector
 import copy
 import logging
 import numpy as np
+import time
 
 
 _STYLE = """\
@@ -189,14 +192,15 @@ SETTINGS = {
         'brief': 'The trigger configuration.',
         'default': None,
     },
+    'latency': {
+        'dtype': 'obj',
+        'brief': 'The trigger detection latency in seconds.',
+        'default': None,
+        'flags': ['ro', 'hide', 'tmp'],
+    },
 }
 
 
-def _sample_utc_end(value):
-    fs = value['sample_freq']
-    return int(len(value['data']) / fs * time64.SECOND) + value['utc']
-
-
 def _grid_row_set_visible(layout, row, visible):
     visible = bool(visible)
     for col in range(layout.columnCount()):
@@ -214,6 +218,8 @@ class ConditionWidget(QtWidgets.QFrame):
     def __init__(self, parent):
         self._signal_list = []
         self._value_scale = None
+        self._terms = None  # additional compound condition terms, see trigger_engine
+        self._combine = None
         super().__init__(parent=parent)
         self._layout = QtWidgets.QGridLayout(self)
         self._layout.addWidget(QtWidgets.QLabel(N_('Type')), 0, 0, 1, 1)
@@ -267,6 +273,10 @@ class ConditionWidget(QtWidgets.QFrame):
         self._duration = IntervalWidget(self, 1)
         self._layout.addWidget(self._duration, 3, 1, 1, 1)
 
+        self._terms_label = QtWidgets.QLabel()
+        self._terms_label.setVisible(False)
+        self._layout.addWidget(self._terms_label, 4, 0, 1, 2)
+
         signals = [
             self._type.currentIndexChanged,
             self._signal.currentIndexChanged,
@@ -315,7 +325,7 @@ class ConditionWidget(QtWidgets.QFrame):
         v1 *= v_scale
         v2 *= v_scale
 
-        return {
+        rv = {
             'type': type_name,
             'signal': signal,
             'condition': condition,
@@ -324,6 +334,10 @@ class ConditionWidget(QtWidgets.QFrame):
             'value_unit': v_unit,
             'duration': self._duration.value,
         }
+        if self._terms:
+            rv['terms'] = self._terms
+            rv['combine'] = self._combine
+        return rv
 
     @config.setter
     def config(self, value):
@@ -373,6 +387,14 @@ class ConditionWidget(QtWidgets.QFrame):
 
         self._duration.value = value['duration']
 
+        self._terms = copy.deepcopy(value.get('terms')) or None
+        self._combine = value.get('combine') or 'any'
+        if self._terms:
+            combine = N_('any') if self._combine == 'any' else N_('all')
+            self._terms_label.setText(N_('Combined with {count} more conditions ({combine})').format(
+                count=len(self._terms), combine=combine))
+        self._terms_label.setVisible(bool(self._terms))
+
     def _value_units_update(self):
         self._value_scale = 1.0 if self._value_scale is None else float(self._value_scale)
         value = self._value_units.currentText()
@@ -782,7 +804,8 @@ class TriggerWidget(QtWidgets.QWidget):
 
     def __init__(self, parent=None):
         self._count = 0
-        self._utc = None  # time64 for the most recently detected event
+        self._engine = None
+        self._engine_id = 0
         self._utc_start = None  # time64 for the most recent start
         self._utc_stop = None  # time64 for the most recent stop
         self._config = None  # config for activated trigger sequence
@@ -791,19 +814,14 @@ class TriggerWidget(QtWidgets.QWidget):
         self._log = logging.getLogger(__name__)
         self._resolved_source = None
         self._signal_record = None
-        self._signal_record_buffer = {}  # (source, signal) -> list of messages
+        self._signal_record_buffer = {}  # data topic -> SampleRingBuffer
         self._stats_record = None
-        self._stats_record_buffer = {}  # source -> list of messages
+        self._stats_record_buffer = {}  # source -> StatisticsHistory
         super().__init__(parent=parent)
         self.setObjectName('jls_info_widget')
         self._layout = QtWidgets.QVBoxLayout(self)
         self._layout.setSpacing(6)
 
-        self._always_condition_timer = QtCore.QTimer(self)
-        self._always_condition_timer.setTimerType(QtGui.Qt.PreciseTimer)
-        self._always_condition_timer.setSingleShot(True)
-        self._always_condition_timer.timeout.connect(self._on_always_condition_timer)
-
         self._buffer_stop_timer = QtCore.QTimer(self)
         self._buffer_stop_timer.setTimerType(QtGui.Qt.PreciseTimer)
         self._buffer_stop_timer.setSingleShot(True)
@@ -872,28 +890,6 @@ class TriggerWidget(QtWidgets.QWidget):
         style.unpolish(self._status_button)
         style.polish(self._status_button)
 
-    def _condition_enter(self, condition):
-        signal = condition['signal']
-        if signal == 'always':
-            duration_ms = int(np.ceil(condition['duration'] * 1000))
-            self._always_condition_timer.start(duration_ms)
-        elif signal == 'never':
-            pass  # never expire, need manual intervention
-        else:
-            fn = condition.get('fn')
-            if hasattr(fn, 'clear'):
-                fn.clear()
-            data = copy.copy(condition.get('data'))
-            if data is not None and data['utc'] <= self._utc:
-                fs = data['sample_freq']
-                idx = int((self._utc - data['utc']) / time64.SECOND * fs)
-                if idx < len(data['data']):
-                    data['sample_id'] += idx
-                    data['origin_sample_id'] += idx * data['origin_decimate_factor']
-                    data['utc'] += int((idx / fs) * time64.SECOND)
-                    data['data'] = data['data'][idx:]
-                    self._process_signal_data(data)
-
     def _output_perform(self, actions):
         if not actions['output']:
             return
@@ -936,8 +932,7 @@ class TriggerWidget(QtWidgets.QWidget):
             config = signal_record_config_widget.config_update(config, count=self._count)
             self._signal_record = SignalRecord(config)
             for topic, buffer in self._signal_record_buffer.items():
-                for b in buffer:
-                    self._signal_record._on_data(topic, b)
+                buffer.flush(topic, self._signal_record._on_data)
         if actions['stats_record']:
             config = actions['stats_record_config']
             config = statistics_record_config_widget.config_update(config, count=self._count)
@@ -948,8 +943,8 @@ class TriggerWidget(QtWidgets.QWidget):
                 topic = f'{get_topic_name(source_id)}/events/statistics/!data'
                 obj = StatisticsRecord(topic, source['path'], config)
                 self._stats_record[source_id] = obj
-                for b in self._stats_record_buffer.get(source_id, []):
-                    obj._on_data(topic, b)
+                if source_id in self._stats_record_buffer:
+                    self._stats_record_buffer[source_id].flush(topic, obj._on_data)
 
         self._output_perform(actions)
         if actions['single_marker']:
@@ -983,70 +978,51 @@ class TriggerWidget(QtWidgets.QWidget):
     def _on_buffer_stop_timer(self):
         self.pubsub.publish('registry/app/settings/signal_stream_enable', False)
 
-    def _on_detect(self):
-        status = self._status_button.status
-        if status == 'searching':
-            self._utc_start = self._utc
+    def _on_detect(self, event, utc):
+        if event == 'start':
+            self._utc_start = utc
             self._start_actions_perform()
             self._status_update('active')
-            self._condition_enter(self._config['stop_condition'])
-        elif status == 'active':
-            self._utc_stop = self._utc
+        elif event == 'stop':
+            self._utc_stop = utc
             self._stop_actions_perform()
             if self._config['run_mode'] == 'single':
                 self._deactivate()
             else:
                 self._count += 1
                 self._status_update('searching')
-                self._condition_enter(self._config['start_condition'])
 
-    @QtCore.Slot()
-    def _on_always_condition_timer(self):
-        self._utc = time64.now()
-        self._on_detect()
-
-    def _on_signal_data(self, topic, value):
-        parts = topic.split('/')
-        topic_source = parts[1]
-        topic_signal = parts[4]
-        data_type = value['dtype']
-        y = value['data']
-        if data_type in ['f32', 'f64', 'u8', 'u16', 'u32', 'u64', 'i8', 'i16', 'i32', 'i64']:
-            pass
-        elif data_type == 'u1':
-            y = np.unpackbits(y, bitorder='little')
-        elif data_type in ['u4', 'i4']:
-            d = np.empty(len(y) * 2, dtype=np.uint8)
-            d[0::2] = np.bitwise_and(y, 0x0f)
-            d[1::2] = np.bitwise_and(np.right_shift(y, 4), 0x0f)
-            y = d
-        value = copy.copy(value)
-        value['topic'] = topic
-        value['data'] = y
-        value['topic_source'] = topic_source
-        value['topic_signal'] = topic_signal
-        self._process_signal_data(value)
-
-    def _process_signal_data(self, value):
-        topic_source, topic_signal = value['topic_source'], value['topic_signal']
-        cfg = self._config
-        start_condition = cfg['start_condition']
-        stop_condition = cfg['stop_condition']
-        status = self._status_button.status
-        if status == 'inactive':
-            return
-        condition = start_condition if status == 'searching' else stop_condition
-        if topic_source == cfg['source']:
-            for c in [start_condition, stop_condition]:
-                if topic_signal == c['signal']:
-                    c['data'] = value
-            if topic_signal == condition['signal']:
-                fs = value['sample_freq']
-                data = value['data']
-                rv = condition['fn'](fs, data)
-                if rv is not None:
-                    self._utc = int((rv / fs) * time64.SECOND) + value['utc']
-                    self._on_detect()
+    def _engine_event_factory(self):
+        self._engine_id += 1
+        engine_id = self._engine_id
+        topic = f'{self.topic}/callbacks/!engine'
+
+        def on_event(value):
+            # called from the trigger engine thread
+            value['engine_id'] = engine_id
+            self.pubsub.publish(topic, value)
+
+        return on_event
+
+    def on_callback_engine(self, value):
+        if self._engine is None or value.get('engine_id') != self._engine_id:
+            return  # stale event from a previous activation
+        event = value['event']
+        latency = dict(self.latency) if isinstance(self.latency, dict) else {}
+        if event == 'status':
+            latency['block_mean'] = value['block_latency']['mean']
+            latency['block_max'] = value['block_latency']['max']
+            latency['overflow'] = value['overflow']
+            if value['overflow']:
+                self._log.warning('trigger engine dropped %d blocks', value['overflow'])
+        else:
+            latency['detect'] = value['latency']
+            latency['dispatch'] = time.perf_counter() - value['perf_counter']
+            self._log.info('%s: detect latency %.6f s, dispatch %.6f s',
+                           event, latency['detect'], latency['dispatch'])
+        self.latency = latency
+        if event in ['start', 'stop']:
+            self._on_detect(event, value['utc'])
 
     def _on_signal_record_data(self, topic, value):
         if self._config is None:
@@ -1055,12 +1031,8 @@ class TriggerWidget(QtWidgets.QWidget):
         if pre <= 0:
             return
         if topic not in self._signal_record_buffer:
-            self._signal_record_buffer[topic] = []
-        b = self._signal_record_buffer[topic]
-        b.append(value)
-        utc_start = value['utc'] - int(pre * time64.SECOND)  # keep at least one buffer by using start
-        while len(b) and _sample_utc_end(b[0]) < utc_start:
-            b.pop(0)
+            self._signal_record_buffer[topic] = SampleRingBuffer(pre)
+        self._signal_record_buffer[topic].append(value)
 
     def _on_statistics_record_data(self, topic, value):
         if self._config is None:
@@ -1070,12 +1042,8 @@ class TriggerWidget(QtWidgets.QWidget):
             return
         source_id = topic.split('/')[1]
         if source_id not in self._stats_record_buffer:
-            self._stats_record_buffer[source_id] = []
-        b = self._stats_record_buffer[source_id]
-        b.append(value)
-        utc_start = value['time']['utc']['value'][0] - int(pre * time64.SECOND)
-        while len(b) and (b[0]['time']['utc']['value'][1] <= utc_start):
-            b.pop(0)
+            self._stats_record_buffer[source_id] = StatisticsHistory(pre)
+        self._stats_record_buffer[source_id].append(value)
 
     def _activate(self):
         if 'inactive' != self._status_button.status:
@@ -1084,22 +1052,7 @@ class TriggerWidget(QtWidgets.QWidget):
             w.setEnabled(False)
         self._status_update('searching')
         self._config = copy.deepcopy(self.config)
-        source = self._config['source']
-        for condition_name in ['start_condition', 'stop_condition']:
-            condition = self._config[condition_name]
-            condition['fn'] = condition_detector_factory(condition)
-
-        start_signal = self._config['start_condition']['signal']
-        if start_signal not in _DURATION_META_SIGNALS:
-            topic = f'{get_topic_name(source)}/events/signals/{start_signal}/!data'
-            self._log.info('start_condition subscribe: %s', topic)
-            self.pubsub.subscribe(topic, self._on_signal_data, ['pub'])
-
-        stop_signal = self._config['stop_condition']['signal']
-        if stop_signal not in _DURATION_META_SIGNALS and start_signal != stop_signal:
-            topic = f'{get_topic_name(source)}/events/signals/{stop_signal}/!data'
-            self._log.info('stop_condition subscribe: %s', topic)
-            self.pubsub.subscribe(topic, self._on_signal_data, ['pub'])
+        self._engine = TriggerEngine(self._config, self._engine_event_factory())
 
         if self._config['start_actions']['sample_record']:
             config = self._config['start_actions']['sample_record_config']
@@ -1115,10 +1068,15 @@ class TriggerWidget(QtWidgets.QWidget):
                     topic = f'{get_topic_name(source_id)}/events/statistics/!data'
                     self.pubsub.subscribe(topic, self._on_statistics_record_data, ['pub'])
 
-        self._condition_enter(self._config['start_condition'])
+        self._engine.start()
+
+    def _engine_stop(self):
+        engine, self._engine = self._engine, None
+        if engine is not None:
+            engine.stop()
 
     def _deactivate(self):
-        self.pubsub.unsubscribe_all(self._on_signal_data)
+        self._engine_stop()
         self.pubsub.unsubscribe_all(self._on_signal_record_data)
         self.pubsub.unsubscribe_all(self._on_statistics_record_data)
         if 'inactive' == self._status_button.status:
@@ -1236,6 +1194,6 @@ class TriggerWidget(QtWidgets.QWidget):
 
     def on_pubsub_unregister(self, pubsub):
         # Stop all timers so a torn-down widget cannot keep firing / repainting.
-        self._always_condition_timer.stop()
+        self._engine_stop()
         self._buffer_stop_timer.stop()
         self._status_button.status = 'inactive'  # stops its repeating repaint timer
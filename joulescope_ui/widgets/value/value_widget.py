@@ -20,12 +20,16 @@ from joulescope_ui.units import RE_IS_NUMBER, UNITS_SETTING, \
     convert_units, effective_units, unit_prefix, prefix_to_scale, three_sig_figs
 from joulescope_ui.ui_util import comboBoxConfig, comboBoxSelectItemByText
 from joulescope_ui.source_selector import SourceSelector
+from joulescope_ui.statistics_data import SIGNALS, STATISTICS, ACCUMULATORS, UNITS, as_statistics_data
 import datetime
 import numpy as np
 import copy
 import logging
 
 
+_AVG, _STD, _MIN, _MAX, _P2P = [STATISTICS.index(s) for s in ['avg', 'std', 'min', 'max', 'p2p']]
+
+
 SETTINGS = {
     'statistics_stream_source': {
         'dtype': 'str',
@@ -332,7 +336,7 @@ class _InnerWidget(QtWidgets.QWidget):
         self.setMouseTracking(True)
 
     def _on_statistics(self, value):
-        self._statistics = copy.deepcopy(value)
+        self._statistics = value
         self.repaint()
 
     def _value_format(self, value):
@@ -448,9 +452,8 @@ class _InnerWidget(QtWidgets.QWidget):
             self.geometry()
 
         if self._statistics is not None:
-            a_start, a_end = self._statistics['time']['accum_samples']['value']
-            sample_freq = self._statistics['time']['sample_freq']['value']
-            a_duration = (a_end - a_start) / sample_freq
+            a_start, a_end = self._statistics.accum_samples
+            a_duration = (a_end - a_start) / self._statistics.sample_freq
             a_duration_txt = duration_to_str(a_duration)
 
         painter.fillRect(0, 0, x_max, y_max, background_brush)
@@ -471,7 +474,7 @@ class _InnerWidget(QtWidgets.QWidget):
                 y += title_font_metrics.ascent()
                 signal_title_parts = [resolved, signal_name]
                 if self._statistics is not None:
-                    if signal_name not in self._statistics['accumulators'] and self._main != 'avg':
+                    if signal_name not in ACCUMULATORS and self._main != 'avg':
                         signal_title_parts.append(self._main)
                 painter.drawText(x, y, ' . '.join(signal_title_parts))
                 y += title_font_metrics.descent() + title_space
@@ -483,20 +486,20 @@ class _InnerWidget(QtWidgets.QWidget):
             painter.setFont(main_font)
             y += main_font_metrics.ascent() + (y_signal - title_height - main_font_metrics.height()) // 2
 
-            if signal_name in self._statistics['accumulators']:
-                signal = self._statistics['accumulators'][signal_name]
+            if signal_name in ACCUMULATORS:
+                signal_value = self._statistics.field(signal_name)
                 fields = ['accumulate_duration'] if parent.show_fields else []
-                signal_value, signal_units = convert_units(signal['value'] / divisor, signal['units'], parent.units)
+                signal_value, signal_units = convert_units(signal_value / divisor, UNITS[signal_name], parent.units)
                 _, prefix, scale = unit_prefix(signal_value)
                 scale *= divisor
             else:
-                signal = self._statistics['signals'][signal_name]
+                signal = {s: self._statistics.field(f'{signal_name}_{s}') for s in self._fields}
                 fields = fields if parent.show_fields else []
                 fields_all = [self._main] + fields
-                max_value = max([abs(signal[s]['value']) for s in fields_all])
+                max_value = max([abs(signal[s]) for s in fields_all])
                 _, prefix, scale = unit_prefix(max_value / divisor)
-                signal_value = signal[self._main]['value']
-                signal_units = signal[self._main]['units']
+                signal_value = signal[self._main]
+                signal_units = UNITS[signal_name]
                 scale *= divisor
             prefix_preferred = (parent.prefix_preferred or {}).get(signal_name, 'auto')
             if prefix_preferred != 'auto':
@@ -541,7 +544,7 @@ class _InnerWidget(QtWidgets.QWidget):
                     painter.drawText(x0, y, a_duration_txt)
                     self._geometry[(signal_name, 'duration')] = ((x0, y0), (x3, y), a_duration_txt)
                 else:
-                    v_str = self._value_format(signal[stat]['value'] / scale)
+                    v_str = self._value_format(signal[stat] / scale)
                     v_str_idx = 1
                     if v_str[0] == '-' or parent.show_sign:
                         painter.drawText(x0, y, v_str[0])
@@ -663,6 +666,7 @@ class _BaseWidget(QtWidgets.QWidget):
         self._layout.addItem(self._spacer)
 
         self._statistics = None  # most recent statistics information
+        self._accum_start = None
         self.mousePressEvent = self._on_mousePressEvent
 
     def on_pubsub_register(self):
@@ -698,50 +702,54 @@ class _BaseWidget(QtWidgets.QWidget):
         self.repaint()
 
     def _accum(self, stats):
-        if self._statistics is None:
-            return stats
-        if stats['source']['unique_id'] != self._statistics['source']['unique_id']:
+        if self._statistics is None or stats.unique_id != self._statistics.unique_id:
+            self._accum_start = None
             return stats
-        v_start, v_end = self._statistics['time']['samples']['value']
+        v_start, v_end = self._statistics.samples
         v_duration = v_end - v_start
-        x_start, x_end = stats['time']['samples']['value']
+        x_start, x_end = stats.samples
         x_duration = x_end - x_start
-        for signal_name, v in self._statistics['signals'].items():
-            x = stats['signals'][signal_name]
-            x_min, x_max = x['min']['value'], x['max']['value']
-            if np.isfinite(x_min) and np.isfinite(x_max):
-                v['min']['value'] = min(v['min']['value'], x_min)
-                v['max']['value'] = max(v['max']['value'], x_max)
-                v['p2p']['value'] = v['max']['value'] - v['min']['value']
-            x_avg, x_std = x['avg']['value'], x['std']['value']
-            if np.isfinite(x_avg) and np.isfinite(x_std):
-                v_avg, v_std = v['avg']['value'], v['std']['value']
-                avg = v_avg + ((x_avg - v_avg) * (x_duration / (x_duration + v_duration)))
-                v['avg']['value'] = avg
-                x_diff = x_avg - avg
-                v_diff = v_avg - avg
-                x_var = x_std * x_std
-                v_var = v_std * v_std
-                s = ((v_var + v_diff * v_diff) * v_duration +
-                     (x_var + x_diff * x_diff) * x_duration)
-                v['std']['value'] = np.sqrt(s / (x_duration + v_duration - 1))
-        self._statistics['time']['accum_samples'] = stats['time']['accum_samples']
-        self._statistics['accumulators'] = stats['accumulators']
-        self._statistics['time']['samples']['value'] = [v_start, x_end]
-        return self._statistics
+        n = len(SIGNALS) * len(STATISTICS)
+        shape = (len(SIGNALS), len(STATISTICS))
+        v = self._statistics.values[:n].reshape(shape)
+        x = stats.values[:n].reshape(shape)
+        values = np.array(stats.values)  # keep the accumulators from stats
+        y = values[:n].reshape(shape)
+        y[:, :] = v
+
+        valid = np.isfinite(x[:, _MIN]) & np.isfinite(x[:, _MAX])
+        y[valid, _MIN] = np.minimum(v[valid, _MIN], x[valid, _MIN])
+        y[valid, _MAX] = np.maximum(v[valid, _MAX], x[valid, _MAX])
+        y[valid, _P2P] = y[valid, _MAX] - y[valid, _MIN]
+
+        valid = np.isfinite(x[:, _AVG]) & np.isfinite(x[:, _STD])
+        x_avg, x_std = x[valid, _AVG], x[valid, _STD]
+        v_avg, v_std = v[valid, _AVG], v[valid, _STD]
+        avg = v_avg + ((x_avg - v_avg) * (x_duration / (x_duration + v_duration)))
+        x_diff = x_avg - avg
+        v_diff = v_avg - avg
+        x_var = x_std * x_std
+        v_var = v_std * v_std
+        s = ((v_var + v_diff * v_diff) * v_duration +
+             (x_var + x_diff * x_diff) * x_duration)
+        y[valid, _AVG] = avg
+        y[valid, _STD] = np.sqrt(s / (x_duration + v_duration - 1))
+        return stats.replace(values=values, samples=[v_start, x_end])
 
     def _on_statistics(self, value):
+        value = as_statistics_data(value)
         if self._accrue_widget.is_accrue:
             self._statistics = self._accum(value)
-            if 'accum_start' not in self._statistics:
-                self._statistics['accum_start'] = datetime.datetime.now().isoformat().split('.')[0]
+            if self._accum_start is None:
+                self._accum_start = datetime.datetime.now().isoformat().split('.')[0]
         else:
             self._statistics = value
-        v_start, v_end = self._statistics['time']['samples']['value']
-        sample_freq = self._statistics['time']['sample_freq']['value']
+            self._accum_start = None
+        v_start, v_end = self._statistics.samples
+        sample_freq = self._statistics.sample_freq
         self._device_widget.device_show(self.source_selector.resolved())
         if not self._accrue_widget.hold:
-            self._accrue_widget.accrue_duration((v_end - v_start) / sample_freq, self._statistics.get('accum_start'))
+            self._accrue_widget.accrue_duration((v_end - v_start) / sample_freq, self._accum_start)
             self._inner._on_statistics(self._statistics)
 
     def _on_global_statistics_stream_enable(self, value):
@@ -0,0 +1,55 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test WaveformWidget construction."""
+
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6 import QtWidgets
+
+from joulescope_ui import pubsub_singleton
+from joulescope_ui.widgets.waveform.waveform_widget import WaveformWidget
+
+
+_UNIQUE_ID = 'WaveformWidget:test_construct'
+
+
+class TestWaveformWidgetConstruct(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    def setUp(self):
+        # Registering an instance replaces the class settings with descriptors,
+        # which later instances see until they are registered.
+        self.registered = WaveformWidget(None)
+        pubsub_singleton.register(self.registered, _UNIQUE_ID)
+
+    def tearDown(self):
+        pubsub_singleton.unregister(self.registered, delete=True)
+
+    def test_construct_after_register(self):
+        w = WaveformWidget(None)
+        self.assertFalse(w._is_comparison)
+        self.assertFalse(w._is_file_mode)
+
+    def test_construct_comparison(self):
+        w = WaveformWidget(None, source_filter='JlsComparisonSource:a')
+        self.assertTrue(w._is_comparison)
+        self.assertTrue(w._is_file_mode)
+        self.assertFalse(w._trace_widget.isVisibleTo(w))
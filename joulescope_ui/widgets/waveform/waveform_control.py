@@ -188,7 +188,8 @@ class WaveformControlWidget(QtWidgets.QWidget):
 
     @property
     def is_file_mode(self):
-        return self._source_filter is not None and 'JlsSource' in self._source_filter
+        source_filter = self._source_filter
+        return source_filter is not None and any([s in source_filter for s in ('JlsSource', 'JlsComparisonSource')])
 
     def on_pubsub_register(self, pubsub, topic, source_filter):
         self.pubsub = pubsub
@@ -186,6 +186,8 @@ class WaveformSourceWidget(QtWidgets.QWidget):
         return self.parent().pubsub
 
     def _is_needed(self):
+        if getattr(self.parent(), '_is_comparison', False):
+            return False  # comparison displays all subsources
         if len(self._subsources) > 1:
             return True
         if not len(self._subsources):
@@ -71,6 +71,13 @@ _ANTIALIASING = QtGui.QPainter.RenderHint.Antialiasing
 _CLIP_LIMIT_PIXELS = 8192
 _PIN_ATTENTION_DURATION_S = 3.0  # in-plot pinned x-axis message display duration
 _PIN_ATTENTION_MESSAGE = N_('X-axis pinned: click the pin buttons or press Shift+Space to unpin')
+_FILE_SOURCES = ('JlsSource', 'JlsComparisonSource')
+_STREAM_SOURCES = ('JsdrvStreamBuffer:001', 'SimStreamBuffer:001')  # live device buffers
+_COMPARISON_SOURCE = 'JlsComparisonSource'
+_COMPARISON_TRACE_COLORS = [  # comparison traces after waveform.trace1..4
+    '#17becfff', '#bcbd22ff', '#e377c2ff', '#8c564bff',
+    '#7f7f7fff', '#9467bdff', '#ff9896ff', '#98df8aff',
+]
 
 
 def _analog_plot(quantity, show, units, name, integral=None, range_bounds=None):
@@ -659,7 +666,9 @@ class WaveformWidget(QtWidgets.QWidget):
         self._source_subscriptions = {}   # source -> [(topic, fn, flags), ...]
         self._signal_subscriptions = {}   # signal_id -> (topic, fn, flags)
         self._points = PointsF()
-        self._marker_data = {}  # rsp_id -> data,
+        self._marker_data = {}  # (marker_id, plot_id) -> data, retained while updates are pending
+        self._marker_pending = set()  # (marker_id, plot_id) with outstanding requests
+        self._request_batch = {}  # source -> [req, ...], flushed by _request_data
         self._annotations_request_defer = []
         self._await = []  # defer topic publish on JLS user_data
         self._pin_attention_expire = 0.0  # end time for the pinned x-axis indication
@@ -734,6 +743,10 @@ class WaveformWidget(QtWidgets.QWidget):
             The first entry has the highest priority.
             Trace_idx starts from 0.
         """
+        if self._is_comparison:
+            # overlay every capture, first capture has the highest priority
+            return [[idx, subsource] for idx, subsource in enumerate(self.subsources)
+                    if quantity is None or f'{subsource}.{quantity}' in self._signals]
         data = []
         subsources = self.trace_subsources
         for idx, priority in enumerate(self.trace_priority):
@@ -760,7 +773,7 @@ class WaveformWidget(QtWidgets.QWidget):
         """Get the drawing style for one trace of one plot.
 
         :param s: The style dict from self._style.
-        :param trace_idx: The trace index 0..3.
+        :param trace_idx: The trace index, 0..3 or any index in comparison mode.
         :param quantity: The plot quantity.
         :return: dict with keys trace_pen, trace_brush, min_max_trace,
             min_max_fill_pen, min_max_fill_brush, std_fill, missing.
@@ -773,6 +786,7 @@ class WaveformWidget(QtWidgets.QWidget):
             qs = s['quantity_style'].get(quantity)
             if qs is not None:
                 return qs
+        trace_idx %= len(s['plot_trace_pen'])
         return {
             'trace_pen': s['plot_trace_pen'][trace_idx],
             'trace_brush': s['plot_trace_brush'][trace_idx],
@@ -934,19 +948,32 @@ class WaveformWidget(QtWidgets.QWidget):
         if not self.pubsub.query(f'registry/app/settings/signal_stream_enable'):
             return False
         source_filter = self.pubsub.query(f'{self.topic}/settings/source_filter')
-        if source_filter is not None and 'JlsSource' in source_filter:
+        if source_filter is not None and any([s in source_filter for s in _FILE_SOURCES]):
             return False
         return True
 
+    def _source_filter_value(self):
+        # Before registration, the source_filter attribute may still be the
+        # class setting descriptor, so prefer the constructor argument.
+        source_filter = self._kwargs.get('source_filter')
+        if source_filter is None:
+            source_filter = getattr(self, 'source_filter', None)
+        return source_filter if isinstance(source_filter, str) else None
+
     @property
     def _is_file_mode(self):
-        source_filter = getattr(self, 'source_filter', None)
-        return source_filter is not None and 'JlsSource' in source_filter
+        source_filter = self._source_filter_value()
+        return source_filter is not None and any([s in source_filter for s in _FILE_SOURCES])
+
+    @property
+    def _is_comparison(self):
+        source_filter = self._source_filter_value()
+        return source_filter is not None and _COMPARISON_SOURCE in source_filter
 
     def on_pubsub_register(self):
         self._trace_widget.on_pubsub_register(self.pubsub)
         source_filter = self._source_filter_set()
-        is_device = source_filter in [None, '', 'JsdrvStreamBuffer:001']
+        is_device = source_filter in (None, '') + _STREAM_SOURCES
         if not is_device and get_topic_name(source_filter) not in self.pubsub:
             raise RuntimeError(f'Source not found {source_filter}')
         if self.state is None:
@@ -1162,6 +1189,9 @@ class WaveformWidget(QtWidgets.QWidget):
                 x_max.append(x_range[1])
         if 0 == len(x_min):
             return [0, 0]
+        if self._is_comparison:
+            # captures may differ in duration, comparison source handles out of range requests
+            return [min(x_min), max(x_max)]
         # return [min(x_min), max(x_max)]   # todo restore when JLS v2 supports out of range requests
         x0, x1 = max(x_min), min(x_max)
         if x0 > x1:
@@ -1243,6 +1273,12 @@ class WaveformWidget(QtWidgets.QWidget):
                     changed = True
                     m['changed'] = False
                     self._request_marker_data(m)
+            marker_ids = set([m['id'] for m in self.annotations['x'].values()])
+            for key in list(self._marker_data.keys()):
+                if key[0] not in marker_ids:
+                    self._marker_data.pop(key)
+                    self._marker_pending.discard(key)
+        self._request_flush()
         return changed
 
     def _request_marker_data(self, marker):
@@ -1261,7 +1297,8 @@ class WaveformWidget(QtWidgets.QWidget):
                 continue
             plot_id = plot['index']
             rsp_id = _marker_to_rsp_id(marker_id, plot_id)
-            self._marker_data[(marker_id, plot_id)] = None  # invalidate any existing data
+            # keep displaying any existing data until the response arrives
+            self._marker_pending.add((marker_id, plot_id))
             if marker.get('mode', 'absolute') == 'relative':
                 x0, x1 = marker['pos_next1'], marker['pos_next2']
             else:
@@ -1274,8 +1311,6 @@ class WaveformWidget(QtWidgets.QWidget):
         if isinstance(signal, str):
             signal = self._signals[signal]
         source, subsignal_id = signal['id'].split('.', 1)
-        topic_req = f'registry/{source}/actions/!request'
-        topic_rsp = f'{get_topic_name(self)}/callbacks/!response'
         if length is None:
             x_info = self._x_geometry_info.get('plot')
             if x_info is None:
@@ -1285,13 +1320,24 @@ class WaveformWidget(QtWidgets.QWidget):
             req = {
                 'signal_id': subsignal_id,
                 'time_type': 'utc',
-                'rsp_topic': topic_rsp,
                 'rsp_id': signal['rsp_id'] if rsp_id is None else rsp_id,
                 'start': x_range[0],
                 'end': x_range[1],
                 'length': length,
             }
-            self.pubsub.publish(topic_req, req, defer=True)
+            self._request_batch.setdefault(source, []).append(req)
+
+    def _request_flush(self):
+        """Publish the pending requests as one batch request per source."""
+        batches, self._request_batch = self._request_batch, {}
+        topic_rsp = f'{get_topic_name(self)}/callbacks/!response_batch'
+        for source, requests in batches.items():
+            req = {
+                'requests': requests,
+                'rsp_topic': topic_rsp,
+                'rsp_id': 0,
+            }
+            self.pubsub.publish(f'registry/{source}/actions/!request_batch', req, defer=True)
 
     def _signal_freq(self):
         """Get the minimum signal frequency
@@ -1327,6 +1373,11 @@ class WaveformWidget(QtWidgets.QWidget):
             self.pubsub.publish(self._annotations_request_defer.pop(0),
                                 {'rsp_topic': f'{self.topic}/callbacks/!annotations'})
 
+    def on_callback_response_batch(self, topic, value):
+        for rsp in value['responses']:
+            if rsp is not None:
+                self.on_callback_response(topic, rsp)
+
     def on_callback_response(self, topic, value):
         sample_ids = value['info']['time_range_samples']
         if sample_ids['length'] == 0:
@@ -1388,6 +1439,7 @@ class WaveformWidget(QtWidgets.QWidget):
         if rsp_id >= _MARKER_RSP_OFFSET:
             marker_id, plot_id = _marker_from_rsp_id(rsp_id)
             self._marker_data[(marker_id, plot_id)] = data
+            self._marker_pending.discard((marker_id, plot_id))
         elif rsp_id == 1:
             if self._summary_data is None:
                 self._summary_data = {}
@@ -1540,6 +1592,9 @@ class WaveformWidget(QtWidgets.QWidget):
         trace2 = color_as_string(v['waveform.trace2'], alpha=0xff)
         trace3 = color_as_string(v['waveform.trace3'], alpha=0xff)
         trace4 = color_as_string(v['waveform.trace4'], alpha=0xff)
+        traces = [trace1, trace2, trace3, trace4]
+        if self._is_comparison:
+            traces += _COMPARISON_TRACE_COLORS
 
         self._style_cache = {
             'background_brush': QtGui.QBrush(color_as_qcolor(v['waveform.background'])),
@@ -1560,48 +1615,13 @@ class WaveformWidget(QtWidgets.QWidget):
             'summary_min_max_fill': QBrush(color_as_qcolor(summary_trace, alpha=min_max_fill_alpha)),
             'summary_view': QBrush(color_as_qcolor(v['waveform.summary_view'])),
 
-            'plot_trace_pen': [
-                QPen(color_as_qcolor(trace1, alpha=trace_alpha)),
-                QPen(color_as_qcolor(trace2, alpha=trace_alpha)),
-                QPen(color_as_qcolor(trace3, alpha=trace_alpha)),
-                QPen(color_as_qcolor(trace4, alpha=trace_alpha)),
-            ],
-            'plot_trace_brush': [
-                QBrush(color_as_qcolor(trace1, alpha=trace_alpha)),
-                QBrush(color_as_qcolor(trace2, alpha=trace_alpha)),
-                QBrush(color_as_qcolor(trace3, alpha=trace_alpha)),
-                QBrush(color_as_qcolor(trace4, alpha=trace_alpha)),
-            ],
-            'plot_min_max_trace': [
-                QPen(color_as_qcolor(trace1, alpha=min_max_trace_alpha)),
-                QPen(color_as_qcolor(trace2, alpha=min_max_trace_alpha)),
-                QPen(color_as_qcolor(trace3, alpha=min_max_trace_alpha)),
-                QPen(color_as_qcolor(trace4, alpha=min_max_trace_alpha)),
-            ],
-            'plot_min_max_fill_pen': [
-                QPen(color_as_qcolor(trace1, alpha=min_max_fill_alpha)),
-                QPen(color_as_qcolor(trace2, alpha=min_max_fill_alpha)),
-                QPen(color_as_qcolor(trace3, alpha=min_max_fill_alpha)),
-                QPen(color_as_qcolor(trace4, alpha=min_max_fill_alpha)),
-            ],
-            'plot_min_max_fill_brush': [
-                QBrush(color_as_qcolor(trace1, alpha=min_max_fill_alpha)),
-                QBrush(color_as_qcolor(trace2, alpha=min_max_fill_alpha)),
-                QBrush(color_as_qcolor(trace3, alpha=min_max_fill_alpha)),
-                QBrush(color_as_qcolor(trace4, alpha=min_max_fill_alpha)),
-            ],
-            'plot_std_fill': [
-                QBrush(color_as_qcolor(trace1, alpha=std_fill_alpha)),
-                QBrush(color_as_qcolor(trace2, alpha=std_fill_alpha)),
-                QBrush(color_as_qcolor(trace3, alpha=std_fill_alpha)),
-                QBrush(color_as_qcolor(trace4, alpha=std_fill_alpha)),
-            ],
-            'plot_missing': [
-                QBrush(color_as_qcolor(trace1, alpha=missing_alpha)),
-                QBrush(color_as_qcolor(trace2, alpha=missing_alpha)),
-                QBrush(color_as_qcolor(trace3, alpha=missing_alpha)),
-                QBrush(color_as_qcolor(trace4, alpha=missing_alpha)),
-            ],
+            'plot_trace_pen': [QPen(color_as_qcolor(c, alpha=trace_alpha)) for c in traces],
+            'plot_trace_brush': [QBrush(color_as_qcolor(c, alpha=trace_alpha)) for c in traces],
+            'plot_min_max_trace': [QPen(color_as_qcolor(c, alpha=min_max_trace_alpha)) for c in traces],
+            'plot_min_max_fill_pen': [QPen(color_as_qcolor(c, alpha=min_max_fill_alpha)) for c in traces],
+            'plot_min_max_fill_brush': [QBrush(color_as_qcolor(c, alpha=min_max_fill_alpha)) for c in traces],
+            'plot_std_fill': [QBrush(color_as_qcolor(c, alpha=std_fill_alpha)) for c in traces],
+            'plot_missing': [QBrush(color_as_qcolor(c, alpha=missing_alpha)) for c in traces],
 
             'axis_font': axis_font,
             'axis_font_metrics': QtGui.QFontMetrics(axis_font),
@@ -1771,8 +1791,7 @@ class WaveformWidget(QtWidgets.QWidget):
             self._log.exception('Exception during drawing')
         req = self._request_data()
         if not req and len(self._await):
-            pending = [key for key, value in self._marker_data.items() if value is None]
-            if not len(pending):
+            if not len(self._marker_pending):
                 # requests completed, publish deferred topics
                 while len(self._await):
                     topic, value = self._await.pop()
@@ -2174,6 +2193,10 @@ class WaveformWidget(QtWidgets.QWidget):
             if sig_d is None:
                 continue
             ts = self._trace_style(s, trace_idx, quantity)
+            # comparison: only the primary trace shows min/max to limit clutter and paint cost
+            show_min_max = self.show_min_max
+            if self._is_comparison and trace_idx != traces[0][0]:
+                show_min_max = 0
             d = sig_d['data']
             d_x = self._x_map.time64_to_counter(d['x'])
             if len(d_x) == w:
@@ -2199,10 +2222,10 @@ class WaveformWidget(QtWidgets.QWidget):
             for idx_start, idx_stop in segment_idx:
                 d_x_segment = d_x[idx_start:idx_stop]
                 d_avg = d['avg'][idx_start:idx_stop]
-                if self.show_min_max and d['min'] is not None and d['max'] is not None:
+                if show_min_max and d['min'] is not None and d['max'] is not None:
                     d_y_min = self._y_value_to_pixel(plot, d['min'][idx_start:idx_stop])
                     d_y_max = self._y_value_to_pixel(plot, d['max'][idx_start:idx_stop])
-                    if 1 == self.show_min_max:
+                    if 1 == show_min_max:
                         p.setPen(ts['min_max_trace'])
                         segs = self._points.set_line(d_x_segment, d_y_min)
                         p.drawPolyline(segs)
@@ -2213,7 +2236,7 @@ class WaveformWidget(QtWidgets.QWidget):
                         p.setPen(ts['min_max_fill_pen'])
                         p.setBrush(ts['min_max_fill_brush'])
                         p.drawPolygon(segs)
-                        if 3 == self.show_min_max:
+                        if 3 == show_min_max:
                             d_std = d['std'][idx_start:idx_stop]
                             if np.all(np.isfinite(d_std)):
                                 d_y_std_min = self._y_value_to_pixel(plot, d_avg - d_std)